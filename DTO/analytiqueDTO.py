@@ -0,0 +1,24 @@
+# DTO/analytiqueDTO.py
+# -----------------------------------------------------------------------------
+# Fichier: DTO/analytiqueDTO.py
+# Rôle : indicateurs de revenu/occupation par période et par type de chambre.
+# Définitions (standard hôtellerie):
+#   - taux_occupation = nuits_vendues / nuits_disponibles (0..1)
+#   - adr (average daily rate) = revenu / nuits_vendues
+#   - revpar (revenue per available room) = revenu / nuits_disponibles
+#   - nuits_disponibles = chambres du type × jours de la période (inventaire
+#     actuel: les chambres ajoutées/retirées ne sont pas historisées).
+# -----------------------------------------------------------------------------
+
+from pydantic import BaseModel
+
+class IndicateurDTO(BaseModel):
+    periode: str            # "2036-06-01", "2036-06", "2036" ou "total"
+    nom_type: str
+    chambres: int
+    nuits_vendues: int
+    nuits_disponibles: int
+    revenu: float
+    taux_occupation: float
+    adr: float
+    revpar: float
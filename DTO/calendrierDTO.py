@@ -0,0 +1,26 @@
+# DTO/calendrierDTO.py
+# -----------------------------------------------------------------------------
+# Fichier: DTO/calendrierDTO.py
+# Rôle : réponse JSON de GET /calendrier (grille chambres × nuits).
+# Notes: selon ?format=, chaque chambre porte soit `occupe` (RLE: liste de
+#        [nuit, longueur]), soit `bits` (bitset base64, nuit 0 = bit de poids
+#        fort du 1er octet). L'autre champ reste None.
+# -----------------------------------------------------------------------------
+
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class CalendrierChambreDTO(BaseModel):
+    idChambre: UUID
+    numero_chambre: int
+    disponible_reservation: bool
+    occupe: Optional[List[List[int]]] = None
+    bits: Optional[str] = None
+
+class CalendrierDTO(BaseModel):
+    debut: date
+    jours: int
+    format: str
+    chambres: List[CalendrierChambreDTO]
@@ -6,11 +6,15 @@
 #       des entrées (create/update). J’ai mis des Field(...) pour limiter tailles.
 # Note: TypeChambre.prix_plafond est un str en DB (NCHAR(10)), je le garde pareil
 #       ici pour être fidèle au modèle, mais je convertis prix_plancher en float.
+# Sortie: from_entity() = chemin de confiance (DTO/confiance.py, sans
+#       validation: les valeurs viennent de notre BD, déjà typées par
+#       SQLAlchemy). Le constructeur DTO(entité) valide encore tout.
 # -----------------------------------------------------------------------------
 
 from typing import Optional
 from pydantic import BaseModel, Field
 from uuid import UUID
+from DTO.confiance import construire
 from modele.chambre import Chambre
 from modele.type_chambre import TypeChambre
 
@@ -34,6 +38,17 @@ class TypeChambreDTO(BaseModel):
             description_chambre=typeChambre.description_chambre,
         )
 
+    # Chemin rapide pour les réponses: mêmes valeurs, sans validation Pydantic.
+    @classmethod
+    def from_entity(cls, typeChambre: TypeChambre) -> "TypeChambreDTO":
+        return construire(cls, dict(
+            idTypeChambre=typeChambre.id_type_chambre,
+            nom_type=typeChambre.nom_type,
+            prix_plafond=typeChambre.prix_plafond,
+            prix_plancher=float(typeChambre.prix_plancher),
+            description_chambre=typeChambre.description_chambre,
+        ))
+
 # Ce DTO résume une chambre. J’imbrique le TypeChambreDTO si la relation est chargée.
 class ChambreDTO(BaseModel):
     idChambre: UUID
@@ -54,6 +69,24 @@ class ChambreDTO(BaseModel):
             type_chambre=TypeChambreDTO(chambre.type_chambre) if getattr(chambre, "type_chambre", None) else None,
         )
 
+    # Chemin rapide (sans validation); le type imbriqué aussi, s'il est chargé.
+    @classmethod
+    def from_entity(cls, chambre: Chambre) -> "ChambreDTO":
+        tc = getattr(chambre, "type_chambre", None)
+        return cls.avec_type(chambre, TypeChambreDTO.from_entity(tc) if tc else None)
+
+    # Variante quand le type vient déjà du catalogue en mémoire (metier/catalogue.py):
+    # on ne touche pas chambre.type_chambre, donc aucun chargement de la relation.
+    @classmethod
+    def avec_type(cls, chambre: Chambre, type_chambre: Optional[TypeChambreDTO]) -> "ChambreDTO":
+        return construire(cls, dict(
+            idChambre=chambre.id_chambre,
+            numero_chambre=chambre.numero_chambre,
+            disponible_reservation=chambre.disponible_reservation,
+            autre_informations=chambre.autre_informations,
+            type_chambre=type_chambre,
+        ))
+
 # -------------------- INPUT DTOs --------------------
 # Create DTO pour TypeChambre: je mets max_length pour garder ça clean.
 class TypeChambreCreateDTO(BaseModel):
@@ -0,0 +1,34 @@
+# DTO/confiance.py
+# -----------------------------------------------------------------------------
+# Fichier: DTO/confiance.py
+# Rôle : construction « de confiance » des DTO de sortie (from_entity), pour
+#        des valeurs qui viennent de notre BD et sont déjà typées par
+#        SQLAlchemy: aucune validation Pydantic.
+# Idée:
+#   - model_construct() ferait l'affaire, mais il boucle en Python sur chaque
+#     champ (alias, défauts) et finit plus lent que la validation en Rust.
+#     Ici on pose directement l'état d'un BaseModel (__dict__ + champs posés),
+#     comme model_construct, pour des appelants qui fournissent TOUS les champs.
+#   - tests/test_dto_confiance.py compare au chemin validé (même JSON): garde-
+#     fou si une version de Pydantic change cet état interne.
+# -----------------------------------------------------------------------------
+
+from typing import Any, Dict, Type, TypeVar
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+_poser = object.__setattr__
+_champs: Dict[type, frozenset] = {}
+
+def construire(cls: Type[M], valeurs: Dict[str, Any]) -> M:
+    """Instance de cls sans validation; valeurs = un dict neuf avec tous les champs."""
+    champs = _champs.get(cls)
+    if champs is None:
+        champs = _champs[cls] = frozenset(cls.model_fields)
+    dto = cls.__new__(cls)
+    _poser(dto, "__dict__", valeurs)
+    _poser(dto, "__pydantic_fields_set__", set(champs))
+    _poser(dto, "__pydantic_extra__", None)
+    _poser(dto, "__pydantic_private__", None)
+    return dto
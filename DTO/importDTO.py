@@ -0,0 +1,22 @@
+# DTO/importDTO.py
+# -----------------------------------------------------------------------------
+# Fichier: DTO/importDTO.py
+# Rôle : rapport d'un import en masse (usagers, types ou chambres).
+# Notes: les erreurs sont comptées au complet, mais seuls les premiers
+#        exemples sont gardés (mémoire constante sur un gros fichier).
+# -----------------------------------------------------------------------------
+
+from typing import List
+from pydantic import BaseModel
+
+class ErreurImportDTO(BaseModel):
+    ligne: int              # numéro d'enregistrement dans le fichier (1 = premier)
+    erreur: str
+
+class RapportImportDTO(BaseModel):
+    entite: str
+    lues: int = 0
+    creees: int = 0
+    existantes: int = 0     # doublons (déjà en BD ou répétés dans le fichier)
+    erreurs: int = 0
+    exemples_erreurs: List[ErreurImportDTO] = []
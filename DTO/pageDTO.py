@@ -0,0 +1,16 @@
+# DTO/pageDTO.py
+# -----------------------------------------------------------------------------
+# Fichier: DTO/pageDTO.py
+# Rôle : enveloppe générique pour les listes paginées (keyset).
+# Notes: next_cursor est opaque pour le client; il le renvoie tel quel dans
+#        ?cursor= pour avoir la page suivante. None => dernière page.
+# -----------------------------------------------------------------------------
+
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+class PageDTO(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -6,9 +6,11 @@
 #   - ReservationDTO (réponse complète)
 #   - ReservationCreateDTO (payload minimal pour POST /reservations)
 #   - ReservationUpdateDTO (patch partiel)
+#   - ResultatLotDTO / LotReservationsDTO (création en lot)
 # Détails:
 #   - Validations de base: dateFin > dateDebut (dans deux DTOs).
-#   - Constructeur from_entity pour convertir l’ORM -> DTO propre.
+#   - Constructeur from_entity pour convertir l’ORM -> DTO propre, sans
+#     validation (DTO/confiance.py): dates et prix viennent de notre BD.
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
@@ -19,6 +21,7 @@ from uuid import UUID
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
 from modele.reservation import Reservation as ReservationEntity
+from DTO.confiance import construire
 from DTO.chambreDTO import ChambreDTO
 from DTO.usagerDTO import UsagerDTO
 
@@ -83,7 +86,16 @@ class ReservationDTO(BaseModel):
     @classmethod
     def from_entity(cls, r: ReservationEntity) -> "ReservationDTO":
         # Petite helper pour que l’appelant fasse ReservationDTO.from_entity(r) direct.
-        return cls(r)
+        # Chemin de confiance: aucun validateur ne tourne (ReservationDTO(r) valide).
+        return construire(cls, dict(
+            idReservation=r.id_reservation,
+            dateDebut=r.date_debut_reservation,
+            dateFin=r.date_fin_reservation,
+            prixParJour=float(r.prix_jour),
+            infoReservation=r.info_reservation,
+            chambre=ChambreDTO.from_entity(r.chambre),
+            usager=UsagerDTO.from_entity(r.usager),
+        ))
 
 # -------------------- DTO de création minimal (IDs seulement) -------------
 # Sert au POST /reservations avec un body simple à produire côté front.
@@ -137,3 +149,17 @@ class ReservationUpdateDTO(BaseModel):
     def model_post_init(self, __ctx) -> None:
         if self.dateDebut and self.dateFin and self.dateFin <= self.dateDebut:
             raise ValueError("La date de fin doit être après la date de début.")
+
+# -------------------- Création en lot (POST /reservations/batch) ----------
+# Un résultat par élément envoyé, dans le même ordre (index = position).
+# statut: 201 créée, 400 invalide (usager/chambre/prix), 409 chevauchement.
+class ResultatLotDTO(BaseModel):
+    index: int
+    statut: int
+    idReservation: Optional[UUID] = None
+    erreur: Optional[str] = None
+
+class LotReservationsDTO(BaseModel):
+    crees: int
+    erreurs: int
+    resultats: list[ResultatLotDTO]
@@ -3,12 +3,14 @@
 # Fichier: DTO/usagerDTO.py
 # Rôle : DTO pour Usager (sortie + create/update + petit search).
 # Notes: le constructeur principal prend un modèle Usager ORM
-#        et sort un DTO propre pour l’API.
+#        et sort un DTO propre pour l’API. from_entity() fait pareil sans
+#        valider (DTO/confiance.py): c’est lui que le métier utilise.
 # -----------------------------------------------------------------------------
 
 from typing import Optional
 from pydantic import BaseModel, Field
 from uuid import UUID
+from DTO.confiance import construire
 from modele.usager import Usager
 
 # -------------------- OUTPUT DTO --------------------
@@ -33,6 +35,18 @@ class UsagerDTO(BaseModel):
             type_usager=usager.type_usager,
         )
 
+    # Chemin rapide pour les réponses: données de notre BD, déjà typées.
+    @classmethod
+    def from_entity(cls, usager: Usager) -> "UsagerDTO":
+        return construire(cls, dict(
+            idUsager=usager.id_usager,
+            prenom=usager.prenom,
+            nom=usager.nom,
+            adresse=usager.adresse,
+            mobile=usager.mobile,
+            type_usager=usager.type_usager,
+        ))
+
 # -------------------- INPUT DTOs --------------------
 # Create DTO: validations basiques (longueurs), rien de fancy.
 class UsagerCreateDTO(BaseModel):
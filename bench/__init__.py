@@ -0,0 +1,26 @@
+# =====================================================================
+# Scripts de benchmark (pas des tests unitaires: lancés à la main).
+#   python -m bench.bench_reservation_concurrente
+# Sans HOTEL_DB_URL, on pointe sur une BD SQLite fichier temporaire (les
+# connexions doivent être réelles pour mesurer la concurrence). Ça doit
+# être fait ici, avant le premier import de core.db.
+# =====================================================================
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional
+
+if not os.getenv("HOTEL_DB_URL"):
+    _tmp = tempfile.mkdtemp(prefix="hotel-bench-")
+    os.environ["HOTEL_DB_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+    atexit.register(shutil.rmtree, _tmp, True)
+
+def commit_git() -> Optional[str]:
+    """Commit courant (court), noté dans les résultats pour comparer entre commits."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
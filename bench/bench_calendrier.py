@@ -0,0 +1,79 @@
+# bench/bench_calendrier.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/bench_calendrier.py
+# Rôle : temps de calcul de la grille /calendrier (chambres × nuits).
+# Mesure séparément la requête + remplissage NumPy (calendrierOccupation) et
+# chaque encodage (RLE, bitset, binaire).
+# Usage:
+#   python -m bench.bench_calendrier --chambres 500 --jours 365 --sejours 20
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import core.db
+from core.db import SessionLocal, init_db
+from metier.calendrier import bits_base64, binaire, calendrierOccupation, plages_rle
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+def _preparer(nb_chambres: int, jours: int, sejours: int, debut: date) -> None:
+    rnd = random.Random(42)
+    t0 = datetime.combine(debut, datetime.min.time())
+    with SessionLocal() as s:
+        tc = TypeChambre(nom_type=f"bench-cal-{time.time_ns()}", prix_plancher=100.0)
+        u = Usager(prenom="Bench", nom="Calendrier", adresse="1 rue", mobile="0", mot_de_passe="x".ljust(60), type_usager="Client")
+        chambres = [Chambre(numero_chambre=i, disponible_reservation=True, type_chambre=tc) for i in range(nb_chambres)]
+        s.add_all([tc, u, *chambres])
+        s.flush()
+        resas = []
+        for ch in chambres:
+            jour = rnd.randint(-3, 3)
+            for _ in range(sejours):
+                duree = rnd.randint(1, 7)
+                d = t0 + timedelta(days=jour, hours=15)
+                resas.append(dict(date_debut_reservation=d, date_fin_reservation=d + timedelta(days=duree, hours=-4),
+                                  prix_jour=100.0, fk_id_usager=u.id_usager, fk_id_chambre=ch.id_chambre))
+                jour += duree + rnd.randint(0, 10)
+                if jour >= jours:
+                    break
+        s.execute(Reservation.__table__.insert(), resas)
+        s.commit()
+        print(f"{nb_chambres} chambres, {len(resas)} réservations")
+
+def _chrono(fn, repetitions: int):
+    temps = []
+    for _ in range(repetitions):
+        t = time.perf_counter()
+        res = fn()
+        temps.append((time.perf_counter() - t) * 1000)
+    return res, statistics.median(temps)
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--chambres", type=int, default=500)
+    p.add_argument("--jours", type=int, default=365)
+    p.add_argument("--sejours", type=int, default=20, help="Séjours max par chambre.")
+    p.add_argument("--repetitions", type=int, default=20)
+    args = p.parse_args(argv)
+
+    init_db()
+    debut = date(2041, 1, 1)
+    _preparer(args.chambres, args.jours, args.sejours, debut)
+    print(f"BD: {core.db.engine.url.render_as_string(hide_password=True)}")
+    cal, ms = _chrono(lambda: calendrierOccupation(debut, args.jours), args.repetitions)
+    print(f"{'calcul (requête + NumPy)':<26} {ms:>8.2f} ms  {cal.occupation.shape}")
+    for nom, fn in (("rle", plages_rle), ("bitset", bits_base64), ("binaire", binaire)):
+        _, ms = _chrono(lambda: fn(cal), args.repetitions)
+        print(f"{'encodage ' + nom:<26} {ms:>8.2f} ms")
+    core.db.engine.dispose()
+
+if __name__ == "__main__":
+    main()
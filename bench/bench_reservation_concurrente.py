@@ -0,0 +1,95 @@
+# bench/bench_reservation_concurrente.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/bench_reservation_concurrente.py
+# Rôle : débit de POST réservation (creerReservationAvecIds) selon le nombre
+#        de clients parallèles, avec le verrou par chambre actif.
+# Deux scénarios:
+#   - "dispersé": chaque client réserve des chambres différentes (le verrou
+#     de ligne ne doit pas les sérialiser, sauf sur SQLite = verrou global).
+#   - "chaud": tout le monde vise la même chambre (conflits attendus, 409).
+# Usage:
+#   python -m bench.bench_reservation_concurrente --clients 1 2 4 8 16 --requetes 200
+# Note: sur SQLite le verrou d'écriture est global, donc le débit plafonne
+#       avec les clients; sur MSSQL le scénario dispersé doit monter.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+import core.db
+from core.db import SessionLocal, configure_engine, init_db
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.reservationMetier import ConflitReservation, creerReservationAvecIds
+from modele.chambre import Chambre
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+def _preparer(nb_chambres: int):
+    with SessionLocal() as s:
+        tc = TypeChambre(nom_type=f"bench-{time.time_ns()}", prix_plancher=100.0)
+        # Numéros uniques (uq_chambre_numero): on continue après le plus grand.
+        premier = (s.scalar(select(func.max(Chambre.numero_chambre))) or 0) + 1
+        chambres = [Chambre(numero_chambre=premier + i, disponible_reservation=True, type_chambre=tc) for i in range(nb_chambres)]
+        u = Usager(prenom="Bench", nom="Concurrence", adresse="1 rue", mobile="0", mot_de_passe="x".ljust(60), type_usager="Client")
+        s.add_all([tc, u, *chambres])
+        s.commit()
+        return u.id_usager, [c.id_chambre for c in chambres]
+
+def _mesurer(clients: int, requetes: int, id_usager, chambres, chaud: bool):
+    compteur = iter(range(requetes))
+    verrou = threading.Lock()
+    ok = conflits = 0
+    base = datetime(2040, 1, 1, 15)
+
+    def travail(_):
+        nonlocal ok, conflits
+        with verrou:
+            i = next(compteur)
+        ch = chambres[0] if chaud else chambres[i % len(chambres)]
+        # Nuits successives par chambre: aucune collision en mode dispersé.
+        debut = base + timedelta(days=0 if chaud else 2 * (i // len(chambres)))
+        data = ReservationCreateDTO(idUsager=id_usager, idChambre=ch, dateDebut=debut,
+                                    dateFin=debut + timedelta(days=1), prixParJour=100.0)
+        try:
+            creerReservationAvecIds(data)
+            with verrou:
+                ok += 1
+        except ConflitReservation:
+            with verrou:
+                conflits += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as ex:
+        list(ex.map(travail, range(requetes)))
+    duree = time.perf_counter() - t0
+    return requetes / duree, ok, conflits
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    p.add_argument("--requetes", type=int, default=200)
+    p.add_argument("--chambres", type=int, default=64)
+    args = p.parse_args(argv)
+
+    # Assez de connexions pour que le pool ne soit pas le goulot.
+    core.db.settings.pool_size = max(args.clients) + 2
+    configure_engine(core.db.settings)
+    init_db()
+    print(f"BD: {core.db.engine.url.render_as_string(hide_password=True)}")
+    print(f"{'scénario':<10} {'clients':>7} {'req/s':>10} {'ok':>6} {'409':>6}")
+    for chaud in (False, True):
+        for n in args.clients:
+            id_usager, chambres = _preparer(args.chambres)
+            debit, ok, conflits = _mesurer(n, args.requetes, id_usager, chambres, chaud)
+            print(f"{'chaud' if chaud else 'dispersé':<10} {n:>7} {debit:>10.1f} {ok:>6} {conflits:>6}")
+    core.db.engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# bench/bench_reservation_lot.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/bench_reservation_lot.py
+# Rôle : débit de création de réservations, un par un (creerReservationAvecIds)
+#        vs en lot (creerReservationsLot), même charge, mêmes chambres.
+# Usage:
+#   python -m bench.bench_reservation_lot --reservations 2000 --lots 50 200 1000
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+import core.db
+from core.db import SessionLocal, init_db
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.reservationMetier import creerReservationAvecIds, creerReservationsLot
+from modele.chambre import Chambre
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+def _preparer(nb_chambres: int):
+    with SessionLocal() as s:
+        tc = TypeChambre(nom_type=f"bench-lot-{time.time_ns()}", prix_plancher=100.0)
+        # Numéros uniques (uq_chambre_numero): on continue après le plus grand.
+        premier = (s.scalar(select(func.max(Chambre.numero_chambre))) or 0) + 1
+        chambres = [Chambre(numero_chambre=premier + i, disponible_reservation=True, type_chambre=tc) for i in range(nb_chambres)]
+        u = Usager(prenom="Bench", nom="Lot", adresse="1 rue", mobile="0", mot_de_passe="x".ljust(60), type_usager="Client")
+        s.add_all([tc, u, *chambres])
+        s.commit()
+        return u.id_usager, [c.id_chambre for c in chambres]
+
+def _payloads(n: int, id_usager, chambres, base: datetime):
+    # Séjours de 2 nuits qui se suivent par chambre: aucun conflit.
+    return [
+        ReservationCreateDTO(idUsager=id_usager, idChambre=chambres[i % len(chambres)],
+                             dateDebut=base + timedelta(days=2 * (i // len(chambres))),
+                             dateFin=base + timedelta(days=2 * (i // len(chambres)) + 2), prixParJour=100.0)
+        for i in range(n)
+    ]
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--reservations", type=int, default=2000)
+    p.add_argument("--chambres", type=int, default=100)
+    p.add_argument("--lots", type=int, nargs="+", default=[50, 200, 1000])
+    args = p.parse_args(argv)
+
+    init_db()
+    print(f"BD: {core.db.engine.url.render_as_string(hide_password=True)}")
+    print(f"{'mode':<14} {'résa/s':>10} {'x':>6}")
+
+    id_usager, chambres = _preparer(args.chambres)
+    items = _payloads(args.reservations, id_usager, chambres, datetime(2045, 1, 1, 15))
+    t0 = time.perf_counter()
+    for data in items:
+        creerReservationAvecIds(data)
+    unitaire = len(items) / (time.perf_counter() - t0)
+    print(f"{'un par un':<14} {unitaire:>10.0f} {1:>6.1f}")
+
+    for taille in args.lots:
+        id_usager, chambres = _preparer(args.chambres)
+        items = _payloads(args.reservations, id_usager, chambres, datetime(2045, 1, 1, 15))
+        t0 = time.perf_counter()
+        for i in range(0, len(items), taille):
+            lot = creerReservationsLot(items[i:i + taille])
+            assert lot.erreurs == 0, lot.resultats
+        debit = len(items) / (time.perf_counter() - t0)
+        print(f"{'lot de ' + str(taille):<14} {debit:>10.0f} {debit / unitaire:>6.1f}")
+    core.db.engine.dispose()
+
+if __name__ == "__main__":
+    main()
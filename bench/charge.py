@@ -0,0 +1,379 @@
+# bench/charge.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/charge.py
+# Rôle : test de charge HTTP (asyncio + httpx) contre main:app, avec un mélange
+#        de trafic configurable. Sert à dimensionner workers et pools avant
+#        une mise en prod.
+# Idée:
+#   - Trois cibles:
+#       * en process (défaut): httpx.ASGITransport sur main:app, lifespan
+#         déclenché à la main (caches chargés comme en prod);
+#       * --uvicorn: lance « uvicorn main:app --workers N » localement (même
+#         BD que HOTEL_DB_URL) et tape dessus en HTTP;
+#       * --url: serveur déjà lancé (la BD n'est alors pas peuplée ici).
+#   - Mélange: --mix "disponibles=50,chambre=20,creer=20,lister=10" (poids
+#     relatifs des scénarios de SCENARIOS). Ids échantillonnés via l'API.
+#   - Boucle fermée (défaut): --concurrence usagers virtuels enchaînent les
+#     requêtes. Boucle ouverte (--debit R): arrivées de Poisson à R req/s,
+#     au plus --concurrence en vol; la latence part de l'heure d'arrivée
+#     prévue (l'attente côté client compte, pas d'omission coordonnée).
+#   - Par route: débit, p50/p95/p99/max, histogramme de latence, 4xx (refus
+#     métier attendus, ex. 409 chevauchement) et erreurs (5xx + exceptions).
+#   Usage:
+#     HOTEL_DB_URL=sqlite:///bench.db python -m bench.charge --duree 30 --concurrence 32
+#     python -m bench.charge --uvicorn --workers 4 --debit 200 --histogramme
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from bench import commit_git
+from bench.donnees import Echelle
+
+RACINE = Path(__file__).resolve().parent.parent
+BORNES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+MIX_DEFAUT = "disponibles=50,chambre=20,creer=20,lister=10"
+ECHANTILLON = 1000
+
+# --------------------------------- données ----------------------------------
+@dataclass
+class Donnees:
+    """Ids et période lus via l'API au démarrage (marche aussi contre un serveur distant)."""
+    chambres: List[str]
+    usagers: List[str]
+    reservations: List[str]
+    premier: date
+    futur: date         # à partir d'ici: créneaux pour les créations
+
+    def fenetre(self, rnd: random.Random, nuits: int = 3) -> Tuple[str, str]:
+        d = datetime.combine(self.premier + timedelta(days=rnd.randrange(365)), datetime.min.time())
+        return (d + timedelta(hours=15)).isoformat(), (d + timedelta(days=nuits, hours=11)).isoformat()
+
+async def _ids(client: httpx.AsyncClient, chemin: str, champ: str) -> List[dict]:
+    res = await client.get(chemin, params={"limit": ECHANTILLON})
+    res.raise_for_status()
+    return [x for x in res.json()["items"] if x.get(champ)]
+
+async def charger_donnees(client: httpx.AsyncClient) -> Donnees:
+    chambres = await _ids(client, "/chambres", "idChambre")
+    usagers = await _ids(client, "/usagers", "idUsager")
+    resas = await _ids(client, "/reservations", "idReservation")
+    if not (chambres and usagers):
+        raise SystemExit("Aucune chambre ou aucun usager côté API: rien à charger.")
+    # /reservations est trié par date de début: la première page donne le début de la période.
+    premier = min((datetime.fromisoformat(r["dateDebut"]).date() for r in resas), default=date.today())
+    dernier = max((datetime.fromisoformat(r["dateFin"]).date() for r in resas), default=date.today())
+    return Donnees(
+        chambres=[c["idChambre"] for c in chambres],
+        usagers=[u["idUsager"] for u in usagers],
+        reservations=[r["idReservation"] for r in resas],
+        premier=premier,
+        futur=max(dernier, date.today()) + timedelta(days=3 * 365),
+    )
+
+# -------------------------------- scénarios ---------------------------------
+# Un scénario rend (route, méthode, chemin, kwargs httpx). « route » = gabarit
+# du chemin: les stats sont regroupées par gabarit, pas par URL.
+Requete = Tuple[str, str, str, dict]
+
+def _disponibles(d: Donnees, rnd: random.Random) -> Requete:
+    debut, fin = d.fenetre(rnd)
+    return "GET /chambres/disponibles", "GET", "/chambres/disponibles", {"params": {"debut": debut, "fin": fin}}
+
+def _chambre(d: Donnees, rnd: random.Random) -> Requete:
+    return "GET /chambres/id/{id}", "GET", f"/chambres/id/{rnd.choice(d.chambres)}", {}
+
+def _reservation(d: Donnees, rnd: random.Random) -> Requete:
+    if not d.reservations:
+        return _chambre(d, rnd)
+    return "GET /reservations/{id}", "GET", f"/reservations/{rnd.choice(d.reservations)}", {}
+
+def _usager(d: Donnees, rnd: random.Random) -> Requete:
+    return "GET /usagers/{id}", "GET", f"/usagers/{rnd.choice(d.usagers)}", {}
+
+def _creer(d: Donnees, rnd: random.Random) -> Requete:
+    # Créneau au hasard sur 2 ans dans le futur: quelques 409 (chevauchement) voulus.
+    debut = datetime.combine(d.futur + timedelta(days=rnd.randrange(730)), datetime.min.time()) + timedelta(hours=15)
+    corps = {"idUsager": rnd.choice(d.usagers), "idChambre": rnd.choice(d.chambres),
+             "dateDebut": debut.isoformat(), "dateFin": (debut + timedelta(days=rnd.randint(1, 4), hours=-4)).isoformat(),
+             "prixParJour": 120.0, "infoReservation": "charge"}
+    return "POST /reservations", "POST", "/reservations", {"json": corps}
+
+def _lister(d: Donnees, rnd: random.Random) -> Requete:
+    return "GET /reservations", "GET", "/reservations", {"params": {"limit": 50}}
+
+def _lister_chambres(d: Donnees, rnd: random.Random) -> Requete:
+    return "GET /chambres", "GET", "/chambres", {"params": {"limit": 50}}
+
+def _calendrier(d: Donnees, rnd: random.Random) -> Requete:
+    return "GET /calendrier", "GET", "/calendrier", {"params": {"debut": d.fenetre(rnd)[0][:10], "jours": 30}}
+
+SCENARIOS: Dict[str, Callable[[Donnees, random.Random], Requete]] = {
+    "disponibles": _disponibles,
+    "chambre": _chambre,
+    "reservation": _reservation,
+    "usager": _usager,
+    "creer": _creer,
+    "lister": _lister,
+    "lister_chambres": _lister_chambres,
+    "calendrier": _calendrier,
+}
+
+def lire_mix(texte: str) -> Dict[str, float]:
+    mix = {}
+    for morceau in filter(None, (m.strip() for m in texte.split(","))):
+        nom, _, poids = morceau.partition("=")
+        if nom not in SCENARIOS:
+            raise ValueError(f"Scénario inconnu '{nom}' (connus: {', '.join(SCENARIOS)}).")
+        mix[nom] = float(poids or 1)
+        if mix[nom] < 0:
+            raise ValueError(f"Poids négatif pour '{nom}'.")
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mélange vide.")
+    return mix
+
+# ---------------------------------- stats -----------------------------------
+@dataclass
+class StatsRoute:
+    latences: List[float] = field(default_factory=list)
+    statuts: Counter = field(default_factory=Counter)
+    exceptions: Counter = field(default_factory=Counter)
+
+    def noter(self, ms: float, statut: Optional[int] = None, erreur: Optional[BaseException] = None) -> None:
+        self.latences.append(ms)
+        if erreur is not None:
+            self.exceptions[type(erreur).__name__] += 1
+        else:
+            self.statuts[statut] += 1
+
+    def resume(self, duree: float) -> dict:
+        ms = np.array(self.latences or [0.0])
+        n = len(self.latences)
+        erreurs = sum(v for k, v in self.statuts.items() if k >= 500) + sum(self.exceptions.values())
+        refus = sum(v for k, v in self.statuts.items() if 400 <= k < 500)
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        compte = np.bincount(np.searchsorted(BORNES_MS, ms, side="left"), minlength=len(BORNES_MS) + 1)
+        return dict(
+            n=n, debit_rps=round(n / duree, 2), erreurs=erreurs, taux_erreur=round(erreurs / max(n, 1), 4),
+            refus_4xx=refus, p50_ms=round(float(p50), 2), p95_ms=round(float(p95), 2),
+            p99_ms=round(float(p99), 2), max_ms=round(float(ms.max()), 2),
+            statuts={str(k): v for k, v in sorted(self.statuts.items())}, exceptions=dict(self.exceptions),
+            histogramme={(f"<={b}" if i < len(BORNES_MS) else f">{BORNES_MS[-1]}"): int(c)
+                         for i, (b, c) in enumerate(zip(BORNES_MS + (BORNES_MS[-1],), compte))},
+        )
+
+class Collecte:
+    def __init__(self):
+        self.par_route: Dict[str, StatsRoute] = {}
+        self.actif = False      # False pendant l'échauffement
+
+    def noter(self, route: str, ms: float, statut: Optional[int] = None, erreur: Optional[BaseException] = None):
+        if self.actif:
+            self.par_route.setdefault(route, StatsRoute()).noter(ms, statut, erreur)
+
+# ---------------------------------- charge ----------------------------------
+async def _envoyer(client: httpx.AsyncClient, collecte: Collecte, req: Requete, t0: float) -> None:
+    route, methode, chemin, kwargs = req
+    try:
+        res = await client.request(methode, chemin, **kwargs)
+        await res.aread()
+        collecte.noter(route, (time.perf_counter() - t0) * 1000, statut=res.status_code)
+    except Exception as e:     # transport, timeout...: compté comme erreur
+        collecte.noter(route, (time.perf_counter() - t0) * 1000, erreur=e)
+
+async def boucle_fermee(client, donnees, mix, collecte, fin: float, concurrence: int, graine: str) -> None:
+    noms, poids = list(mix), list(mix.values())
+
+    async def usager_virtuel(k: int):
+        rnd = random.Random(f"{graine}-{k}")
+        while time.perf_counter() < fin:
+            req = SCENARIOS[rnd.choices(noms, poids)[0]](donnees, rnd)
+            await _envoyer(client, collecte, req, time.perf_counter())
+
+    await asyncio.gather(*(usager_virtuel(k) for k in range(concurrence)))
+
+async def boucle_ouverte(client, donnees, mix, collecte, fin: float, concurrence: int, graine: str,
+                         debit: float) -> None:
+    noms, poids = list(mix), list(mix.values())
+    rnd = random.Random(graine)
+    places = asyncio.Semaphore(concurrence)
+    taches = set()
+
+    async def une(req: Requete, prevu: float):
+        async with places:
+            await _envoyer(client, collecte, req, prevu)
+
+    prevu = time.perf_counter()
+    while prevu < fin:
+        prevu += rnd.expovariate(debit)
+        attente = prevu - time.perf_counter()
+        if attente > 0:
+            await asyncio.sleep(attente)
+        t = asyncio.create_task(une(SCENARIOS[rnd.choices(noms, poids)[0]](donnees, rnd), prevu))
+        taches.add(t)
+        t.add_done_callback(taches.discard)
+    await asyncio.gather(*taches)
+
+async def executer(client: httpx.AsyncClient, args, mix: Dict[str, float]) -> Tuple[Collecte, float, Donnees]:
+    donnees = await charger_donnees(client)
+    collecte = Collecte()
+
+    async def phase(nom: str, secondes: float):
+        # Graine propre à la phase: la mesure ne rejoue pas les créations de l'échauffement (409).
+        fin, graine = time.perf_counter() + secondes, f"{args.graine}-{nom}"
+        if args.debit:
+            await boucle_ouverte(client, donnees, mix, collecte, fin, args.concurrence, graine, args.debit)
+        else:
+            await boucle_fermee(client, donnees, mix, collecte, fin, args.concurrence, graine)
+
+    if args.echauffement > 0:
+        await phase("echauffement", args.echauffement)
+    collecte.actif = True
+    t0 = time.perf_counter()
+    await phase("mesure", args.duree)
+    return collecte, time.perf_counter() - t0, donnees
+
+# --------------------------------- cibles -----------------------------------
+@contextlib.asynccontextmanager
+async def client_en_process():
+    from main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://hotel", timeout=60) as client:
+            yield client
+
+@contextlib.asynccontextmanager
+async def client_distant(url: str, concurrence: int):
+    limites = httpx.Limits(max_connections=concurrence, max_keepalive_connections=concurrence)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=60) as client:
+        yield client
+
+@contextlib.contextmanager
+def serveur_uvicorn(port: int, workers: int):
+    if importlib.util.find_spec("uvicorn") is None:
+        raise SystemExit("--uvicorn demande le paquet uvicorn (pip install uvicorn).")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=RACINE, env=dict(os.environ),
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        limite = time.monotonic() + 60
+        while True:
+            if proc.poll() is not None:
+                raise SystemExit(f"uvicorn s'est arrêté (code {proc.returncode}).")
+            try:
+                if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > limite:
+                raise SystemExit("uvicorn ne répond pas sur /health après 60 s.")
+            time.sleep(0.2)
+        yield url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+# --------------------------------- rapport ----------------------------------
+def _afficher(resultats: Dict[str, dict], histogramme: bool) -> None:
+    print(f"{'route':<30} {'n':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'4xx':>6} {'err':>6}")
+    for route, r in resultats.items():
+        print(f"{route:<30} {r['n']:>7} {r['debit_rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['max_ms']:>8.1f} {r['refus_4xx']:>6} {r['erreurs']:>6}")
+        if histogramme and r["n"]:
+            haut = max(r["histogramme"].values())
+            for borne, c in r["histogramme"].items():
+                if c:
+                    print(f"    {borne:>8} ms {c:>7} {'#' * max(1, round(40 * c / haut))}")
+
+def _rapport(collecte: Collecte, duree: float) -> Dict[str, dict]:
+    resultats = {route: s.resume(duree) for route, s in sorted(collecte.par_route.items())}
+    total = StatsRoute()
+    for s in collecte.par_route.values():
+        total.latences += s.latences
+        total.statuts.update(s.statuts)
+        total.exceptions.update(s.exceptions)
+    resultats["TOTAL"] = total.resume(duree)
+    return resultats
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Test de charge HTTP sur main:app.")
+    cible = p.add_mutually_exclusive_group()
+    cible.add_argument("--url", help="Serveur déjà lancé (ex. http://127.0.0.1:8000).")
+    cible.add_argument("--uvicorn", action="store_true", help="Lance uvicorn main:app localement.")
+    p.add_argument("--workers", type=int, default=1, help="Workers uvicorn (avec --uvicorn).")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--mix", default=MIX_DEFAUT, help=f"Poids par scénario ({', '.join(SCENARIOS)}).")
+    p.add_argument("--duree", type=float, default=20.0, help="Secondes mesurées.")
+    p.add_argument("--echauffement", type=float, default=3.0, help="Secondes non mesurées avant.")
+    p.add_argument("--concurrence", type=int, default=16, help="Usagers virtuels / requêtes en vol max.")
+    p.add_argument("--debit", type=float, help="Boucle ouverte: arrivées par seconde (Poisson).")
+    p.add_argument("--graine", type=int, default=42)
+    for champ, defaut in asdict(Echelle()).items():
+        p.add_argument(f"--{champ}", type=int, default=defaut, help="Échelle si la BD locale est vide.")
+    p.add_argument("--histogramme", action="store_true", help="Affiche l'histogramme de latence par route.")
+    p.add_argument("--sortie", help="Fichier JSON des résultats.")
+    args = p.parse_args(argv)
+    try:
+        mix = lire_mix(args.mix)
+    except ValueError as e:
+        p.error(str(e))
+
+    if not args.url:
+        # Cible locale: même BD que HOTEL_DB_URL, peuplée au besoin.
+        from core.db import init_db
+        from bench.donnees import peupler_si_vide
+        init_db()
+        peupler_si_vide(Echelle(args.types, args.chambres, args.usagers, args.reservations), args.graine)
+
+    async def lancer():
+        if args.url:
+            fabrique = client_distant(args.url, args.concurrence)
+        elif args.uvicorn:
+            fabrique = client_distant(pile.enter_context(serveur_uvicorn(args.port, args.workers)), args.concurrence)
+        else:
+            fabrique = client_en_process()
+        async with fabrique as client:
+            return await executer(client, args, mix)
+
+    with contextlib.ExitStack() as pile:
+        mode = args.url or ("uvicorn" if args.uvicorn else "process")
+        boucle = f"ouverte {args.debit} req/s" if args.debit else "fermée"
+        print(f"Cible: {mode} | mélange {mix} | boucle {boucle}, concurrence {args.concurrence} | {args.duree} s")
+        collecte, duree, _ = asyncio.run(lancer())
+
+    resultats = _rapport(collecte, duree)
+    _afficher(resultats, args.histogramme)
+    if args.sortie:
+        meta = dict(commit=commit_git(), date=datetime.now().isoformat(timespec="seconds"), cible=mode,
+                    workers=args.workers if args.uvicorn else None, mix=mix, concurrence=args.concurrence,
+                    debit=args.debit, duree_s=round(duree, 2))
+        Path(args.sortie).write_text(json.dumps({"meta": meta, "routes": resultats}, indent=2, ensure_ascii=False),
+                                     encoding="utf-8")
+        print(f"Résultats: {args.sortie}")
+
+if __name__ == "__main__":
+    main()
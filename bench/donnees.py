@@ -0,0 +1,277 @@
+# bench/donnees.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/donnees.py
+# Rôle : générateur déterministe de données synthétiques (types, chambres,
+#        usagers, réservations) pour benchmarks et tests de charge.
+# Idée:
+#   - Graine fixe => exactement le même jeu (ids compris) à chaque exécution,
+#     à paramètres égaux: les résultats de bench restent comparables.
+#   - Réaliste sans être lourd:
+#       * popularité des types en loi de Zipf: beaucoup de chambres des types
+#         courants, et ces chambres sont aussi plus demandées;
+#       * saisonnalité: plus d'arrivées en été et les vendredis/samedis
+#         (chance d'arrivée d'un jour libre × facteur du jour), prix de la
+#         nuit qui suit la saison;
+#       * séjours de plusieurs nuits (1 à 14, surtout 1-3);
+#       * usagers fidèles: une petite part des usagers fait la plupart des
+#         réservations (poids en 1/rang^a);
+#       * aucun chevauchement: les séjours d'une chambre se suivent.
+#   - Le nb de réservations par chambre est fixé d'avance (quota selon la
+#     demande du type); l'horizon (--jours, auto = ~65 % d'occupation) fixe
+#     l'écart moyen entre séjours. Les chambres très demandées peuvent
+#     déborder un peu après l'horizon.
+#   - INSERT Core multi-lignes (executemany) par lots, un commit par lot.
+#     Les index secondaires non uniques (usager, reservation) sont supprimés
+#     pendant le chargement puis recréés en une passe (~40 % plus rapide):
+#     environ 1 M de réservations par minute sur SQLite.
+#   - daily_summary reconstruit à la fin (analytique cohérente).
+#   Usage:
+#     HOTEL_DB_URL=sqlite:///bench.db python -m bench.donnees --types 1000 --chambres 20000 \
+#         --usagers 500000 --reservations 5000000
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List, Sequence
+from uuid import UUID
+from sqlalchemy import Table, func, select
+from sqlalchemy.orm import Session
+
+import core.db
+from core.db import SessionLocal, init_db
+from metier.resume import reconstruireResume
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+TAILLE_LOT = 10000
+NUMERO_MAX = 32767          # numero_chambre est un SMALLINT
+ARRIVEE, DEPART = 15, 11    # heures d'arrivée / de départ
+
+# Durée du séjour (nuits) -> poids.
+DUREES = (1, 2, 3, 4, 5, 6, 7, 10, 14)
+POIDS_DUREES = (22, 25, 18, 10, 7, 5, 7, 4, 2)
+DUREE_MOYENNE = sum(d * p for d, p in zip(DUREES, POIDS_DUREES)) / sum(POIDS_DUREES)
+
+PRENOMS = ("Marie", "Jean", "Camille", "Louis", "Léa", "Gabriel", "Chloé", "Félix", "Emma", "Noah",
+           "Alice", "William", "Rosalie", "Thomas", "Florence", "Olivier", "Juliette", "Samuel")
+NOMS = ("Tremblay", "Gagnon", "Roy", "Côté", "Bouchard", "Gauthier", "Morin", "Lavoie", "Fortin",
+        "Gagné", "Ouellet", "Pelletier", "Bélanger", "Lévesque", "Bergeron", "Leblanc", "Paquette")
+RUES = ("rue Principale", "boul. Saint-Laurent", "rue Sherbrooke", "av. du Parc", "rue King", "ch. du Lac")
+
+@dataclass
+class Echelle:
+    types: int = 20
+    chambres: int = 500
+    usagers: int = 5000
+    reservations: int = 50000
+
+@dataclass
+class Profil:
+    debut: date = date(2022, 1, 1)
+    jours: int = 0                  # horizon; 0 = auto (~65 % d'occupation moyenne)
+    zipf_types: float = 1.1         # popularité des types (0 = uniforme)
+    fidelite: float = 0.8           # poids des usagers en 1/rang^fidelite (0 = uniforme)
+    saison: float = 0.35            # amplitude été/hiver du facteur de saison
+    fin_de_semaine: float = 1.4     # arrivées vendredi/samedi vs autres jours
+
+# ------------------------------- utilitaires --------------------------------
+def _uuid(rnd: random.Random) -> UUID:
+    return UUID(int=rnd.getrandbits(128), version=4)
+
+def _cumul(poids: Sequence[float]) -> List[float]:
+    return list(accumulate(poids))
+
+def _poids_zipf(n: int, a: float) -> List[float]:
+    return [1.0 / (rang ** a) for rang in range(1, n + 1)]
+
+def _repartir(total: int, poids: Sequence[float]) -> List[int]:
+    """Répartit total entiers au prorata des poids (plus forts restes)."""
+    somme = sum(poids)
+    exacts = [total * p / somme for p in poids]
+    parts = [int(x) for x in exacts]
+    reste = total - sum(parts)
+    for i in sorted(range(len(poids)), key=lambda i: parts[i] - exacts[i])[:reste]:
+        parts[i] += 1
+    return parts
+
+def _facteurs_saison(profil: Profil, jours: int) -> List[float]:
+    """Facteur d'arrivée par jour (moyenne ~1): pic mi-juillet, creux mi-janvier, bonus fin de semaine."""
+    facteurs = []
+    for k in range(jours):
+        d = profil.debut + timedelta(days=k)
+        f = 1 + profil.saison * math.cos(2 * math.pi * (d.timetuple().tm_yday - 196) / 365.25)
+        facteurs.append(f * (profil.fin_de_semaine if d.weekday() in (4, 5) else 1.0))
+    moyenne = sum(facteurs) / len(facteurs)
+    return [f / moyenne for f in facteurs]
+
+def _inserer(s: Session, table: Table, lignes: Iterator[Dict], taille_lot: int) -> int:
+    # Core direct (pas le chemin ORM bulk): une instruction executemany par lot.
+    n, lot = 0, []
+    for ligne in lignes:
+        lot.append(ligne)
+        if len(lot) == taille_lot:
+            s.execute(table.insert(), lot)
+            s.commit()
+            n, lot = n + len(lot), []
+    if lot:
+        s.execute(table.insert(), lot)
+        s.commit()
+        n += len(lot)
+    return n
+
+# ------------------------------- générateurs --------------------------------
+def _types(rnd: random.Random, n: int) -> List[Dict]:
+    lignes = []
+    for i in range(n):
+        plancher = round(rnd.uniform(60, 400), 2)
+        lignes.append(dict(id_type_chambre=_uuid(rnd), nom_type=f"Type {i:04d}", prix_plancher=plancher,
+                           prix_plafond=f"{plancher * 2:.2f}", description_chambre=None))
+    return lignes
+
+def _chambres(rnd: random.Random, n: int, types: List[Dict], poids: Sequence[float]) -> List[Dict]:
+    ids = [t["id_type_chambre"] for t in types]
+    choix = rnd.choices(ids, cum_weights=_cumul(poids), k=n)
+    return [
+        dict(id_chambre=_uuid(rnd), numero_chambre=i + 1, disponible_reservation=True,
+             autre_informations=None, fk_type_chambre=choix[i])
+        for i in range(n)
+    ]
+
+def _usagers(rnd: random.Random, n: int) -> Iterator[Dict]:
+    for i in range(n):
+        yield dict(id_usager=_uuid(rnd), prenom=rnd.choice(PRENOMS), nom=rnd.choice(NOMS),
+                   adresse=f"{rnd.randint(1, 9999)} {rnd.choice(RUES)}", mobile=f"{5140000000 + i:015d}",
+                   mot_de_passe="x" * 60, type_usager="Client")
+
+def _reservations(rnd: random.Random, quotas: Sequence[int], chambres: List[Dict], prix: Dict[UUID, float],
+                  usagers: List[UUID], poids_usagers: List[float], saison: List[float],
+                  profil: Profil) -> Iterator[Dict]:
+    horizon = len(saison)
+    origine = datetime.combine(profil.debut, datetime.min.time())
+    cumul_durees = _cumul(POIDS_DUREES)
+    for ch, quota in zip(chambres, quotas):
+        if not quota:
+            continue
+        plancher = prix[ch["fk_type_chambre"]]
+        ecart_moyen = max((horizon - quota * DUREE_MOYENNE) / quota, 0.05)
+        clients = rnd.choices(usagers, cum_weights=poids_usagers, k=quota)
+        durees = rnd.choices(DUREES, cum_weights=cumul_durees, k=quota)
+        # Chance d'une arrivée un jour libre donné (écart moyen ~ecart_moyen),
+        # modulée par le facteur du jour: les arrivées tombent surtout en
+        # haute saison et en fin de semaine.
+        p_arrivee = 1.0 / (1.0 + ecart_moyen)
+        jour = rnd.randrange(7)
+        for client, duree in zip(clients, durees):
+            while rnd.random() >= p_arrivee * saison[jour % horizon]:
+                jour += 1
+            f = saison[jour % horizon]
+            debut = origine + timedelta(days=jour, hours=ARRIVEE)
+            yield dict(id_reservation=_uuid(rnd), date_debut_reservation=debut,
+                       date_fin_reservation=debut + timedelta(days=duree, hours=DEPART - ARRIVEE),
+                       prix_jour=round(plancher * (0.8 + 0.2 * f), 2), info_reservation=None,
+                       fk_id_usager=client, fk_id_chambre=ch["id_chambre"])
+            jour += duree
+
+def horizon_auto(echelle: Echelle, occupation: float = 0.65) -> int:
+    return max(365, math.ceil(echelle.reservations * DUREE_MOYENNE / max(echelle.chambres, 1) / occupation))
+
+def peupler(echelle: Echelle, graine: int = 42, taille_lot: int = TAILLE_LOT,
+            profil: Profil | None = None) -> Dict[str, int]:
+    """Insère le jeu complet dans une BD vide. Retourne le nb de lignes par table."""
+    profil = profil or Profil()
+    if not 1 <= echelle.chambres <= NUMERO_MAX:
+        raise ValueError(f"chambres doit être entre 1 et {NUMERO_MAX} (numero_chambre SMALLINT).")
+    if min(echelle.types, echelle.usagers) < 1:
+        raise ValueError("Il faut au moins un type et un usager.")
+    rnd = random.Random(graine)
+    poids_types = _poids_zipf(echelle.types, profil.zipf_types)
+    types = _types(rnd, echelle.types)
+    chambres = _chambres(rnd, echelle.chambres, types, poids_types)
+    demande = {t["id_type_chambre"]: math.sqrt(p) for t, p in zip(types, poids_types)}
+    quotas = _repartir(echelle.reservations, [demande[ch["fk_type_chambre"]] for ch in chambres])
+    saison = _facteurs_saison(profil, profil.jours or horizon_auto(echelle))
+    index = [ix for t in (Usager.__table__, Reservation.__table__) for ix in t.indexes if not ix.unique]
+    with core.db.engine.begin() as conn:
+        for ix in index:
+            ix.drop(conn, checkfirst=True)
+    try:
+        return _charger(echelle, rnd, types, chambres, quotas, saison, profil, taille_lot)
+    finally:
+        with core.db.engine.begin() as conn:
+            for ix in index:
+                ix.create(conn, checkfirst=True)
+
+def _charger(echelle: Echelle, rnd: random.Random, types: List[Dict], chambres: List[Dict], quotas: List[int],
+             saison: List[float], profil: Profil, taille_lot: int) -> Dict[str, int]:
+    with SessionLocal() as s:
+        compte = {
+            "type_chambre": _inserer(s, TypeChambre.__table__, iter(types), taille_lot),
+            "chambre": _inserer(s, Chambre.__table__, iter(chambres), taille_lot),
+        }
+        ids_usagers: List[UUID] = []
+        def _noter(lignes):
+            for u in lignes:
+                ids_usagers.append(u["id_usager"])
+                yield u
+        compte["usager"] = _inserer(s, Usager.__table__, _noter(_usagers(rnd, echelle.usagers)), taille_lot)
+        # Fidèles tirés au hasard (pas les premiers créés).
+        rnd.shuffle(ids_usagers)
+        poids_usagers = _cumul(_poids_zipf(len(ids_usagers), profil.fidelite))
+        prix = {t["id_type_chambre"]: t["prix_plancher"] for t in types}
+        compte["reservation"] = _inserer(
+            s, Reservation.__table__,
+            _reservations(rnd, quotas, chambres, prix, ids_usagers, poids_usagers, saison, profil), taille_lot)
+        compte["daily_summary"] = reconstruireResume(s)
+    return compte
+
+def compter(s: Session) -> Dict[str, int]:
+    return {
+        modele.__tablename__: s.scalar(select(func.count()).select_from(modele))
+        for modele in (TypeChambre, Chambre, Usager, Reservation)
+    }
+
+def peupler_si_vide(echelle: Echelle, graine: int = 42) -> Dict[str, int]:
+    """Peuple la BD si elle n'a ni chambre ni réservation, sinon la réutilise telle quelle."""
+    with SessionLocal() as s:
+        deja = compter(s)
+    if deja["reservation"] or deja["chambre"]:
+        print(f"BD déjà peuplée, réutilisée: {deja}")
+        return deja
+    t0 = time.perf_counter()
+    print(f"Peuplement {asdict(echelle)} ...")
+    peupler(echelle, graine)
+    print(f"  {time.perf_counter() - t0:.1f} s")
+    with SessionLocal() as s:
+        return compter(s)
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Peuple une BD de benchmark (jeu déterministe).")
+    for champ, defaut in asdict(Echelle()).items():
+        p.add_argument(f"--{champ}", type=int, default=defaut)
+    for f in fields(Profil):
+        if f.name != "debut":
+            p.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default), default=f.default)
+    p.add_argument("--debut", type=date.fromisoformat, default=Profil.debut, help="Première nuit (AAAA-MM-JJ).")
+    p.add_argument("--graine", type=int, default=42)
+    p.add_argument("--lot", type=int, default=TAILLE_LOT, help="Lignes par INSERT/commit.")
+    args = p.parse_args(argv)
+    init_db()
+    print(f"BD: {core.db.engine.url.render_as_string(hide_password=True)}")
+    t0 = time.perf_counter()
+    echelle = Echelle(args.types, args.chambres, args.usagers, args.reservations)
+    profil = Profil(**{f.name: getattr(args, f.name) for f in fields(Profil)})
+    for table, n in peupler(echelle, args.graine, args.lot, profil).items():
+        print(f"{table:<15} {n:>10}")
+    print(f"{time.perf_counter() - t0:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# bench/serialisation.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/serialisation.py
+# Rôle : coût par ligne de la sortie API (entité ORM -> DTO -> octets JSON),
+#        avant/après le chemin de confiance des DTO (from_entity).
+# Idée:
+#   - Entités ORM transitoires (pas de BD): on isole la conversion et la
+#     sérialisation, sans bruit SQL.
+#   - Étapes mesurées séparément, en µs par ligne (médiane et min sur
+#     --repetitions), pour une page de --lignes réservations:
+#       construction  : ReservationDTO(r) (valide tout) vs from_entity(r)
+#                       (DTO/confiance.py), et model_construct pour repère
+#       réponse       : ce que fait FastAPI avec response_model (validation
+#                       de l'instance + dump_json pydantic-core), comparé à
+#                       jsonable_encoder + json.dumps (JSONResponse) et à
+#                       model_dump + orjson (ORJSONResponse, si installé)
+#       bout à bout   : avant (construction validée + réponse) vs après
+#   Usage:
+#     python -m bench.serialisation --lignes 1000 --repetitions 30
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from DTO.chambreDTO import ChambreDTO, TypeChambreDTO
+from DTO.pageDTO import PageDTO
+from DTO.reservationDTO import ReservationDTO
+from DTO.usagerDTO import UsagerDTO
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def entites(n: int, graine: int) -> List[Reservation]:
+    rnd = random.Random(graine)
+    uid = lambda: UUID(int=rnd.getrandbits(128), version=4)
+    types = [TypeChambre(id_type_chambre=uid(), nom_type=f"Type {i}", prix_plancher=Decimal("89.9900"),
+                         prix_plafond="250", description_chambre="Vue sur le fleuve") for i in range(10)]
+    chambres = [Chambre(id_chambre=uid(), numero_chambre=100 + i, disponible_reservation=True,
+                        autre_informations="Lit king, bureau, machine à café" * 3, type_chambre=types[i % 10])
+                for i in range(50)]
+    usagers = [Usager(id_usager=uid(), prenom=f"Prénom{i}", nom=f"Nom{i}", adresse=f"{i} rue Principale",
+                      mobile="514-555-0100", mot_de_passe="x" * 60, type_usager="client") for i in range(200)]
+    debut = datetime(2025, 1, 1, 15)
+    res = []
+    for i in range(n):
+        d = debut + timedelta(days=rnd.randrange(365))
+        res.append(Reservation(id_reservation=uid(), date_debut_reservation=d,
+                               date_fin_reservation=d + timedelta(days=rnd.randint(1, 7)),
+                               prix_jour=Decimal("129.9900"), info_reservation="Demande étage élevé",
+                               chambre=rnd.choice(chambres), usager=rnd.choice(usagers)))
+    return res
+
+def mesurer(fn: Callable[[], object], n: int, repetitions: int) -> Dict[str, float]:
+    fn()
+    durees: List[float] = []
+    gc.collect()
+    gc.disable()           # comme timeit: pas de pause GC au milieu d'une mesure
+    try:
+        for _ in range(repetitions):
+            t0 = time.perf_counter()
+            fn()
+            durees.append((time.perf_counter() - t0) / n * 1e6)
+    finally:
+        gc.enable()
+    return {"mediane_us": round(statistics.median(durees), 3), "min_us": round(min(durees), 3)}
+
+def _par_model_construct(r: Reservation) -> ReservationDTO:
+    c, u, tc = r.chambre, r.usager, r.chambre.type_chambre
+    return ReservationDTO.model_construct(
+        idReservation=r.id_reservation, dateDebut=r.date_debut_reservation, dateFin=r.date_fin_reservation,
+        prixParJour=float(r.prix_jour), infoReservation=r.info_reservation,
+        chambre=ChambreDTO.model_construct(
+            idChambre=c.id_chambre, numero_chambre=c.numero_chambre, disponible_reservation=c.disponible_reservation,
+            autre_informations=c.autre_informations,
+            type_chambre=TypeChambreDTO.model_construct(
+                idTypeChambre=tc.id_type_chambre, nom_type=tc.nom_type, prix_plafond=tc.prix_plafond,
+                prix_plancher=float(tc.prix_plancher), description_chambre=tc.description_chambre)),
+        usager=UsagerDTO.model_construct(
+            idUsager=u.id_usager, prenom=u.prenom, nom=u.nom, adresse=u.adresse, mobile=u.mobile,
+            type_usager=u.type_usager))
+
+def cas(rows: List[Reservation]) -> Dict[str, Callable[[], object]]:
+    page = TypeAdapter(PageDTO[ReservationDTO])      # = response_model de GET /reservations
+    valides = PageDTO[ReservationDTO](items=[ReservationDTO(r) for r in rows])
+    confiance = PageDTO[ReservationDTO](items=[ReservationDTO.from_entity(r) for r in rows])
+
+    def reponse_fastapi(p):
+        return page.dump_json(page.validate_python(p, from_attributes=True))
+
+    c = {
+        "construction: ReservationDTO(r)": lambda: [ReservationDTO(r) for r in rows],
+        "construction: from_entity(r)": lambda: [ReservationDTO.from_entity(r) for r in rows],
+        "construction: model_construct": lambda: [_par_model_construct(r) for r in rows],
+        "réponse: response_model + dump_json": lambda: reponse_fastapi(confiance),
+        "réponse: jsonable_encoder + json.dumps": lambda: json.dumps(jsonable_encoder(confiance)).encode(),
+    }
+    if orjson is not None:
+        c["réponse: model_dump + orjson"] = lambda: orjson.dumps(confiance.model_dump())
+    c["bout à bout: avant"] = lambda: reponse_fastapi(
+        PageDTO[ReservationDTO](items=[ReservationDTO(r) for r in rows]))
+    c["bout à bout: après"] = lambda: reponse_fastapi(
+        PageDTO[ReservationDTO](items=[ReservationDTO.from_entity(r) for r in rows]))
+    # Même JSON des deux côtés, sinon la comparaison ne veut rien dire.
+    assert reponse_fastapi(valides) == reponse_fastapi(confiance)
+    return c
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Coût par ligne de la sérialisation des réponses.")
+    p.add_argument("--lignes", type=int, default=1000, help="Réservations par page mesurée.")
+    p.add_argument("--repetitions", type=int, default=30)
+    p.add_argument("--graine", type=int, default=42)
+    p.add_argument("--sortie", help="Fichier JSON des résultats.")
+    args = p.parse_args(argv)
+
+    rows = entites(args.lignes, args.graine)
+    resultats = {nom: mesurer(fn, args.lignes, args.repetitions) for nom, fn in cas(rows).items()}
+    print(f"{'étape':<42} {'médiane µs/ligne':>17} {'min µs/ligne':>13}")
+    for nom, r in resultats.items():
+        print(f"{nom:<42} {r['mediane_us']:>17.2f} {r['min_us']:>13.2f}")
+    if orjson is None:
+        print("(orjson absent: variante ORJSONResponse non mesurée)")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump({"lignes": args.lignes, "repetitions": args.repetitions, "resultats": resultats}, f, indent=2,
+                      ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+# bench/suite.py
+# -----------------------------------------------------------------------------
+# Fichier: bench/suite.py
+# Rôle : suite de benchmark complète, à volume « production »: chaque fonction
+#        métier publique et chaque route de main.py (en process, TestClient).
+# Idée:
+#   - BD peuplée par bench.donnees si elle est vide (sinon réutilisée: pointer
+#     HOTEL_DB_URL sur un fichier pour ne peupler qu'une fois).
+#   - Par cas: p50/p95/p99/moy/max en ms + requêtes SQL par appel (écouteur
+#     before_cursor_execute sur l'engine sync ET l'engine async).
+#   - Écritures en chaîne creer -> modifier -> supprimer (les supprimer
+#     défont les creer). Créneaux de réservation après la dernière date en BD.
+#   - Cas « complets » (listes non paginées, exports, reconstruction) ignorés
+#     au-delà de --max-complet lignes dans la table lue.
+#   - Résultat JSON dans bench/resultats/ (commit git + échelle + dialecte),
+#     --comparer A.json B.json signale les régressions (code de sortie 1).
+#   Usage:
+#     HOTEL_DB_URL=sqlite:///bench.db python -m bench.suite --types 1000 --chambres 20000 \
+#         --usagers 500000 --reservations 5000000
+#     python -m bench.suite --comparer bench/resultats/a.json bench/resultats/b.json
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+import core.db
+from core.db import SessionLocal, get_async_engine, init_db
+from bench import commit_git
+from bench.donnees import Echelle, compter, peupler_si_vide
+from DTO.chambreDTO import (
+    ChambreCreateDTO, ChambreUpdateDTO, TypeChambreCreateDTO, TypeChambreSearchDTO, TypeChambreUpdateDTO,
+)
+from DTO.reservationDTO import CriteresRechercheDTO, ReservationCreateDTO, ReservationDTO, ReservationUpdateDTO
+from DTO.usagerDTO import UsagerCreateDTO, UsagerSearchDTO, UsagerUpdateDTO
+from main import app
+from metier.analytiqueMetier import indicateurs
+from metier.calendrier import calendrierOccupation
+from metier.chambreMetier import (
+    creerChambre, creerTypeChambre, getChambreParNumero, getTypeChambreParId, iterChambres, listerChambres,
+    listerChambresDisponibles, listerChambresPage, listerTypesChambre, listerTypesChambrePage, modifierChambre,
+    modifierTypeChambre, rechercherChambreParId, rechercherTypeChambre, supprimerChambre, supprimerTypeChambre,
+)
+from metier.export import exporter
+from metier.importation import importer
+from metier.reservationMetier import (
+    creerReservation, creerReservationAvecIds, creerReservationsLot, getReservationParId, iterReservations,
+    listerReservations, listerReservationsPage, modifierReservation, rechercherReservation, supprimerReservation,
+)
+from metier.resume import reconstruireResume
+from metier.usagerMetier import (
+    creerUsager, getUsagerParId, iterUsagers, listerUsagers, listerUsagersPage, modifierUsager, rechercherUsager,
+    supprimerUsager,
+)
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+RESULTATS = Path(__file__).resolve().parent / "resultats"
+ECHANTILLON = 500
+TAILLE_LOT_RESA = 10
+TAILLE_IMPORT = 100
+
+@dataclass
+class Cas:
+    nom: str
+    groupe: str                         # "metier" ou "route"
+    appel: Callable[[int], object]      # i = numéro d'appel (0..n-1, échauffement compris)
+    complet: Optional[str] = None       # table lue en entier (ignoré au-delà de --max-complet)
+
+# ------------------------------ compteur SQL --------------------------------
+class CompteurRequetes:
+    """Requêtes envoyées au driver, sur l'engine sync et l'engine async."""
+    def __init__(self):
+        self.n = 0
+        self._engines = [core.db.engine, get_async_engine().sync_engine]
+        for e in self._engines:
+            event.listen(e, "before_cursor_execute", self._compter)
+
+    def _compter(self, *_args) -> None:
+        self.n += 1
+
+    def fermer(self) -> None:
+        for e in self._engines:
+            event.remove(e, "before_cursor_execute", self._compter)
+
+# -------------------------------- contexte ----------------------------------
+class Contexte:
+    """Échantillons d'ids lus en BD + générateurs de valeurs uniques pour les écritures."""
+    def __init__(self, graine: int):
+        self.rnd = random.Random(graine)
+        self.jeton = f"{time.time_ns() % 10**8:08d}"
+        with SessionLocal() as s:
+            self.taille = compter(s)
+            self.types = s.execute(select(TypeChambre.id_type_chambre, TypeChambre.nom_type)
+                                   .order_by(TypeChambre.id_type_chambre).limit(ECHANTILLON)).all()
+            self.chambres = s.execute(select(Chambre.id_chambre, Chambre.numero_chambre)
+                                      .order_by(Chambre.id_chambre).limit(ECHANTILLON)).all()
+            self.usagers = s.scalars(select(Usager.id_usager).order_by(Usager.id_usager).limit(ECHANTILLON)).all()
+            self.reservations = s.scalars(select(Reservation.id_reservation)
+                                          .order_by(Reservation.id_reservation).limit(ECHANTILLON)).all()
+            premier, dernier = s.execute(select(func.min(Reservation.date_debut_reservation),
+                                                func.max(Reservation.date_fin_reservation))).one()
+            self.prochain_numero = (s.scalar(select(func.max(Chambre.numero_chambre))) or 0) + 1
+        if not (self.types and self.chambres and self.usagers):
+            raise SystemExit("BD sans types/chambres/usagers: rien à mesurer.")
+        self.premier = (premier or datetime(2020, 1, 1)).date()
+        self.dernier = (dernier or datetime(2021, 1, 1)).date()
+        # Créneaux libres: après la dernière fin en BD, 3 jours par chambre.
+        self._base = datetime.combine(self.dernier + timedelta(days=1), datetime.min.time()) + timedelta(hours=15)
+        self._creneaux = 0
+        self._compteur = 0
+        # Ids créés par les cas creer*, consommés par modifier*/supprimer*.
+        self.crees: Dict[str, List[str]] = {"type": [], "chambre": [], "usager": [], "reservation": []}
+        self.nom_type = self.types[0][1]
+        self.dto_chambre = rechercherChambreParId(str(self.chambres[0][0]))
+        self.dto_usager = getUsagerParId(str(self.usagers[0]))
+
+    def unique(self, prefixe: str) -> str:
+        self._compteur += 1
+        return f"{prefixe}-{self.jeton}-{self._compteur}"
+
+    def numero(self) -> int:
+        self.prochain_numero += 1
+        return self.prochain_numero - 1
+
+    def creneau(self):
+        """(id_chambre, debut, fin) jamais réservé: 2 nuits, décalé de 3 jours par tour de chambres."""
+        k, self._creneaux = self._creneaux, self._creneaux + 1
+        tour, i = divmod(k, len(self.chambres))
+        debut = self._base + timedelta(days=3 * tour)
+        return self.chambres[i][0], debut, debut + timedelta(days=2, hours=-4)
+
+    def fenetre(self, i: int, nuits: int = 3):
+        """Fenêtre [debut, fin[ dans la période peuplée."""
+        jours = max((self.dernier - self.premier).days - nuits, 1)
+        d = datetime.combine(self.premier + timedelta(days=(i * 37) % jours), datetime.min.time())
+        return d + timedelta(hours=15), d + timedelta(days=nuits, hours=11)
+
+    def choisir(self, liste):
+        return self.rnd.choice(liste)
+
+    def prendre(self, cle: str) -> str:
+        return self.crees[cle].pop()
+
+    def dernier_cree(self, cle: str, i: int) -> str:
+        ids = self.crees[cle]
+        return ids[i % len(ids)]
+
+# -------------------------------- cas métier --------------------------------
+def _consommer(it) -> int:
+    return sum(1 for _ in it)
+
+def _usager_cree(ctx: Contexte) -> dict:
+    return dict(prenom="Bench", nom=ctx.unique("U"), adresse="1 rue du Banc", mobile="5550001111",
+                mot_de_passe="x" * 60, type_usager="Client")
+
+def _resa_ids(ctx: Contexte) -> ReservationCreateDTO:
+    id_ch, debut, fin = ctx.creneau()
+    return ReservationCreateDTO(idUsager=ctx.choisir(ctx.usagers), idChambre=id_ch, dateDebut=debut,
+                                dateFin=fin, prixParJour=100.0, infoReservation="bench")
+
+def _noter(ctx: Contexte, cle: str, valeur) -> None:
+    ctx.crees[cle].append(str(valeur))
+
+def cas_metier(ctx: Contexte) -> List[Cas]:
+    c = ctx
+    def m(nom, appel, complet=None):
+        return Cas(nom, "metier", appel, complet)
+
+    def creer_resa_legacy(i):
+        id_ch, debut, fin = c.creneau()
+        ch = c.dto_chambre.model_copy(update={"idChambre": id_ch})
+        r = creerReservation(ReservationDTO(dateDebut=debut, dateFin=fin, prixParJour=100.0,
+                                            chambre=ch, usager=c.dto_usager))
+        _noter(c, "reservation", r.idReservation)
+
+    def creer_resa_lot(i):
+        lot = creerReservationsLot([_resa_ids(c) for _ in range(TAILLE_LOT_RESA)])
+        for r in lot.resultats:
+            if r.idReservation:
+                _noter(c, "reservation", r.idReservation)
+
+    return [
+        # ---- lectures: types
+        m("listerTypesChambre", lambda i: listerTypesChambre()),
+        m("listerTypesChambrePage", lambda i: listerTypesChambrePage(limit=50)),
+        m("getTypeChambreParId", lambda i: getTypeChambreParId(str(c.choisir(c.types)[0]))),
+        m("rechercherTypeChambre", lambda i: rechercherTypeChambre(
+            TypeChambreSearchDTO(idTypeChambre=str(c.choisir(c.types)[0])))),
+        # ---- lectures: chambres
+        m("getChambreParNumero", lambda i: getChambreParNumero(c.choisir(c.chambres)[1])),
+        m("rechercherChambreParId", lambda i: rechercherChambreParId(str(c.choisir(c.chambres)[0]))),
+        m("listerChambresPage", lambda i: listerChambresPage(limit=50)),
+        m("listerChambres", lambda i: listerChambres(), "chambre"),
+        m("iterChambres", lambda i: _consommer(iterChambres()), "chambre"),
+        m("listerChambresDisponibles", lambda i: listerChambresDisponibles(*c.fenetre(i))),
+        m("listerChambresDisponibles(type)", lambda i: listerChambresDisponibles(*c.fenetre(i), c.nom_type)),
+        # ---- lectures: usagers
+        m("getUsagerParId", lambda i: getUsagerParId(str(c.choisir(c.usagers)))),
+        m("rechercherUsager", lambda i: rechercherUsager(UsagerSearchDTO(idUsager=str(c.choisir(c.usagers))))),
+        m("listerUsagersPage", lambda i: listerUsagersPage(limit=50)),
+        m("listerUsagers", lambda i: listerUsagers(), "usager"),
+        m("iterUsagers", lambda i: _consommer(iterUsagers()), "usager"),
+        # ---- lectures: réservations
+        m("getReservationParId", lambda i: getReservationParId(str(c.choisir(c.reservations)))),
+        m("rechercherReservation", lambda i: rechercherReservation(
+            CriteresRechercheDTO(idReservation=str(c.choisir(c.reservations))))),
+        m("listerReservationsPage", lambda i: listerReservationsPage(limit=50)),
+        m("listerReservations", lambda i: listerReservations(), "reservation"),
+        m("iterReservations", lambda i: _consommer(iterReservations()), "reservation"),
+        # ---- analytique / calendrier / export
+        m("calendrierOccupation(30j)", lambda i: calendrierOccupation(c.fenetre(i, 30)[0].date(), 30)),
+        m("indicateurs(mois)", lambda i: indicateurs(c.premier, c.dernier, "mois")),
+        m("indicateurs(jour,type)", lambda i: indicateurs(*[d.date() for d in c.fenetre(i, 30)], "jour", c.nom_type)),
+        m("exporter(chambres,csv)", lambda i: _consommer(exporter("chambres")), "chambre"),
+        m("exporter(reservations,csv)", lambda i: _consommer(exporter("reservations")), "reservation"),
+        # ---- écritures: types
+        m("creerTypeChambre", lambda i: _noter(c, "type", creerTypeChambre(
+            TypeChambreCreateDTO(nom_type=c.unique("T"), prix_plancher=99.0)).idTypeChambre)),
+        m("modifierTypeChambre", lambda i: modifierTypeChambre(
+            c.dernier_cree("type", i), TypeChambreUpdateDTO(description_chambre=f"v{i}"))),
+        m("supprimerTypeChambre", lambda i: supprimerTypeChambre(c.prendre("type"))),
+        # ---- écritures: chambres
+        m("creerChambre", lambda i: _noter(c, "chambre", creerChambre(ChambreCreateDTO(
+            numero_chambre=c.numero(), disponible_reservation=True, nom_type=c.nom_type)).idChambre)),
+        m("modifierChambre", lambda i: modifierChambre(
+            c.dernier_cree("chambre", i), ChambreUpdateDTO(autre_informations=f"v{i}"))),
+        m("supprimerChambre", lambda i: supprimerChambre(c.prendre("chambre"))),
+        # ---- écritures: usagers
+        m("creerUsager", lambda i: _noter(c, "usager", creerUsager(UsagerCreateDTO(**_usager_cree(c))).idUsager)),
+        m("modifierUsager", lambda i: modifierUsager(c.dernier_cree("usager", i), UsagerUpdateDTO(adresse=f"{i} rue"))),
+        m("supprimerUsager", lambda i: supprimerUsager(c.prendre("usager"))),
+        m(f"importer(usagers,{TAILLE_IMPORT})", lambda i: importer(
+            "usagers", [(n, _usager_cree(c)) for n in range(1, TAILLE_IMPORT + 1)])),
+        # ---- écritures: réservations
+        m("creerReservation", creer_resa_legacy),
+        m("creerReservationAvecIds", lambda i: _noter(c, "reservation", creerReservationAvecIds(_resa_ids(c)).idReservation)),
+        m(f"creerReservationsLot({TAILLE_LOT_RESA})", creer_resa_lot),
+        m("modifierReservation", lambda i: modifierReservation(
+            c.dernier_cree("reservation", i), ReservationUpdateDTO(infoReservation=f"v{i}"))),
+        m("supprimerReservation", lambda i: supprimerReservation(c.prendre("reservation"))),
+        m("reconstruireResume", lambda i: reconstruireResume(), "reservation"),
+    ]
+
+# -------------------------------- cas routes --------------------------------
+class ErreurHTTP(Exception):
+    pass
+
+def cas_routes(ctx: Contexte, client: TestClient) -> List[Cas]:
+    c = ctx
+    def r(nom, appel, complet=None):
+        def verifier(i):
+            res = appel(i)
+            if res.status_code >= 400:
+                raise ErreurHTTP(f"{res.status_code} {res.text[:200]}")
+            return res
+        return Cas(nom, "route", verifier, complet)
+
+    def fenetre(i, nuits=3):
+        debut, fin = c.fenetre(i, nuits)
+        return {"debut": debut.isoformat(), "fin": fin.isoformat()}
+
+    def corps_resa():
+        return json.loads(_resa_ids(c).model_dump_json())
+
+    def creer(cle, champ, res):
+        if res.status_code < 400:
+            _noter(c, cle, res.json()[champ])
+        return res
+
+    def creer_lot(res):
+        for x in res.json()["resultats"] if res.status_code < 400 else []:
+            if x.get("idReservation"):
+                _noter(c, "reservation", x["idReservation"])
+        return res
+
+    etag = {}
+    def conditionnel(i):
+        if "chambres" not in etag:
+            etag["chambres"] = client.get("/chambres", params={"limit": 50}).headers.get("etag", "")
+        return client.get("/chambres", params={"limit": 50}, headers={"If-None-Match": etag["chambres"]})
+
+    def importer_csv(i):
+        lignes = ["prenom,nom,adresse,mobile,mot_de_passe,type_usager"]
+        lignes += [",".join(_usager_cree(c).values()) for _ in range(TAILLE_IMPORT)]
+        return client.post("/import/usagers", content="\n".join(lignes).encode(),
+                           headers={"Content-Type": "text/csv"})
+
+    return [
+        r("GET /", lambda i: client.get("/")),
+        r("GET /health", lambda i: client.get("/health")),
+        # ---- types
+        r("GET /typesChambre", lambda i: client.get("/typesChambre", params={"limit": 50})),
+        r("GET /typeChambre/{id}", lambda i: client.get(f"/typeChambre/{c.choisir(c.types)[0]}")),
+        # ---- chambres
+        r("GET /chambres", lambda i: client.get("/chambres", params={"limit": 50})),
+        r("GET /chambres (304)", conditionnel),
+        r("GET /chambres?fields", lambda i: client.get("/chambres", params={"limit": 50, "fields": "numero_chambre"})),
+        r("GET /chambres?stream", lambda i: client.get("/chambres", params={"stream": "true"}), "chambre"),
+        r("GET /chambres/{no}", lambda i: client.get(f"/chambres/{c.choisir(c.chambres)[1]}")),
+        r("GET /chambres/id/{id}", lambda i: client.get(f"/chambres/id/{c.choisir(c.chambres)[0]}")),
+        r("GET /chambres/disponibles", lambda i: client.get("/chambres/disponibles", params=fenetre(i))),
+        # ---- usagers
+        r("GET /usagers", lambda i: client.get("/usagers", params={"limit": 50})),
+        r("GET /usagers/{id}", lambda i: client.get(f"/usagers/{c.choisir(c.usagers)}")),
+        # ---- réservations
+        r("GET /reservations", lambda i: client.get("/reservations", params={"limit": 50})),
+        r("GET /reservations?fields", lambda i: client.get(
+            "/reservations", params={"limit": 50, "fields": "dateDebut,dateFin,chambre.numero_chambre"})),
+        r("GET /reservations/{id}", lambda i: client.get(f"/reservations/{c.choisir(c.reservations)}")),
+        r("GET /reservations?stream", lambda i: client.get("/reservations", params={"stream": "true"}), "reservation"),
+        # ---- analytique / calendrier / export
+        r("GET /calendrier", lambda i: client.get("/calendrier", params={"debut": fenetre(i, 30)["debut"][:10], "jours": 30})),
+        r("GET /calendrier?binaire", lambda i: client.get(
+            "/calendrier", params={"debut": fenetre(i, 30)["debut"][:10], "jours": 30, "format": "binaire"})),
+        r("GET /analytics/indicateurs", lambda i: client.get(
+            "/analytics/indicateurs", params={"debut": c.premier.isoformat(), "fin": c.dernier.isoformat()})),
+        r("GET /export/chambres", lambda i: client.get("/export/chambres"), "chambre"),
+        r("GET /export/reservations", lambda i: client.get("/export/reservations"), "reservation"),
+        # ---- écritures: types
+        r("POST /creerTypeChambre", lambda i: creer("type", "idTypeChambre", client.post(
+            "/creerTypeChambre", json={"nom_type": c.unique("T"), "prix_plancher": 99.0}))),
+        r("PUT /typeChambre/{id}", lambda i: client.put(
+            f"/typeChambre/{c.dernier_cree('type', i)}", json={"description_chambre": f"v{i}"})),
+        r("DELETE /typeChambre/{id}", lambda i: client.delete(f"/typeChambre/{c.prendre('type')}")),
+        # ---- écritures: chambres
+        r("POST /creerChambre", lambda i: creer("chambre", "idChambre", client.post("/creerChambre", json={
+            "numero_chambre": c.numero(), "disponible_reservation": True, "nom_type": c.nom_type}))),
+        r("PUT /chambres/{id}", lambda i: client.put(
+            f"/chambres/{c.dernier_cree('chambre', i)}", json={"autre_informations": f"v{i}"})),
+        r("DELETE /chambres/{id}", lambda i: client.delete(f"/chambres/{c.prendre('chambre')}")),
+        # ---- écritures: usagers
+        r("POST /usagers", lambda i: creer("usager", "idUsager", client.post("/usagers", json=_usager_cree(c)))),
+        r("PUT /usagers/{id}", lambda i: client.put(f"/usagers/{c.dernier_cree('usager', i)}", json={"adresse": f"{i} rue"})),
+        r("DELETE /usagers/{id}", lambda i: client.delete(f"/usagers/{c.prendre('usager')}")),
+        r(f"POST /import/usagers ({TAILLE_IMPORT})", importer_csv),
+        # ---- écritures: réservations
+        r("POST /reservations", lambda i: creer("reservation", "idReservation", client.post("/reservations", json=corps_resa()))),
+        r(f"POST /reservations/batch ({TAILLE_LOT_RESA})", lambda i: creer_lot(client.post(
+            "/reservations/batch", json=[corps_resa() for _ in range(TAILLE_LOT_RESA)]))),
+        r("PUT /reservations/{id}", lambda i: client.put(
+            f"/reservations/{c.dernier_cree('reservation', i)}", json={"infoReservation": f"v{i}"})),
+        r("DELETE /reservations/{id}", lambda i: client.delete(f"/reservations/{c.prendre('reservation')}")),
+    ]
+
+# -------------------------------- mesure ------------------------------------
+def mesurer(cas: Cas, iterations: int, echauffement: int, compteur: CompteurRequetes) -> dict:
+    for i in range(echauffement):
+        try:
+            cas.appel(i)
+        except Exception:
+            pass
+    temps, erreurs, derniere = [], 0, None
+    requetes = compteur.n
+    for i in range(echauffement, echauffement + iterations):
+        t = time.perf_counter()
+        try:
+            cas.appel(i)
+        except Exception as e:
+            erreurs += 1
+            derniere = f"{type(e).__name__}: {e}"[:300]
+        temps.append((time.perf_counter() - t) * 1000)
+    ms = np.array(temps)
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    res = dict(groupe=cas.groupe, n=iterations, erreurs=erreurs,
+               p50_ms=round(float(p50), 3), p95_ms=round(float(p95), 3), p99_ms=round(float(p99), 3),
+               moyenne_ms=round(float(ms.mean()), 3), max_ms=round(float(ms.max()), 3),
+               requetes=round((compteur.n - requetes) / iterations, 2))
+    if derniere:
+        res["derniere_erreur"] = derniere
+    return res
+
+def _afficher(resultats: Dict[str, dict]) -> None:
+    print(f"{'cas':<42} {'p50':>9} {'p95':>9} {'p99':>9} {'req':>7} {'err':>4}")
+    for nom, r in resultats.items():
+        if "ignore" in r:
+            print(f"{nom:<42} {'ignoré: ' + r['ignore']:>42}")
+            continue
+        print(f"{nom:<42} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['requetes']:>7.1f} {r['erreurs']:>4}")
+
+def lancer(args) -> Path:
+    init_db()
+    url = core.db.engine.url
+    print(f"BD: {url.render_as_string(hide_password=True)}")
+    peupler_si_vide(Echelle(args.types, args.chambres, args.usagers, args.reservations), args.graine)
+
+    filtre = re.compile(args.filtre) if args.filtre else None
+    compteur = CompteurRequetes()
+    resultats: Dict[str, dict] = {}
+    # Le lifespan charge les caches (index d'occupation, catalogue des types):
+    # les cas métier tournent dans le même état que l'API en production.
+    with TestClient(app) as client:
+        ctx = Contexte(args.graine)
+        tous = (cas_metier(ctx) if args.groupe in ("tout", "metier") else []) \
+            + (cas_routes(ctx, client) if args.groupe in ("tout", "route") else [])
+        for cas in tous:
+            if filtre and not filtre.search(cas.nom):
+                continue
+            if cas.complet and ctx.taille[cas.complet] > args.max_complet:
+                resultats[cas.nom] = dict(groupe=cas.groupe, ignore=f"{cas.complet} > {args.max_complet}")
+                continue
+            n = args.iterations_complet if cas.complet else args.iterations
+            resultats[cas.nom] = mesurer(cas, n, 1 if cas.complet else args.echauffement, compteur)
+            print(f"  {cas.nom:<42} p50 {resultats[cas.nom]['p50_ms']:.2f} ms", flush=True)
+        taille = ctx.taille
+    compteur.fermer()
+    core.db.engine.dispose()
+
+    _afficher(resultats)
+    commit = commit_git()
+    sortie = Path(args.sortie) if args.sortie else \
+        RESULTATS / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'sans-git'}.json"
+    sortie.parent.mkdir(parents=True, exist_ok=True)
+    meta = dict(commit=commit, date=datetime.now().isoformat(timespec="seconds"), dialecte=url.get_backend_name(),
+                python=platform.python_version(), machine=platform.machine(), lignes=taille,
+                iterations=args.iterations, echauffement=args.echauffement)
+    sortie.write_text(json.dumps({"meta": meta, "cas": resultats}, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Résultats: {sortie}")
+    return sortie
+
+# ------------------------------- comparaison --------------------------------
+def comparer(avant: Path, apres: Path, seuil: float) -> int:
+    """Affiche les ratios p50/p95 et l'écart de requêtes. Retourne le nb de régressions."""
+    a, b = (json.loads(Path(p).read_text(encoding="utf-8")) for p in (avant, apres))
+    print(f"avant: {a['meta'].get('commit')} {a['meta'].get('lignes')}")
+    print(f"après: {b['meta'].get('commit')} {b['meta'].get('lignes')}")
+    print(f"{'cas':<42} {'p50 x':>7} {'p95 x':>7} {'Δreq':>7}")
+    regressions = 0
+    for nom, rb in b["cas"].items():
+        ra = a["cas"].get(nom)
+        if not ra or "ignore" in ra or "ignore" in rb:
+            continue
+        r50 = rb["p50_ms"] / max(ra["p50_ms"], 1e-6)
+        r95 = rb["p95_ms"] / max(ra["p95_ms"], 1e-6)
+        dreq = rb["requetes"] - ra["requetes"]
+        mauvais = r50 > seuil or dreq > 0 or rb["erreurs"] > ra["erreurs"]
+        regressions += mauvais
+        print(f"{nom:<42} {r50:>7.2f} {r95:>7.2f} {dreq:>+7.1f}{'  REGRESSION' if mauvais else ''}")
+    print(f"{regressions} régression(s) (seuil p50 x{seuil}, toute requête en plus, toute erreur en plus)")
+    return regressions
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Benchmark des fonctions métier et des routes.")
+    for champ, defaut in asdict(Echelle()).items():
+        p.add_argument(f"--{champ}", type=int, default=defaut, help="Échelle si la BD est vide.")
+    p.add_argument("--graine", type=int, default=42)
+    p.add_argument("--iterations", type=int, default=30)
+    p.add_argument("--echauffement", type=int, default=3)
+    p.add_argument("--iterations-complet", type=int, default=3, help="Itérations des cas « complets ».")
+    p.add_argument("--max-complet", type=int, default=100_000, help="Lignes max pour les cas « complets ».")
+    p.add_argument("--groupe", choices=("tout", "metier", "route"), default="tout")
+    p.add_argument("--filtre", help="Regex sur le nom des cas.")
+    p.add_argument("--sortie", help="Fichier JSON (défaut: bench/resultats/<date>-<commit>.json).")
+    p.add_argument("--comparer", nargs=2, metavar=("AVANT", "APRES"), help="Compare deux résultats et sort.")
+    p.add_argument("--seuil", type=float, default=1.2, help="Ratio p50 au-delà duquel c'est une régression.")
+    args = p.parse_args(argv)
+    if args.comparer:
+        sys.exit(1 if comparer(*args.comparer, seuil=args.seuil) else 0)
+    lancer(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# core/contexte.py
+# -----------------------------------------------------------------------------
+# Fichier: core/contexte.py
+# Rôle : contexte de la requête HTTP en cours (id, méthode, route, SQL
+#        exécuté), lisible depuis n'importe quelle couche sans le passer en
+#        paramètre: hooks SQL, journal des requêtes lentes, métriques.
+# Idée:
+#   - ContextVar posée par un middleware ASGI pur: elle suit la tâche asyncio
+#     jusque dans le greenlet de run_sync et dans le threadpool.
+#   - Id de requête: en-tête X-Request-ID du client s'il est raisonnable
+#     (sinon généré), renvoyé dans la réponse pour recouper les journaux.
+#   - La route est lue à la demande dans le scope: FastAPI y pose le gabarit
+#     (/chambres/id/{id_chambre}) une fois le routage fait.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import re
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+ENTETE_ID = "x-request-id"
+HORS_ROUTE = "(non routée)"
+_ID_VALIDE = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+@dataclass
+class RequeteCourante:
+    id: str
+    methode: str
+    scope: dict = field(repr=False)
+    requetes: int = 0          # instructions SQL exécutées (hooks de core/metriques.py)
+    duree_sql: float = 0.0     # secondes passées dans le driver
+
+    @property
+    def route(self) -> str:
+        return getattr(self.scope.get("route"), "path", None) or HORS_ROUTE
+
+_courante: ContextVar[Optional[RequeteCourante]] = ContextVar("hotel_requete_courante", default=None)
+
+def requete_courante() -> Optional[RequeteCourante]:
+    return _courante.get()
+
+def _id_requete(scope) -> str:
+    for nom, valeur in scope.get("headers") or ():
+        if nom == ENTETE_ID.encode():
+            v = valeur.decode("latin-1").strip()
+            if _ID_VALIDE.match(v):
+                return v
+            break
+    return uuid.uuid4().hex
+
+class MiddlewareContexte:
+    """Middleware ASGI: pose la RequeteCourante et renvoie X-Request-ID."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        rq = RequeteCourante(id=_id_requete(scope), methode=scope["method"], scope=scope)
+        jeton = _courante.set(rq)
+
+        async def envoyer(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + [(ENTETE_ID.encode(), rq.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, envoyer)
+        finally:
+            _courante.reset(jeton)
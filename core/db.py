@@ -1,28 +1,293 @@
 # core/db.py
-import logging
-from sqlalchemy import create_engine
+# -----------------------------------------------------------------------------
+# Fichier: core/db.py
+# Rôle : Engine SQLAlchemy + fabrique de sessions, configurés par variables
+#        d'environnement (MSSQL par défaut, SQLite pour dev/tests/benchmarks).
+# Variables reconnues (toutes optionnelles):
+#   - HOTEL_DB_URL            : URL SQLAlchemy (ex.: "sqlite://" = en mémoire,
+#                               "sqlite:///hotel.db" = fichier)
+#   - HOTEL_DB_ECHO           : 1 pour afficher tout le SQL (dev seulement,
+#                               off par défaut; en prod: journal des lentes)
+#   - HOTEL_DB_POOL_SIZE      : taille du pool (défaut 10)
+#   - HOTEL_DB_MAX_OVERFLOW   : connexions en surplus permises (défaut 20)
+#   - HOTEL_DB_POOL_TIMEOUT   : secondes d'attente d'une connexion (défaut 30)
+#   - HOTEL_DB_POOL_RECYCLE   : recycle les connexions après N s (défaut 1800)
+#   - HOTEL_DB_POOL_PRE_PING  : ping avant usage (défaut 1)
+#   - HOTEL_DB_ASYNC_URL      : URL du driver async (sinon déduite de HOTEL_DB_URL:
+#                               pyodbc -> aioodbc, pysqlite -> aiosqlite)
+#   - HOTEL_DB_STRICT_LOADING : 1 pour lever une erreur sur tout lazy load non
+#                               prévu (voir metier/chargement.py), off par défaut
+#   - HOTEL_DB_LENT_MS        : seuil du journal JSON des requêtes lentes en ms
+#                               (défaut 200; négatif = désactivé), voir
+#                               core/requetes_lentes.py
+#   - HOTEL_DB_LENT_ECHANTILLON : fraction des requêtes lentes journalisées
+#                               (0 à 1, défaut 1)
+#   - HOTEL_DB_LENT_PLAN      : 1 pour joindre le plan d'exécution (off)
+#   - HOTEL_DB_LENT_FICHIER   : fichier de sortie du journal (défaut stderr)
+#   - HOTEL_METRIQUES         : 0 pour ne pas instrumenter les engines (voir
+#                               core/metriques.py), on par défaut
+# Async: l'engine async est créé au premier usage (driver optionnel). Les
+#        fonctions métier *Async roulent le même code sync via run_sync().
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from core.metriques import instrumenter
+from core.requetes_lentes import installer as installer_journal_lent
 from modele.base import Base
 
-# Enable SQLAlchemy logging (INFO level)
-logging.basicConfig(level=logging.INFO)
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
-
-SQLALCHEMY_DATABASE_URL = (
+DEFAULT_DATABASE_URL = (
     "mssql+pyodbc://localhost\\SQLEXPRESS/Hotel"
     "?driver=ODBC Driver 17 for SQL Server"
     "&Trusted_Connection=yes"
 )
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    echo=True,                 # ✅ print all SQL querie
-    use_setinputsizes=False,
-    future=True
-)
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"{name} doit être un entier (reçu: {raw!r}).")
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"{name} doit être un nombre (reçu: {raw!r}).")
+
+@dataclass
+class DBSettings:
+    """Paramètres de connexion/pool. from_env() lit les HOTEL_DB_*."""
+    url: str = DEFAULT_DATABASE_URL
+    async_url: str | None = None
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    strict_loading: bool = False
+    lent_ms: float = 200.0
+    lent_echantillon: float = 1.0
+    lent_plan: bool = False
+    lent_fichier: str | None = None
+    connect_args: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "DBSettings":
+        return cls(
+            url=os.getenv("HOTEL_DB_URL") or DEFAULT_DATABASE_URL,
+            async_url=os.getenv("HOTEL_DB_ASYNC_URL") or None,
+            echo=_env_bool("HOTEL_DB_ECHO", False),
+            pool_size=_env_int("HOTEL_DB_POOL_SIZE", 10),
+            max_overflow=_env_int("HOTEL_DB_MAX_OVERFLOW", 20),
+            pool_timeout=_env_int("HOTEL_DB_POOL_TIMEOUT", 30),
+            pool_recycle=_env_int("HOTEL_DB_POOL_RECYCLE", 1800),
+            pool_pre_ping=_env_bool("HOTEL_DB_POOL_PRE_PING", True),
+            strict_loading=_env_bool("HOTEL_DB_STRICT_LOADING", False),
+            lent_ms=_env_float("HOTEL_DB_LENT_MS", 200.0),
+            lent_echantillon=_env_float("HOTEL_DB_LENT_ECHANTILLON", 1.0),
+            lent_plan=_env_bool("HOTEL_DB_LENT_PLAN", False),
+            lent_fichier=os.getenv("HOTEL_DB_LENT_FICHIER") or None,
+        )
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def is_sqlite_memory(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:")
+
+# Nom de la BD SQLite en mémoire partagée (sync + async voient la même BD).
+SQLITE_MEMORY_NAME = "hotel_memdb"
+
+def _sqlite_memory_url(driver: str) -> str:
+    return f"{driver}:///file:{SQLITE_MEMORY_NAME}?mode=memory&cache=shared&uri=true"
+
+def async_url_for(url: str) -> str:
+    """Déduit l'URL async équivalente (même BD, driver asyncio)."""
+    u = make_url(url)
+    backend, driver = u.get_backend_name(), u.get_driver_name()
+    if backend == "sqlite" and driver != "aiosqlite":
+        return str(u.set(drivername="sqlite+aiosqlite"))
+    if backend == "mssql" and driver == "pyodbc":
+        return str(u.set(drivername="mssql+aioodbc"))
+    if backend == "postgresql" and driver in ("psycopg2", "pg8000"):
+        return str(u.set(drivername="postgresql+asyncpg"))
+    return url
+
+def _engine_kwargs(settings: DBSettings, url: str) -> dict:
+    kwargs: dict = {"echo": settings.echo}
+    connect_args = dict(settings.connect_args)
+
+    if is_sqlite(url):
+        # Les routes/threads partagent les connexions (threadpool Starlette).
+        connect_args.setdefault("check_same_thread", False)
+        if is_sqlite_memory(url):
+            # En mémoire: une seule connexion, qui garde aussi la BD vivante.
+            kwargs["poolclass"] = StaticPool
+        else:
+            kwargs.update(
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_timeout=settings.pool_timeout,
+                pool_pre_ping=settings.pool_pre_ping,
+            )
+    else:
+        kwargs.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            pool_pre_ping=settings.pool_pre_ping,
+        )
+        if make_url(url).get_backend_name() == "mssql":
+            kwargs["use_setinputsizes"] = False
+
+    if connect_args:
+        kwargs["connect_args"] = connect_args
+    return kwargs
+
+def _install_sqlite_pragmas(eng: Engine) -> None:
+    @event.listens_for(eng, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # SQLite n'applique pas les FK par défaut; on veut les mêmes
+        # IntegrityError que MSSQL (ex.: supprimer une chambre réservée).
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+
+def _installer_journal_lent(eng: Engine, settings: DBSettings, nom: str) -> None:
+    installer_journal_lent(eng, nom, settings.lent_ms, settings.lent_echantillon,
+                           settings.lent_plan, settings.lent_fichier)
+
+def make_engine(settings: DBSettings | None = None) -> Engine:
+    """Construit l'engine selon le backend (MSSQL ou SQLite)."""
+    settings = settings or DBSettings.from_env()
+    kwargs = _engine_kwargs(settings, settings.url)
+    url = _sqlite_memory_url("sqlite") if is_sqlite_memory(settings.url) else settings.url
+    eng = create_engine(url, future=True, **kwargs)
+    if is_sqlite(url):
+        _install_sqlite_pragmas(eng)
+    instrumenter(eng, "sync")
+    _installer_journal_lent(eng, settings, "sync")
+    return eng
+
+def make_async_engine(settings: DBSettings | None = None) -> AsyncEngine:
+    """Engine asyncio (aiosqlite/aioodbc). Le driver doit être installé."""
+    settings = settings or DBSettings.from_env()
+    url = settings.async_url or async_url_for(settings.url)
+    kwargs = _engine_kwargs(settings, url)
+    if is_sqlite_memory(url):
+        url = _sqlite_memory_url("sqlite+aiosqlite")
+    eng = create_async_engine(url, **kwargs)
+    if is_sqlite(url):
+        _install_sqlite_pragmas(eng.sync_engine)
+    instrumenter(eng.sync_engine, "async")
+    _installer_journal_lent(eng.sync_engine, settings, "async")
+    return eng
+
+settings = DBSettings.from_env()
+SQLALCHEMY_DATABASE_URL = settings.url
+
+engine = make_engine(settings)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# Mêmes options que SessionLocal; bind posé par get_async_engine().
+AsyncSessionLocal = async_sessionmaker(autoflush=False, autocommit=False)
+_async_engine: AsyncEngine | None = None
+
+def get_async_engine() -> AsyncEngine:
+    """Engine async paresseux: créé au premier appel, puis réutilisé."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = make_async_engine(settings)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+def async_session() -> AsyncSession:
+    get_async_engine()
+    return AsyncSessionLocal()
+
+T = TypeVar("T")
+
+async def run_async(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Exécute fn(session, *args) dans une AsyncSession via run_sync().
+    Le code métier reste écrit une seule fois (sync); les I/O passent par le
+    driver async, donc la route n'occupe pas de thread pendant la requête."""
+    async with async_session() as s:
+        return await s.run_sync(fn, *args, **kwargs)
+
+def engines_actifs() -> dict[str, Engine]:
+    """Engines créés à date (jauges du pool pour /metrics)."""
+    engines = {"sync": engine}
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return engines
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+_fermetures: set = set()
+
+def _fermer_async_engine(eng: AsyncEngine) -> None:
+    # dispose() est une coroutine. Sans boucle en cours (scripts, tests): une
+    # boucle le temps de la fermeture. Depuis une boucle: tâche planifiée,
+    # référence gardée jusqu'à la fin.
+    try:
+        boucle = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(eng.dispose())
+        return
+    tache = boucle.create_task(eng.dispose())
+    _fermetures.add(tache)
+    tache.add_done_callback(_fermetures.discard)
+
+def configure_engine(new_settings: DBSettings) -> Engine:
+    """Remplace l'engine global et rebranche SessionLocal (scripts, benchmarks).
+    L'ancien engine async est fermé; il sera recréé au prochain usage avec les
+    nouveaux réglages."""
+    global engine, settings, SQLALCHEMY_DATABASE_URL, _async_engine
+    old, old_async = engine, _async_engine
+    settings = new_settings
+    SQLALCHEMY_DATABASE_URL = new_settings.url
+    engine = make_engine(new_settings)
+    SessionLocal.configure(bind=engine)
+    _async_engine = None
+    old.dispose()
+    if old_async is not None:
+        _fermer_async_engine(old_async)
+    return engine
+
 def init_db():
-    """Create all tables (only if they don’t exist yet)."""
+    """Create all tables (only if they don’t exist yet), puis migrations de
+    schéma (index ajoutés aux tables qui existaient déjà)."""
+    # Import des modèles pour que Base.metadata connaisse toutes les tables.
+    import modele.type_chambre, modele.chambre, modele.usager, modele.reservation, modele.compteur, modele.resume_journalier, modele.migration  # noqa: F401
     Base.metadata.create_all(bind=engine)
+    from core.migrations import migrer
+    migrer(engine)
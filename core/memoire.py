@@ -0,0 +1,212 @@
+# core/memoire.py
+# -----------------------------------------------------------------------------
+# Fichier: core/memoire.py
+# Rôle : instrumentation mémoire (tracemalloc) pour rattacher la croissance
+#        du RSS des workers à des routes et à des lignes de code.
+# Variables (toutes optionnelles):
+#   - HOTEL_MEMOIRE        : 1 pour activer (off par défaut: tracemalloc
+#                            ralentit nettement chaque allocation)
+#   - HOTEL_MEMOIRE_CADRES : profondeur des tracebacks gardés (défaut 10)
+#   - HOTEL_MEMOIRE_JETON  : jeton exigé (en-tête X-Debug-Jeton) par
+#                            GET /debug/memoire; sans jeton, route fermée (404)
+#   - HOTEL_MEMOIRE_SESSION_S : âge (s) à partir duquel une transaction de
+#                            session encore ouverte est signalée (défaut 30)
+# Idée:
+#   - Pic par route: pic tracemalloc pendant la requête moins l'alloué au
+#     départ. Le pic est global au processus (remis à zéro quand aucune autre
+#     requête n'est en cours): exact pour des requêtes isolées, borne
+#     supérieure si elles se chevauchent.
+#   - Sessions: chaque transaction racine de Session (sync et AsyncSession via
+#     sync_session) est inscrite avec la route et l'id de requête qui l'ont
+#     ouverte, retirée à commit/rollback/close. Encore ouverte à la fin de sa
+#     requête => orpheline (compteur + avertissement "hotel.memoire").
+#   - rapport(): top des lieux d'allocation, diff contre une photo de
+#     référence, pics par route, sessions ouvertes trop longtemps.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hmac
+import linecache
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from core.contexte import MiddlewareContexte, requete_courante
+from core.metriques import Compteur, Histogramme, enregistrer
+
+ACTIF = os.getenv("HOTEL_MEMOIRE", "0") == "1"
+CADRES = int(os.getenv("HOTEL_MEMOIRE_CADRES") or 10)
+JETON = os.getenv("HOTEL_MEMOIRE_JETON") or None
+AGE_SESSION_S = float(os.getenv("HOTEL_MEMOIRE_SESSION_S") or 30)
+
+BORNES_OCTETS = tuple(2 ** p for p in range(16, 29, 2))      # 64 Kio .. 256 Mio
+_EXCLUS = (tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, linecache.__file__),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+           tracemalloc.Filter(False, "<unknown>"))
+
+journal = logging.getLogger("hotel.memoire")
+
+HTTP = ("methode", "route")
+http_pic = enregistrer(Histogramme("hotel_http_memoire_pic_octets",
+                                   "Pic d'allocation Python pendant la requête (tracemalloc).", BORNES_OCTETS, HTTP))
+sessions_orphelines = enregistrer(Compteur("hotel_sessions_orphelines_total",
+                                           "Transactions de session encore ouvertes à la fin de leur requête.", HTTP))
+
+# ------------------------------- sessions ------------------------------------
+@dataclass
+class SessionOuverte:
+    debut: float
+    methode: Optional[str]
+    route: Optional[str]
+    id_requete: Optional[str]
+    requete_terminee: bool = False
+
+_sessions: "weakref.WeakKeyDictionary[Session, SessionOuverte]" = weakref.WeakKeyDictionary()
+_verrou = threading.Lock()
+
+def _transaction_ouverte(session, transaction):
+    if transaction.parent is None:
+        rq = requete_courante()
+        info = SessionOuverte(time.monotonic(), rq.methode if rq else None, rq.route if rq else None,
+                              rq.id if rq else None)
+        with _verrou:
+            _sessions[session] = info
+
+def _transaction_finie(session, transaction):
+    if transaction.parent is None:
+        with _verrou:
+            _sessions.pop(session, None)
+
+def sessions_ouvertes(age_min_s: float = 0.0) -> List[dict]:
+    maintenant = time.monotonic()
+    with _verrou:
+        items = list(_sessions.items())
+    return sorted(({"age_s": round(maintenant - info.debut, 3), "methode": info.methode, "route": info.route,
+                    "id_requete": info.id_requete, "requete_terminee": info.requete_terminee,
+                    "objets": len(session.identity_map)}
+                   for session, info in items if maintenant - info.debut >= age_min_s),
+                  key=lambda s: -s["age_s"])
+
+# ---------------------------- pics par route ---------------------------------
+_pics: Dict[Tuple[str, str], list] = {}        # (méthode, route) -> [n, somme, max]
+_en_cours = 0
+
+def _noter_pic(cle: Tuple[str, str], pic: int) -> None:
+    http_pic.observer(pic, *cle)
+    with _verrou:
+        stats = _pics.setdefault(cle, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += pic
+        stats[2] = max(stats[2], pic)
+
+def pics_par_route() -> List[dict]:
+    with _verrou:
+        items = list(_pics.items())
+    return sorted(({"methode": m, "route": r, "requetes": n, "pic_moyen_octets": somme // n, "pic_max_octets": mx}
+                   for (m, r), (n, somme, mx) in items), key=lambda p: -p["pic_max_octets"])
+
+class MiddlewareMemoire:
+    """Middleware ASGI: pic d'allocation par route et sessions orphelines.
+    À placer sous MiddlewareContexte; seul, il se l'ajoute lui-même."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _en_cours
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            return await self.app(scope, receive, send)
+        rq = requete_courante()
+        if rq is None:
+            return await MiddlewareContexte(self)(scope, receive, send)
+        with _verrou:
+            if _en_cours == 0:
+                tracemalloc.reset_peak()
+            _en_cours += 1
+        depart = tracemalloc.get_traced_memory()[0]
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pic = max(tracemalloc.get_traced_memory()[1] - depart, 0)
+            with _verrou:
+                _en_cours -= 1
+                orphelines = [i for i in _sessions.values() if i.id_requete == rq.id]
+                for info in orphelines:
+                    info.requete_terminee = True
+            cle = (rq.methode, rq.route)
+            _noter_pic(cle, pic)
+            if orphelines:
+                sessions_orphelines.inc(*cle, n=len(orphelines))
+                journal.warning("%d transaction(s) de session encore ouverte(s) après %s %s (requête %s)",
+                                len(orphelines), rq.methode, rq.route, rq.id)
+
+# --------------------------- photo et rapport --------------------------------
+_reference: Optional[tracemalloc.Snapshot] = None
+_reference_quand: Optional[str] = None
+
+def _lieu(trace) -> str:
+    cadre = trace.traceback[0]
+    return f"{cadre.filename}:{cadre.lineno}"
+
+def _rss_octets() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def rapport(top: int = 20, nouvelle_reference: bool = False) -> dict:
+    """Photo tracemalloc: top des lieux d'allocation, diff contre la référence,
+    pics par route et sessions ouvertes depuis plus de AGE_SESSION_S."""
+    global _reference, _reference_quand
+    if not tracemalloc.is_tracing():
+        raise ValueError("tracemalloc inactif (HOTEL_MEMOIRE=1 pour l'activer).")
+    photo = tracemalloc.take_snapshot().filter_traces(_EXCLUS)
+    courant, pic = tracemalloc.get_traced_memory()
+    res = {
+        "tracemalloc": {"courant_octets": courant, "pic_octets": pic, "cadres": tracemalloc.get_traceback_limit()},
+        "rss_octets": _rss_octets(),
+        "top": [{"lieu": _lieu(s), "octets": s.size, "blocs": s.count} for s in photo.statistics("lineno")[:top]],
+        "reference": _reference_quand,
+        "diff": None,
+        "routes": pics_par_route(),
+        "sessions": sessions_ouvertes(AGE_SESSION_S),
+    }
+    if _reference is not None:
+        res["diff"] = [{"lieu": _lieu(s), "octets_diff": s.size_diff, "blocs_diff": s.count_diff, "octets": s.size}
+                       for s in photo.compare_to(_reference, "lineno")[:top]]
+    if nouvelle_reference:
+        _reference, _reference_quand = photo, datetime.now().isoformat(timespec="seconds")
+    return res
+
+# ------------------------------ démarrage ------------------------------------
+def jeton_valide(jeton: Optional[str]) -> bool:
+    return bool(JETON) and jeton is not None and hmac.compare_digest(jeton.encode(), JETON.encode())
+
+def demarrer(cadres: int = CADRES) -> None:
+    """Démarre tracemalloc et le suivi des sessions (idempotent)."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(cadres)
+    if not event.contains(Session, "after_transaction_create", _transaction_ouverte):
+        event.listen(Session, "after_transaction_create", _transaction_ouverte)
+        event.listen(Session, "after_transaction_end", _transaction_finie)
+
+def arreter() -> None:
+    global _reference, _reference_quand
+    if event.contains(Session, "after_transaction_create", _transaction_ouverte):
+        event.remove(Session, "after_transaction_create", _transaction_ouverte)
+        event.remove(Session, "after_transaction_end", _transaction_finie)
+    tracemalloc.stop()
+    with _verrou:
+        _sessions.clear()
+        _pics.clear()
+    _reference = _reference_quand = None
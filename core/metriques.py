@@ -0,0 +1,211 @@
+# core/metriques.py
+# -----------------------------------------------------------------------------
+# Fichier: core/metriques.py
+# Rôle : métriques au format texte Prometheus (GET /metrics) + attribution
+#        du SQL (nb de requêtes, temps BD) à la requête HTTP en cours.
+# Idée:
+#   - Hooks before/after_cursor_execute posés sur chaque engine (sync et
+#     async) à sa création. La durée va à la requête HTTP courante
+#     (core/contexte.py) et aux totaux par engine.
+#   - Middleware ASGI pur (pas BaseHTTPMiddleware): la mesure couvre aussi le
+#     corps des réponses en flux (NDJSON, export). Route = gabarit FastAPI
+#     (/chambres/id/{id_chambre}), jamais l'URL brute (cardinalité bornée).
+#   - Jauges du pool (taille, connexions prises, overflow) lues au scrape
+#     (QueuePool seulement: la BD SQLite en mémoire n'a pas de vrai pool).
+#   - Pas de dépendance prometheus_client: quelques compteurs/histogrammes
+#     sous verrou suffisent. HOTEL_METRIQUES=0 => ni hooks ni middleware.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from core.contexte import MiddlewareContexte, requete_courante
+
+ACTIF = os.getenv("HOTEL_METRIQUES", "1") != "0"
+TYPE_CONTENU = "text/plain; version=0.0.4; charset=utf-8"
+
+BORNES_LATENCE = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BORNES_SQL = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+BORNES_NB_REQUETES = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+Etiquettes = Tuple[str, ...]
+
+# ------------------------------- registre -----------------------------------
+def _echapper(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _etiquettes(noms: Sequence[str], valeurs: Sequence[str], extra: str = "") -> str:
+    paires = [f'{n}="{_echapper(str(v))}"' for n, v in zip(noms, valeurs)]
+    if extra:
+        paires.append(extra)
+    return "{" + ",".join(paires) + "}" if paires else ""
+
+def _nombre(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+class Compteur:
+    def __init__(self, nom: str, aide: str, etiquettes: Sequence[str] = ()):
+        self.nom, self.aide, self.etiquettes = nom, aide, tuple(etiquettes)
+        self._valeurs: Dict[Etiquettes, float] = {}
+        self._verrou = threading.Lock()
+
+    def inc(self, *valeurs: str, n: float = 1.0) -> None:
+        with self._verrou:
+            self._valeurs[valeurs] = self._valeurs.get(valeurs, 0.0) + n
+
+    def valeur(self, *valeurs: str) -> float:
+        return self._valeurs.get(valeurs, 0.0)
+
+    def rendre(self) -> List[str]:
+        with self._verrou:
+            items = sorted(self._valeurs.items())
+        return [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} counter"] + [
+            f"{self.nom}{_etiquettes(self.etiquettes, k)} {_nombre(v)}" for k, v in items
+        ]
+
+class Histogramme:
+    def __init__(self, nom: str, aide: str, bornes: Sequence[float], etiquettes: Sequence[str] = ()):
+        self.nom, self.aide, self.etiquettes = nom, aide, tuple(etiquettes)
+        self.bornes = tuple(bornes)
+        self._series: Dict[Etiquettes, list] = {}     # [compte par borne..., +Inf, somme]
+        self._verrou = threading.Lock()
+
+    def observer(self, v: float, *valeurs: str) -> None:
+        with self._verrou:
+            serie = self._series.get(valeurs)
+            if serie is None:
+                serie = self._series[valeurs] = [0] * (len(self.bornes) + 1) + [0.0]
+            for i, b in enumerate(self.bornes):
+                if v <= b:
+                    serie[i] += 1
+                    break
+            else:
+                serie[len(self.bornes)] += 1
+            serie[-1] += v
+
+    def compte(self, *valeurs: str) -> int:
+        serie = self._series.get(valeurs)
+        return sum(serie[:-1]) if serie else 0
+
+    def rendre(self) -> List[str]:
+        with self._verrou:
+            items = sorted((k, list(s)) for k, s in self._series.items())
+        lignes = [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} histogram"]
+        for k, serie in items:
+            cumul = 0
+            for b, n in zip(self.bornes + (float("inf"),), serie[:-1]):
+                cumul += n
+                le = 'le="' + ("+Inf" if b == float("inf") else _nombre(b)) + '"'
+                lignes.append(f"{self.nom}_bucket{_etiquettes(self.etiquettes, k, le)} {cumul}")
+            lignes.append(f"{self.nom}_sum{_etiquettes(self.etiquettes, k)} {_nombre(serie[-1])}")
+            lignes.append(f"{self.nom}_count{_etiquettes(self.etiquettes, k)} {cumul}")
+        return lignes
+
+HTTP = ("methode", "route")
+http_requetes = Compteur("hotel_http_requetes_total", "Requêtes HTTP traitées.", HTTP + ("statut",))
+http_duree = Histogramme("hotel_http_duree_secondes", "Durée des requêtes HTTP (corps compris).", BORNES_LATENCE, HTTP)
+http_erreurs = Compteur("hotel_http_erreurs_total", "Réponses 5xx et exceptions non gérées.", HTTP + ("type",))
+http_sql = Compteur("hotel_http_sql_requetes_total", "Instructions SQL exécutées pour la route.", HTTP)
+http_sql_duree = Compteur("hotel_http_sql_secondes_total", "Temps passé dans le driver BD pour la route.", HTTP)
+http_sql_par_requete = Histogramme("hotel_http_sql_par_requete", "Instructions SQL par requête HTTP.",
+                                   BORNES_NB_REQUETES, HTTP)
+bd_requetes = Histogramme("hotel_bd_requete_secondes", "Durée de chaque instruction SQL.", BORNES_SQL, ("engine",))
+bd_erreurs = Compteur("hotel_bd_erreurs_total", "Erreurs levées par le driver BD.", ("engine",))
+
+METRIQUES = [http_requetes, http_duree, http_erreurs, http_sql, http_sql_duree, http_sql_par_requete,
+             bd_requetes, bd_erreurs]
+
+def enregistrer(metrique):
+    """Ajoute une métrique définie ailleurs (ex.: core/memoire.py) au rendu de /metrics."""
+    METRIQUES.append(metrique)
+    return metrique
+
+# ------------------------------- hooks SQL ----------------------------------
+def instrumenter(eng: Engine, nom: str) -> None:
+    """Pose les hooks de mesure sur un engine sync (pour l'async: .sync_engine)."""
+    if not ACTIF:
+        return
+
+    @event.listens_for(eng, "before_cursor_execute")
+    def _avant(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault("hotel_t0", []).append(time.perf_counter())
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def _apres(conn, _cursor, _statement, _parameters, _context, _executemany):
+        duree = time.perf_counter() - conn.info["hotel_t0"].pop()
+        bd_requetes.observer(duree, nom)
+        m = requete_courante()
+        if m is not None:
+            m.requetes += 1
+            m.duree_sql += duree
+
+    @event.listens_for(eng, "handle_error")
+    def _erreur(ctx):
+        pile = ctx.connection.info.get("hotel_t0") if ctx.connection is not None else None
+        if pile:
+            pile.pop()
+        bd_erreurs.inc(nom)
+
+# ------------------------------- middleware ---------------------------------
+class MiddlewareMetriques:
+    """Middleware ASGI: durée, statut, erreurs et SQL par (méthode, route).
+    À placer sous MiddlewareContexte; seul, il se l'ajoute lui-même."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        mesure = requete_courante()
+        if mesure is None:
+            return await MiddlewareContexte(self)(scope, receive, send)
+        statut, erreur = 500, None
+        t0 = time.perf_counter()
+
+        async def envoyer(message):
+            nonlocal statut
+            if message["type"] == "http.response.start":
+                statut = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, envoyer)
+        except Exception as e:
+            erreur = type(e).__name__
+            raise
+        finally:
+            cle = (mesure.methode, mesure.route)
+            http_requetes.inc(*cle, str(statut))
+            http_duree.observer(time.perf_counter() - t0, *cle)
+            http_sql.inc(*cle, n=mesure.requetes)
+            http_sql_duree.inc(*cle, n=mesure.duree_sql)
+            http_sql_par_requete.observer(mesure.requetes, *cle)
+            if erreur or statut >= 500:
+                http_erreurs.inc(*cle, erreur or str(statut))
+
+# ---------------------------------- rendu -----------------------------------
+def _jauges_pool(engines: Dict[str, Engine]) -> List[str]:
+    lectures = (("taille", "size", "Connexions permanentes du pool."),
+                ("prises", "checkedout", "Connexions actuellement empruntées au pool."),
+                ("overflow", "overflow", "Connexions au-delà de la taille du pool (négatif: places libres)."))
+    lignes = []
+    for suffixe, methode, aide in lectures:
+        nom = f"hotel_bd_pool_{suffixe}"
+        valeurs = [(e, getattr(eng.pool, methode)()) for e, eng in engines.items() if isinstance(eng.pool, QueuePool)]
+        if valeurs:
+            lignes += [f"# HELP {nom} {aide}", f"# TYPE {nom} gauge"]
+            lignes += [f'{nom}{{engine="{e}"}} {v}' for e, v in valeurs]
+    return lignes
+
+def rendre(engines: Dict[str, Engine]) -> str:
+    lignes: List[str] = []
+    for m in METRIQUES:
+        lignes += m.rendre()
+    lignes += _jauges_pool(engines)
+    return "\n".join(lignes) + "\n"
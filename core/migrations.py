@@ -0,0 +1,158 @@
+# core/migrations.py
+# -----------------------------------------------------------------------------
+# Fichier: core/migrations.py
+# Rôle : migrations de schéma versionnées, pour faire évoluer une BD existante
+#        (create_all ne touche jamais une table qui existe déjà).
+# Idée:
+#   - MIGRATIONS = liste ordonnée (version, nom, fonction(conn)). Les versions
+#     appliquées sont notées dans schema_migration.
+#   - Une migration = un bloc bind.begin(): DDL puis ligne schema_migration.
+#     Sous MSSQL c'est tout ou rien (DDL transactionnel). Sous pysqlite (gestion
+#     de transaction par défaut) rien ne garantit que le DDL et l'INSERT soient
+#     dans la même transaction: un arrêt entre les deux peut laisser l'index
+#     créé sans la version notée.
+#   - La vraie garantie est donc l'idempotence: chaque migration vérifie avant
+#     d'agir (_existe/_creer_index) et se rejoue sans effet. Toute nouvelle
+#     migration doit l'être aussi. Une BD neuve a déjà les index via
+#     create_all: la migration ne fait alors que s'enregistrer.
+#   - Index déclarés dans les modèles (source de vérité); les migrations les
+#     créent par leur nom. Faire évoluer un index = nouvelle migration qui
+#     supprime l'ancien et crée le nouveau.
+#   - Index unique sur des données existantes: on cherche d'abord les
+#     doublons et on arrête avec un message clair (rien n'est appliqué).
+#   - Deux workers qui migrent en même temps: le perdant échoue sur le DDL ou
+#     sur la PK de schema_migration; si la version est alors notée, on continue.
+#   Usage CLI:
+#     python -m core.migrations            # applique tout
+#     python -m core.migrations --etat     # versions appliquées / en attente
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Set
+from sqlalchemy import Index, Table, func, inspect, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+import core.db
+from modele.chambre import Chambre
+from modele.migration import SchemaMigration
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    nom: str
+    appliquer: Callable[[Connection], None]
+
+# ------------------------------- outils DDL -------------------------------
+def _index(table: Table, nom: str) -> Index:
+    for ix in table.indexes:
+        if ix.name == nom:
+            return ix
+    raise KeyError(f"Index {nom} absent du modèle {table.name}.")
+
+def _existe(conn: Connection, table: Table, nom: str) -> bool:
+    return any(ix["name"] == nom for ix in inspect(conn).get_indexes(table.name))
+
+def _creer_index(conn: Connection, table: Table, nom: str) -> None:
+    if not _existe(conn, table, nom):
+        _index(table, nom).create(conn)
+
+def _verifier_unique(conn: Connection, table: Table, colonnes: Sequence[str]) -> None:
+    cols = [table.c[c] for c in colonnes]
+    doublons = conn.execute(
+        select(*cols, func.count()).group_by(*cols).having(func.count() > 1).limit(5)
+    ).all()
+    if doublons:
+        exemples = ", ".join(str(tuple(d[:-1]) if len(cols) > 1 else d[0]) for d in doublons)
+        raise RuntimeError(
+            f"Doublons dans {table.name}({', '.join(colonnes)}) : {exemples}. "
+            f"Corriger les données avant d'ajouter l'index unique."
+        )
+
+# ------------------------------- migrations -------------------------------
+def _m001_index_recherches(conn: Connection) -> None:
+    # Résolution par nom_type (création/modif de chambre), GET par numéro,
+    # anti-doublon usager, filtre des chambres par type.
+    _verifier_unique(conn, TypeChambre.__table__, ["nom_type"])
+    _verifier_unique(conn, Chambre.__table__, ["numero_chambre"])
+    _creer_index(conn, TypeChambre.__table__, "uq_type_chambre_nom")
+    _creer_index(conn, Chambre.__table__, "uq_chambre_numero")
+    _creer_index(conn, Chambre.__table__, "ix_chambre_type")
+    _creer_index(conn, Usager.__table__, "ix_usager_identite")
+
+def _m002_index_reservations(conn: Connection) -> None:
+    # Tri/keyset par date de début, jointures sur les deux FK (fk_id_chambre
+    # est couverte par la première colonne de ix_reservation_chambre_dates).
+    t = Reservation.__table__
+    _creer_index(conn, t, "ix_reservation_chambre_dates")
+    _creer_index(conn, t, "ix_reservation_debut")
+    _creer_index(conn, t, "ix_reservation_usager")
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "index_recherches", _m001_index_recherches),
+    Migration(2, "index_reservations", _m002_index_reservations),
+]
+
+# -------------------------------- exécution --------------------------------
+def versions_appliquees(conn: Connection) -> Set[int]:
+    return set(conn.execute(select(SchemaMigration.version)).scalars())
+
+def _appliquee(bind: Engine, version: int) -> bool:
+    with bind.connect() as conn:
+        return version in versions_appliquees(conn)
+
+def migrer(bind: Optional[Engine] = None, cible: Optional[int] = None) -> List[int]:
+    """Applique dans l'ordre les migrations manquantes (jusqu'à cible).
+    Retourne les versions appliquées par cet appel."""
+    bind = bind if bind is not None else core.db.engine
+    SchemaMigration.__table__.create(bind, checkfirst=True)
+    faites: List[int] = []
+    for m in MIGRATIONS:
+        if cible is not None and m.version > cible:
+            break
+        try:
+            # Pas atomique sous pysqlite (cf. en-tête): rejouable car idempotente.
+            with bind.begin() as conn:
+                if m.version in versions_appliquees(conn):
+                    continue
+                m.appliquer(conn)
+                conn.execute(insert(SchemaMigration).values(
+                    version=m.version, nom=m.nom, applique_le=datetime.now(),
+                ))
+        except DBAPIError:
+            # Appliquée entre-temps par un autre process: rien à refaire.
+            if _appliquee(bind, m.version):
+                continue
+            raise
+        faites.append(m.version)
+    return faites
+
+def etat(bind: Optional[Engine] = None) -> List[tuple]:
+    """(version, nom, appliquée?) pour chaque migration connue."""
+    bind = bind if bind is not None else core.db.engine
+    SchemaMigration.__table__.create(bind, checkfirst=True)
+    with bind.connect() as conn:
+        faites = versions_appliquees(conn)
+    return [(m.version, m.nom, m.version in faites) for m in MIGRATIONS]
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Migrations de schéma (index, etc.).")
+    p.add_argument("--cible", type=int, help="S'arrêter à cette version.")
+    p.add_argument("--etat", action="store_true", help="Afficher l'état sans rien appliquer.")
+    args = p.parse_args(argv)
+    if args.etat:
+        for version, nom, faite in etat():
+            print(f"{version:04d} {nom:<30} {'appliquée' if faite else 'en attente'}")
+        return
+    faites = migrer(cible=args.cible)
+    print(f"Migrations appliquées: {', '.join(map(str, faites)) or 'aucune'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# core/profilage.py
+# -----------------------------------------------------------------------------
+# Fichier: core/profilage.py
+# Rôle : profilage CPU d'une requête HTTP à la demande, en production, pour
+#        voir où part le temps (SQL, validation Pydantic des DTO, conversions
+#        de dates...) sans profiler tout le trafic.
+# Déclencheurs (au moins un doit être configuré):
+#   - en-tête X-Profil égal au jeton HOTEL_PROFIL_JETON (comparaison à temps
+#     constant); sans jeton configuré, l'en-tête est ignoré;
+#   - échantillon: fraction HOTEL_PROFIL_ECHANTILLON des requêtes dont le
+#     chemin commence par un des préfixes HOTEL_PROFIL_CHEMINS (tous si vide).
+# Artefact écrit dans HOTEL_PROFIL_DOSSIER, nommé d'après l'heure, la route
+# et l'id de requête (renvoyé dans l'en-tête X-Profil de la réponse):
+#   - HOTEL_PROFIL_FORMAT=pstats (défaut): cProfile, lisible par pstats /
+#     snakeviz;
+#   - HOTEL_PROFIL_FORMAT=collapsed: piles échantillonnées toutes les
+#     HOTEL_PROFIL_INTERVALLE_MS (défaut 1) au format "a;b;c n", pour
+#     flamegraph.pl / speedscope. L'attente d'I/O (driver async) y apparaît
+#     dans la boucle d'événements (select).
+# Idée:
+#   - Les routes sont async: tout le code (routes, run_sync et son greenlet)
+#     roule dans le thread de la boucle, c'est lui qu'on profile. Les autres
+#     requêtes entrelacées sur la boucle pendant ce temps y apparaissent
+#     aussi: un seul profil à la fois par processus (les autres requêtes
+#     passent sans profil).
+#   - Sans HOTEL_PROFIL_DOSSIER le middleware n'est pas monté: coût nul.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+from core.contexte import requete_courante
+
+ENTETE = "x-profil"
+FORMATS = ("pstats", "collapsed")
+
+@dataclass
+class ReglagesProfil:
+    dossier: Optional[str] = None
+    jeton: Optional[str] = None
+    echantillon: float = 0.0
+    chemins: Tuple[str, ...] = ()
+    format: str = "pstats"
+    intervalle_ms: float = 1.0
+
+    def __post_init__(self):
+        if self.format not in FORMATS:
+            raise ValueError(f"HOTEL_PROFIL_FORMAT doit être un de {FORMATS} (reçu: {self.format!r}).")
+
+    @property
+    def actif(self) -> bool:
+        return bool(self.dossier) and (bool(self.jeton) or self.echantillon > 0)
+
+    @classmethod
+    def from_env(cls) -> "ReglagesProfil":
+        try:
+            echantillon = float(os.getenv("HOTEL_PROFIL_ECHANTILLON") or 0)
+            intervalle = float(os.getenv("HOTEL_PROFIL_INTERVALLE_MS") or 1)
+        except ValueError:
+            raise ValueError("HOTEL_PROFIL_ECHANTILLON et HOTEL_PROFIL_INTERVALLE_MS doivent être des nombres.")
+        chemins = tuple(c.strip() for c in (os.getenv("HOTEL_PROFIL_CHEMINS") or "").split(",") if c.strip())
+        return cls(
+            dossier=os.getenv("HOTEL_PROFIL_DOSSIER") or None,
+            jeton=os.getenv("HOTEL_PROFIL_JETON") or None,
+            echantillon=echantillon,
+            chemins=chemins,
+            format=os.getenv("HOTEL_PROFIL_FORMAT") or "pstats",
+            intervalle_ms=intervalle,
+        )
+
+# ------------------------------- piles ---------------------------------------
+def _cadre(f) -> str:
+    code = f.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class EchantillonneurPiles:
+    """Relève la pile d'un thread à intervalle fixe (sys._current_frames)."""
+    def __init__(self, tid: int, intervalle_s: float):
+        self.tid, self.intervalle_s = tid, intervalle_s
+        self.piles: Counter = Counter()
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._boucle, name="hotel-profil", daemon=True)
+
+    def _boucle(self):
+        while not self._arret.wait(self.intervalle_s):
+            f = sys._current_frames().get(self.tid)
+            pile = []
+            while f is not None:
+                pile.append(_cadre(f))
+                f = f.f_back
+            if pile:
+                self.piles[";".join(reversed(pile))] += 1
+
+    def demarrer(self):
+        self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        self._thread.join()
+
+    def ecrire(self, chemin: str):
+        with open(chemin, "w", encoding="utf-8") as f:
+            for pile, n in self.piles.most_common():
+                f.write(f"{pile} {n}\n")
+
+# ----------------------------- middleware ------------------------------------
+def _nom_artefact(methode: str, route: str, id_requete: str, fmt: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "racine"
+    ext = "prof" if fmt == "pstats" else "collapsed"
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{methode}-{slug}-{id_requete}.{ext}"
+
+class MiddlewareProfilage:
+    """Middleware ASGI: profile la requête si l'en-tête ou l'échantillon le
+    demande. À placer sous MiddlewareContexte (id de requête, route)."""
+    def __init__(self, app, reglages: Optional[ReglagesProfil] = None):
+        self.app = app
+        self.reglages = reglages or ReglagesProfil.from_env()
+        self._occupe = threading.Lock()
+        if self.reglages.dossier:
+            os.makedirs(self.reglages.dossier, exist_ok=True)
+
+    def _demande(self, scope) -> bool:
+        r = self.reglages
+        if r.jeton:
+            for nom, valeur in scope.get("headers") or ():
+                if nom == ENTETE.encode():
+                    return hmac.compare_digest(valeur, r.jeton.encode())
+        if r.echantillon <= 0 or (r.chemins and not scope["path"].startswith(r.chemins)):
+            return False
+        return random.random() < r.echantillon
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._demande(scope) or not self._occupe.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+        rq = requete_courante()
+        id_requete = rq.id if rq else f"{time.time_ns():x}"
+        fmt = self.reglages.format
+        nom = None
+
+        async def envoyer(message):
+            nonlocal nom
+            if message["type"] == "http.response.start":
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                nom = _nom_artefact(scope["method"], route, id_requete, fmt)
+                message["headers"] = list(message.get("headers", ())) + [(ENTETE.encode(), nom.encode())]
+            await send(message)
+
+        if fmt == "pstats":
+            profil = cProfile.Profile()
+            profil.enable()
+        else:
+            profil = EchantillonneurPiles(threading.get_ident(), self.reglages.intervalle_ms / 1000.0)
+            profil.demarrer()
+        try:
+            await self.app(scope, receive, envoyer)
+        finally:
+            try:
+                if fmt == "pstats":
+                    profil.disable()
+                else:
+                    profil.arreter()
+                if nom is None:
+                    nom = _nom_artefact(scope["method"], scope["path"], id_requete, fmt)
+                chemin = os.path.join(self.reglages.dossier, nom)
+                if fmt == "pstats":
+                    profil.dump_stats(chemin)
+                else:
+                    profil.ecrire(chemin)
+            finally:
+                self._occupe.release()
@@ -0,0 +1,159 @@
+# core/requetes_lentes.py
+# -----------------------------------------------------------------------------
+# Fichier: core/requetes_lentes.py
+# Rôle : journal structuré (une ligne JSON par événement) des instructions SQL
+#        lentes, au lieu de echo=True qui déverse tout le SQL en texte libre.
+# Idée:
+#   - Mêmes hooks before/after_cursor_execute que core/metriques.py; sous le
+#     seuil (HOTEL_DB_LENT_MS) rien n'est écrit, au-dessus on garde une
+#     fraction (HOTEL_DB_LENT_ECHANTILLON) pour borner le volume sous charge.
+#   - Empreinte = SQL normalisé (littéraux -> ?, listes IN et VALUES
+#     repliées) + hash court: regrouper les occurrences d'une même requête.
+#   - Contexte: route et id de requête HTTP (core/contexte.py), engine,
+#     durée, lignes (rowcount si le driver le donne; -1 pour un SELECT sur
+#     la plupart des drivers => null). Jamais les paramètres (données
+#     personnelles des usagers).
+#   - HOTEL_DB_LENT_PLAN=1: plan d'exécution du SELECT lent (SQLite: EXPLAIN
+#     QUERY PLAN, PostgreSQL: EXPLAIN, MSSQL: SHOWPLAN_TEXT), avec les mêmes
+#     paramètres. Au mieux: un échec va dans plan_erreur, jamais à l'appelant.
+#   - Sortie: logger "hotel.sql.lent" (stderr, ou HOTEL_DB_LENT_FICHIER);
+#     l'appli peut lui brancher ses propres handlers avant le 1er engine.
+#     Seuil négatif => aucun hook.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from core.contexte import requete_courante
+
+journal = logging.getLogger("hotel.sql.lent")
+SQL_MAX = 2000       # caractères de SQL normalisé gardés dans la ligne
+
+# ------------------------------- empreinte ----------------------------------
+_COMMENTAIRES = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_CHAINES = re.compile(r"N?'(?:[^']|'')*'")
+_NOMBRES = re.compile(r"(?<![\w\"\]])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_MARQUEURS = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_LISTES = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_TUPLES = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_ESPACES = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def empreinte(statement: str) -> Tuple[str, str]:
+    """(hash court, SQL normalisé). Le texte compilé est réutilisé par le cache
+    de SQLAlchemy, d'où le lru_cache: la normalisation ne coûte qu'une fois."""
+    s = _COMMENTAIRES.sub(" ", statement)
+    s = _CHAINES.sub("?", s)
+    s = _MARQUEURS.sub("?", s)
+    s = _NOMBRES.sub("?", s)
+    s = _LISTES.sub("(...)", s)
+    s = _TUPLES.sub("(...)", s)
+    s = _ESPACES.sub(" ", s).strip()
+    return hashlib.sha1(s.encode()).hexdigest()[:16], s
+
+# ------------------------------ plan d'exécution ----------------------------
+def _lignes_plan(cur) -> List[str]:
+    lignes = []
+    while True:
+        if cur.description is not None:
+            lignes += [" | ".join(str(v) for v in r) for r in cur.fetchall()]
+        if not hasattr(cur, "nextset") or not cur.nextset():
+            return lignes
+
+def capturer_plan(conn, statement: str, parameters) -> List[str]:
+    """Plan du SELECT. SQLite: un 2e curseur sur la même connexion suffit
+    (et la BD en mémoire n'en a qu'une). Ailleurs: connexion brute distincte,
+    la connexion courante a peut-être encore des lignes à lire."""
+    backend = conn.dialect.name
+    if backend == "sqlite":
+        cur = conn.connection.dbapi_connection.cursor()
+        try:
+            cur.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            return [str(r[-1]) for r in cur.fetchall()]
+        finally:
+            cur.close()
+    if backend not in ("postgresql", "mssql"):
+        raise ValueError(f"Capture de plan non prise en charge pour {backend}.")
+    brute = conn.engine.raw_connection()
+    try:
+        cur = brute.cursor()
+        if backend == "postgresql":
+            cur.execute("EXPLAIN " + statement, parameters)
+            return _lignes_plan(cur)
+        cur.execute("SET SHOWPLAN_TEXT ON")
+        try:
+            cur.execute(statement, parameters)
+            return _lignes_plan(cur)
+        finally:
+            cur.execute("SET SHOWPLAN_TEXT OFF")
+    finally:
+        brute.close()     # retour au pool (rollback au retour)
+
+# -------------------------------- sortie ------------------------------------
+def configurer_sortie(fichier: Optional[str] = None) -> None:
+    """Handler par défaut (une ligne JSON par message), seulement si
+    l'application n'en a pas déjà branché un."""
+    if journal.handlers:
+        return
+    handler = logging.FileHandler(fichier, encoding="utf-8") if fichier else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    journal.addHandler(handler)
+    journal.setLevel(logging.INFO)
+    journal.propagate = False
+
+# --------------------------------- hooks ------------------------------------
+def installer(eng: Engine, nom: str, seuil_ms: float, echantillon: float = 1.0, plan: bool = False,
+              fichier: Optional[str] = None) -> None:
+    """Pose le journal des requêtes lentes sur un engine sync (async: .sync_engine)."""
+    if seuil_ms < 0 or echantillon <= 0:
+        return
+    configurer_sortie(fichier)
+    seuil = seuil_ms / 1000.0
+
+    @event.listens_for(eng, "before_cursor_execute")
+    def _avant(conn, _cursor, _statement, _parameters, _context, _executemany):
+        conn.info.setdefault("hotel_lent_t0", []).append(time.perf_counter())
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def _apres(conn, cursor, statement, parameters, _context, executemany):
+        duree = time.perf_counter() - conn.info["hotel_lent_t0"].pop()
+        if duree < seuil or (echantillon < 1.0 and random.random() >= echantillon):
+            return
+        h, sql = empreinte(statement)
+        rq = requete_courante()
+        lignes = getattr(cursor, "rowcount", -1)
+        entree = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "evenement": "requete_lente",
+            "empreinte": h,
+            "duree_ms": round(duree * 1000, 3),
+            "lignes": lignes if lignes is not None and lignes >= 0 else None,
+            "executemany": executemany,
+            "engine": nom,
+            "route": f"{rq.methode} {rq.route}" if rq else None,
+            "id_requete": rq.id if rq else None,
+            "sql": sql[:SQL_MAX],
+        }
+        if plan and not executemany and sql.lower().startswith(("select", "with")):
+            try:
+                entree["plan"] = capturer_plan(conn, statement, parameters)
+            except Exception as e:
+                entree["plan_erreur"] = f"{type(e).__name__}: {e}"
+        journal.info(json.dumps(entree, ensure_ascii=False, default=str))
+
+    @event.listens_for(eng, "handle_error")
+    def _erreur(ctx):
+        pile = ctx.connection.info.get("hotel_lent_t0") if ctx.connection is not None else None
+        if pile:
+            pile.pop()
@@ -5,7 +5,34 @@
 # Notes:
 #   - Les routes retournent les DTO (réponse propre).
 #   - try/except ValueError -> lève HTTP 400 (bad request) avec message clair.
+#     ConflitReservation (chambre déjà prise sur la période) -> HTTP 409.
 #   - POST /reservations accepte le payload minimal (IDs+dates+prix).
+#   - POST /reservations/batch: même payload en liste, une transaction,
+#     un résultat par élément.
+#   - Routes async def -> fonctions métier *Async (AsyncSession). La route ne
+#     bloque pas de thread du threadpool; la limite devient le pool de connexions.
+#   - Les listes sont paginées (keyset): ?limit=&cursor= -> {items, next_cursor}.
+#   - /reservations, /chambres, /usagers: ?stream=1 ou Accept: application/x-ndjson
+#     -> tout le contenu en NDJSON, lu par lots (mémoire constante).
+#   - GET /calendrier: grille d'occupation chambres × nuits (RLE, bitset ou binaire).
+#   - GET /analytics/indicateurs: ADR, RevPAR, occupation (lus dans daily_summary).
+#   - POST /import/{usagers|types|chambres}: import CSV/JSONL par lots (aussi en CLI).
+#   - GET /export/{reservations|usagers|chambres}: CSV/Parquet en flux (aussi en CLI).
+#   - GET conditionnels: ETag calculé depuis les compteurs de modification des
+#     tables lues (compteur_modification). If-None-Match qui correspond -> 304
+#     sans exécuter la requête de liste ni bâtir de DTO.
+#   - Types de chambre servis par un catalogue en mémoire chargé au démarrage
+#     (metier/catalogue.py), invalidé par version à chaque écriture.
+#   - GET /metrics: métriques Prometheus (latence, SQL et erreurs par route,
+#     pool de connexions), voir core/metriques.py.
+#   - GET /chambres et /reservations: ?fields= et ?expand= (champs à la carte,
+#     colonnes et jointures réduites en SQL), voir metier/projection.py.
+#   - SQL lent journalisé en JSON (route, id de requête X-Request-ID), voir
+#     core/requetes_lentes.py.
+#   - Profil CPU d'une requête sur demande (en-tête X-Profil ou échantillon),
+#     voir core/profilage.py.
+#   - GET /debug/memoire (HOTEL_MEMOIRE=1 + jeton): top des allocations, diff
+#     contre une référence, pics par route, sessions restées ouvertes.
 # -----------------------------------------------------------------------------
 
 # FICHIER PRINCIPAL DE L’API
@@ -26,7 +53,13 @@ Docs :
 """
 
 # ------------------- Imports de base FastAPI -------------------
-from fastapi import FastAPI, HTTPException, Response, status
+import io
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import Literal, Optional
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # ------------------- DTOs (validation/retour) -------------------
@@ -42,47 +75,114 @@ from DTO.reservationDTO import (
     ReservationDTO,
     ReservationCreateDTO,   # <-- import du payload minimal
     ReservationUpdateDTO,
+    LotReservationsDTO,     # réponse de POST /reservations/batch
 )
 from DTO.usagerDTO import (
     UsagerDTO,
     UsagerCreateDTO,
     UsagerUpdateDTO,
 )
+from DTO.pageDTO import PageDTO
+from DTO.calendrierDTO import CalendrierDTO, CalendrierChambreDTO
+from DTO.analytiqueDTO import IndicateurDTO
+from DTO.importDTO import RapportImportDTO
 
 # ------------------- Couche métier (logique) -------------------
 from metier.chambreMetier import (
-    creerChambre,
-    creerTypeChambre,
-    getChambreParNumero,
-    listerChambres,
-    listerTypesChambre,
-    modifierChambre,
-    supprimerChambre,
-    modifierTypeChambre,
-    supprimerTypeChambre,
-    rechercherChambreParId,   # GET par ID pour les chambres
-    getTypeChambreParId,      # GET par ID pour les types de chambre
+    TABLE_CHAMBRE,
+    creerChambreAsync,
+    creerTypeChambreAsync,
+    getChambreParNumeroAsync,
+    listerChambresPageAsync,
+    iterChambresAsync,              # flux NDJSON
+    listerChambresDisponiblesAsync, # recherche de disponibilité
+    listerTypesChambrePageAsync,
+    modifierChambreAsync,
+    supprimerChambreAsync,
+    modifierTypeChambreAsync,
+    supprimerTypeChambreAsync,
+    rechercherChambreParIdAsync,    # GET par ID pour les chambres
+    getTypeChambreParIdAsync,       # GET par ID pour les types de chambre
 )
 from metier.reservationMetier import (
-    listerReservations,       # GET list des réservations
-    getReservationParId,      # GET par ID pour une réservation
-    creerReservationAvecIds,  # <-- nouvelle fonction (payload minimal)
-    modifierReservation,
-    supprimerReservation,
+    listerReservationsPageAsync,    # GET list des réservations (paginée)
+    iterReservationsAsync,          # flux NDJSON
+    getReservationParIdAsync,       # GET par ID pour une réservation
+    creerReservationAvecIdsAsync,   # <-- nouvelle fonction (payload minimal)
+    creerReservationsLotAsync,      # POST /reservations/batch
+    ConflitReservation,             # chevauchement -> 409
+    modifierReservationAsync,
+    supprimerReservationAsync,
+)
+from metier.calendrier import (
+    JOURS_DEFAUT,
+    JOURS_MAX,
+    calendrierOccupationAsync,      # grille chambres × nuits (NumPy)
+    plages_rle,
+    bits_base64,
+    binaire,
+)
+from metier.analytiqueMetier import indicateursAsync   # ADR / RevPAR / occupation
+from metier.importation import (                       # import en masse CSV/JSONL
+    TAILLE_LOT_IMPORT,
+    TAILLE_LOT_MAX,
+    importerAsync,
+    lire,
+)
+from metier.export import (                            # export CSV/Parquet en flux
+    TAILLE_LOT_EXPORT,
+    TYPES_MEDIA,
+    exporterAsync,
+    requete,
+    verifier_format,
 )
 from metier.usagerMetier import (
-    creerUsager,
-    modifierUsager,
-    supprimerUsager,
-    getUsagerParId,           # GET par ID pour un usager
-    listerUsagers,            # GET list des usagers
+    TABLE_USAGER,
+    creerUsagerAsync,
+    modifierUsagerAsync,
+    supprimerUsagerAsync,
+    getUsagerParIdAsync,            # GET par ID pour un usager
+    listerUsagersPageAsync,         # GET list des usagers (paginée)
+    iterUsagersAsync,               # flux NDJSON
 )
 
+# ------------------- Infra BD -------------------
+import os
+from core.db import dispose_async_engine, engines_actifs, run_async
+from core.contexte import MiddlewareContexte
+from core.memoire import ACTIF as MEMOIRE_ACTIVE, MiddlewareMemoire, demarrer as demarrer_memoire, jeton_valide, rapport as rapport_memoire
+from core.profilage import MiddlewareProfilage, ReglagesProfil
+from core.metriques import ACTIF as METRIQUES_ACTIVES, TYPE_CONTENU as TYPE_METRIQUES, MiddlewareMetriques, rendre as rendre_metriques
+from metier.catalogue import TABLE as TABLE_TYPE_CHAMBRE, catalogue_types
+from metier.occupation import TABLE as TABLE_RESERVATION, index_occupation
+from metier.versions import etag_versions, lireVersionsAsync
+from metier.pagination import LIMITE_DEFAUT, LIMITE_MAX
+from metier.flux import ndjson_async
+from metier.projection import CHAMBRE as PROJ_CHAMBRE, RESERVATION as PROJ_RESERVATION, lire_projection
+
 # ------------------- App & CORS -------------------
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Index d'occupation en mémoire (HOTEL_OCCUPATION_INDEX=0 pour désactiver).
+    if os.getenv("HOTEL_OCCUPATION_INDEX", "1") != "0":
+        await run_async(index_occupation.charger)
+    # Catalogue des types de chambre en mémoire (HOTEL_CATALOGUE_TYPES=0 pour désactiver).
+    if os.getenv("HOTEL_CATALOGUE_TYPES", "1") != "0":
+        await run_async(catalogue_types.charger)
+    yield
+    index_occupation.desactiver()
+    catalogue_types.desactiver()
+    # Ferme proprement les connexions async à l'arrêt du serveur.
+    await dispose_async_engine()
+
+# Pas de default_response_class (ORJSONResponse & cie): avec response_model, FastAPI
+# écrit déjà les octets JSON via pydantic-core (dump_json); une classe de réponse
+# perso désactive ce chemin et repasse par un dict. Mesures: bench/serialisation.py.
 app = FastAPI(
     title="API Hôtel - Projet Partiel",
     description="API permettant de gérer les chambres, les usagers et les réservations d'un hôtel.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS large pour dev. En prod, je restreindrais ça aux domaines connus.
@@ -94,49 +194,189 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profilage CPU à la demande (monté seulement si HOTEL_PROFIL_DOSSIER + un déclencheur).
+REGLAGES_PROFIL = ReglagesProfil.from_env()
+if REGLAGES_PROFIL.actif:
+    app.add_middleware(MiddlewareProfilage, reglages=REGLAGES_PROFIL)
+
+# Mémoire (tracemalloc): pic par route et sessions orphelines (HOTEL_MEMOIRE=1).
+if MEMOIRE_ACTIVE:
+    demarrer_memoire()
+    app.add_middleware(MiddlewareMemoire)
+
+# Métriques par route, sous le contexte de requête (ajouté en dernier = le plus
+# à l'extérieur: id de requête et route visibles de tout le reste).
+if METRIQUES_ACTIVES:
+    app.add_middleware(MiddlewareMetriques)
+app.add_middleware(MiddlewareContexte)
+
+# ------------------- Pagination (commun aux listes) -------------------
+# limit borné côté route (422 si hors bornes); cursor = next_cursor reçu.
+def _limit_query():
+    return Query(LIMITE_DEFAUT, ge=1, le=LIMITE_MAX, description="Taille de page.")
+
+def _cursor_query():
+    return Query(None, description="next_cursor de la page précédente (opaque).")
+
+# ------------------- Champs à la carte (metier/projection.py) -------------------
+# Avec fields/expand, les items sont partiels: réponse hors response_model (qui
+# exige tous les champs). Un Union dans response_model coûterait une validation
+# de plus à chaque réponse complète.
+def _fields_query():
+    return Query(None, description="Champs servis, séparés par des virgules (ex.: dateDebut,prixParJour); "
+                                   "'relation.champ' pour un objet imbriqué. L'id est toujours servi.")
+
+def _expand_query(exemple: str):
+    return Query(None, description=f"Objets imbriqués à inclure (ex.: {exemple}). "
+                                   "Sans fields ni expand: réponse complète.")
+
+def _reponse_partielle(page, response: Response) -> Response:
+    # Response retournée telle quelle: FastAPI n'y recopie pas les en-têtes posés
+    # par les dépendances (ETag de _conditionnel), on le fait ici.
+    return Response(page.model_dump_json(), media_type="application/json", headers=dict(response.headers))
+
+# ------------------- Streaming NDJSON (listes volumineuses) -------------------
+NDJSON = "application/x-ndjson"
+
+def _stream_query():
+    return Query(False, description="1 = tout le contenu en NDJSON (ignore limit/cursor).")
+
+def _veut_flux(request: Request, stream: bool) -> bool:
+    return stream or NDJSON in request.headers.get("accept", "")
+
+def _reponse_ndjson(dtos) -> StreamingResponse:
+    # Pas de response_model ici: chaque DTO est sérialisé une fois, au fil de l'eau.
+    return StreamingResponse(ndjson_async(dtos), media_type=NDJSON)
+
+# ------------------- GET conditionnels (ETag / If-None-Match) -------------------
+# Tables dont le contenu se retrouve dans la réponse (DTO imbriqués compris).
+TABLES_TYPES = (TABLE_TYPE_CHAMBRE,)
+TABLES_CHAMBRES = (TABLE_CHAMBRE, TABLE_TYPE_CHAMBRE)
+TABLES_USAGERS = (TABLE_USAGER,)
+TABLES_RESERVATIONS = (TABLE_RESERVATION, TABLE_CHAMBRE, TABLE_TYPE_CHAMBRE, TABLE_USAGER)
+
+class _NonModifie(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+@app.exception_handler(_NonModifie)
+async def _reponse_304(_request: Request, exc: _NonModifie):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": exc.etag})
+
+def _correspond(if_none_match: Optional[str], etag: str) -> bool:
+    # Comparaison faible (RFC 9110): le préfixe W/ ne compte pas.
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    cible = etag.removeprefix("W/")
+    return any(v.strip().removeprefix("W/") == cible for v in if_none_match.split(","))
+
+def _conditionnel(*tables: str):
+    """Dépendance de route: ETag = versions des tables + URL + Accept. Une seule
+    petite requête; 304 avant que la route ne lise quoi que ce soit."""
+    async def verifier(request: Request, response: Response) -> None:
+        versions = await lireVersionsAsync(tables)
+        etag = etag_versions(versions, f"{request.url.path}?{request.url.query}|{request.headers.get('accept', '')}")
+        if _correspond(request.headers.get("if-none-match"), etag):
+            raise _NonModifie(etag)
+        response.headers["ETag"] = etag
+        # Le client peut garder la réponse, mais doit revalider à chaque fois.
+        response.headers["Cache-Control"] = "no-cache"
+    return [Depends(verifier)]
+
 # ------------------- Utilitaires -------------------
 @app.get("/", summary="Statut de l'API")
-def root():
+async def root():
     # Petit endpoint santé (simple).
     return {"status": "ok", "docs": "/docs"}
 
 @app.get("/health", summary="Vérification de santé")
-def health():
+async def health():
     # Un autre ping santé si jamais pour monitoring.
     return {"status": "ok"}
 
+@app.get("/metrics", summary="Métriques Prometheus", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(rendre_metriques(engines_actifs()), media_type=TYPE_METRIQUES)
+
+@app.get("/debug/memoire", summary="Photo mémoire (tracemalloc)", include_in_schema=False)
+async def debug_memoire(
+    request: Request,
+    top: int = Query(20, ge=1, le=200),
+    reference: bool = Query(False, description="Garder cette photo comme référence des prochains diff"),
+):
+    # Protégée: 404 (pas 401) pour ne pas révéler la route si le jeton manque.
+    if not MEMOIRE_ACTIVE or not jeton_valide(request.headers.get("x-debug-jeton")):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return rapport_memoire(top, reference)
+
 # ===================================================
 #                ROUTES - CHAMBRES
 # ===================================================
+# Déclarée avant /chambres/{no_chambre}, sinon "disponibles" serait lu comme un numéro.
+@app.get(
+    "/chambres/disponibles",
+    response_model=list[ChambreDTO],
+    dependencies=_conditionnel(TABLE_RESERVATION, *TABLES_CHAMBRES),
+    summary="Chambres disponibles sur une période",
+    description=("Chambres réservables (disponible_reservation) sans réservation qui chevauche "
+                 "[debut, fin[. Filtre optionnel par nom_type."),
+)
+async def api_chambres_disponibles(debut: datetime, fin: datetime, nom_type: Optional[str] = None):
+    try:
+        return await listerChambresDisponiblesAsync(debut, fin, nom_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get(
     "/chambres/{no_chambre}",
     response_model=ChambreDTO,
+    dependencies=_conditionnel(*TABLES_CHAMBRES),
     summary="Obtenir une chambre par numéro",
     description="Retourne les infos complètes d'une chambre selon son numéro (ex.: 101).",
 )
-def api_get_chambre(no_chambre: int):
-    ch = getChambreParNumero(no_chambre)
+async def api_get_chambre(no_chambre: int):
+    ch = await getChambreParNumeroAsync(no_chambre)
     if not ch:
         raise HTTPException(status_code=404, detail=f"Chambre {no_chambre} non trouvée.")
     return ch
 
 @app.get(
     "/chambres",
-    response_model=list[ChambreDTO],
+    response_model=PageDTO[ChambreDTO],
+    dependencies=_conditionnel(*TABLES_CHAMBRES),
     summary="Lister les chambres",
-    description="Retourne la liste de toutes les chambres (tri simple par numéro).",
+    description="Retourne une page de chambres (tri par numéro). Suivre next_cursor pour la suite. "
+                "fields/expand: seulement les champs voulus (colonnes et jointures réduites en SQL).",
 )
-def api_lister_chambres():
-    return listerChambres()
+async def api_lister_chambres(
+    request: Request,
+    response: Response,
+    limit: int = _limit_query(),
+    cursor: Optional[str] = _cursor_query(),
+    stream: bool = _stream_query(),
+    fields: Optional[str] = _fields_query(),
+    expand: Optional[str] = _expand_query("type_chambre"),
+):
+    try:
+        proj = lire_projection(PROJ_CHAMBRE, fields, expand)
+        if _veut_flux(request, stream):
+            return _reponse_ndjson(iterChambresAsync(proj=proj))
+        page = await listerChambresPageAsync(limit, cursor, proj)
+        return page if proj is None else _reponse_partielle(page, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get(
     "/chambres/id/{id_chambre}",
     response_model=ChambreDTO,
+    dependencies=_conditionnel(*TABLES_CHAMBRES),
     summary="Rechercher une chambre par ID",
     description="Retourne une chambre selon son identifiant (UUID).",
 )
-def api_rechercher_chambre_par_id(id_chambre: str):
-    ch = rechercherChambreParId(id_chambre)
+async def api_rechercher_chambre_par_id(id_chambre: str):
+    ch = await rechercherChambreParIdAsync(id_chambre)
     if not ch:
         raise HTTPException(status_code=404, detail="Chambre introuvable.")
     return ch
@@ -147,9 +387,9 @@ def api_rechercher_chambre_par_id(id_chambre: str):
     summary="Créer une chambre",
     description="Ajoute une chambre en liant un type existant via son nom (nom_type).",
 )
-def api_creer_chambre(body: ChambreCreateDTO):
+async def api_creer_chambre(body: ChambreCreateDTO):
     try:
-        return creerChambre(body)
+        return await creerChambreAsync(body)
     except ValueError as e:
         # Transforme en 400 côté client avec le message métier.
         raise HTTPException(status_code=400, detail=str(e))
@@ -160,9 +400,9 @@ def api_creer_chambre(body: ChambreCreateDTO):
     summary="Modifier une chambre",
     description="Modifie partiellement (numéro, dispo, infos, type via nom).",
 )
-def api_modifier_chambre(id_chambre: str, body: ChambreUpdateDTO):
+async def api_modifier_chambre(id_chambre: str, body: ChambreUpdateDTO):
     try:
-        return modifierChambre(id_chambre, body)
+        return await modifierChambreAsync(id_chambre, body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -172,9 +412,9 @@ def api_modifier_chambre(id_chambre: str, body: ChambreUpdateDTO):
     summary="Supprimer une chambre",
     description="Supprime une chambre (échec si des réservations y sont rattachées).",
 )
-def api_supprimer_chambre(id_chambre: str):
+async def api_supprimer_chambre(id_chambre: str):
     try:
-        ok = supprimerChambre(id_chambre)
+        ok = await supprimerChambreAsync(id_chambre)
         if not ok:
             raise HTTPException(status_code=404, detail="Chambre introuvable.")
         return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -186,21 +426,26 @@ def api_supprimer_chambre(id_chambre: str):
 # ===================================================
 @app.get(
     "/typesChambre",
-    response_model=list[TypeChambreDTO],
+    response_model=PageDTO[TypeChambreDTO],
+    dependencies=_conditionnel(*TABLES_TYPES),
     summary="Lister les types de chambre",
-    description="Retourne la liste des types de chambre (simple, double, etc.).",
+    description="Retourne une page de types de chambre (simple, double, etc.), triés par nom.",
 )
-def api_lister_types_chambre():
-    return listerTypesChambre()
+async def api_lister_types_chambre(limit: int = _limit_query(), cursor: Optional[str] = _cursor_query()):
+    try:
+        return await listerTypesChambrePageAsync(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get(
     "/typeChambre/{id_type_chambre}",
     response_model=TypeChambreDTO,
+    dependencies=_conditionnel(*TABLES_TYPES),
     summary="Obtenir un type de chambre par ID",
     description="Retourne un type de chambre selon son identifiant (UUID).",
 )
-def api_get_type_chambre_by_id(id_type_chambre: str):
-    tc = getTypeChambreParId(id_type_chambre)
+async def api_get_type_chambre_by_id(id_type_chambre: str):
+    tc = await getTypeChambreParIdAsync(id_type_chambre)
     if not tc:
         raise HTTPException(status_code=404, detail="Type de chambre introuvable.")
     return tc
@@ -211,8 +456,8 @@ def api_get_type_chambre_by_id(id_type_chambre: str):
     summary="Créer un type de chambre",
     description="Ajoute un nouveau type (nom, prix plancher/plafond, description).",
 )
-def api_creer_type_chambre(body: TypeChambreCreateDTO):
-    return creerTypeChambre(body)
+async def api_creer_type_chambre(body: TypeChambreCreateDTO):
+    return await creerTypeChambreAsync(body)
 
 @app.put(
     "/typeChambre/{id_type_chambre}",
@@ -220,9 +465,9 @@ def api_creer_type_chambre(body: TypeChambreCreateDTO):
     summary="Modifier un type de chambre",
     description="Modifie nom/prix/description du type de chambre.",
 )
-def api_modifier_type_chambre(id_type_chambre: str, body: TypeChambreUpdateDTO):
+async def api_modifier_type_chambre(id_type_chambre: str, body: TypeChambreUpdateDTO):
     try:
-        return modifierTypeChambre(id_type_chambre, body)
+        return await modifierTypeChambreAsync(id_type_chambre, body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -232,9 +477,9 @@ def api_modifier_type_chambre(id_type_chambre: str, body: TypeChambreUpdateDTO):
     summary="Supprimer un type de chambre",
     description="Échoue si des chambres dépendent encore de ce type.",
 )
-def api_supprimer_type_chambre(id_type_chambre: str):
+async def api_supprimer_type_chambre(id_type_chambre: str):
     try:
-        ok = supprimerTypeChambre(id_type_chambre)
+        ok = await supprimerTypeChambreAsync(id_type_chambre)
         if not ok:
             raise HTTPException(status_code=404, detail="Type de chambre introuvable.")
         return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -246,21 +491,39 @@ def api_supprimer_type_chambre(id_type_chambre: str):
 # ===================================================
 @app.get(
     "/reservations",
-    response_model=list[ReservationDTO],
+    response_model=PageDTO[ReservationDTO],
+    dependencies=_conditionnel(*TABLES_RESERVATIONS),
     summary="Lister les réservations",
-    description="Retourne la liste de toutes les réservations (tri par date de début).",
+    description="Retourne une page de réservations (tri par date de début). Suivre next_cursor pour la suite. "
+                "fields/expand: seulement les champs voulus (colonnes et jointures réduites en SQL).",
 )
-def api_lister_reservations():
-    return listerReservations()
+async def api_lister_reservations(
+    request: Request,
+    response: Response,
+    limit: int = _limit_query(),
+    cursor: Optional[str] = _cursor_query(),
+    stream: bool = _stream_query(),
+    fields: Optional[str] = _fields_query(),
+    expand: Optional[str] = _expand_query("chambre,usager,chambre.type_chambre"),
+):
+    try:
+        proj = lire_projection(PROJ_RESERVATION, fields, expand)
+        if _veut_flux(request, stream):
+            return _reponse_ndjson(iterReservationsAsync(proj=proj))
+        page = await listerReservationsPageAsync(limit, cursor, proj)
+        return page if proj is None else _reponse_partielle(page, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get(
     "/reservations/{id_reservation}",
     response_model=ReservationDTO,
+    dependencies=_conditionnel(*TABLES_RESERVATIONS),
     summary="Obtenir une réservation par ID",
     description="Retourne une réservation selon son identifiant (UUID).",
 )
-def api_get_reservation_by_id(id_reservation: str):
-    r = getReservationParId(id_reservation)
+async def api_get_reservation_by_id(id_reservation: str):
+    r = await getReservationParIdAsync(id_reservation)
     if not r:
         raise HTTPException(status_code=404, detail="Réservation introuvable.")
     return r
@@ -273,9 +536,25 @@ def api_get_reservation_by_id(id_reservation: str):
     description=("Body minimal: idUsager, idChambre, dateDebut, dateFin, "
                  "prixParJour, infoReservation (optionnel). Réponse: DTO complet."),
 )
-def api_creer_reservation_simple(body: ReservationCreateDTO):
+async def api_creer_reservation_simple(body: ReservationCreateDTO):
+    try:
+        return await creerReservationAvecIdsAsync(body)
+    except ConflitReservation as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post(
+    "/reservations/batch",
+    response_model=LotReservationsDTO,
+    summary="Créer des réservations en lot",
+    description=("Liste de payloads minimaux (comme POST /reservations), créés en une transaction. "
+                 "Réponse: un résultat par élément, même ordre (statut 201, 400 ou 409). "
+                 "Les éléments en erreur n'empêchent pas les autres d'être créés."),
+)
+async def api_creer_reservations_lot(body: list[ReservationCreateDTO]):
     try:
-        return creerReservationAvecIds(body)
+        return await creerReservationsLotAsync(body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -285,9 +564,11 @@ def api_creer_reservation_simple(body: ReservationCreateDTO):
     summary="Modifier une réservation",
     description="Modifie partiellement une réservation (dates, prix, chambre/usager, infos).",
 )
-def api_modifier_reservation(id_reservation: str, body: ReservationUpdateDTO):
+async def api_modifier_reservation(id_reservation: str, body: ReservationUpdateDTO):
     try:
-        return modifierReservation(id_reservation, body)
+        return await modifierReservationAsync(id_reservation, body)
+    except ConflitReservation as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -297,23 +578,169 @@ def api_modifier_reservation(id_reservation: str, body: ReservationUpdateDTO):
     summary="Supprimer une réservation",
     description="Supprime une réservation existante.",
 )
-def api_supprimer_reservation(id_reservation: str):
-    ok = supprimerReservation(id_reservation)
+async def api_supprimer_reservation(id_reservation: str):
+    ok = await supprimerReservationAsync(id_reservation)
     if not ok:
         raise HTTPException(status_code=404, detail="Réservation introuvable.")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+# ===================================================
+#               ROUTES - CALENDRIER
+# ===================================================
+@app.get(
+    "/calendrier",
+    response_model=CalendrierDTO,
+    summary="Grille d'occupation chambres × nuits",
+    description=("Occupation de chaque chambre pour les `jours` nuits à partir de `debut`. "
+                 "format=rle (plages [nuit, longueur]), bitset (base64) ou binaire "
+                 "(application/octet-stream, ceil(jours/8) octets par chambre; "
+                 "numéros de chambre dans l'en-tête X-Calendrier-Chambres)."),
+)
+async def api_calendrier(
+    debut: Optional[date] = Query(None, description="Première nuit (défaut: aujourd'hui)."),
+    jours: int = Query(JOURS_DEFAUT, ge=1, le=JOURS_MAX, description="Nombre de nuits."),
+    format: Literal["rle", "bitset", "binaire"] = Query("rle", description="Encodage de la grille."),
+):
+    try:
+        cal = await calendrierOccupationAsync(debut or date.today(), jours)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "binaire":
+        return Response(
+            content=binaire(cal),
+            media_type="application/octet-stream",
+            headers={
+                "X-Calendrier-Debut": cal.debut.isoformat(),
+                "X-Calendrier-Jours": str(cal.jours),
+                "X-Calendrier-Chambres": ",".join(map(str, cal.numeros.tolist())),
+            },
+        )
+    valeurs = plages_rle(cal) if format == "rle" else bits_base64(cal)
+    cle = "occupe" if format == "rle" else "bits"
+    return CalendrierDTO(
+        debut=cal.debut,
+        jours=cal.jours,
+        format=format,
+        chambres=[
+            CalendrierChambreDTO(idChambre=id_ch, numero_chambre=no, disponible_reservation=dispo, **{cle: v})
+            for id_ch, no, dispo, v in zip(cal.ids, cal.numeros.tolist(), cal.disponibles.tolist(), valeurs)
+        ],
+    )
+
+# ===================================================
+#               ROUTES - ANALYTIQUE
+# ===================================================
+@app.get(
+    "/analytics/indicateurs",
+    response_model=list[IndicateurDTO],
+    summary="ADR, RevPAR et taux d'occupation",
+    description=("Indicateurs par période (jour, mois, annee ou total) et par type de chambre "
+                 "sur [debut, fin[, lus dans le résumé journalier (daily_summary)."),
+)
+async def api_indicateurs(
+    debut: date,
+    fin: date,
+    periode: Literal["jour", "mois", "annee", "total"] = "mois",
+    nom_type: Optional[str] = None,
+):
+    try:
+        return await indicateursAsync(debut, fin, periode, nom_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ===================================================
+#                 ROUTES - IMPORT
+# ===================================================
+# Le corps est copié au fil de l'eau dans un fichier temporaire (en mémoire
+# jusqu'à 8 Mo, sur disque au-delà), puis relu par lots: mémoire constante.
+_SPOOL_MAX = 8 * 1024 * 1024
+
+def _format_import(request: Request, format: Optional[str]) -> str:
+    if format:
+        return format
+    return "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+
+@app.post(
+    "/import/{entite}",
+    response_model=RapportImportDTO,
+    summary="Import en masse (CSV ou JSONL)",
+    description=("Corps brut: CSV avec en-tête (text/csv) ou un objet JSON par ligne "
+                 "(application/x-ndjson). Champs = ceux des DTO de création. Doublons ignorés "
+                 "(comptés dans existantes), enregistrements invalides listés dans le rapport."),
+)
+async def api_importer(
+    entite: Literal["usagers", "types", "chambres"],
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="Déduit du Content-Type si absent."),
+    lot: int = Query(TAILLE_LOT_IMPORT, ge=1, le=TAILLE_LOT_MAX, description="Enregistrements par transaction."),
+):
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX) as brut:
+        async for morceau in request.stream():
+            brut.write(morceau)
+        brut.seek(0)
+        texte = io.TextIOWrapper(brut, encoding="utf-8-sig", newline="")
+        try:
+            return await importerAsync(entite, lire(texte, _format_import(request, format)), lot)
+        except ValueError as e:   # inclut UnicodeDecodeError, CSV illisible
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            texte.detach()
+
+# ===================================================
+#                 ROUTES - EXPORT
+# ===================================================
+@app.get(
+    "/export/{entite}",
+    summary="Export en flux (CSV ou Parquet)",
+    description=("Lignes plates (jointures faites: usager, chambre, type) lues par curseur serveur. "
+                 "debut/fin (réservations seulement): séjours qui chevauchent [debut, fin[. "
+                 "Parquet: un row group par lot (pyarrow requis côté serveur)."),
+    response_class=StreamingResponse,
+)
+async def api_exporter(
+    entite: Literal["reservations", "usagers", "chambres"],
+    format: Literal["csv", "parquet"] = "csv",
+    debut: Optional[datetime] = None,
+    fin: Optional[datetime] = None,
+    lot: int = Query(TAILLE_LOT_EXPORT, ge=1, le=100_000, description="Lignes par lot / row group."),
+):
+    # Validé avant le flux: une erreur après les premiers octets ne peut plus devenir un 400.
+    try:
+        requete(entite, debut, fin)
+        verifier_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    nom = f"{entite}.{'csv' if format == 'csv' else 'parquet'}"
+    return StreamingResponse(
+        exporterAsync(entite, format, debut, fin, lot),
+        media_type=TYPES_MEDIA[format],
+        headers={"Content-Disposition": f'attachment; filename="{nom}"'},
+    )
+
 # ===================================================
 #                 ROUTES - USAGERS
 # ===================================================
 @app.get(
     "/usagers",
-    response_model=list[UsagerDTO],
+    response_model=PageDTO[UsagerDTO],
+    dependencies=_conditionnel(*TABLES_USAGERS),
     summary="Lister les usagers",
-    description="Retourne la liste de tous les usagers.",
+    description="Retourne une page d'usagers (tri nom, prénom). Suivre next_cursor pour la suite.",
 )
-def api_lister_usagers():
-    return listerUsagers()
+async def api_lister_usagers(
+    request: Request,
+    limit: int = _limit_query(),
+    cursor: Optional[str] = _cursor_query(),
+    stream: bool = _stream_query(),
+):
+    if _veut_flux(request, stream):
+        return _reponse_ndjson(iterUsagersAsync())
+    try:
+        return await listerUsagersPageAsync(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.post(
     "/usagers",
@@ -321,20 +748,21 @@ def api_lister_usagers():
     summary="Créer un usager",
     description="Ajoute un usager (petit dédoublonnage nom+prénom+mobile).",
 )
-def api_creer_usager(body: UsagerCreateDTO):
+async def api_creer_usager(body: UsagerCreateDTO):
     try:
-        return creerUsager(body)
+        return await creerUsagerAsync(body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get(
     "/usagers/{id_usager}",
     response_model=UsagerDTO,
+    dependencies=_conditionnel(*TABLES_USAGERS),
     summary="Obtenir un usager",
     description="Retourne un usager par son identifiant (UUID).",
 )
-def api_get_usager(id_usager: str):
-    u = getUsagerParId(id_usager)
+async def api_get_usager(id_usager: str):
+    u = await getUsagerParIdAsync(id_usager)
     if not u:
         raise HTTPException(status_code=404, detail="Usager introuvable.")
     return u
@@ -345,9 +773,9 @@ def api_get_usager(id_usager: str):
     summary="Modifier un usager",
     description="Modifie partiellement un usager (tous les champs sauf l'ID).",
 )
-def api_modifier_usager(id_usager: str, body: UsagerUpdateDTO):
+async def api_modifier_usager(id_usager: str, body: UsagerUpdateDTO):
     try:
-        return modifierUsager(id_usager, body)
+        return await modifierUsagerAsync(id_usager, body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -357,8 +785,8 @@ def api_modifier_usager(id_usager: str, body: UsagerUpdateDTO):
     summary="Supprimer un usager",
     description="Supprime un usager.",
 )
-def api_supprimer_usager(id_usager: str):
-    ok = supprimerUsager(id_usager)
+async def api_supprimer_usager(id_usager: str):
+    ok = await supprimerUsagerAsync(id_usager)
     if not ok:
         raise HTTPException(status_code=404, detail="Usager introuvable.")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,126 @@
+# metier/analytiqueMetier.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/analytiqueMetier.py
+# Rôle : indicateurs ADR / RevPAR / taux d'occupation par période et par type.
+# Points d’attention:
+#   - Lit daily_summary (tenu à jour par les écritures de réservation), jamais
+#     la table reservation: coût proportionnel aux jours × types demandés.
+#   - Période: jour, mois, annee ou total. total: SUM ... GROUP BY type en
+#     SQL. Sinon les lignes daily_summary, déjà au grain (jour, type) (sa PK),
+#     sont lues telles quelles puis regroupées par jour/mois/année en Python
+#     (pas de fonction de date SQL: portable MSSQL/SQLite).
+#   - Intervalle [debut, fin[ en jours (fin exclue).
+#   - Même patron sync/async que les autres services (_xxx(s, ...)).
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.db import SessionLocal, run_async
+from DTO.analytiqueDTO import IndicateurDTO
+from modele.chambre import Chambre
+from modele.resume_journalier import SANS_TYPE, ResumeJournalier
+from modele.type_chambre import TypeChambre
+
+PERIODES = ("jour", "mois", "annee", "total")
+NOM_SANS_TYPE = "(sans type)"
+
+def _etiquette(jour: date, periode: str) -> str:
+    if periode == "jour":
+        return jour.isoformat()
+    if periode == "mois":
+        return f"{jour.year:04d}-{jour.month:02d}"
+    if periode == "annee":
+        return f"{jour.year:04d}"
+    return "total"
+
+def _types(s: Session, nom_type: Optional[str]) -> Tuple[Dict[UUID, str], Dict[UUID, int]]:
+    """Noms des types suivis et nombre de chambres (inventaire actuel) par type."""
+    noms = {id_t: nom for id_t, nom in s.execute(select(TypeChambre.id_type_chambre, TypeChambre.nom_type))}
+    compte: Dict[UUID, int] = {
+        (id_t or SANS_TYPE): n
+        for id_t, n in s.execute(select(Chambre.fk_type_chambre, func.count()).group_by(Chambre.fk_type_chambre))
+    }
+    if compte.get(SANS_TYPE):
+        noms[SANS_TYPE] = NOM_SANS_TYPE
+    if nom_type is not None:
+        noms = {id_t: nom for id_t, nom in noms.items() if nom == nom_type}
+        if not noms:
+            raise ValueError(f"Type de chambre '{nom_type}' introuvable.")
+    return noms, compte
+
+def _indicateurs(s: Session, debut: date, fin: date, periode: str = "mois",
+                 nom_type: Optional[str] = None) -> List[IndicateurDTO]:
+    if periode not in PERIODES:
+        raise ValueError(f"periode doit être parmi {', '.join(PERIODES)}.")
+    if fin <= debut:
+        raise ValueError("fin doit être après debut.")
+    noms, compte = _types(s, nom_type)
+
+    # Jours de chaque période dans [debut, fin[ (dénominateur du RevPAR).
+    jours_par_periode: Dict[str, int] = defaultdict(int)
+    for i in range((fin - debut).days):
+        jours_par_periode[_etiquette(debut + timedelta(days=i), periode)] += 1
+
+    filtre = [
+        ResumeJournalier.jour >= debut,
+        ResumeJournalier.jour < fin,
+        ResumeJournalier.fk_type_chambre.in_(list(noms)),
+    ]
+    if periode == "total":
+        stmt = (
+            select(ResumeJournalier.fk_type_chambre,
+                   func.sum(ResumeJournalier.nuits_vendues), func.sum(ResumeJournalier.revenu))
+            .where(*filtre)
+            .group_by(ResumeJournalier.fk_type_chambre)
+        )
+        lignes = [("total", id_t, n, r) for id_t, n, r in s.execute(stmt)]
+    else:
+        stmt = (
+            select(ResumeJournalier.jour, ResumeJournalier.fk_type_chambre,
+                   ResumeJournalier.nuits_vendues, ResumeJournalier.revenu)
+            .where(*filtre)
+        )
+        lignes = [(_etiquette(j, periode), id_t, n, r) for j, id_t, n, r in s.execute(stmt)]
+
+    ventes: Dict[Tuple[str, UUID], List[float]] = defaultdict(lambda: [0, 0.0])
+    for etiquette, id_t, n, r in lignes:
+        v = ventes[(etiquette, id_t)]
+        v[0] += int(n or 0)
+        v[1] += float(r or 0)
+
+    resultat: List[IndicateurDTO] = []
+    for etiquette, nb_jours in jours_par_periode.items():
+        for id_t, nom in noms.items():
+            chambres = compte.get(id_t, 0)
+            vendues, revenu = ventes.get((etiquette, id_t), (0, 0.0))
+            if not chambres and not vendues:
+                continue
+            dispo = chambres * nb_jours
+            resultat.append(IndicateurDTO(
+                periode=etiquette,
+                nom_type=nom,
+                chambres=chambres,
+                nuits_vendues=vendues,
+                nuits_disponibles=dispo,
+                revenu=round(revenu, 2),
+                taux_occupation=round(vendues / dispo, 4) if dispo else 0.0,
+                adr=round(revenu / vendues, 2) if vendues else 0.0,
+                revpar=round(revenu / dispo, 2) if dispo else 0.0,
+            ))
+    resultat.sort(key=lambda i: (i.periode, i.nom_type))
+    return resultat
+
+def indicateurs(debut: date, fin: date, periode: str = "mois", nom_type: Optional[str] = None) -> List[IndicateurDTO]:
+    with SessionLocal() as s:
+        return _indicateurs(s, debut, fin, periode, nom_type)
+
+async def indicateursAsync(debut: date, fin: date, periode: str = "mois",
+                           nom_type: Optional[str] = None) -> List[IndicateurDTO]:
+    return await run_async(_indicateurs, debut, fin, periode, nom_type)
@@ -0,0 +1,136 @@
+# metier/calendrier.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/calendrier.py
+# Rôle : grille d'occupation chambres × nuits (réception), calculée en NumPy.
+# Idée:
+#   - Nuit k = nuit du jour debut + k. Une réservation occupe les nuits
+#     [date(début), date(fin)[ (au moins une nuit si même jour).
+#   - Une seule requête (réservations qui touchent la fenêtre), puis remplissage
+#     vectorisé: +1 au début, -1 à la fin (bincount), cumsum par ligne, > 0.
+#     Aucune boucle Python par réservation pour remplir les plages.
+#   - Encodages: RLE ([nuit, longueur] des plages occupées), bitset
+#     (packbits, base64, nuit 0 = bit de poids fort) ou binaire brut.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+from uuid import UUID
+import numpy as np
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.orm import Session
+
+from core.db import SessionLocal, run_async
+from metier.reservationMetier import chevauche
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+
+JOURS_DEFAUT = 90
+JOURS_MAX = 731
+
+@dataclass
+class Calendrier:
+    debut: date
+    jours: int
+    ids: List[UUID]
+    numeros: np.ndarray         # int, une entrée par chambre (ordre des lignes)
+    disponibles: np.ndarray     # bool, disponible_reservation
+    occupation: np.ndarray      # uint8 (chambres × jours), 1 = nuit occupée
+
+def _brut(col):
+    # Aucune conversion côté Python: str hex (SQLite) ou str/UUID selon le driver.
+    return type_coerce(col, String)
+
+def _uuid(v) -> UUID:
+    return v if isinstance(v, UUID) else UUID(str(v))
+
+def _jour(d) -> date:
+    return d.date() if isinstance(d, datetime) else d
+
+def _calendrier(s: Session, debut, jours: int = JOURS_DEFAUT) -> Calendrier:
+    if not 1 <= jours <= JOURS_MAX:
+        raise ValueError(f"jours doit être entre 1 et {JOURS_MAX}.")
+    debut = _jour(debut)
+    t0 = datetime.combine(debut, datetime.min.time())
+    t1 = t0 + timedelta(days=jours)
+
+    # IDs lus bruts (sans construire un UUID par réservation): ils ne servent
+    # qu'à retrouver la ligne de la chambre, des deux côtés avec le même format.
+    # Exécution Core (s.connection()): pas de traitement ORM par ligne.
+    conn = s.connection()
+    chambres = conn.execute(
+        select(_brut(Chambre.id_chambre), Chambre.numero_chambre, Chambre.disponible_reservation)
+        .order_by(Chambre.numero_chambre, Chambre.id_chambre)
+    ).all()
+    resas = conn.execute(
+        select(
+            _brut(Reservation.fk_id_chambre),
+            Reservation.date_debut_reservation,
+            Reservation.date_fin_reservation,
+        ).where(chevauche(t0, t1))
+    ).all()
+
+    n = len(chambres)
+    ids = [_uuid(c[0]) for c in chambres]
+    numeros = np.fromiter((c[1] for c in chambres), dtype=np.int32, count=n)
+    disponibles = np.fromiter((bool(c[2]) for c in chambres), dtype=bool, count=n)
+    occupation = np.zeros((n, jours), dtype=np.uint8)
+    ligne_de: Dict[Any, int] = {c[0]: i for i, c in enumerate(chambres)}
+    # Deux SELECT: une chambre créée (avec une résa) entre les deux n'a pas de
+    # ligne dans la grille; sa résa est ignorée, comme la chambre.
+    resas = [r for r in resas if r[0] in ligne_de]
+    if not resas:
+        return Calendrier(debut, jours, ids, numeros, disponibles, occupation)
+
+    m = len(resas)
+    ids_ch, debuts, fins = zip(*resas)
+    lignes = np.fromiter(map(ligne_de.__getitem__, ids_ch), dtype=np.int64, count=m)
+    # Numéro de jour (ordinal) -> indice de nuit relatif à debut.
+    origine = debut.toordinal()
+    d = np.fromiter(map(date.toordinal, debuts), dtype=np.int64, count=m) - origine
+    f = np.fromiter(map(date.toordinal, fins), dtype=np.int64, count=m) - origine
+    f = np.maximum(f, d + 1)
+    d = np.clip(d, 0, jours)
+    f = np.clip(f, 0, jours)
+
+    # Tableau de différences (n × jours+1) aplati: +1 au début, -1 à la fin.
+    largeur = jours + 1
+    taille = n * largeur
+    diff = (np.bincount(lignes * largeur + d, minlength=taille)
+            - np.bincount(lignes * largeur + f, minlength=taille)).reshape(n, largeur)
+    occupation = (np.cumsum(diff[:, :jours], axis=1) > 0).astype(np.uint8)
+    return Calendrier(debut, jours, ids, numeros, disponibles, occupation)
+
+def calendrierOccupation(debut, jours: int = JOURS_DEFAUT) -> Calendrier:
+    with SessionLocal() as session:
+        return _calendrier(session, debut, jours)
+
+async def calendrierOccupationAsync(debut, jours: int = JOURS_DEFAUT) -> Calendrier:
+    return await run_async(_calendrier, debut, jours)
+
+# ------------------------------- encodages -------------------------------
+def plages_rle(cal: Calendrier) -> List[List[List[int]]]:
+    """Par chambre: [[nuit, longueur], ...] des plages occupées."""
+    n, jours = cal.occupation.shape
+    bord = np.zeros((n, jours + 2), dtype=np.int8)
+    bord[:, 1:-1] = cal.occupation
+    delta = np.diff(bord, axis=1)
+    # nonzero parcourt en ordre ligne par ligne: débuts et fins s'apparient.
+    lignes, debuts = np.nonzero(delta == 1)
+    _, fins = np.nonzero(delta == -1)
+    coupures = np.searchsorted(lignes, np.arange(1, n))
+    paires = np.stack([debuts, fins - debuts], axis=1).tolist()
+    bornes = [0, *coupures.tolist(), len(paires)]
+    return [paires[bornes[i]:bornes[i + 1]] for i in range(n)]
+
+def bits_base64(cal: Calendrier) -> List[str]:
+    """Par chambre: bitset packbits (nuit 0 = bit de poids fort) en base64."""
+    paquets = np.packbits(cal.occupation, axis=1)
+    return [base64.b64encode(ligne.tobytes()).decode("ascii") for ligne in paquets]
+
+def binaire(cal: Calendrier) -> bytes:
+    """Matrice packbits brute: ceil(jours/8) octets par chambre, lignes dans l'ordre."""
+    return np.packbits(cal.occupation, axis=1).tobytes()
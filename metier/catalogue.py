@@ -0,0 +1,113 @@
+# metier/catalogue.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/catalogue.py
+# Rôle : catalogue en mémoire des types de chambre (par id et par nom_type).
+# Idée:
+#   - La table est minuscule et ne bouge presque jamais, mais chaque liste de
+#     chambres, chaque création/modif de chambre (résolution du nom_type) et
+#     chaque GET de type allait en BD. Ici: un instantané de TypeChambreDTO,
+#     chargé au démarrage de l'API, remplacé en bloc à chaque rechargement.
+#   - Écritures (creer/modifier/supprimerTypeChambre, import de types):
+#     publier() après commit => version +1 (compteur_modification) puis
+#     rechargement local. Les autres workers voient la version changer au
+#     prochain contrôle (au plus intervalle_controle) et rechargent.
+#   - Lecture « read-through »: un id ou un nom absent déclenche un contrôle
+#     de version forcé (un type créé par un autre worker il y a < 1 s).
+#   - Ordre = celui de la BD (ORDER BY COLONNES_TRI au chargement), jamais un
+#     tri Python: collation (insensible à la casse sous MSSQL) et ordre natif
+#     des id ne se reproduisent pas avec str. Page suivante: rang de la ligne
+#     du curseur; ligne absente ou renommée => apres() rend None, l'appelant
+#     pagine en SQL. Un curseur vaut donc la même chose sur les deux chemins.
+#   - Les DTO servis sont partagés: ne pas les modifier.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from DTO.chambreDTO import TypeChambreDTO
+from metier.chargement import options_type_chambre
+from metier.versions import CacheVersionne, incrementer_version
+from modele.type_chambre import TypeChambre
+
+TABLE = "type_chambre"
+
+def _uuid(v) -> UUID:
+    return v if isinstance(v, UUID) else UUID(str(v))
+
+# Clé keyset des types, partagée avec la pagination SQL (chambreMetier).
+COLONNES_TRI = (TypeChambre.nom_type, TypeChambre.id_type_chambre)
+
+class CatalogueTypes(CacheVersionne):
+    def __init__(self, intervalle_controle: float = 1.0, ttl: float = 300.0):
+        super().__init__(TABLE, intervalle_controle, ttl)
+        self._tries: List[TypeChambreDTO] = []
+        self._par_id: Dict[UUID, TypeChambreDTO] = {}
+        self._par_nom: Dict[str, TypeChambreDTO] = {}
+        self._rang: Dict[UUID, int] = {}
+
+    # ------------------------------ chargement ------------------------------
+    def _lire(self, s: Session) -> List[TypeChambreDTO]:
+        rows = s.execute(
+            select(TypeChambre).options(*options_type_chambre()).order_by(*COLONNES_TRI)
+        ).scalars().all()
+        return [TypeChambreDTO.from_entity(t) for t in rows]
+
+    def _installer(self, tries: List[TypeChambreDTO]) -> None:
+        self._tries = tries
+        self._par_id = {t.idTypeChambre: t for t in tries}
+        self._par_nom = {t.nom_type: t for t in tries}
+        self._rang = {t.idTypeChambre: i for i, t in enumerate(tries)}
+
+    def _vider(self) -> None:
+        self._installer([])
+
+    def publier(self, s: Session) -> None:
+        """Après le commit d'une écriture sur type_chambre (pas de commit métier ici)."""
+        incrementer_version(s, TABLE)
+        if self.actif:
+            self.charger(s)
+
+    # ------------------------------- lectures ------------------------------
+    def lister(self) -> List[TypeChambreDTO]:
+        """Tous les types, dans l'ordre SQL de (nom_type, id)."""
+        return list(self._tries)
+
+    def apres(self, valeurs: Sequence | None, limit: int) -> Optional[List[TypeChambreDTO]]:
+        """Au plus limit types strictement après la clé valeurs (keyset).
+        None si la ligne du curseur n'est plus telle quelle: paginer en SQL."""
+        tries = self._tries
+        if valeurs is None:
+            return tries[:limit]
+        try:
+            i = self._rang.get(_uuid(valeurs[1]))
+        except (TypeError, ValueError):
+            return None
+        if i is None or tries[i].nom_type != valeurs[0]:
+            return None
+        return tries[i + 1:i + 1 + limit]
+
+    def par_id(self, id_type, s: Session | None = None) -> Optional[TypeChambreDTO]:
+        id_type = _uuid(id_type)
+        t = self._par_id.get(id_type)
+        if t is None and self.actif:
+            self.synchroniser(s, forcer=True)
+            t = self._par_id.get(id_type)
+        return t
+
+    def par_nom(self, nom_type: str, s: Session | None = None) -> Optional[TypeChambreDTO]:
+        t = self._par_nom.get(nom_type)
+        if t is None and self.actif:
+            self.synchroniser(s, forcer=True)
+            t = self._par_nom.get(nom_type)
+        return t
+
+# Instance du process (un catalogue par worker).
+catalogue_types = CatalogueTypes(
+    intervalle_controle=float(os.getenv("HOTEL_CATALOGUE_CONTROLE_S", "1.0")),
+    ttl=float(os.getenv("HOTEL_CATALOGUE_TTL_S", "300")),
+)
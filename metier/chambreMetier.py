@@ -3,21 +3,38 @@
 # Fichier: metier/chambreMetier.py
 # Rôle : logique métier pour TypeChambre et Chambre (CRUD + validations).
 # Points d’attention:
-#   - _ensure_plafond_ok: s’assure que prix_plafond est numérique (string) et
+#   - verifier_plafond: s’assure que prix_plafond est numérique (string) et
 #     >= prix_plancher si fourni. Ça respecte le modèle (plafond en NCHAR(10)).
+#     Public: l'import en masse (metier/importation.py) fait la même vérif.
 #   - On relie Chambre -> TypeChambre par nom_type pour la création/maj (simple).
 #   - Gestion d’erreurs ValueError pour renvoyer 400 côté API.
+#   - Chaque service a son corps dans _xxx(session, ...); la version publique
+#     sync ouvre une SessionLocal, la version *Async passe par run_async()
+#     (AsyncSession + run_sync), donc même logique pour les deux.
+#   - Catalogue des types en mémoire (metier/catalogue.py) quand il est chargé:
+#     types listés/lus sans SQL, nom_type résolu sans SQL, et les chambres
+#     sont lues sans jointure sur type_chambre (type pris au catalogue).
+#     Chaque écriture sur un type appelle catalogue_types.publier().
+#   - Écriture sur une chambre: version "chambre" +1 après commit (ETag des GET).
+#   - Index uniques (core/migrations.py): nom_type et numero_chambre. Une
+#     violation (doublon, course entre deux requêtes) devient un ValueError.
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
 
 from decimal import Decimal, InvalidOperation
-from typing import List
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.exc import IntegrityError
 
-from core.db import SessionLocal
+from core.db import SessionLocal, run_async
+from metier.chargement import charger, options_chambre, options_type_chambre, recharger
+from metier.pagination import LIMITE_DEFAUT, couper_page, decoder_curseur, encoder_curseur, paginer, valider_limite
+from metier.flux import TAILLE_LOT, iterer, iterer_async
+from metier.projection import Projection, options_projection, vers_dict
+from DTO.pageDTO import PageDTO
 from DTO.chambreDTO import (
     ChambreDTO,
     TypeChambreDTO,
@@ -27,10 +44,18 @@ from DTO.chambreDTO import (
     ChambreUpdateDTO,
     TypeChambreSearchDTO,
 )
+from metier.reservationMetier import chevauche, naive, verrouiller_chambre, verrouiller_chambres
+from metier.catalogue import COLONNES_TRI, catalogue_types
+from metier.occupation import index_occupation
+from metier.resume import deplacer_chambre, retirer_type
+from metier.versions import incrementer_version
 from modele.chambre import Chambre
+from modele.reservation import Reservation
 from modele.type_chambre import TypeChambre
 
-def _ensure_plafond_ok(plancher: float | None, plafond_str: str | None) -> None:
+TABLE_CHAMBRE = "chambre"
+
+def verifier_plafond(plancher: float | None, plafond_str: str | None) -> None:
     """Si prix_plafond (string) est fourni, vérifier que c'est numérique
     et, si prix_plancher est fourni, que plafond >= plancher."""
     # Ici je tolère None (pas de plafond), sinon je parse avec Decimal (plus strict).
@@ -46,183 +71,498 @@ def _ensure_plafond_ok(plancher: float | None, plafond_str: str | None) -> None:
         if plafond < plancher_dec:
             raise ValueError("Le prix plafond doit être supérieur ou égal au prix plancher.")
 
+# ------------------------- catalogue des types -------------------------
+def _avec_catalogue(session: Session) -> bool:
+    # Décidé une fois par appel: les options de requête et la construction
+    # des DTO doivent suivre le même chemin.
+    catalogue_types.synchroniser(session)
+    return catalogue_types.actif
+
+def _options_chambres(avec_catalogue: bool) -> list:
+    # Type pris au catalogue => pas de jointure; raiseload garantit qu'aucun
+    # lazy load ne part en cachette.
+    return [raiseload("*")] if avec_catalogue else options_chambre()
+
+def _chambre_dto(session: Session, ch: Chambre, avec_catalogue: bool) -> ChambreDTO:
+    if not avec_catalogue:
+        return ChambreDTO.from_entity(ch)
+    tc = catalogue_types.par_id(ch.fk_type_chambre, session) if ch.fk_type_chambre else None
+    return ChambreDTO.avec_type(ch, tc)
+
+# ?fields=/?expand= (metier/projection.py). Type étendu pris au catalogue quand
+# il est actif: on lit seulement la FK, pas de jointure.
+def _options_chambres_projetees(proj: Projection, avec_catalogue: bool) -> list:
+    if avec_catalogue and "type_chambre" in proj.relations:
+        return options_projection(proj.sans("type_chambre"), _CLE_CHAMBRES + (Chambre.fk_type_chambre,))
+    return options_projection(proj, _CLE_CHAMBRES)
+
+def _chambre_dict(session: Session, ch: Chambre, proj: Projection, avec_catalogue: bool) -> dict:
+    sous = proj.relations.get("type_chambre")
+    if not (avec_catalogue and sous):
+        return vers_dict(ch, proj)
+    d = vers_dict(ch, proj.sans("type_chambre"))
+    tc = catalogue_types.par_id(ch.fk_type_chambre, session) if ch.fk_type_chambre else None
+    d["type_chambre"] = tc.model_dump(include=set(sous.champs)) if tc else None
+    return d
+
+def _type_par_nom(session: Session, nom_type: str, avec_catalogue: bool):
+    """(id du type, TypeChambreDTO ou entité) pour nom_type, ValueError si absent."""
+    if avec_catalogue:
+        tc = catalogue_types.par_nom(nom_type, session)
+        id_type = tc.idTypeChambre if tc else None
+    else:
+        tc = session.execute(
+            select(TypeChambre).where(TypeChambre.nom_type == nom_type)
+        ).scalar_one_or_none()
+        id_type = tc.id_type_chambre if tc else None
+    if tc is None:
+        raise ValueError(f"Type de chambre '{nom_type}' introuvable.")
+    return id_type, tc
+
+def _erreur_integrite_chambre(session: Session, numero: int | None, id_chambre=None) -> ValueError:
+    # Après rollback: numéro déjà pris (index unique) ou FK vers un type
+    # supprimé par un autre worker (catalogue pas encore à jour).
+    if numero is not None:
+        stmt = select(Chambre.id_chambre).where(Chambre.numero_chambre == numero)
+        if id_chambre is not None:
+            stmt = stmt.where(Chambre.id_chambre != id_chambre)
+        if session.execute(stmt).first() is not None:
+            return ValueError(f"La chambre {numero} existe déjà.")
+    catalogue_types.synchroniser(session, forcer=True)
+    return ValueError("Type de chambre introuvable (supprimé entre-temps).")
+
+def _enregistrer_chambre(session: Session, ch: Chambre, numero: int | None, id_chambre=None) -> ChambreDTO:
+    # Chemin catalogue: aucun SELECT. DTO bâti après le flush (id connu,
+    # attributs pas encore expirés par le commit), type pris au catalogue.
+    try:
+        session.flush()
+        dto = _chambre_dto(session, ch, True)
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise _erreur_integrite_chambre(session, numero, id_chambre)
+    incrementer_version(session, TABLE_CHAMBRE)
+    return dto
+
 # ----------------------------- CREATE -----------------------------
-def creerTypeChambre(data: TypeChambreCreateDTO) -> TypeChambreDTO:
+def _creerTypeChambre(session: Session, data: TypeChambreCreateDTO) -> TypeChambreDTO:
     # Je vérifie si le nom existe déjà pour éviter doublon plate.
-    with SessionLocal() as session:
+    if _avec_catalogue(session):
+        deja = catalogue_types.par_nom(data.nom_type, session)
+        if deja:
+            return deja
+    exists = session.execute(
+        select(TypeChambre).where(TypeChambre.nom_type == data.nom_type)
+    ).scalar_one_or_none()
+    if exists:
+        return TypeChambreDTO.from_entity(exists)
+
+    # Valide le plafond (string) vs plancher (float).
+    verifier_plafond(data.prix_plancher, data.prix_plafond)
+
+    # Création, commit, refresh pour récupérer l’ID.
+    new_tc = TypeChambre(
+        nom_type=data.nom_type,
+        prix_plancher=data.prix_plancher,       # modèle: float (MONEY)
+        prix_plafond=data.prix_plafond,         # modèle: str (NCHAR(10))
+        description_chambre=data.description_chambre,
+    )
+    session.add(new_tc)
+    try:
+        session.commit()
+    except IntegrityError:
+        # Créé au même moment par une autre requête (index unique sur nom_type).
+        session.rollback()
         exists = session.execute(
             select(TypeChambre).where(TypeChambre.nom_type == data.nom_type)
         ).scalar_one_or_none()
-        if exists:
-            return TypeChambreDTO(exists)
-
-        # Valide le plafond (string) vs plancher (float).
-        _ensure_plafond_ok(data.prix_plancher, data.prix_plafond)
-
-        # Création, commit, refresh pour récupérer l’ID.
-        new_tc = TypeChambre(
-            nom_type=data.nom_type,
-            prix_plancher=data.prix_plancher,       # modèle: float (MONEY)
-            prix_plafond=data.prix_plafond,         # modèle: str (NCHAR(10))
-            description_chambre=data.description_chambre,
-        )
-        session.add(new_tc)
-        session.commit()
-        session.refresh(new_tc)
-        return TypeChambreDTO(new_tc)
+        if exists is None:
+            raise
+        return TypeChambreDTO.from_entity(exists)
+    session.refresh(new_tc)
+    dto = TypeChambreDTO.from_entity(new_tc)
+    catalogue_types.publier(session)
+    return dto
 
-def creerChambre(data: ChambreCreateDTO) -> ChambreDTO:
-    with SessionLocal() as session:
-        # On resolve le type par son nom pour lier proprement (FK).
-        tc = session.execute(
-            select(TypeChambre).where(TypeChambre.nom_type == data.nom_type)
-        ).scalar_one_or_none()
-        if tc is None:
-            raise ValueError(f"Type de chambre '{data.nom_type}' introuvable.")
+def _creerChambre(session: Session, data: ChambreCreateDTO) -> ChambreDTO:
+    # On resolve le type par son nom pour lier proprement (FK).
+    avec_cat = _avec_catalogue(session)
+    id_type, tc = _type_par_nom(session, data.nom_type, avec_cat)
 
+    if avec_cat:
         ch = Chambre(
             numero_chambre=data.numero_chambre,
             disponible_reservation=data.disponible_reservation,
             autre_informations=data.autre_informations,
-            type_chambre=tc,
+            fk_type_chambre=id_type,
         )
         session.add(ch)
+        return _enregistrer_chambre(session, ch, data.numero_chambre)
+
+    ch = Chambre(
+        numero_chambre=data.numero_chambre,
+        disponible_reservation=data.disponible_reservation,
+        autre_informations=data.autre_informations,
+        type_chambre=tc,
+    )
+    session.add(ch)
+    try:
         session.commit()
-        session.refresh(ch)
-        return ChambreDTO(ch)
+    except IntegrityError:
+        session.rollback()
+        raise _erreur_integrite_chambre(session, data.numero_chambre)
+    # Relit chambre + type en une requête (au lieu de refresh + lazy load).
+    dto = ChambreDTO.from_entity(recharger(session, Chambre, ch.id_chambre))
+    incrementer_version(session, TABLE_CHAMBRE)
+    return dto
+
+def creerTypeChambre(data: TypeChambreCreateDTO) -> TypeChambreDTO:
+    with SessionLocal() as session:
+        return _creerTypeChambre(session, data)
+
+def creerChambre(data: ChambreCreateDTO) -> ChambreDTO:
+    with SessionLocal() as session:
+        return _creerChambre(session, data)
+
+async def creerTypeChambreAsync(data: TypeChambreCreateDTO) -> TypeChambreDTO:
+    return await run_async(_creerTypeChambre, data)
+
+async def creerChambreAsync(data: ChambreCreateDTO) -> ChambreDTO:
+    return await run_async(_creerChambre, data)
 
 # --------------------------- READ / LIST ---------------------------
-def getChambreParNumero(no_chambre: int) -> ChambreDTO | None:
+def _getChambreParNumero(session: Session, no_chambre: int) -> ChambreDTO | None:
     # Recherche par numero_chambre (ex.: 101).
+    avec_cat = _avec_catalogue(session)
+    ch = session.execute(
+        select(Chambre)
+        .options(*_options_chambres(avec_cat))
+        .where(Chambre.numero_chambre == no_chambre)
+    ).scalar_one_or_none()
+    return _chambre_dto(session, ch, avec_cat) if ch else None
+
+def _listerTypesChambre(session: Session) -> List[TypeChambreDTO]:
+    # Trié par nom pour le confort visuel dans un drop-down.
+    if _avec_catalogue(session):
+        return catalogue_types.lister()
+    rows = session.execute(
+        select(TypeChambre)
+        .options(*options_type_chambre())
+        .order_by(TypeChambre.nom_type)
+    ).scalars().all()
+    return [TypeChambreDTO.from_entity(t) for t in rows]
+
+def _listerChambres(session: Session) -> List[ChambreDTO]:
+    # Tri par numéro pour un listing clean.
+    avec_cat = _avec_catalogue(session)
+    rows = session.execute(
+        select(Chambre)
+        .options(*_options_chambres(avec_cat))  # type joint ou pris au catalogue, pas de N+1
+        .order_by(Chambre.numero_chambre)
+    ).scalars().all()
+    return [_chambre_dto(session, c, avec_cat) for c in rows]
+
+def getChambreParNumero(no_chambre: int) -> ChambreDTO | None:
     with SessionLocal() as session:
-        ch = session.execute(
-            select(Chambre).where(Chambre.numero_chambre == no_chambre)
-        ).scalar_one_or_none()
-        return ChambreDTO(ch) if ch else None
+        return _getChambreParNumero(session, no_chambre)
 
 def listerTypesChambre() -> List[TypeChambreDTO]:
-    # Trié par nom pour le confort visuel dans un drop-down.
     with SessionLocal() as session:
-        rows = session.execute(
-            select(TypeChambre).order_by(TypeChambre.nom_type)
-        ).scalars().all()
-        return [TypeChambreDTO(t) for t in rows]
+        return _listerTypesChambre(session)
 
 def listerChambres() -> List[ChambreDTO]:
-    # Tri par numéro pour un listing clean.
     with SessionLocal() as session:
-        rows = session.execute(
-            select(Chambre).order_by(Chambre.numero_chambre)
-        ).scalars().all()
-        return [ChambreDTO(c) for c in rows]
+        return _listerChambres(session)
+
+# Clés keyset: tri d'affichage + PK pour départager.
+_CLE_TYPES = COLONNES_TRI   # même clé que l'ordre du catalogue
+_CLE_CHAMBRES = (Chambre.numero_chambre, Chambre.id_chambre)
+
+def _listerTypesChambrePage(session: Session, limit: int, curseur: str | None) -> PageDTO[TypeChambreDTO]:
+    if _avec_catalogue(session):
+        # Même clé, même ordre (celui de la BD) et même curseur que la version SQL.
+        valider_limite(limit)
+        apres = decoder_curseur("typeChambre", curseur, _CLE_TYPES) if curseur else None
+        items = catalogue_types.apres(apres, limit + 1)
+        if items is not None:
+            suivant = None
+            if len(items) > limit:
+                items = items[:limit]
+                suivant = encoder_curseur("typeChambre", [items[-1].nom_type, items[-1].idTypeChambre])
+            return PageDTO[TypeChambreDTO](items=items, next_cursor=suivant)
+    stmt = paginer(select(TypeChambre).options(*options_type_chambre()), "typeChambre", _CLE_TYPES, limit, curseur)
+    rows, suivant = couper_page(session.execute(stmt).scalars().all(), "typeChambre", _CLE_TYPES, limit)
+    return PageDTO[TypeChambreDTO](items=[TypeChambreDTO.from_entity(t) for t in rows], next_cursor=suivant)
+
+def _listerChambresPage(
+    session: Session, limit: int, curseur: str | None, proj: Projection | None = None
+) -> PageDTO[ChambreDTO] | PageDTO[dict]:
+    avec_cat = _avec_catalogue(session)
+    options = _options_chambres(avec_cat) if proj is None else _options_chambres_projetees(proj, avec_cat)
+    stmt = paginer(select(Chambre).options(*options), "chambre", _CLE_CHAMBRES, limit, curseur)
+    rows, suivant = couper_page(session.execute(stmt).scalars().all(), "chambre", _CLE_CHAMBRES, limit)
+    if proj is not None:
+        return PageDTO[dict](items=[_chambre_dict(session, c, proj, avec_cat) for c in rows], next_cursor=suivant)
+    return PageDTO[ChambreDTO](items=[_chambre_dto(session, c, avec_cat) for c in rows], next_cursor=suivant)
+
+def listerTypesChambrePage(limit: int = LIMITE_DEFAUT, curseur: str | None = None) -> PageDTO[TypeChambreDTO]:
+    with SessionLocal() as session:
+        return _listerTypesChambrePage(session, limit, curseur)
+
+def listerChambresPage(
+    limit: int = LIMITE_DEFAUT, curseur: str | None = None, proj: Projection | None = None
+) -> PageDTO[ChambreDTO] | PageDTO[dict]:
+    with SessionLocal() as session:
+        return _listerChambresPage(session, limit, curseur, proj)
+
+async def getChambreParNumeroAsync(no_chambre: int) -> ChambreDTO | None:
+    return await run_async(_getChambreParNumero, no_chambre)
+
+async def listerTypesChambreAsync() -> List[TypeChambreDTO]:
+    return await run_async(_listerTypesChambre)
+
+async def listerChambresAsync() -> List[ChambreDTO]:
+    return await run_async(_listerChambres)
+
+async def listerTypesChambrePageAsync(limit: int = LIMITE_DEFAUT, curseur: str | None = None) -> PageDTO[TypeChambreDTO]:
+    return await run_async(_listerTypesChambrePage, limit, curseur)
+
+async def listerChambresPageAsync(
+    limit: int = LIMITE_DEFAUT, curseur: str | None = None, proj: Projection | None = None
+) -> PageDTO[ChambreDTO] | PageDTO[dict]:
+    return await run_async(_listerChambresPage, limit, curseur, proj)
+
+# Flux complet (NDJSON côté route), lu par lots.
+# Avec proj: le type étendu vient de la jointure (pas de session pour le catalogue).
+def _stmtChambresFlux(proj: Projection | None = None):
+    options = options_chambre() if proj is None else options_projection(proj, _CLE_CHAMBRES)
+    return select(Chambre).options(*options).order_by(*_CLE_CHAMBRES)
+
+def _versSortie(proj: Projection | None):
+    return ChambreDTO.from_entity if proj is None else (lambda c: vers_dict(c, proj))
+
+def iterChambres(taille_lot: int = TAILLE_LOT, proj: Projection | None = None) -> Iterator[ChambreDTO | dict]:
+    return iterer(_stmtChambresFlux(proj), _versSortie(proj), taille_lot)
+
+def iterChambresAsync(taille_lot: int = TAILLE_LOT, proj: Projection | None = None) -> AsyncIterator[ChambreDTO | dict]:
+    return iterer_async(_stmtChambresFlux(proj), _versSortie(proj), taille_lot)
+
+# --------------------------- DISPONIBILITÉ ---------------------------
+def _listerChambresDisponibles(
+    session: Session, debut: datetime, fin: datetime, nom_type: str | None = None
+) -> List[ChambreDTO]:
+    debut, fin = naive(debut), naive(fin)
+    if fin <= debut:
+        raise ValueError("La date de fin doit être après la date de début.")
+    avec_cat = _avec_catalogue(session)
+    stmt = (
+        select(Chambre)
+        .options(*_options_chambres(avec_cat))
+        .where(Chambre.disponible_reservation.is_(True))
+        .order_by(Chambre.numero_chambre)
+    )
+    if nom_type is not None and avec_cat:
+        tc = catalogue_types.par_nom(nom_type, session)
+        if tc is None:
+            return []
+        stmt = stmt.where(Chambre.fk_type_chambre == tc.idTypeChambre)
+    elif nom_type is not None:
+        stmt = stmt.where(
+            Chambre.fk_type_chambre.in_(
+                select(TypeChambre.id_type_chambre).where(TypeChambre.nom_type == nom_type)
+            )
+        )
+
+    index_occupation.synchroniser(session)
+    if index_occupation.actif:
+        # Index en mémoire chargé: le chevauchement se teste sans SQL.
+        rows = session.execute(stmt).scalars().all()
+        occupees = index_occupation.chambres_occupees((c.id_chambre for c in rows), debut, fin)
+        return [_chambre_dto(session, c, avec_cat) for c in rows if c.id_chambre not in occupees]
+
+    # Anti-jointure: NOT EXISTS une résa qui chevauche sur la même chambre.
+    # L'index ix_reservation_chambre_dates couvre (chambre, début, fin).
+    occupee = exists().where(
+        (Reservation.fk_id_chambre == Chambre.id_chambre) & chevauche(debut, fin)
+    )
+    rows = session.execute(stmt.where(~occupee)).scalars().all()
+    return [_chambre_dto(session, c, avec_cat) for c in rows]
+
+def listerChambresDisponibles(debut: datetime, fin: datetime, nom_type: str | None = None) -> List[ChambreDTO]:
+    """Chambres réservables sans chevauchement sur [debut, fin[."""
+    with SessionLocal() as session:
+        return _listerChambresDisponibles(session, debut, fin, nom_type)
+
+async def listerChambresDisponiblesAsync(debut: datetime, fin: datetime, nom_type: str | None = None) -> List[ChambreDTO]:
+    return await run_async(_listerChambresDisponibles, debut, fin, nom_type)
 
 # ---------------------------- SEARCH (ID) --------------------------
-def rechercherChambreParId(id_chambre: str) -> ChambreDTO | None:
+def _rechercherChambreParId(session: Session, id_chambre: str) -> ChambreDTO | None:
     # Fetch direct par PK (UUID).
+    avec_cat = _avec_catalogue(session)
+    ch = session.get(Chambre, id_chambre, options=_options_chambres(avec_cat))
+    return _chambre_dto(session, ch, avec_cat) if ch else None
+
+def _getTypeChambreParId(session: Session, id_type_chambre: str) -> TypeChambreDTO | None:
+    if _avec_catalogue(session):
+        return catalogue_types.par_id(id_type_chambre, session)
+    tc = charger(session, TypeChambre, id_type_chambre)
+    return TypeChambreDTO.from_entity(tc) if tc else None
+
+def rechercherChambreParId(id_chambre: str) -> ChambreDTO | None:
     with SessionLocal() as session:
-        ch = session.get(Chambre, id_chambre)
-        return ChambreDTO(ch) if ch else None
+        return _rechercherChambreParId(session, id_chambre)
 
 def getTypeChambreParId(id_type_chambre: str) -> TypeChambreDTO | None:
     with SessionLocal() as session:
-        tc = session.get(TypeChambre, id_type_chambre)
-        return TypeChambreDTO(tc) if tc else None
+        return _getTypeChambreParId(session, id_type_chambre)
+
+async def rechercherChambreParIdAsync(id_chambre: str) -> ChambreDTO | None:
+    return await run_async(_rechercherChambreParId, id_chambre)
+
+async def getTypeChambreParIdAsync(id_type_chambre: str) -> TypeChambreDTO | None:
+    return await run_async(_getTypeChambreParId, id_type_chambre)
 
 def rechercherTypeChambre(critere: TypeChambreSearchDTO) -> List[TypeChambreDTO]:
     # Je garde ça minimaliste pour matcher la consigne.
     with SessionLocal() as session:
         if not critere.idTypeChambre:
             return []
-        tc = session.get(TypeChambre, critere.idTypeChambre)
-        return [TypeChambreDTO(tc)] if tc else []
+        tc = charger(session, TypeChambre, critere.idTypeChambre)
+        return [TypeChambreDTO.from_entity(tc)] if tc else []
 
 # ------------------------------ UPDATE ----------------------------
-def modifierTypeChambre(id_type_chambre: str, data: TypeChambreUpdateDTO) -> TypeChambreDTO:
-    with SessionLocal() as session:
-        session: Session
-        tc = session.get(TypeChambre, id_type_chambre)
-        if not tc:
-            raise ValueError("Type de chambre introuvable.")
-
-        # On valide le plafond vs plancher (en tenant compte des valeurs actuelles).
-        plancher = data.prix_plancher if data.prix_plancher is not None else float(tc.prix_plancher)
-        plafond_str = data.prix_plafond if data.prix_plafond is not None else tc.prix_plafond
-        _ensure_plafond_ok(plancher, plafond_str)
-
-        # Patch champ par champ.
-        if data.nom_type is not None:
-            tc.nom_type = data.nom_type
-        if data.prix_plancher is not None:
-            tc.prix_plancher = data.prix_plancher
-        if data.prix_plafond is not None:
-            tc.prix_plafond = data.prix_plafond
-        if data.description_chambre is not None:
-            tc.description_chambre = data.description_chambre
+def _modifierTypeChambre(session: Session, id_type_chambre: str, data: TypeChambreUpdateDTO) -> TypeChambreDTO:
+    tc = session.get(TypeChambre, id_type_chambre)
+    if not tc:
+        raise ValueError("Type de chambre introuvable.")
+
+    # On valide le plafond vs plancher (en tenant compte des valeurs actuelles).
+    plancher = data.prix_plancher if data.prix_plancher is not None else float(tc.prix_plancher)
+    plafond_str = data.prix_plafond if data.prix_plafond is not None else tc.prix_plafond
+    verifier_plafond(plancher, plafond_str)
+
+    # Patch champ par champ.
+    if data.nom_type is not None:
+        tc.nom_type = data.nom_type
+    if data.prix_plancher is not None:
+        tc.prix_plancher = data.prix_plancher
+    if data.prix_plafond is not None:
+        tc.prix_plafond = data.prix_plafond
+    if data.description_chambre is not None:
+        tc.description_chambre = data.description_chambre
 
+    try:
         session.commit()
-        session.refresh(tc)
-        return TypeChambreDTO(tc)
+    except IntegrityError:
+        session.rollback()
+        raise ValueError(f"Le type de chambre '{data.nom_type}' existe déjà.")
+    session.refresh(tc)
+    dto = TypeChambreDTO.from_entity(tc)
+    catalogue_types.publier(session)
+    return dto
 
-def modifierChambre(id_chambre: str, data: ChambreUpdateDTO) -> ChambreDTO:
-    with SessionLocal() as session:
-        session: Session
-        ch = session.get(Chambre, id_chambre)
-        if not ch:
-            raise ValueError("Chambre introuvable.")
-
-        # Patch simple des champs scalaires.
-        if data.numero_chambre is not None:
-            ch.numero_chambre = data.numero_chambre
-        if data.disponible_reservation is not None:
-            ch.disponible_reservation = data.disponible_reservation
-        if data.autre_informations is not None:
-            ch.autre_informations = data.autre_informations
-
-        # Si on change de type, on résout par nom_type (doit exister).
-        if data.nom_type is not None:
-            tc = session.execute(
-                select(TypeChambre).where(TypeChambre.nom_type == data.nom_type)
-            ).scalar_one_or_none()
-            if not tc:
-                raise ValueError(f"Type de chambre '{data.nom_type}' introuvable.")
-            ch.fk_type_chambre = tc.id_type_chambre
+def _modifierChambre(session: Session, id_chambre: str, data: ChambreUpdateDTO) -> ChambreDTO:
+    # Changement de type: même verrou que les écritures de réservation, tenu
+    # jusqu'au commit. Sinon une résa commitée entre deplacer_chambre() et le
+    # commit irait dans daily_summary sous l'ancien type.
+    ch = verrouiller_chambre(session, id_chambre) if data.nom_type is not None else session.get(Chambre, id_chambre)
+    if not ch:
+        raise ValueError("Chambre introuvable.")
+
+    # Patch simple des champs scalaires.
+    if data.numero_chambre is not None:
+        ch.numero_chambre = data.numero_chambre
+    if data.disponible_reservation is not None:
+        ch.disponible_reservation = data.disponible_reservation
+    if data.autre_informations is not None:
+        ch.autre_informations = data.autre_informations
+
+    # Si on change de type, on résout par nom_type (doit exister).
+    # daily_summary suit: les séjours de la chambre passent au nouveau type.
+    avec_cat = _avec_catalogue(session)
+    if data.nom_type is not None:
+        id_type, tc = _type_par_nom(session, data.nom_type, avec_cat)
+        deplacer_chambre(session, ch.id_chambre, ch.fk_type_chambre, id_type)
+        ch.fk_type_chambre = id_type
+        if not avec_cat:
             ch.type_chambre = tc
 
+    if avec_cat:
+        return _enregistrer_chambre(session, ch, data.numero_chambre, ch.id_chambre)
+
+    try:
         session.commit()
-        session.refresh(ch)
-        return ChambreDTO(ch)
+    except IntegrityError:
+        session.rollback()
+        raise _erreur_integrite_chambre(session, data.numero_chambre, id_chambre)
+    dto = ChambreDTO.from_entity(recharger(session, Chambre, ch.id_chambre))
+    incrementer_version(session, TABLE_CHAMBRE)
+    return dto
+
+def modifierTypeChambre(id_type_chambre: str, data: TypeChambreUpdateDTO) -> TypeChambreDTO:
+    with SessionLocal() as session:
+        return _modifierTypeChambre(session, id_type_chambre, data)
+
+def modifierChambre(id_chambre: str, data: ChambreUpdateDTO) -> ChambreDTO:
+    with SessionLocal() as session:
+        return _modifierChambre(session, id_chambre, data)
+
+async def modifierTypeChambreAsync(id_type_chambre: str, data: TypeChambreUpdateDTO) -> TypeChambreDTO:
+    return await run_async(_modifierTypeChambre, id_type_chambre, data)
+
+async def modifierChambreAsync(id_chambre: str, data: ChambreUpdateDTO) -> ChambreDTO:
+    return await run_async(_modifierChambre, id_chambre, data)
 
 # ------------------------------ DELETE ----------------------------
+def _supprimerTypeChambre(session: Session, id_type_chambre: str) -> bool:
+    tc = session.get(TypeChambre, id_type_chambre)
+    if not tc:
+        return False
+    try:
+        # Les chambres du type passent à fk NULL: daily_summary les suit,
+        # chambres verrouillées comme pour un changement de type.
+        verrouiller_chambres(session, session.scalars(
+            select(Chambre.id_chambre).where(Chambre.fk_type_chambre == tc.id_type_chambre)
+        ))
+        retirer_type(session, tc.id_type_chambre)
+        session.delete(tc)
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        # Message clair si FK bloque.
+        raise ValueError(
+            "Impossible de supprimer ce type de chambre car des chambres y sont rattachées."
+        )
+    catalogue_types.publier(session)
+    return True
+
+def _supprimerChambre(session: Session, id_chambre: str) -> bool:
+    ch = session.get(Chambre, id_chambre)
+    if not ch:
+        return False
+    try:
+        session.delete(ch)
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        # Pareil: empêche si réservations existent.
+        raise ValueError(
+            "Impossible de supprimer cette chambre car des réservations y sont rattachées."
+        )
+    incrementer_version(session, TABLE_CHAMBRE)
+    return True
+
 def supprimerTypeChambre(id_type_chambre: str) -> bool:
     with SessionLocal() as session:
-        session: Session
-        tc = session.get(TypeChambre, id_type_chambre)
-        if not tc:
-            return False
-        try:
-            session.delete(tc)
-            session.commit()
-            return True
-        except IntegrityError:
-            session.rollback()
-            # Message clair si FK bloque.
-            raise ValueError(
-                "Impossible de supprimer ce type de chambre car des chambres y sont rattachées."
-            )
+        return _supprimerTypeChambre(session, id_type_chambre)
 
 def supprimerChambre(id_chambre: str) -> bool:
     with SessionLocal() as session:
-        session: Session
-        ch = session.get(Chambre, id_chambre)
-        if not ch:
-            return False
-        try:
-            session.delete(ch)
-            session.commit()
-            return True
-        except IntegrityError:
-            session.rollback()
-            # Pareil: empêche si réservations existent.
-            raise ValueError(
-                "Impossible de supprimer cette chambre car des réservations y sont rattachées."
-            )
+        return _supprimerChambre(session, id_chambre)
+
+async def supprimerTypeChambreAsync(id_type_chambre: str) -> bool:
+    return await run_async(_supprimerTypeChambre, id_type_chambre)
+
+async def supprimerChambreAsync(id_chambre: str) -> bool:
+    return await run_async(_supprimerChambre, id_chambre)
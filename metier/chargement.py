@@ -0,0 +1,77 @@
+# metier/chargement.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/chargement.py
+# Rôle : stratégie de chargement des relations, centralisée pour toutes les
+#        lectures de la couche métier (list, get, recharge après commit).
+# Idée:
+#   - Les DTO de sortie touchent Reservation.chambre, Chambre.type_chambre et
+#     Reservation.usager. Sans options, chaque ligne déclenche des SELECT lazy
+#     (N+1). Ici on les charge en joinedload (relations N:1 => pas de doublons).
+#   - Mode strict (HOTEL_DB_STRICT_LOADING=1): raiseload("*") sur le reste, donc
+#     construire un DTO ne peut jamais émettre un lazy load en cachette.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from typing import Any, List, Type, TypeVar
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy.orm.interfaces import ORMOption
+
+import core.db
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+E = TypeVar("E")
+
+def strict_actif() -> bool:
+    # Lu à chaque appel: configure_engine() peut changer les réglages.
+    return core.db.settings.strict_loading
+
+def options_type_chambre() -> List[ORMOption]:
+    # TypeChambreDTO ne touche aucune relation.
+    return [raiseload("*")] if strict_actif() else []
+
+def options_usager() -> List[ORMOption]:
+    # UsagerDTO ne touche aucune relation (pas les réservations).
+    return [raiseload("*")] if strict_actif() else []
+
+def options_chambre() -> List[ORMOption]:
+    # type_chambre est nullable => LEFT OUTER JOIN.
+    type_opt = joinedload(Chambre.type_chambre)
+    if strict_actif():
+        return [type_opt.raiseload("*"), raiseload("*")]
+    return [type_opt]
+
+def options_reservation() -> List[ORMOption]:
+    # FK NOT NULL des deux côtés => INNER JOIN (plus simple pour l'optimiseur).
+    chambre_opt = joinedload(Reservation.chambre, innerjoin=True)
+    usager_opt = joinedload(Reservation.usager, innerjoin=True)
+    if strict_actif():
+        return [
+            chambre_opt.options(joinedload(Chambre.type_chambre).raiseload("*"), raiseload("*")),
+            usager_opt.raiseload("*"),
+            raiseload("*"),
+        ]
+    return [chambre_opt.joinedload(Chambre.type_chambre), usager_opt]
+
+_OPTIONS = {
+    TypeChambre: options_type_chambre,
+    Usager: options_usager,
+    Chambre: options_chambre,
+    Reservation: options_reservation,
+}
+
+def options_pour(entity_cls: Type[Any]) -> List[ORMOption]:
+    """Options de chargement à appliquer à toute lecture de entity_cls."""
+    return _OPTIONS[entity_cls]()
+
+def charger(session: Session, entity_cls: Type[E], pk: Any) -> E | None:
+    """session.get() avec les options de chargement de l'entité."""
+    return session.get(entity_cls, pk, options=options_pour(entity_cls))
+
+def recharger(session: Session, entity_cls: Type[E], pk: Any) -> E:
+    """Remplace refresh() après un commit: relit la ligne ET ses relations
+    en une seule requête (populate_existing écrase l'état expiré)."""
+    return session.get(entity_cls, pk, options=options_pour(entity_cls), populate_existing=True)
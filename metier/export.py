@@ -0,0 +1,262 @@
+# metier/export.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/export.py
+# Rôle : export en flux de réservations, usagers et chambres, en lignes plates
+#        (jointures déjà faites) vers CSV ou Parquet.
+# Idée:
+#   - Requête Core (colonnes, pas d'entités ORM ni de DTO Pydantic), curseur
+#     serveur (stream_results/yield_per), lue par partitions de taille_lot.
+#   - CSV: une partition -> un morceau de texte encodé, envoyé aussitôt.
+#   - Parquet: une partition -> un row group; les octets écrits sont relâchés
+#     au fur et à mesure (le pied de fichier part à la fin).
+#   - Mémoire constante: au plus une partition en cours.
+#   - Filtre de dates (réservations): séjours qui chevauchent [debut, fin[.
+#   - Parquet demande pyarrow (dépendance optionnelle, importée au besoin).
+#   Usage CLI:
+#     python -m metier.export reservations --format parquet --debut 2025-01-01 --sortie resa.parquet
+#     python -m metier.export usagers > usagers.csv
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import sys
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, Select, SmallInteger, select
+from sqlalchemy.dialects.mssql import MONEY
+
+from core.db import SessionLocal, async_session
+from metier.reservationMetier import naive
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+from modele.types import GUID
+
+TAILLE_LOT_EXPORT = 5000
+FORMATS = ("csv", "parquet")
+TYPES_MEDIA = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+# ------------------------------- requêtes -------------------------------
+def _stmt_reservations(debut: Optional[datetime], fin: Optional[datetime]) -> Select:
+    stmt = (
+        select(
+            Reservation.id_reservation,
+            Reservation.date_debut_reservation.label("date_debut"),
+            Reservation.date_fin_reservation.label("date_fin"),
+            Reservation.prix_jour,
+            Reservation.info_reservation,
+            Usager.id_usager,
+            Usager.nom.label("usager_nom"),
+            Usager.prenom.label("usager_prenom"),
+            Usager.mobile.label("usager_mobile"),
+            Chambre.id_chambre,
+            Chambre.numero_chambre,
+            TypeChambre.nom_type,
+        )
+        .join(Usager, Usager.id_usager == Reservation.fk_id_usager)
+        .join(Chambre, Chambre.id_chambre == Reservation.fk_id_chambre)
+        .outerjoin(TypeChambre, TypeChambre.id_type_chambre == Chambre.fk_type_chambre)
+        .order_by(Reservation.date_debut_reservation, Reservation.id_reservation)
+    )
+    if debut is not None:
+        stmt = stmt.where(Reservation.date_fin_reservation > naive(debut))
+    if fin is not None:
+        stmt = stmt.where(Reservation.date_debut_reservation < naive(fin))
+    return stmt
+
+def _stmt_usagers() -> Select:
+    # Jamais le mot de passe.
+    return select(
+        Usager.id_usager, Usager.prenom, Usager.nom, Usager.adresse, Usager.mobile, Usager.type_usager,
+    ).order_by(Usager.nom, Usager.prenom, Usager.id_usager)
+
+def _stmt_chambres() -> Select:
+    return (
+        select(
+            Chambre.id_chambre,
+            Chambre.numero_chambre,
+            Chambre.disponible_reservation,
+            Chambre.autre_informations,
+            TypeChambre.nom_type,
+            TypeChambre.prix_plancher,
+            TypeChambre.prix_plafond,
+        )
+        .outerjoin(TypeChambre, TypeChambre.id_type_chambre == Chambre.fk_type_chambre)
+        .order_by(Chambre.numero_chambre, Chambre.id_chambre)
+    )
+
+ENTITES = ("reservations", "usagers", "chambres")
+
+def requete(entite: str, debut: Optional[datetime] = None, fin: Optional[datetime] = None) -> Select:
+    if entite not in ENTITES:
+        raise ValueError(f"entite doit être parmi {', '.join(ENTITES)}.")
+    if entite == "reservations":
+        if debut is not None and fin is not None and naive(fin) <= naive(debut):
+            raise ValueError("fin doit être après debut.")
+        return _stmt_reservations(debut, fin)
+    if debut is not None or fin is not None:
+        raise ValueError("Le filtre de dates ne s'applique qu'aux réservations.")
+    return _stmt_usagers() if entite == "usagers" else _stmt_chambres()
+
+def verifier_format(format: str) -> None:
+    if format not in FORMATS:
+        raise ValueError(f"format doit être parmi {', '.join(FORMATS)}.")
+    if format == "parquet":
+        _pyarrow()
+
+# ------------------------------- lecture --------------------------------
+def iter_partitions(stmt: Select, taille_lot: int = TAILLE_LOT_EXPORT) -> Iterator[Sequence[Tuple]]:
+    with SessionLocal() as s:
+        result = s.connection().execution_options(stream_results=True, yield_per=taille_lot).execute(stmt)
+        yield from result.partitions(taille_lot)
+
+async def iter_partitions_async(stmt: Select, taille_lot: int = TAILLE_LOT_EXPORT) -> AsyncIterator[Sequence[Tuple]]:
+    async with async_session() as s:
+        conn = await s.connection()
+        result = await conn.stream(stmt.execution_options(yield_per=taille_lot))
+        async for part in result.partitions(taille_lot):
+            yield part
+
+# ------------------------------- CSV ------------------------------------
+class _CSV:
+    def __init__(self, stmt: Select):
+        self.colonnes = [c.name for c in stmt.selected_columns]
+
+    def entete(self) -> bytes:
+        return self._ecrire([self.colonnes])
+
+    def lot(self, rows: Iterable[Tuple]) -> bytes:
+        return self._ecrire(rows)
+
+    def fin(self) -> bytes:
+        return b""
+
+    @staticmethod
+    def _ecrire(rows) -> bytes:
+        tampon = io.StringIO()
+        csv.writer(tampon, lineterminator="\n").writerows(rows)
+        return tampon.getvalue().encode("utf-8")
+
+# ------------------------------ Parquet ---------------------------------
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise RuntimeError("L'export Parquet demande pyarrow (pip install pyarrow).")
+    return pyarrow
+
+class _Tampon(io.RawIOBase):
+    """Sortie pour ParquetWriter: garde la position totale (tell), mais on
+    vide les octets après chaque row group."""
+    def __init__(self):
+        self.morceaux: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.morceaux.append(bytes(b))
+        self.position += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self.position
+
+    def vider(self) -> bytes:
+        data, self.morceaux = b"".join(self.morceaux), []
+        return data
+
+def _type_arrow(pa, sa_type):
+    if isinstance(sa_type, GUID):
+        return pa.string()
+    if isinstance(sa_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sa_type, Boolean):
+        return pa.bool_()
+    if isinstance(sa_type, (SmallInteger, Integer)):
+        return pa.int64()
+    if isinstance(sa_type, (Numeric, MONEY)):
+        return pa.float64()
+    return pa.string()
+
+class _Parquet:
+    def __init__(self, stmt: Select):
+        self.pa = _pyarrow()
+        self.champs = [(c.name, _type_arrow(self.pa, c.type)) for c in stmt.selected_columns]
+        self.schema = self.pa.schema(self.champs)
+        self.sortie = _Tampon()
+        self.writer = self.pa.parquet.ParquetWriter(self.sortie, self.schema, compression="snappy")
+
+    def entete(self) -> bytes:
+        return self.sortie.vider()
+
+    def lot(self, rows: Sequence[Tuple]) -> bytes:
+        colonnes = list(zip(*rows))
+        tableau = {}
+        for (nom, type_), valeurs in zip(self.champs, colonnes):
+            if type_ == self.pa.string():
+                valeurs = [None if v is None else str(v) for v in valeurs]
+            elif type_ == self.pa.float64():
+                valeurs = [None if v is None else float(v) for v in valeurs]
+            tableau[nom] = self.pa.array(valeurs, type=type_)
+        self.writer.write_table(self.pa.table(tableau, schema=self.schema))
+        return self.sortie.vider()
+
+    def fin(self) -> bytes:
+        self.writer.close()
+        return self.sortie.vider()
+
+def _encodeur(format: str, stmt: Select):
+    return _CSV(stmt) if format == "csv" else _Parquet(stmt)
+
+# ------------------------------- export ---------------------------------
+def exporter(entite: str, format: str = "csv", debut: Optional[datetime] = None, fin: Optional[datetime] = None,
+             taille_lot: int = TAILLE_LOT_EXPORT) -> Iterator[bytes]:
+    """Générateur sync d'octets (CLI, scripts)."""
+    verifier_format(format)
+    stmt = requete(entite, debut, fin)
+    enc = _encodeur(format, stmt)
+    yield enc.entete()
+    for part in iter_partitions(stmt, taille_lot):
+        yield enc.lot(part)
+    yield enc.fin()
+
+async def exporterAsync(entite: str, format: str = "csv", debut: Optional[datetime] = None,
+                        fin: Optional[datetime] = None, taille_lot: int = TAILLE_LOT_EXPORT) -> AsyncIterator[bytes]:
+    """Générateur async d'octets (StreamingResponse). Valider avant avec
+    requete()/verifier_format() pour pouvoir répondre 400 avant le flux."""
+    verifier_format(format)
+    stmt = requete(entite, debut, fin)
+    enc = _encodeur(format, stmt)
+    yield enc.entete()
+    async for part in iter_partitions_async(stmt, taille_lot):
+        yield enc.lot(part)
+    yield enc.fin()
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Export en flux (CSV ou Parquet).")
+    p.add_argument("entite", choices=ENTITES)
+    p.add_argument("--format", choices=FORMATS, default="csv")
+    p.add_argument("--debut", type=datetime.fromisoformat, help="Réservations: séjours qui finissent après.")
+    p.add_argument("--fin", type=datetime.fromisoformat, help="Réservations: séjours qui commencent avant.")
+    p.add_argument("--sortie", help="Fichier de sortie (défaut: stdout).")
+    p.add_argument("--lot", type=int, default=TAILLE_LOT_EXPORT, help="Lignes par lot / row group.")
+    args = p.parse_args(argv)
+    morceaux = exporter(args.entite, args.format, args.debut, args.fin, args.lot)
+    if args.sortie:
+        with open(args.sortie, "wb") as f:
+            for m in morceaux:
+                f.write(m)
+    else:
+        for m in morceaux:
+            sys.stdout.buffer.write(m)
+        sys.stdout.buffer.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# metier/flux.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/flux.py
+# Rôle : itération en flux (streaming) sur de gros résultats.
+# Idée:
+#   - yield_per: le driver lit par lots (curseur serveur quand supporté), donc
+#     on n'a jamais toute la table en mémoire: une entité -> un DTO -> une ligne
+#     NDJSON, puis tout ça est relâché.
+#   - Versions sync (scripts) et async (routes, via AsyncSession.stream()).
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from typing import AsyncIterator, Callable, Iterator, TypeVar
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Select
+
+from core.db import SessionLocal, async_session
+
+TAILLE_LOT = 500
+
+D = TypeVar("D", bound=BaseModel)
+
+def iterer(stmt: Select, vers_dto: Callable[[object], D], taille_lot: int = TAILLE_LOT) -> Iterator[D]:
+    """Générateur sync: la session reste ouverte tant qu'on consomme."""
+    with SessionLocal() as s:
+        result = s.execute(stmt.execution_options(yield_per=taille_lot))
+        for ent in result.scalars():
+            yield vers_dto(ent)
+
+async def iterer_async(stmt: Select, vers_dto: Callable[[object], D], taille_lot: int = TAILLE_LOT) -> AsyncIterator[D]:
+    """Générateur async: AsyncSession.stream() => curseur côté serveur."""
+    async with async_session() as s:
+        result = await s.stream(stmt.execution_options(yield_per=taille_lot))
+        async for ent in result.scalars():
+            yield vers_dto(ent)
+
+def ligne_ndjson(dto: BaseModel | dict) -> bytes:
+    # Une ligne JSON par objet (format application/x-ndjson). dict: champs à la
+    # carte (metier/projection.py), même encodeur pydantic-core que les DTO.
+    if isinstance(dto, BaseModel):
+        return dto.model_dump_json().encode() + b"\n"
+    return to_json(dto) + b"\n"
+
+async def ndjson_async(dtos: AsyncIterator[BaseModel | dict]) -> AsyncIterator[bytes]:
+    async for dto in dtos:
+        yield ligne_ndjson(dto)
@@ -0,0 +1,284 @@
+# metier/importation.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/importation.py
+# Rôle : import en masse d'usagers, de types de chambre et de chambres depuis
+#        un fichier CSV (en-tête = noms des champs) ou JSONL (un objet/ligne).
+# Idée:
+#   - Lecture en flux, par lots de taille_lot enregistrements: la mémoire ne
+#     dépend que de la taille du lot, pas du fichier.
+#   - Chaque enregistrement est validé par le DTO de création habituel
+#     (UsagerCreateDTO, TypeChambreCreateDTO, ChambreCreateDTO).
+#   - Par lot: UNE requête IN pour les clés déjà en BD, UNE pour résoudre les
+#     nom_type (chambres), puis INSERT multi-lignes et commit.
+#   - Clés de doublon (mêmes règles que les services unitaires):
+#       usagers  -> (nom, prenom, mobile)
+#       types    -> nom_type
+#       chambres -> numero_chambre (un import relancé ne duplique pas)
+#     Un doublon est compté dans « existantes », pas en erreur.
+#   - Enregistrement invalide => compté en erreur (avec son numéro), le reste
+#     du lot passe quand même.
+#   Usage CLI:
+#     python -m metier.importation usagers clients.csv
+#     python -m metier.importation chambres chambres.jsonl --lot 500
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from uuid import UUID, uuid4
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.db import SessionLocal, run_async
+from DTO.chambreDTO import ChambreCreateDTO, TypeChambreCreateDTO
+from DTO.importDTO import ErreurImportDTO, RapportImportDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from metier.catalogue import catalogue_types
+from metier.chambreMetier import TABLE_CHAMBRE, verifier_plafond
+from metier.usagerMetier import TABLE_USAGER
+from metier.versions import incrementer_version
+from modele.chambre import Chambre
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+TAILLE_LOT_IMPORT = 1000
+# Requêtes IN d'un lot: au plus 2 × taille_lot paramètres (MSSQL: max 2100).
+TAILLE_LOT_MAX = 1000
+EXEMPLES_MAX = 100
+FORMATS = ("csv", "jsonl")
+
+Enregistrement = Tuple[int, object]     # (numéro dans le fichier, dict ou erreur)
+
+# ------------------------------- lecture -------------------------------
+def _lire_csv(fichier: TextIO) -> Iterator[Enregistrement]:
+    # DictReader lit au fil de l'eau (gère aussi les champs multi-lignes entre "").
+    lecteur = csv.DictReader(fichier)
+    try:
+        for n, ligne in enumerate(lecteur, 1):
+            # Cellule vide = champ absent (les optionnels restent None).
+            yield n, {k: v for k, v in ligne.items() if k and v not in ("", None)}
+    except csv.Error as e:
+        # Fichier illisible à partir d'ici: on arrête l'import (les lots déjà
+        # commités restent).
+        raise ValueError(f"CSV invalide (ligne {lecteur.line_num}): {e}")
+
+def _lire_jsonl(fichier: TextIO) -> Iterator[Enregistrement]:
+    n = 0
+    for brut in fichier:
+        if not brut.strip():
+            continue
+        n += 1
+        try:
+            obj = json.loads(brut)
+        except json.JSONDecodeError as e:
+            yield n, ValueError(f"JSON invalide: {e.msg}")
+            continue
+        yield n, obj if isinstance(obj, dict) else ValueError("Objet JSON attendu.")
+
+def lire(fichier: TextIO, format: str) -> Iterator[Enregistrement]:
+    if format not in FORMATS:
+        raise ValueError(f"format doit être parmi {', '.join(FORMATS)}.")
+    return _lire_csv(fichier) if format == "csv" else _lire_jsonl(fichier)
+
+def par_lots(enregistrements: Iterable[Enregistrement], taille_lot: int) -> Iterator[List[Enregistrement]]:
+    it = iter(enregistrements)
+    while lot := list(islice(it, taille_lot)):
+        yield lot
+
+# ------------------------------ rapport --------------------------------
+def _noter_erreur(rapport: RapportImportDTO, ligne: int, erreur: str) -> None:
+    rapport.erreurs += 1
+    if len(rapport.exemples_erreurs) < EXEMPLES_MAX:
+        rapport.exemples_erreurs.append(ErreurImportDTO(ligne=ligne, erreur=erreur))
+
+def _message(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        err = e.errors()[0]
+        champ = ".".join(str(x) for x in err["loc"]) or "enregistrement"
+        return f"{champ}: {err['msg']}"
+    return str(e)
+
+def _valider(lot: List[Enregistrement], dto: type[BaseModel], rapport: RapportImportDTO,
+             verifier: Optional[Callable] = None) -> List[Tuple[int, BaseModel]]:
+    valides = []
+    for n, brut in lot:
+        rapport.lues += 1
+        try:
+            if isinstance(brut, Exception):
+                raise brut
+            data = dto.model_validate(brut)
+            if verifier:
+                verifier(data)
+            valides.append((n, data))
+        except (ValidationError, ValueError) as e:
+            _noter_erreur(rapport, n, _message(e))
+    return valides
+
+# ------------------------- un lot par entité ---------------------------
+def _lot_usagers(s: Session, lot: List[Enregistrement], rapport: RapportImportDTO) -> List[dict]:
+    valides = _valider(lot, UsagerCreateDTO, rapport)
+    if not valides:
+        return []
+    # CHAR(15): la BD peut rendre le mobile complété d'espaces.
+    cle = lambda nom, prenom, mobile: (nom, prenom, mobile.rstrip())
+    existants = {
+        cle(*r) for r in s.execute(
+            select(Usager.nom, Usager.prenom, Usager.mobile)
+            .where(Usager.nom.in_({d.nom for _, d in valides}),
+                   Usager.mobile.in_({d.mobile for _, d in valides}))
+        )
+    }
+    lignes = []
+    for _, d in valides:
+        k = cle(d.nom, d.prenom, d.mobile)
+        if k in existants:
+            rapport.existantes += 1
+            continue
+        existants.add(k)
+        lignes.append(dict(
+            id_usager=uuid4(), prenom=d.prenom, nom=d.nom, adresse=d.adresse, mobile=d.mobile,
+            mot_de_passe=(d.mot_de_passe[:60]).ljust(60)[:60], type_usager=d.type_usager,
+        ))
+    if lignes:
+        s.execute(insert(Usager), lignes)
+    return lignes
+
+def _lot_types(s: Session, lot: List[Enregistrement], rapport: RapportImportDTO) -> List[dict]:
+    valides = _valider(lot, TypeChambreCreateDTO, rapport,
+                       verifier=lambda d: verifier_plafond(d.prix_plancher, d.prix_plafond))
+    if not valides:
+        return []
+    existants = set(s.scalars(
+        select(TypeChambre.nom_type).where(TypeChambre.nom_type.in_({d.nom_type for _, d in valides}))
+    ))
+    lignes = []
+    for _, d in valides:
+        if d.nom_type in existants:
+            rapport.existantes += 1
+            continue
+        existants.add(d.nom_type)
+        lignes.append(dict(
+            id_type_chambre=uuid4(), nom_type=d.nom_type, prix_plancher=d.prix_plancher,
+            prix_plafond=d.prix_plafond, description_chambre=d.description_chambre,
+        ))
+    if lignes:
+        s.execute(insert(TypeChambre), lignes)
+    return lignes
+
+def _lot_chambres(s: Session, lot: List[Enregistrement], rapport: RapportImportDTO) -> List[dict]:
+    valides = _valider(lot, ChambreCreateDTO, rapport)
+    if not valides:
+        return []
+    types: Dict[str, UUID] = dict(s.execute(
+        select(TypeChambre.nom_type, TypeChambre.id_type_chambre)
+        .where(TypeChambre.nom_type.in_({d.nom_type for _, d in valides}))
+    ).all())
+    existants = set(s.scalars(
+        select(Chambre.numero_chambre).where(Chambre.numero_chambre.in_({d.numero_chambre for _, d in valides}))
+    ))
+    lignes = []
+    for n, d in valides:
+        if d.nom_type not in types:
+            _noter_erreur(rapport, n, f"Type de chambre '{d.nom_type}' introuvable.")
+            continue
+        if d.numero_chambre in existants:
+            rapport.existantes += 1
+            continue
+        existants.add(d.numero_chambre)
+        lignes.append(dict(
+            id_chambre=uuid4(), numero_chambre=d.numero_chambre, disponible_reservation=d.disponible_reservation,
+            autre_informations=d.autre_informations, fk_type_chambre=types[d.nom_type],
+        ))
+    if lignes:
+        s.execute(insert(Chambre), lignes)
+    return lignes
+
+_PAR_ENTITE = {"usagers": _lot_usagers, "types": _lot_types, "chambres": _lot_chambres}
+ENTITES = tuple(_PAR_ENTITE)
+
+def _importer_lot(s: Session, entite: str, lot: List[Enregistrement], rapport: RapportImportDTO) -> None:
+    """Un lot = une transaction. Si un autre process a inséré les mêmes clés
+    entre notre SELECT et l'INSERT, on annule et on rejoue le lot une fois
+    (la requête de doublons les verra alors). Un second conflit => ValueError
+    (400 côté API): le lot est annulé, les lots précédents restent commités."""
+    try:
+        partiel = RapportImportDTO(entite=entite)
+        partiel.creees = len(_PAR_ENTITE[entite](s, lot, partiel))
+        s.commit()
+    except IntegrityError:
+        s.rollback()
+        try:
+            partiel = RapportImportDTO(entite=entite)
+            partiel.creees = len(_PAR_ENTITE[entite](s, lot, partiel))
+            s.commit()
+        except IntegrityError:
+            s.rollback()
+            raise ValueError(
+                f"Import {entite}: conflit d'unicité persistant sur le lot des lignes "
+                f"{lot[0][0]} à {lot[-1][0]} (lot annulé, lots précédents conservés)."
+            )
+    if partiel.creees:
+        _publier_lot(s, entite)
+    for champ in ("lues", "creees", "existantes", "erreurs"):
+        setattr(rapport, champ, getattr(rapport, champ) + getattr(partiel, champ))
+    place = EXEMPLES_MAX - len(rapport.exemples_erreurs)
+    rapport.exemples_erreurs.extend(partiel.exemples_erreurs[:max(place, 0)])
+
+def _publier_lot(s: Session, entite: str) -> None:
+    # Après commit: version +1 (ETag des GET); pour les types, les catalogues
+    # en mémoire (tous workers) rechargent.
+    if entite == "types":
+        catalogue_types.publier(s)
+    else:
+        incrementer_version(s, TABLE_USAGER if entite == "usagers" else TABLE_CHAMBRE)
+
+def _verifier(entite: str, taille_lot: int) -> None:
+    if entite not in _PAR_ENTITE:
+        raise ValueError(f"entite doit être parmi {', '.join(ENTITES)}.")
+    if not 1 <= taille_lot <= TAILLE_LOT_MAX:
+        raise ValueError(f"taille_lot doit être entre 1 et {TAILLE_LOT_MAX}.")
+
+def importer(entite: str, enregistrements: Iterable[Enregistrement],
+             taille_lot: int = TAILLE_LOT_IMPORT) -> RapportImportDTO:
+    """Importe un flux d'enregistrements (voir lire()) par lots."""
+    _verifier(entite, taille_lot)
+    rapport = RapportImportDTO(entite=entite)
+    with SessionLocal() as s:
+        for lot in par_lots(enregistrements, taille_lot):
+            _importer_lot(s, entite, lot, rapport)
+    return rapport
+
+async def importerAsync(entite: str, enregistrements: Iterable[Enregistrement],
+                        taille_lot: int = TAILLE_LOT_IMPORT) -> RapportImportDTO:
+    # Lecture/validation d'un lot dans la boucle, I/O BD via l'AsyncSession.
+    _verifier(entite, taille_lot)
+    rapport = RapportImportDTO(entite=entite)
+    for lot in par_lots(enregistrements, taille_lot):
+        await run_async(_importer_lot, entite, lot, rapport)
+    return rapport
+
+def importerFichier(entite: str, chemin: str, format: Optional[str] = None,
+                    taille_lot: int = TAILLE_LOT_IMPORT) -> RapportImportDTO:
+    format = format or ("csv" if chemin.lower().endswith(".csv") else "jsonl")
+    with open(chemin, encoding="utf-8-sig", newline="") as f:
+        return importer(entite, lire(f, format), taille_lot)
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(description="Import en masse (CSV ou JSONL).")
+    p.add_argument("entite", choices=ENTITES)
+    p.add_argument("fichier")
+    p.add_argument("--format", choices=FORMATS, help="Déduit de l'extension par défaut (.csv, sinon jsonl).")
+    p.add_argument("--lot", type=int, default=TAILLE_LOT_IMPORT, help="Enregistrements par transaction.")
+    args = p.parse_args(argv)
+    from core.db import init_db
+    init_db()
+    print(importerFichier(args.entite, args.fichier, args.format, args.lot).model_dump_json(indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# metier/occupation.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/occupation.py
+# Rôle : index en mémoire des intervalles réservés, par chambre.
+# Idée:
+#   - Par chambre: débuts triés + fins + max cumulatif des fins. Pour savoir si
+#     [a, b[ chevauche quelque chose: bisect des débuts < b (O(log n)), puis
+#     « la plus grande fin parmi eux est-elle > a ? » (fin_max, O(1)).
+#     Juste même si d'anciennes données se chevauchent entre elles.
+#   - Écritures: reservationMetier appelle ajouter()/retirer() après commit
+#     (write-through), avec la version BD obtenue par incrementer_version().
+#   - Multi-workers: synchroniser() relit la version BD au plus une fois par
+#     intervalle_controle; si elle diffère de la nôtre, rechargement complet.
+#     Durée de vie max (ttl) en filet de sécurité (cf. CacheVersionne).
+#   - Désactivé tant que charger() n'a pas été appelé (ex.: au démarrage de
+#     l'API); les appelants retombent alors sur la requête SQL.
+#   - Les dates reçues doivent être naïves (comme en BD), cf. reservationMetier.naive().
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from metier.versions import CacheVersionne
+from modele.reservation import Reservation
+
+TABLE = "reservation"
+
+def _uuid(v) -> UUID:
+    return v if isinstance(v, UUID) else UUID(str(v))
+
+@dataclass
+class Intervalles:
+    """Intervalles d'une chambre, triés par (début, id). Public: aussi utilisé
+    seul, hors index (ex.: vérification d'un lot dans reservationMetier)."""
+    cles: List[Tuple[datetime, UUID]] = field(default_factory=list)
+    fins: List[datetime] = field(default_factory=list)
+    fin_max: List[datetime] = field(default_factory=list)
+
+    def _recalculer_depuis(self, i: int) -> None:
+        # Max cumulatif des fins à partir de i (seule partie qui peut changer).
+        del self.fin_max[i:]
+        courant = self.fin_max[i - 1] if i > 0 else None
+        for fin in self.fins[i:]:
+            courant = fin if courant is None or fin > courant else courant
+            self.fin_max.append(courant)
+
+    def ajouter(self, debut: datetime, fin: datetime, id_resa: UUID) -> None:
+        cle = (debut, id_resa)
+        i = bisect_left(self.cles, cle)
+        self.cles.insert(i, cle)
+        self.fins.insert(i, fin)
+        self._recalculer_depuis(i)
+
+    def retirer(self, debut: datetime, id_resa: UUID) -> None:
+        i = bisect_left(self.cles, (debut, id_resa))
+        if i < len(self.cles) and self.cles[i] == (debut, id_resa):
+            del self.cles[i]
+            del self.fins[i]
+            self._recalculer_depuis(i)
+
+    def chevauche(self, debut: datetime, fin: datetime) -> bool:
+        # Intervalles avec début < fin demandée = les n premiers.
+        n = bisect_left(self.cles, (fin,))
+        return n > 0 and self.fin_max[n - 1] > debut
+
+class IndexOccupation(CacheVersionne):
+    def __init__(self, intervalle_controle: float = 1.0, ttl: float = 300.0):
+        super().__init__(TABLE, intervalle_controle, ttl)
+        self._par_chambre: Dict[UUID, Intervalles] = {}
+        self._par_resa: Dict[UUID, Tuple[UUID, datetime, datetime]] = {}
+
+    # ------------------------------ chargement ------------------------------
+    def _lire(self, s: Session):
+        rows = s.execute(
+            select(
+                Reservation.fk_id_chambre,
+                Reservation.date_debut_reservation,
+                Reservation.date_fin_reservation,
+                Reservation.id_reservation,
+            ).order_by(Reservation.fk_id_chambre, Reservation.date_debut_reservation)
+        ).all()
+        par_chambre: Dict[UUID, Intervalles] = {}
+        par_resa: Dict[UUID, Tuple[UUID, datetime, datetime]] = {}
+        for id_ch, debut, fin, id_resa in rows:
+            iv = par_chambre.setdefault(id_ch, Intervalles())
+            # Lignes déjà triées par début: append direct, tri par id en cas d'égalité.
+            iv.cles.append((debut, id_resa))
+            iv.fins.append(fin)
+            par_resa[id_resa] = (id_ch, debut, fin)
+        for iv in par_chambre.values():
+            if any(a > b for a, b in zip(iv.cles, iv.cles[1:])):
+                paires = sorted(zip(iv.cles, iv.fins))
+                iv.cles = [c for c, _ in paires]
+                iv.fins = [f for _, f in paires]
+            iv._recalculer_depuis(0)
+        return par_chambre, par_resa
+
+    def _installer(self, etat) -> None:
+        self._par_chambre, self._par_resa = etat
+
+    def _vider(self) -> None:
+        self._par_chambre, self._par_resa = {}, {}
+
+    # ------------------------------ écritures ------------------------------
+    def ajouter(self, id_chambre, id_resa, debut: datetime, fin: datetime, version: Optional[int] = None) -> None:
+        if not self.actif:
+            return
+        id_chambre, id_resa = _uuid(id_chambre), _uuid(id_resa)
+        with self._verrou:
+            self._retirer(id_resa)
+            self._par_chambre.setdefault(id_chambre, Intervalles()).ajouter(debut, fin, id_resa)
+            self._par_resa[id_resa] = (id_chambre, debut, fin)
+            self._suivre_version(version)
+
+    def retirer(self, id_resa, version: Optional[int] = None) -> None:
+        if not self.actif:
+            return
+        with self._verrou:
+            self._retirer(_uuid(id_resa))
+            self._suivre_version(version)
+
+    def _retirer(self, id_resa: UUID) -> None:
+        ancien = self._par_resa.pop(id_resa, None)
+        if ancien:
+            id_ch, debut, _ = ancien
+            self._par_chambre[id_ch].retirer(debut, id_resa)
+
+    # ------------------------------- lectures ------------------------------
+    def est_occupee(self, id_chambre, debut: datetime, fin: datetime) -> bool:
+        id_ch = _uuid(id_chambre)
+        # Sous verrou: ajouter()/retirer() modifient cles/fin_max sur place.
+        with self._verrou:
+            iv = self._par_chambre.get(id_ch)
+            return iv is not None and iv.chevauche(debut, fin)
+
+    def chambres_occupees(self, ids_chambres: Iterable, debut: datetime, fin: datetime) -> Set[UUID]:
+        """Sous-ensemble des chambres données qui ont un chevauchement."""
+        occupees = set()
+        with self._verrou:
+            for id_ch in ids_chambres:
+                id_ch = _uuid(id_ch)
+                iv = self._par_chambre.get(id_ch)
+                if iv is not None and iv.chevauche(debut, fin):
+                    occupees.add(id_ch)
+        return occupees
+
+# Instance du process (un index par worker).
+index_occupation = IndexOccupation(
+    intervalle_controle=float(os.getenv("HOTEL_OCCUPATION_CONTROLE_S", "1.0")),
+    ttl=float(os.getenv("HOTEL_OCCUPATION_TTL_S", "300")),
+)
@@ -0,0 +1,84 @@
+# metier/pagination.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/pagination.py
+# Rôle : pagination keyset (curseur) commune aux listes de la couche métier.
+# Idée:
+#   - On trie sur la clé d'affichage + la PK (départage stable), ex.:
+#     (date_debut_reservation, id_reservation).
+#   - Le curseur encode les valeurs de la dernière ligne servie; la page
+#     suivante filtre "clé > curseur" au lieu d'un OFFSET, donc la page N coûte
+#     comme la page 1 (l'index est parcouru à partir du bon endroit).
+#   - Comparaison écrite en OR/AND développé: MSSQL ne supporte pas
+#     (a, b) > (x, y).
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import DateTime, Select, and_, or_
+
+LIMITE_DEFAUT = 100
+LIMITE_MAX = 1000
+
+def valider_limite(limit: int) -> int:
+    if limit is None or limit < 1 or limit > LIMITE_MAX:
+        raise ValueError(f"limit doit être entre 1 et {LIMITE_MAX}.")
+    return limit
+
+def _vers_json(v: Any) -> Any:
+    if isinstance(v, datetime):
+        return v.isoformat()
+    if isinstance(v, UUID):
+        return str(v)
+    return v
+
+def encoder_curseur(cle: str, valeurs: Sequence[Any]) -> str:
+    """Curseur opaque: base64url de {"k": nom de la clé, "v": valeurs}."""
+    brut = json.dumps({"k": cle, "v": [_vers_json(v) for v in valeurs]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(brut.encode()).decode().rstrip("=")
+
+def decoder_curseur(cle: str, curseur: str, colonnes: Sequence[Any]) -> List[Any]:
+    try:
+        pad = "=" * (-len(curseur) % 4)
+        data = json.loads(base64.urlsafe_b64decode(curseur + pad))
+        if data.get("k") != cle or len(data.get("v", [])) != len(colonnes):
+            raise ValueError
+        valeurs = []
+        for col, v in zip(colonnes, data["v"]):
+            # Les dates reviennent en ISO dans le JSON: on les retransforme.
+            if v is not None and isinstance(col.type, DateTime):
+                v = datetime.fromisoformat(v)
+            valeurs.append(v)
+        return valeurs
+    except (ValueError, TypeError, AttributeError, binascii.Error, json.JSONDecodeError):
+        raise ValueError("Curseur de pagination invalide.")
+
+def _apres(colonnes: Sequence[Any], valeurs: Sequence[Any]):
+    # (c1 > v1) OR (c1 = v1 AND c2 > v2) OR (c1 = v1 AND c2 = v2 AND c3 > v3) ...
+    clauses = []
+    for i, (col, v) in enumerate(zip(colonnes, valeurs)):
+        egaux = [c == x for c, x in zip(colonnes[:i], valeurs[:i])]
+        clauses.append(and_(*egaux, col > v))
+    return or_(*clauses)
+
+def paginer(stmt: Select, cle: str, colonnes: Sequence[Any], limit: int, curseur: str | None) -> Select:
+    """Ajoute ORDER BY clé + filtre keyset + LIMIT (limit + 1 pour savoir
+    s'il reste une page)."""
+    valider_limite(limit)
+    if curseur:
+        stmt = stmt.where(_apres(colonnes, decoder_curseur(cle, curseur, colonnes)))
+    return stmt.order_by(*colonnes).limit(limit + 1)
+
+def couper_page(rows: Sequence[Any], cle: str, colonnes: Sequence[Any], limit: int) -> Tuple[List[Any], str | None]:
+    """Garde limit lignes; next_cursor construit depuis la dernière gardée."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    dernier = rows[-1]
+    return rows, encoder_curseur(cle, [getattr(dernier, c.key) for c in colonnes])
@@ -0,0 +1,165 @@
+# metier/projection.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/projection.py
+# Rôle : champs à la carte pour les listes (?fields= & ?expand=), traduits en
+#        SQL: on ne lit que les colonnes servies (load_only) et on ne joint
+#        que les relations demandées.
+# Règles (noms = ceux des DTO de sortie, séparés par des virgules):
+#   - Ni fields ni expand: réponse complète habituelle (DTO), rien ne change.
+#   - fields=dateDebut,prixParJour : champs de premier niveau servis (l'id
+#     de la ressource est toujours servi); sans fields: tous les champs
+#     simples. Les colonnes non servies (ex.: Text info_reservation) ne
+#     sont pas lues.
+#   - expand=chambre,usager : objets imbriqués, tous leurs champs simples;
+#     "chambre.type_chambre" pour descendre d'un niveau. Sans expand: aucun
+#     objet imbriqué, donc aucune jointure.
+#   - fields=chambre.numero_chambre : étend chambre en ne gardant que ce champ.
+#   - Nom inconnu => ValueError (400 côté route).
+# Sortie: dict par ligne (sérialisé par pydantic-core comme les DTO: mêmes
+#         formats de dates/UUID). Les clés de pagination sont toujours lues.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.orm import joinedload, load_only, raiseload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from metier.chargement import strict_actif
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+@dataclass
+class Relation:
+    attribut: Any                 # ex.: Reservation.chambre
+    ressource: "Ressource"
+    interne: bool                 # FK NOT NULL => INNER JOIN
+
+@dataclass
+class Ressource:
+    nom: str
+    identifiant: str                                  # champ DTO toujours servi
+    colonnes: Dict[str, Any]                          # champ DTO -> colonne ORM (ordre du DTO)
+    conversions: Dict[str, Callable[[Any], Any]] = field(default_factory=dict)
+    relations: Dict[str, Relation] = field(default_factory=dict)
+
+TYPE_CHAMBRE = Ressource("typeChambre", "idTypeChambre", {
+    "idTypeChambre": TypeChambre.id_type_chambre,
+    "nom_type": TypeChambre.nom_type,
+    "prix_plafond": TypeChambre.prix_plafond,
+    "prix_plancher": TypeChambre.prix_plancher,
+    "description_chambre": TypeChambre.description_chambre,
+}, conversions={"prix_plancher": float})
+
+CHAMBRE = Ressource("chambre", "idChambre", {
+    "idChambre": Chambre.id_chambre,
+    "numero_chambre": Chambre.numero_chambre,
+    "disponible_reservation": Chambre.disponible_reservation,
+    "autre_informations": Chambre.autre_informations,
+}, relations={"type_chambre": Relation(Chambre.type_chambre, TYPE_CHAMBRE, interne=False)})
+
+USAGER = Ressource("usager", "idUsager", {
+    "idUsager": Usager.id_usager,
+    "prenom": Usager.prenom,
+    "nom": Usager.nom,
+    "adresse": Usager.adresse,
+    "mobile": Usager.mobile,
+    "type_usager": Usager.type_usager,
+})
+
+RESERVATION = Ressource("reservation", "idReservation", {
+    "idReservation": Reservation.id_reservation,
+    "dateDebut": Reservation.date_debut_reservation,
+    "dateFin": Reservation.date_fin_reservation,
+    "prixParJour": Reservation.prix_jour,
+    "infoReservation": Reservation.info_reservation,
+}, conversions={"prixParJour": float}, relations={
+    "chambre": Relation(Reservation.chambre, CHAMBRE, interne=True),
+    "usager": Relation(Reservation.usager, USAGER, interne=True),
+})
+
+# --------------------------------- arbre -------------------------------------
+@dataclass
+class Projection:
+    ressource: Ressource
+    champs: Tuple[str, ...]                           # champs simples servis, identifiant compris
+    relations: Dict[str, "Projection"] = field(default_factory=dict)
+
+    def sans(self, nom: str) -> "Projection":
+        """Copie sans la relation nom (ex.: type servi par le catalogue)."""
+        return Projection(self.ressource, self.champs, {k: v for k, v in self.relations.items() if k != nom})
+
+def _noms(brut: Optional[str]) -> List[str]:
+    return [n.strip() for n in (brut or "").split(",") if n.strip()]
+
+def _inconnu(ressource: Ressource, nom: str) -> ValueError:
+    permis = ", ".join(list(ressource.colonnes) + list(ressource.relations))
+    return ValueError(f"Champ inconnu pour {ressource.nom}: {nom!r} (permis: {permis}).")
+
+def _construire(ressource: Ressource, noeud: dict) -> Projection:
+    voulus = noeud["champs"]
+    champs = tuple(c for c in ressource.colonnes
+                   if c == ressource.identifiant or voulus is None or c in voulus)
+    relations = {nom: _construire(ressource.relations[nom].ressource, sous) for nom, sous in noeud["relations"].items()}
+    return Projection(ressource, champs, relations)
+
+def lire_projection(ressource: Ressource, fields: Optional[str], expand: Optional[str]) -> Optional[Projection]:
+    """?fields= / ?expand= -> Projection, ou None si aucun des deux (réponse complète)."""
+    if fields is None and expand is None:
+        return None
+    racine = {"champs": set() if fields is not None else None, "relations": {}}
+
+    def descendre(chemin: Sequence[str]) -> Tuple[Ressource, dict]:
+        res, noeud = ressource, racine
+        for partie in chemin:
+            if partie not in res.relations:
+                raise _inconnu(res, partie)
+            noeud = noeud["relations"].setdefault(partie, {"champs": None, "relations": {}})
+            res = res.relations[partie].ressource
+        return res, noeud
+
+    for nom in _noms(expand):
+        descendre(nom.split("."))
+    for nom in _noms(fields):
+        *chemin, feuille = nom.split(".")
+        res, noeud = descendre(chemin)
+        if feuille in res.relations:
+            descendre(chemin + [feuille])
+        elif feuille in res.colonnes:
+            if noeud["champs"] is None:
+                noeud["champs"] = set()
+            noeud["champs"].add(feuille)
+        else:
+            raise _inconnu(res, feuille)
+    return _construire(ressource, racine)
+
+# ------------------------------ SQL et sortie --------------------------------
+def options_projection(proj: Projection, toujours: Sequence[Any] = ()) -> List[ORMOption]:
+    """load_only des colonnes servies (+ toujours: clés de tri/pagination, FK
+    utiles), jointure seulement pour les relations demandées."""
+    strict = strict_actif()
+    colonnes = [proj.ressource.colonnes[c] for c in proj.champs]
+    servies = {c.key for c in colonnes}
+    colonnes += [c for c in toujours if c.key not in servies]
+    opts: List[ORMOption] = [load_only(*colonnes, raiseload=strict)]
+    for nom, sous in proj.relations.items():
+        rel = proj.ressource.relations[nom]
+        opts.append(joinedload(rel.attribut, innerjoin=rel.interne).options(*options_projection(sous)))
+    if strict:
+        opts.append(raiseload("*"))
+    return opts
+
+def vers_dict(ent: Any, proj: Projection) -> Dict[str, Any]:
+    res = proj.ressource
+    d = {}
+    for c in proj.champs:
+        v = getattr(ent, res.colonnes[c].key)
+        conv = res.conversions.get(c)
+        d[c] = conv(v) if conv is not None and v is not None else v
+    for nom, sous in proj.relations.items():
+        lie = getattr(ent, res.relations[nom].attribut.key)
+        d[nom] = vers_dict(lie, sous) if lie is not None else None
+    return d
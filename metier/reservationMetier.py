@@ -3,50 +3,184 @@
 # Fichier: metier/reservationMetier.py
 # Rôle : logique métier pour Réservation (CRUD, règles de base).
 # Points clés:
-#   - _naive(): enlève timezone des datetime (DB stocke timezone=False).
+#   - naive(): enlève timezone des datetime (DB stocke timezone=False).
 #   - Création par DTO complet (legacy) ET création minimaliste par IDs.
 #   - Validations: dateFin > dateDebut, prixParJour > 0, usager/chambre existent.
 #   - Update: même validation pour prix > 0; dates cohérentes.
-#   - On recharge les relations après create (selectinload) pour retourner un DTO plein.
+#   - Anti double-réservation: verrou sur la ligne chambre (UPDLOCK côté MSSQL)
+#     puis vérif de chevauchement, le tout dans la transaction de l'insert.
+#     Conflit => ConflitReservation (sous-classe de ValueError, 409 côté API).
+#   - daily_summary (metier/resume.py) ajusté dans la transaction de chaque
+#     écriture: +séjour à la création, -ancien/+nouveau à la modif, -séjour
+#     à la suppression.
+#   - Après chaque écriture: version "reservation" +1 et mise à jour de l'index
+#     d'occupation en mémoire (metier/occupation.py), via _publier_*().
+#   - Lectures et recharges après commit passent par metier/chargement.py
+#     (chambre, type et usager joints: aucun lazy load dans le DTO).
+#   - Création en lot (_creerReservationsLot): mêmes règles, requêtes IN +
+#     INSERT multi-lignes en une transaction, résultat par élément.
+#   - Corps dans _xxx(s, ...): version sync (SessionLocal) + version *Async
+#     (run_async), comme dans chambreMetier.
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
 
-from typing import List, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from uuid import UUID, uuid4
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
 
-from core.db import SessionLocal
+from core.db import SessionLocal, run_async
+from metier.chargement import charger, options_reservation, recharger
+from metier.pagination import LIMITE_DEFAUT, couper_page, paginer
+from metier.projection import Projection, options_projection, vers_dict
+from metier.flux import TAILLE_LOT, iterer, iterer_async
+from metier.occupation import TABLE as TABLE_RESERVATION, Intervalles, index_occupation
+from metier.versions import incrementer_version
+from metier.resume import ajuster_sejour, ajuster_sejours, type_de_chambre
+from DTO.pageDTO import PageDTO
 from DTO.reservationDTO import (
     CriteresRechercheDTO,   # compat ancien, non exposé en route
     ReservationDTO,
     ReservationCreateDTO,
     ReservationUpdateDTO,
+    ResultatLotDTO,
+    LotReservationsDTO,
 )
 from modele.reservation import Reservation
 from modele.chambre import Chambre
 from modele.usager import Usager
 
-def _naive(dt):
+def naive(dt):
     """Enlève la timezone si fournie (DB en timezone=False)."""
     # Juste pour éviter d’insérer un datetime aware dans une colonne naïve.
     return dt.replace(tzinfo=None) if getattr(dt, "tzinfo", None) else dt
 
+def chevauche(debut, fin):
+    """Condition SQL: la réservation chevauche [debut, fin[.
+    Deux séjours se touchant (fin == début suivant) ne se chevauchent pas."""
+    return (Reservation.date_debut_reservation < naive(fin)) & (
+        Reservation.date_fin_reservation > naive(debut)
+    )
+
+class ConflitReservation(ValueError):
+    """La chambre est déjà réservée sur une partie de la période demandée."""
+
+def verrouiller_chambre(s: Session, id_chambre) -> Optional[Chambre]:
+    """Prend un verrou sur la ligne chambre jusqu'au commit/rollback.
+    Deux réservations pour la même chambre passent une après l'autre; les
+    autres chambres ne sont pas bloquées (verrou de ligne, pas de table)."""
+    if s.get_bind().dialect.name == "sqlite":
+        # SQLite ignore FOR UPDATE: un UPDATE neutre prend le verrou d'écriture
+        # (global à la BD) avant la vérification, sinon deux writers passent.
+        s.execute(
+            update(Chambre)
+            .where(Chambre.id_chambre == id_chambre)
+            .values(numero_chambre=Chambre.numero_chambre)
+            .execution_options(synchronize_session=False)
+        )
+    return s.execute(
+        select(Chambre).where(Chambre.id_chambre == id_chambre).with_for_update()
+    ).scalar_one_or_none()
+
+def _verifier_disponible(s: Session, id_chambre, debut, fin, exclure=None) -> None:
+    """ConflitReservation si une autre résa de la chambre chevauche [debut, fin[.
+    À appeler après verrouiller_chambre(), dans la même transaction."""
+    stmt = (
+        select(Reservation.id_reservation)
+        .where(Reservation.fk_id_chambre == id_chambre, chevauche(debut, fin))
+        .limit(1)
+    )
+    if exclure is not None:
+        stmt = stmt.where(Reservation.id_reservation != exclure)
+    if s.execute(stmt).first() is not None:
+        raise ConflitReservation("La chambre est déjà réservée sur cette période.")
+
+def _publier_ecriture(s: Session, r: Reservation) -> None:
+    """Après commit (et après avoir bâti le DTO): version +1, puis l'index
+    d'occupation reçoit l'intervalle à jour (write-through)."""
+    id_ch, id_resa = r.fk_id_chambre, r.id_reservation
+    debut, fin = r.date_debut_reservation, r.date_fin_reservation
+    v = incrementer_version(s, TABLE_RESERVATION)
+    index_occupation.ajouter(id_ch, id_resa, debut, fin, version=v)
+
+def _publier_suppression(s: Session, id_resa) -> None:
+    v = incrementer_version(s, TABLE_RESERVATION)
+    index_occupation.retirer(id_resa, version=v)
+
 # ------------------------------ LIST -----------------------------
-def listerReservations() -> List["ReservationDTO"]:
+def _listerReservations(s: Session) -> List["ReservationDTO"]:
     # Retourne toutes les résas triées par date de début (utile pour UI).
+    rows = s.execute(
+        select(Reservation)
+        .options(*options_reservation())    # 1 requête au lieu de 1 + 3N
+        .order_by(Reservation.date_debut_reservation)
+    ).scalars().all()
+    return [ReservationDTO.from_entity(r) for r in rows]
+
+def listerReservations() -> List["ReservationDTO"]:
+    with SessionLocal() as s:
+        return _listerReservations(s)
+
+async def listerReservationsAsync() -> List["ReservationDTO"]:
+    return await run_async(_listerReservations)
+
+# Page keyset sur (date de début, id): même tri que la liste complète.
+_CLE_RESERVATIONS = (Reservation.date_debut_reservation, Reservation.id_reservation)
+
+def _listerReservationsPage(
+    s: Session, limit: int, curseur: str | None, proj: Projection | None = None
+) -> PageDTO[ReservationDTO] | PageDTO[dict]:
+    # proj (?fields=/?expand=): colonnes et jointures réduites, items en dict.
+    options = options_reservation() if proj is None else options_projection(proj, _CLE_RESERVATIONS)
+    stmt = paginer(select(Reservation).options(*options), "reservation", _CLE_RESERVATIONS, limit, curseur)
+    rows, suivant = couper_page(s.execute(stmt).scalars().all(), "reservation", _CLE_RESERVATIONS, limit)
+    if proj is not None:
+        return PageDTO[dict](items=[vers_dict(r, proj) for r in rows], next_cursor=suivant)
+    return PageDTO[ReservationDTO](items=[ReservationDTO.from_entity(r) for r in rows], next_cursor=suivant)
+
+def listerReservationsPage(
+    limit: int = LIMITE_DEFAUT, curseur: str | None = None, proj: Projection | None = None
+) -> PageDTO[ReservationDTO] | PageDTO[dict]:
     with SessionLocal() as s:
-        rows = s.execute(
-            select(Reservation).order_by(Reservation.date_debut_reservation)
-        ).scalars().all()
-        return [ReservationDTO.from_entity(r) for r in rows]
+        return _listerReservationsPage(s, limit, curseur, proj)
+
+async def listerReservationsPageAsync(
+    limit: int = LIMITE_DEFAUT, curseur: str | None = None, proj: Projection | None = None
+) -> PageDTO[ReservationDTO] | PageDTO[dict]:
+    return await run_async(_listerReservationsPage, limit, curseur, proj)
+
+# Flux (export complet sans tout garder en mémoire), même tri que la liste.
+def _stmtReservationsFlux(proj: Projection | None = None):
+    options = options_reservation() if proj is None else options_projection(proj, _CLE_RESERVATIONS)
+    return (
+        select(Reservation)
+        .options(*options)
+        .order_by(*_CLE_RESERVATIONS)
+    )
+
+def _versSortie(proj: Projection | None):
+    return ReservationDTO.from_entity if proj is None else (lambda r: vers_dict(r, proj))
+
+def iterReservations(taille_lot: int = TAILLE_LOT, proj: Projection | None = None) -> Iterator[ReservationDTO | dict]:
+    return iterer(_stmtReservationsFlux(proj), _versSortie(proj), taille_lot)
+
+def iterReservationsAsync(taille_lot: int = TAILLE_LOT, proj: Projection | None = None) -> AsyncIterator[ReservationDTO | dict]:
+    return iterer_async(_stmtReservationsFlux(proj), _versSortie(proj), taille_lot)
 
 # --------------------------- GET par ID ---------------------------
-def getReservationParId(id_reservation: str) -> Optional["ReservationDTO"]:
+def _getReservationParId(s: Session, id_reservation: str) -> Optional["ReservationDTO"]:
     # Récupère une résa précise par son UUID (ou None si existe pas).
+    r = charger(s, Reservation, id_reservation)
+    return ReservationDTO.from_entity(r) if r else None
+
+def getReservationParId(id_reservation: str) -> Optional["ReservationDTO"]:
     with SessionLocal() as s:
-        r = s.get(Reservation, id_reservation)
-        return ReservationDTO.from_entity(r) if r else None
+        return _getReservationParId(s, id_reservation)
+
+async def getReservationParIdAsync(id_reservation: str) -> Optional["ReservationDTO"]:
+    return await run_async(_getReservationParId, id_reservation)
 
 # ------------------------- RECHERCHE (legacy) --------------------
 def rechercherReservation(criteres: CriteresRechercheDTO) -> List["ReservationDTO"]:
@@ -54,7 +188,7 @@ def rechercherReservation(criteres: CriteresRechercheDTO) -> List["ReservationDT
     with SessionLocal() as s:
         if not criteres.idReservation:
             return []
-        r = s.get(Reservation, criteres.idReservation)
+        r = charger(s, Reservation, criteres.idReservation)
         return [ReservationDTO.from_entity(r)] if r else []
 
 # ----------------------------- CREATE (ancien, DTO complet) -------------
@@ -71,126 +205,274 @@ def creerReservation(dto: ReservationDTO) -> ReservationDTO:
 
     with SessionLocal() as s:
         s: Session
-        # Vérifie existence de l’usager et de la chambre.
+        # Vérifie existence de l’usager et de la chambre (chambre verrouillée).
         u = s.get(Usager, str(dto.usager.idUsager))
-        ch = s.get(Chambre, str(dto.chambre.idChambre))
         if not u:
             raise ValueError("Usager introuvable.")
+        ch = verrouiller_chambre(s, dto.chambre.idChambre)
         if not ch:
             raise ValueError("Chambre introuvable.")
+        _verifier_disponible(s, ch.id_chambre, dto.dateDebut, dto.dateFin)
 
         # Construit l’entité ORM en gardant les types conformes (prix float).
         r = Reservation(
-            date_debut_reservation=_naive(dto.dateDebut),
-            date_fin_reservation=_naive(dto.dateFin),
+            date_debut_reservation=naive(dto.dateDebut),
+            date_fin_reservation=naive(dto.dateFin),
             prix_jour=float(dto.prixParJour),   # modèle: MONEY/float
             info_reservation=dto.infoReservation,
             fk_id_usager=u.id_usager,
             fk_id_chambre=ch.id_chambre,
         )
         s.add(r)
+        ajuster_sejour(s, ch.fk_type_chambre, r.date_debut_reservation, r.date_fin_reservation, r.prix_jour)
         s.commit()
-        s.refresh(r)
-        return ReservationDTO.from_entity(r)
+        r = recharger(s, Reservation, r.id_reservation)
+        dto_sortie = ReservationDTO.from_entity(r)
+        _publier_ecriture(s, r)
+        return dto_sortie
 
 # ----------------------------- CREATE (nouveau, payload minimal) ---------
-def creerReservationAvecIds(data: ReservationCreateDTO) -> ReservationDTO:
-    """Crée une réservation avec seulement idUsager, idChambre, dates, prix, info."""
+def _valider_creation(data: ReservationCreateDTO) -> None:
     # Garde les mêmes règles de base que la version legacy.
     if data.dateFin <= data.dateDebut:
         raise ValueError("La date de fin doit être après la date de début.")
     if data.prixParJour is None or float(data.prixParJour) <= 0:
         raise ValueError("prixParJour doit être > 0.")
 
+def _creerReservationAvecIds(s: Session, data: ReservationCreateDTO) -> ReservationDTO:
+    u = s.get(Usager, str(data.idUsager))
+    if not u:
+        raise ValueError("Usager introuvable.")
+    # Verrou chambre + vérif de chevauchement, tenus jusqu'au commit de l'insert.
+    ch = verrouiller_chambre(s, data.idChambre)
+    if not ch:
+        raise ValueError("Chambre introuvable.")
+    _verifier_disponible(s, ch.id_chambre, data.dateDebut, data.dateFin)
+
+    r = Reservation(
+        date_debut_reservation=naive(data.dateDebut),
+        date_fin_reservation=naive(data.dateFin),
+        prix_jour=float(data.prixParJour),
+        info_reservation=data.infoReservation,
+        fk_id_usager=u.id_usager,
+        fk_id_chambre=ch.id_chambre,
+    )
+    s.add(r)
+    ajuster_sejour(s, ch.fk_type_chambre, r.date_debut_reservation, r.date_fin_reservation, r.prix_jour)
+    s.commit()
+
+    # Recharger avec relations pour retourner un DTO complet
+    # (joinedload via chargement.py, pis on est sûr d’avoir chambre+usager hydratés).
+    r = recharger(s, Reservation, r.id_reservation)
+    dto = ReservationDTO.from_entity(r)
+    _publier_ecriture(s, r)
+    return dto
+
+def creerReservationAvecIds(data: ReservationCreateDTO) -> ReservationDTO:
+    """Crée une réservation avec seulement idUsager, idChambre, dates, prix, info."""
+    _valider_creation(data)
     with SessionLocal() as s:
-        s: Session
-        u = s.get(Usager, str(data.idUsager))
-        ch = s.get(Chambre, str(data.idChambre))
+        return _creerReservationAvecIds(s, data)
+
+async def creerReservationAvecIdsAsync(data: ReservationCreateDTO) -> ReservationDTO:
+    """Version async de creerReservationAvecIds (mêmes validations)."""
+    _valider_creation(data)
+    return await run_async(_creerReservationAvecIds, data)
+
+# ----------------------------- CREATE (lot) ------------------------------
+# Même règles que creerReservationAvecIds, mais pour N éléments: 2 requêtes IN
+# (usagers, chambres verrouillées), 1 requête de chevauchement, 1 INSERT
+# multi-lignes et 1 commit. Résultat par élément (201 / 400 / 409).
+LOT_MAX = 1000
+
+def verrouiller_chambres(s: Session, ids_chambres) -> Dict[UUID, Optional[UUID]]:
+    """Verrouille plusieurs chambres (ordre d'ID: pas d'interblocage entre
+    deux lots). Retourne {id_chambre: fk_type_chambre} des chambres trouvées."""
+    ids = sorted(set(ids_chambres))
+    if not ids:
+        return {}
+    if s.get_bind().dialect.name == "sqlite":
+        s.execute(
+            update(Chambre)
+            .where(Chambre.id_chambre.in_(ids))
+            .values(numero_chambre=Chambre.numero_chambre)
+            .execution_options(synchronize_session=False)
+        )
+    rows = s.execute(
+        select(Chambre.id_chambre, Chambre.fk_type_chambre)
+        .where(Chambre.id_chambre.in_(ids))
+        .order_by(Chambre.id_chambre)
+        .with_for_update()
+    ).all()
+    return {id_ch: id_type for id_ch, id_type in rows}
+
+def _creerReservationsLot(s: Session, items: List[ReservationCreateDTO]) -> LotReservationsDTO:
+    if len(items) > LOT_MAX:
+        raise ValueError(f"Lot trop gros ({len(items)} éléments, max {LOT_MAX}).")
+    resultats: List[Optional[ResultatLotDTO]] = [None] * len(items)
+    valides = []
+    for i, data in enumerate(items):
+        try:
+            _valider_creation(data)
+            valides.append(i)
+        except ValueError as e:
+            resultats[i] = ResultatLotDTO(index=i, statut=400, erreur=str(e))
+
+    ids_usagers = {items[i].idUsager for i in valides}
+    usagers = set(s.scalars(select(Usager.id_usager).where(Usager.id_usager.in_(ids_usagers)))) if ids_usagers else set()
+    chambres = verrouiller_chambres(s, (items[i].idChambre for i in valides))
+
+    # Réservations existantes qui touchent la fenêtre du lot, par chambre.
+    occupees: Dict[UUID, Intervalles] = defaultdict(Intervalles)
+    if chambres and valides:
+        debut_lot = min(naive(items[i].dateDebut) for i in valides)
+        fin_lot = max(naive(items[i].dateFin) for i in valides)
+        for id_ch, id_r, debut, fin in s.execute(
+            select(Reservation.fk_id_chambre, Reservation.id_reservation,
+                   Reservation.date_debut_reservation, Reservation.date_fin_reservation)
+            .where(Reservation.fk_id_chambre.in_(list(chambres)), chevauche(debut_lot, fin_lot))
+        ):
+            occupees[id_ch].ajouter(debut, fin, id_r)
+
+    lignes = []
+    for i in valides:
+        data = items[i]
+        debut, fin = naive(data.dateDebut), naive(data.dateFin)
+        if data.idUsager not in usagers:
+            resultats[i] = ResultatLotDTO(index=i, statut=400, erreur="Usager introuvable.")
+        elif data.idChambre not in chambres:
+            resultats[i] = ResultatLotDTO(index=i, statut=400, erreur="Chambre introuvable.")
+        elif occupees[data.idChambre].chevauche(debut, fin):
+            # Chevauche une résa existante OU un élément précédent du même lot.
+            resultats[i] = ResultatLotDTO(index=i, statut=409, erreur="La chambre est déjà réservée sur cette période.")
+        else:
+            id_r = uuid4()
+            occupees[data.idChambre].ajouter(debut, fin, id_r)
+            lignes.append(dict(
+                id_reservation=id_r,
+                date_debut_reservation=debut,
+                date_fin_reservation=fin,
+                prix_jour=float(data.prixParJour),
+                info_reservation=data.infoReservation,
+                fk_id_usager=data.idUsager,
+                fk_id_chambre=data.idChambre,
+            ))
+            resultats[i] = ResultatLotDTO(index=i, statut=201, idReservation=id_r)
+
+    if lignes:
+        # IDs générés ici: pas besoin de RETURNING, l'insert part en executemany.
+        s.execute(insert(Reservation), lignes)
+        ajuster_sejours(s, (
+            (chambres[l["fk_id_chambre"]], l["date_debut_reservation"], l["date_fin_reservation"], l["prix_jour"])
+            for l in lignes
+        ))
+    s.commit()
+    if lignes:
+        _publier_lot(s, lignes)
+    return LotReservationsDTO(crees=len(lignes), erreurs=len(items) - len(lignes), resultats=resultats)
+
+def _publier_lot(s: Session, lignes: List[dict]) -> None:
+    # Une seule version pour tout le lot: seul le dernier ajout la « suit ».
+    v = incrementer_version(s, TABLE_RESERVATION)
+    for n, l in enumerate(lignes, 1):
+        index_occupation.ajouter(l["fk_id_chambre"], l["id_reservation"], l["date_debut_reservation"],
+                                 l["date_fin_reservation"], version=v if n == len(lignes) else None)
+
+def creerReservationsLot(items: List[ReservationCreateDTO]) -> LotReservationsDTO:
+    """Crée plusieurs réservations en une transaction; résultat par élément."""
+    with SessionLocal() as s:
+        return _creerReservationsLot(s, items)
+
+async def creerReservationsLotAsync(items: List[ReservationCreateDTO]) -> LotReservationsDTO:
+    return await run_async(_creerReservationsLot, items)
+
+# ----------------------------- UPDATE -----------------------------
+def _modifierReservation(s: Session, id_reservation: str, data: ReservationUpdateDTO) -> ReservationDTO:
+    r = s.get(Reservation, id_reservation)
+    if not r:
+        raise ValueError("Réservation introuvable.")
+    # État avant modif, pour corriger daily_summary (-ancien, +nouveau).
+    avant = (r.fk_id_chambre, r.date_debut_reservation, r.date_fin_reservation, r.prix_jour)
+
+    # Si on change l’usager, on vérifie qu’il existe.
+    if data.idUsager:
+        u = s.get(Usager, data.idUsager)
         if not u:
             raise ValueError("Usager introuvable.")
+        r.fk_id_usager = u.id_usager
+
+    # Idem pour la chambre.
+    if data.idChambre:
+        ch = s.get(Chambre, data.idChambre)
         if not ch:
             raise ValueError("Chambre introuvable.")
+        r.fk_id_chambre = ch.id_chambre
 
-        r = Reservation(
-            date_debut_reservation=_naive(data.dateDebut),
-            date_fin_reservation=_naive(data.dateFin),
-            prix_jour=float(data.prixParJour),
-            info_reservation=data.infoReservation,
-            fk_id_usager=u.id_usager,
-            fk_id_chambre=ch.id_chambre,
+    # Cohérence des dates au moment de l’update (début < fin).
+    if data.dateDebut:
+        if r.date_fin_reservation and data.dateDebut >= r.date_fin_reservation:
+            raise ValueError("La date de début doit être avant la date de fin.")
+        r.date_debut_reservation = naive(data.dateDebut)
+
+    if data.dateFin:
+        if r.date_debut_reservation and data.dateFin <= r.date_debut_reservation:
+            raise ValueError("La date de fin doit être après la date de début.")
+        r.date_fin_reservation = naive(data.dateFin)
+
+    # ✅ Ajout: validation prixParJour > 0 à la mise à jour
+    if data.prixParJour is not None:
+        if float(data.prixParJour) <= 0:
+            raise ValueError("prixParJour doit être > 0.")
+        r.prix_jour = float(data.prixParJour)  # modèle: float
+
+    # Note: infoReservation peut être None (on accepte).
+    if data.infoReservation is not None:
+        r.info_reservation = data.infoReservation
+
+    # Chambre ou dates changées: même verrou + vérif que la création
+    # (en s'excluant soi-même du chevauchement).
+    if data.idChambre or data.dateDebut or data.dateFin:
+        verrouiller_chambre(s, r.fk_id_chambre)
+        _verifier_disponible(
+            s, r.fk_id_chambre, r.date_debut_reservation, r.date_fin_reservation,
+            exclure=r.id_reservation,
         )
-        s.add(r)
-        s.commit()
 
-        # Recharger avec relations pour retourner un DTO complet
-        # (selectinload évite N+1, pis on est sûr d’avoir chambre+usager hydratés).
-        r = s.execute(
-            select(Reservation)
-            .options(
-                selectinload(Reservation.chambre).selectinload(Chambre.type_chambre),
-                selectinload(Reservation.usager),
-            )
-            .where(Reservation.id_reservation == r.id_reservation)
-        ).scalar_one()
+    apres = (r.fk_id_chambre, r.date_debut_reservation, r.date_fin_reservation, r.prix_jour)
+    if apres != avant:
+        ajuster_sejour(s, type_de_chambre(s, avant[0]), *avant[1:], signe=-1)
+        ajuster_sejour(s, type_de_chambre(s, apres[0]), *apres[1:])
 
-        return ReservationDTO.from_entity(r)
+    s.commit()
+    r = recharger(s, Reservation, r.id_reservation)
+    dto = ReservationDTO.from_entity(r)
+    _publier_ecriture(s, r)
+    return dto
 
-# ----------------------------- UPDATE -----------------------------
 def modifierReservation(id_reservation: str, data: ReservationUpdateDTO) -> ReservationDTO:
     with SessionLocal() as s:
-        s: Session
+        return _modifierReservation(s, id_reservation, data)
 
-        r = s.get(Reservation, id_reservation)
-        if not r:
-            raise ValueError("Réservation introuvable.")
-
-        # Si on change l’usager, on vérifie qu’il existe.
-        if data.idUsager:
-            u = s.get(Usager, data.idUsager)
-            if not u:
-                raise ValueError("Usager introuvable.")
-            r.fk_id_usager = u.id_usager
-
-        # Idem pour la chambre.
-        if data.idChambre:
-            ch = s.get(Chambre, data.idChambre)
-            if not ch:
-                raise ValueError("Chambre introuvable.")
-            r.fk_id_chambre = ch.id_chambre
-
-        # Cohérence des dates au moment de l’update (début < fin).
-        if data.dateDebut:
-            if r.date_fin_reservation and data.dateDebut >= r.date_fin_reservation:
-                raise ValueError("La date de début doit être avant la date de fin.")
-            r.date_debut_reservation = _naive(data.dateDebut)
-
-        if data.dateFin:
-            if r.date_debut_reservation and data.dateFin <= r.date_debut_reservation:
-                raise ValueError("La date de fin doit être après la date de début.")
-            r.date_fin_reservation = _naive(data.dateFin)
-
-        # ✅ Ajout: validation prixParJour > 0 à la mise à jour
-        if data.prixParJour is not None:
-            if float(data.prixParJour) <= 0:
-                raise ValueError("prixParJour doit être > 0.")
-            r.prix_jour = float(data.prixParJour)  # modèle: float
-
-        # Note: infoReservation peut être None (on accepte).
-        if data.infoReservation is not None:
-            r.info_reservation = data.infoReservation
-
-        s.commit()
-        s.refresh(r)
-        return ReservationDTO.from_entity(r)
+async def modifierReservationAsync(id_reservation: str, data: ReservationUpdateDTO) -> ReservationDTO:
+    return await run_async(_modifierReservation, id_reservation, data)
 
 # ----------------------------- DELETE -----------------------------
-def supprimerReservation(id_reservation: str) -> bool:
+def _supprimerReservation(s: Session, id_reservation: str) -> bool:
     # Suppression « douce » : False si l’ID existe pas.
+    r = s.get(Reservation, id_reservation)
+    if not r:
+        return False
+    id_resa = r.id_reservation
+    ajuster_sejour(s, type_de_chambre(s, r.fk_id_chambre), r.date_debut_reservation,
+                   r.date_fin_reservation, r.prix_jour, signe=-1)
+    s.delete(r)
+    s.commit()
+    _publier_suppression(s, id_resa)
+    return True
+
+def supprimerReservation(id_reservation: str) -> bool:
     with SessionLocal() as s:
-        s: Session
-        r = s.get(Reservation, id_reservation)
-        if not r:
-            return False
-        s.delete(r)
-        s.commit()
-        return True
+        return _supprimerReservation(s, id_reservation)
+
+async def supprimerReservationAsync(id_reservation: str) -> bool:
+    return await run_async(_supprimerReservation, id_reservation)
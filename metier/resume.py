@@ -0,0 +1,240 @@
+# metier/resume.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/resume.py
+# Rôle : maintien incrémental de daily_summary (nuits vendues + revenu par jour
+#        et par type de chambre) et reconstruction complète.
+# Règles:
+#   - Une réservation occupe les nuits [date(début), date(fin)[, au moins une
+#     (même convention que metier/calendrier.py). Revenu d'une nuit = prix_jour.
+#   - ajuster_sejour() applique un delta (+1 / -1 séjour) DANS la transaction
+#     de l'écriture métier: un UPDATE (plage de jours si possible) pour les
+#     lignes existantes seulement, puis INSERT des jours manquants.
+#   - Deux transactions peuvent vouloir créer la même ligne (même jour, même
+#     type, chambres différentes): l'INSERT passe dans un savepoint et, en cas
+#     d'IntegrityError, on refait UPDATE/INSERT pour ces jours seulement.
+#   - ajuster_sejours(): même chose pour un lot (création en lot), deltas
+#     cumulés par (type, jour) et appliqués en executemany.
+#   - deplacer_chambre(): changement de type d'une chambre, nuits de toutes
+#     ses réservations agrégées par jour puis -ancien/+nouveau en un seul lot.
+#     retirer_type(): idem pour toutes les chambres d'un type supprimé.
+#   - reconstruireResume(): recalcul complet (backfill d'une BD existante, ou
+#     après un import en masse). Expansion des nuits vectorisée en NumPy.
+#   Usage: python -m metier.resume
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.db import SessionLocal
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.resume_journalier import SANS_TYPE, ResumeJournalier
+
+_TABLE = ResumeJournalier.__table__
+
+def nuits(debut: datetime, fin: datetime) -> Tuple[date, int]:
+    """(première nuit, nombre de nuits) d'un séjour."""
+    premiere = debut.date() if isinstance(debut, datetime) else debut
+    derniere = fin.date() if isinstance(fin, datetime) else fin
+    return premiere, max((derniere - premiere).days, 1)
+
+def type_de_chambre(s: Session, id_chambre) -> UUID:
+    id_type = s.execute(
+        select(Chambre.fk_type_chambre).where(Chambre.id_chambre == id_chambre)
+    ).scalar_one_or_none()
+    return id_type or SANS_TYPE
+
+def _ajuster_jours(s: Session, id_type: UUID, jours: List[date], dn: int, dr: float) -> None:
+    j0, j1 = jours[0], jours[-1]
+    existants = set(s.scalars(
+        select(ResumeJournalier.jour).where(
+            ResumeJournalier.fk_type_chambre == id_type,
+            ResumeJournalier.jour >= j0,
+            ResumeJournalier.jour <= j1,
+        )
+    ))
+    if existants:
+        # UPDATE limité aux lignes vues: un jour manquant créé entre-temps par
+        # une autre transaction sera compté par le retry de l'INSERT, pas deux
+        # fois. Lignes vues contiguës => une plage, sinon IN.
+        vus = sorted(existants)
+        contigu = (vus[-1] - vus[0]).days + 1 == len(vus)
+        s.execute(
+            update(ResumeJournalier)
+            .where(
+                ResumeJournalier.fk_type_chambre == id_type,
+                (ResumeJournalier.jour >= vus[0]) & (ResumeJournalier.jour <= vus[-1]) if contigu
+                else ResumeJournalier.jour.in_(vus),
+            )
+            .values(
+                nuits_vendues=ResumeJournalier.nuits_vendues + dn,
+                revenu=ResumeJournalier.revenu + dr,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    manquants = [j for j in jours if j not in existants]
+    if not manquants:
+        return
+    try:
+        with s.begin_nested():
+            s.execute(insert(_TABLE), [
+                {"jour": j, "fk_type_chambre": id_type, "nuits_vendues": dn, "revenu": dr}
+                for j in manquants
+            ])
+    except IntegrityError:
+        # Créées entre-temps par une autre transaction: elles existent maintenant.
+        _ajuster_jours(s, id_type, manquants, dn, dr)
+
+def ajuster_sejour(s: Session, id_type: Optional[UUID], debut: datetime, fin: datetime,
+                   prix_jour: float, signe: int = 1) -> None:
+    """Ajoute (signe=1) ou retire (signe=-1) un séjour du résumé. Pas de commit."""
+    premiere, n = nuits(debut, fin)
+    jours = [premiere + timedelta(days=i) for i in range(n)]
+    _ajuster_jours(s, id_type or SANS_TYPE, jours, signe, signe * float(prix_jour))
+
+def _appliquer_deltas(s: Session, deltas: Dict[Tuple[UUID, date], List[float]]) -> None:
+    # Même principe que _ajuster_jours, en executemany (un paramètre par ligne).
+    jours = [j for _, j in deltas]
+    existants = set(s.execute(
+        select(ResumeJournalier.fk_type_chambre, ResumeJournalier.jour).where(
+            ResumeJournalier.fk_type_chambre.in_({t for t, _ in deltas}),
+            ResumeJournalier.jour >= min(jours),
+            ResumeJournalier.jour <= max(jours),
+        )
+    ).all())
+    maj = [{"t": t, "j": j, "dn": dn, "dr": dr} for (t, j), (dn, dr) in deltas.items() if (t, j) in existants]
+    if maj:
+        s.execute(
+            _TABLE.update()
+            .where(_TABLE.c.fk_type_chambre == bindparam("t"), _TABLE.c.jour == bindparam("j"))
+            .values(nuits_vendues=_TABLE.c.nuits_vendues + bindparam("dn"),
+                    revenu=_TABLE.c.revenu + bindparam("dr")),
+            maj,
+        )
+    manquants = {k: v for k, v in deltas.items() if k not in existants}
+    if not manquants:
+        return
+    try:
+        with s.begin_nested():
+            s.execute(insert(_TABLE), [
+                {"jour": j, "fk_type_chambre": t, "nuits_vendues": dn, "revenu": dr}
+                for (t, j), (dn, dr) in manquants.items()
+            ])
+    except IntegrityError:
+        _appliquer_deltas(s, manquants)
+
+def ajuster_sejours(s: Session, sejours: Iterable[Tuple[Optional[UUID], datetime, datetime, float]]) -> None:
+    """Version lot de ajuster_sejour (+1 chacun): deltas cumulés par (type, jour)
+    puis un UPDATE executemany + un INSERT multi-lignes. Pas de commit."""
+    deltas: Dict[Tuple[UUID, date], List[float]] = defaultdict(lambda: [0, 0.0])
+    for id_type, debut, fin, prix in sejours:
+        premiere, n = nuits(debut, fin)
+        for i in range(n):
+            d = deltas[(id_type or SANS_TYPE, premiere + timedelta(days=i))]
+            d[0] += 1
+            d[1] += float(prix)
+    if deltas:
+        _appliquer_deltas(s, dict(deltas))
+
+def _deplacer(s: Session, chambres, ancien_type: Optional[UUID], nouveau_type: Optional[UUID]) -> None:
+    # Nuits des réservations de `chambres` (condition sur fk_id_chambre),
+    # agrégées par jour une seule fois: -ancien type, +nouveau, un seul lot.
+    ancien, nouveau = ancien_type or SANS_TYPE, nouveau_type or SANS_TYPE
+    if ancien == nouveau:
+        return
+    rows = s.execute(
+        select(Reservation.date_debut_reservation, Reservation.date_fin_reservation, Reservation.prix_jour)
+        .where(chambres)
+    ).all()
+    lignes = _agreger((ancien, debut, fin, prix) for debut, fin, prix in rows)
+    deltas: Dict[Tuple[UUID, date], List[float]] = {}
+    for l in lignes:
+        deltas[(ancien, l["jour"])] = [-l["nuits_vendues"], -l["revenu"]]
+        deltas[(nouveau, l["jour"])] = [l["nuits_vendues"], l["revenu"]]
+    if deltas:
+        _appliquer_deltas(s, deltas)
+
+def deplacer_chambre(s: Session, id_chambre, ancien_type: Optional[UUID], nouveau_type: Optional[UUID]) -> None:
+    """La chambre change de type: ses réservations passent d'un type à l'autre."""
+    _deplacer(s, Reservation.fk_id_chambre == id_chambre, ancien_type, nouveau_type)
+
+def retirer_type(s: Session, id_type) -> None:
+    """Le type va être supprimé (ses chambres passent à fk NULL): leurs nuits
+    passent sous SANS_TYPE, comme le donnerait reconstruireResume()."""
+    chambres = select(Chambre.id_chambre).where(Chambre.fk_type_chambre == id_type)
+    _deplacer(s, Reservation.fk_id_chambre.in_(chambres), id_type, SANS_TYPE)
+
+# ------------------------------ reconstruction ------------------------------
+def _agreger(rows: Iterable[Tuple]) -> List[Dict]:
+    """(type, début, fin, prix) -> lignes daily_summary, sans boucle par nuit."""
+    rows = list(rows)
+    if not rows:
+        return []
+    types, debuts, fins, prix = zip(*rows)
+    codes: Dict[UUID, int] = {}
+    code = np.fromiter((codes.setdefault(t or SANS_TYPE, len(codes)) for t in types), dtype=np.int64, count=len(rows))
+    d = np.fromiter(map(date.toordinal, debuts), dtype=np.int64, count=len(rows))
+    f = np.fromiter(map(date.toordinal, fins), dtype=np.int64, count=len(rows))
+    longueur = np.maximum(f - d, 1)
+    p = np.asarray(prix, dtype=np.float64)
+
+    # Une entrée par nuit: début répété + rang de la nuit dans son séjour.
+    total = int(longueur.sum())
+    rang = np.arange(total) - np.repeat(np.cumsum(longueur) - longueur, longueur)
+    jour = np.repeat(d, longueur) + rang
+    j_min = int(jour.min())
+    etendue = int(jour.max()) - j_min + 1
+    cle = np.repeat(code, longueur) * etendue + (jour - j_min)
+    taille = len(codes) * etendue
+    nb = np.bincount(cle, minlength=taille)
+    revenu = np.bincount(cle, weights=np.repeat(p, longueur), minlength=taille)
+
+    par_code = {c: t for t, c in codes.items()}
+    presentes = np.nonzero(nb)[0]
+    return [
+        {
+            "jour": date.fromordinal(j_min + int(k % etendue)),
+            "fk_type_chambre": par_code[int(k // etendue)],
+            "nuits_vendues": int(nb[k]),
+            "revenu": round(float(revenu[k]), 4),
+        }
+        for k in presentes
+    ]
+
+def _reconstruireResume(s: Session) -> int:
+    rows = s.execute(
+        select(
+            Chambre.fk_type_chambre,
+            Reservation.date_debut_reservation,
+            Reservation.date_fin_reservation,
+            Reservation.prix_jour,
+        ).join(Chambre, Chambre.id_chambre == Reservation.fk_id_chambre)
+    ).all()
+    lignes = _agreger(rows)
+    s.execute(delete(ResumeJournalier).execution_options(synchronize_session=False))
+    if lignes:
+        s.execute(insert(_TABLE), lignes)
+    s.commit()
+    return len(lignes)
+
+def reconstruireResume(s: Session | None = None) -> int:
+    """Recalcule daily_summary depuis reservation (commit). Retourne le nb de
+    lignes. s: session de l'appelant (ex.: générateur de données), sinon une
+    SessionLocal."""
+    if s is not None:
+        return _reconstruireResume(s)
+    with SessionLocal() as s:
+        return _reconstruireResume(s)
+
+if __name__ == "__main__":
+    from core.db import init_db
+    init_db()
+    print(f"daily_summary: {reconstruireResume()} lignes")
@@ -5,6 +5,9 @@
 # Détails:
 #   - creerUsager: petit check (nom+prenom+mobile) pour éviter des clones évidents.
 #   - modifierUsager: patch champ par champ, normalise le mdp à 60 chars.
+#   - Corps dans _xxx(s, ...): version sync (SessionLocal) + version *Async
+#     (run_async), comme dans chambreMetier.
+#   - Chaque écriture: version "usager" +1 après commit (ETag des GET).
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
@@ -12,64 +15,124 @@ from __future__ import annotations
 # Imports: on mélange ici ORM (Session, select) + types utilitaires (UUID)
 from sqlalchemy.orm import Session
 from sqlalchemy import select
+from typing import AsyncIterator, Iterator
 from uuid import UUID
 
 # SessionLocal: fabrique de sessions DB; on ouvre/ferme par context manager
-from core.db import SessionLocal
+# run_async: même corps de fonction, mais via AsyncSession (routes async)
+from core.db import SessionLocal, run_async
+# Options de chargement communes (voir metier/chargement.py)
+from metier.chargement import charger, options_usager
+# Pagination keyset (curseur opaque) pour les listes
+from metier.pagination import LIMITE_DEFAUT, couper_page, paginer
+from DTO.pageDTO import PageDTO
+# Flux par lots (yield_per) pour l'export complet
+from metier.flux import TAILLE_LOT, iterer, iterer_async
+# Compteur de modification de la table (ETag des GET)
+from metier.versions import incrementer_version
 
 # Modèle ORM (table `usager`) et DTO (entrées/sorties côté API)
 from modele.usager import Usager
 from DTO.usagerDTO import UsagerDTO, UsagerCreateDTO, UsagerUpdateDTO, UsagerSearchDTO
 
+TABLE_USAGER = "usager"
+
 # ------------------------------ CREATE -----------------------------
 # Création d'un usager. On fait une vérif simple d'existence "métier"
 # (nom + prénom + mobile) pour éviter de créer des doublons évidents.
+def _creerUsager(s: Session, data: UsagerCreateDTO) -> UsagerDTO:
+    # Petit check anti-doublon: même nom/prénom/mobile => on retourne l'existant
+    existing = s.execute(
+        select(Usager).where(
+            (Usager.nom == data.nom)
+            & (Usager.prenom == data.prenom)
+            & (Usager.mobile == data.mobile)
+        )
+    ).scalar_one_or_none()
+
+    if existing:
+        return UsagerDTO.from_entity(existing)
+
+    # Création de l'entité ORM à partir des champs du DTO
+    # Note: mot_de_passe est normalisé à 60 char (padding) pour être conforme
+    #       à une éventuelle colonne CHAR(60) / hash de longueur fixe.
+    u = Usager(
+        prenom=data.prenom,
+        nom=data.nom,
+        adresse=data.adresse,
+        mobile=data.mobile,
+        mot_de_passe=(data.mot_de_passe[:60]).ljust(60)[:60],
+        type_usager=data.type_usager,
+    )
+    s.add(u)
+    s.commit()     # Persisté en DB
+    s.refresh(u)   # Recharge pour obtenir l'ID/valeurs générées
+    dto = UsagerDTO.from_entity(u)
+    incrementer_version(s, TABLE_USAGER)
+    return dto
+
 def creerUsager(data: UsagerCreateDTO) -> UsagerDTO:
     with SessionLocal() as s:
-        # Petit check anti-doublon: même nom/prénom/mobile => on retourne l'existant
-        existing = s.execute(
-            select(Usager).where(
-                (Usager.nom == data.nom)
-                & (Usager.prenom == data.prenom)
-                & (Usager.mobile == data.mobile)
-            )
-        ).scalar_one_or_none()
-
-        if existing:
-            return UsagerDTO(existing)
-
-        # Création de l'entité ORM à partir des champs du DTO
-        # Note: mot_de_passe est normalisé à 60 char (padding) pour être conforme
-        #       à une éventuelle colonne CHAR(60) / hash de longueur fixe.
-        u = Usager(
-            prenom=data.prenom,
-            nom=data.nom,
-            adresse=data.adresse,
-            mobile=data.mobile,
-            mot_de_passe=(data.mot_de_passe[:60]).ljust(60)[:60],
-            type_usager=data.type_usager,
-        )
-        s.add(u)
-        s.commit()     # Persisté en DB
-        s.refresh(u)   # Recharge pour obtenir l'ID/valeurs générées
-        return UsagerDTO(u)
+        return _creerUsager(s, data)
+
+async def creerUsagerAsync(data: UsagerCreateDTO) -> UsagerDTO:
+    return await run_async(_creerUsager, data)
 
 # ------------------------------ READ ------------------------------
 # Lecture ciblée par identifiant. On accepte `str` ou `UUID` pour être
 # flexible côté appelants (ex.: provenant de la route ou du service).
+def _getUsagerParId(s: Session, id_usager: str | UUID) -> UsagerDTO | None:
+    u = charger(s, Usager, str(id_usager))
+    return UsagerDTO.from_entity(u) if u else None
+
 def getUsagerParId(id_usager: str | UUID) -> UsagerDTO | None:
     with SessionLocal() as s:
-        u = s.get(Usager, str(id_usager))
-        return UsagerDTO(u) if u else None
+        return _getUsagerParId(s, id_usager)
+
+async def getUsagerParIdAsync(id_usager: str | UUID) -> UsagerDTO | None:
+    return await run_async(_getUsagerParId, id_usager)
 
 # ------------------------------ LIST ------------------------------
 # Listage complet, trié par nom puis prénom pour un affichage stable.
+def _listerUsagers(s: Session) -> list[UsagerDTO]:
+    rows = s.execute(
+        select(Usager)
+        .options(*options_usager())
+        .order_by(Usager.nom, Usager.prenom)
+    ).scalars().all()
+    return [UsagerDTO.from_entity(u) for u in rows]
+
 def listerUsagers() -> list[UsagerDTO]:
     with SessionLocal() as s:
-        rows = s.execute(
-            select(Usager).order_by(Usager.nom, Usager.prenom)
-        ).scalars().all()
-        return [UsagerDTO(u) for u in rows]
+        return _listerUsagers(s)
+
+async def listerUsagersAsync() -> list[UsagerDTO]:
+    return await run_async(_listerUsagers)
+
+# Version paginée (keyset sur nom, prénom, id): la page N coûte comme la page 1.
+_CLE_USAGERS = (Usager.nom, Usager.prenom, Usager.id_usager)
+
+def _listerUsagersPage(s: Session, limit: int, curseur: str | None) -> PageDTO[UsagerDTO]:
+    stmt = paginer(select(Usager).options(*options_usager()), "usager", _CLE_USAGERS, limit, curseur)
+    rows, suivant = couper_page(s.execute(stmt).scalars().all(), "usager", _CLE_USAGERS, limit)
+    return PageDTO[UsagerDTO](items=[UsagerDTO.from_entity(u) for u in rows], next_cursor=suivant)
+
+def listerUsagersPage(limit: int = LIMITE_DEFAUT, curseur: str | None = None) -> PageDTO[UsagerDTO]:
+    with SessionLocal() as s:
+        return _listerUsagersPage(s, limit, curseur)
+
+async def listerUsagersPageAsync(limit: int = LIMITE_DEFAUT, curseur: str | None = None) -> PageDTO[UsagerDTO]:
+    return await run_async(_listerUsagersPage, limit, curseur)
+
+# Flux complet: on lit par lots au lieu de tout charger (NDJSON côté route).
+def _stmtUsagersFlux():
+    return select(Usager).options(*options_usager()).order_by(*_CLE_USAGERS)
+
+def iterUsagers(taille_lot: int = TAILLE_LOT) -> Iterator[UsagerDTO]:
+    return iterer(_stmtUsagersFlux(), UsagerDTO.from_entity, taille_lot)
+
+def iterUsagersAsync(taille_lot: int = TAILLE_LOT) -> AsyncIterator[UsagerDTO]:
+    return iterer_async(_stmtUsagersFlux(), UsagerDTO.from_entity, taille_lot)
 
 # -------------------------- SEARCH (ID) ---------------------------
 # Compat/recherche minimaliste utilisée ailleurs: on prend un DTO de
@@ -78,48 +141,60 @@ def rechercherUsager(critere: UsagerSearchDTO) -> list[UsagerDTO]:
     with SessionLocal() as s:
         if not critere.idUsager:
             return []
-        u = s.get(Usager, critere.idUsager)
-        return [UsagerDTO(u)] if u else []
+        u = charger(s, Usager, critere.idUsager)
+        return [UsagerDTO.from_entity(u)] if u else []
 
 # ----------------------------- UPDATE -----------------------------
 # Mise à jour partielle: on touche seulement aux champs fournis dans le DTO
 # (pattern "patch-like"). Si un champ est None, on le laisse tel quel.
+def _modifierUsager(s: Session, id_usager: str, data: UsagerUpdateDTO) -> UsagerDTO:
+    u = s.get(Usager, id_usager)
+    if not u:
+        raise ValueError("Usager introuvable.")
+
+    if data.prenom is not None:
+        u.prenom = data.prenom
+    if data.nom is not None:
+        u.nom = data.nom
+    if data.adresse is not None:
+        u.adresse = data.adresse
+    if data.mobile is not None:
+        u.mobile = data.mobile
+    if data.mot_de_passe is not None:
+        # Même normalisation à 60 char que lors de la création
+        u.mot_de_passe = (data.mot_de_passe[:60]).ljust(60)[:60]
+    if data.type_usager is not None:
+        u.type_usager = data.type_usager
+
+    s.commit()
+    s.refresh(u)
+    dto = UsagerDTO.from_entity(u)
+    incrementer_version(s, TABLE_USAGER)
+    return dto
+
 def modifierUsager(id_usager: str, data: UsagerUpdateDTO) -> UsagerDTO:
     with SessionLocal() as s:
-        s: Session
-
-        u = s.get(Usager, id_usager)
-        if not u:
-            raise ValueError("Usager introuvable.")
-
-        if data.prenom is not None:
-            u.prenom = data.prenom
-        if data.nom is not None:
-            u.nom = data.nom
-        if data.adresse is not None:
-            u.adresse = data.adresse
-        if data.mobile is not None:
-            u.mobile = data.mobile
-        if data.mot_de_passe is not None:
-            # Même normalisation à 60 char que lors de la création
-            u.mot_de_passe = (data.mot_de_passe[:60]).ljust(60)[:60]
-        if data.type_usager is not None:
-            u.type_usager = data.type_usager
-
-        s.commit()
-        s.refresh(u)
-        return UsagerDTO(u)
+        return _modifierUsager(s, id_usager, data)
+
+async def modifierUsagerAsync(id_usager: str, data: UsagerUpdateDTO) -> UsagerDTO:
+    return await run_async(_modifierUsager, id_usager, data)
 
 # ----------------------------- DELETE -----------------------------
 # Suppression en douceur: si l'ID est inconnu, on retourne False.
 # Sinon on supprime et on retourne True. Pas d'exception ici car c'est
 # un cas d'usage attendu que l'ID puisse ne pas exister.
+def _supprimerUsager(s: Session, id_usager: str) -> bool:
+    u = s.get(Usager, id_usager)
+    if not u:
+        return False
+    s.delete(u)
+    s.commit()
+    incrementer_version(s, TABLE_USAGER)
+    return True
+
 def supprimerUsager(id_usager: str) -> bool:
     with SessionLocal() as s:
-        s: Session
-        u = s.get(Usager, id_usager)
-        if not u:
-            return False
-        s.delete(u)
-        s.commit()
-        return True
+        return _supprimerUsager(s, id_usager)
+
+async def supprimerUsagerAsync(id_usager: str) -> bool:
+    return await run_async(_supprimerUsager, id_usager)
@@ -0,0 +1,155 @@
+# metier/versions.py
+# -----------------------------------------------------------------------------
+# Fichier: metier/versions.py
+# Rôle : compteurs de modification par table (table compteur_modification).
+# Points d’attention:
+#   - incrementer_version() s'appelle APRÈS le commit métier, dans sa propre
+#     petite transaction: la ligne compteur n'est verrouillée que le temps de
+#     l'UPDATE, donc elle ne sérialise pas les réservations entre elles.
+#   - Si un process plante entre les deux commits, la version rate un
+#     incrément: les caches ont aussi une durée de vie max (resync complet).
+#   - etag_versions(): ETag d'une réponse GET calculé depuis les versions des
+#     tables qu'elle lit (une petite requête au lieu de la liste complète).
+#   - CacheVersionne: base commune des caches en mémoire d'une table
+#     (index d'occupation, catalogue des types). Contrôle de version au plus
+#     une fois par intervalle_controle, rechargement complet si elle diffère.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.db import SessionLocal, run_async
+from modele.compteur import CompteurModification
+
+def version_table(s: Session, nom_table: str) -> int:
+    """Version courante (0 si la table n'a jamais été modifiée)."""
+    v = s.execute(
+        select(CompteurModification.version).where(CompteurModification.nom_table == nom_table)
+    ).scalar_one_or_none()
+    return v or 0
+
+def versions_tables(s: Session, noms: Iterable[str]) -> Dict[str, int]:
+    noms = list(noms)
+    rows = s.execute(
+        select(CompteurModification.nom_table, CompteurModification.version)
+        .where(CompteurModification.nom_table.in_(noms))
+    ).all()
+    trouve = {n: v for n, v in rows}
+    return {n: trouve.get(n, 0) for n in noms}
+
+def lireVersions(noms: Iterable[str]) -> Dict[str, int]:
+    with SessionLocal() as s:
+        return versions_tables(s, noms)
+
+async def lireVersionsAsync(noms: Iterable[str]) -> Dict[str, int]:
+    return await run_async(versions_tables, list(noms))
+
+def etag_versions(versions: Dict[str, int], variante: str = "") -> str:
+    """ETag faible: mêmes versions + même variante (URL, Accept) => même contenu."""
+    brut = ";".join(f"{n}={v}" for n, v in sorted(versions.items())) + "|" + variante
+    return 'W/"' + hashlib.sha1(brut.encode()).hexdigest()[:20] + '"'
+
+def incrementer_version(s: Session, nom_table: str) -> int:
+    """+1 sur la version de nom_table, commit, et retourne la nouvelle valeur."""
+    res = s.execute(
+        update(CompteurModification)
+        .where(CompteurModification.nom_table == nom_table)
+        .values(version=CompteurModification.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount == 0:
+        # Première écriture sur cette table: on crée la ligne.
+        try:
+            s.add(CompteurModification(nom_table=nom_table, version=1))
+            s.flush()
+        except IntegrityError:
+            # Un autre worker l'a créée en même temps: on refait l'UPDATE.
+            s.rollback()
+            return incrementer_version(s, nom_table)
+    v = version_table(s, nom_table)
+    s.commit()
+    return v
+
+class CacheVersionne:
+    """Cache en mémoire du contenu d'une table, resynchronisé par version.
+    Les sous-classes fournissent _lire(s) -> état, _installer(état) et _vider().
+    Désactivé tant que charger() n'a pas été appelé: les appelants retombent
+    alors sur SQL."""
+
+    def __init__(self, table: str, intervalle_controle: float = 1.0, ttl: float = 300.0):
+        self.table = table
+        self.intervalle_controle = intervalle_controle
+        self.ttl = ttl
+        self._verrou = threading.RLock()
+        self._version: Optional[int] = None
+        self._charge_a = 0.0
+        self._controle_a = 0.0
+        self.actif = False
+
+    def _lire(self, s: Session) -> Any:
+        raise NotImplementedError
+
+    def _installer(self, etat: Any) -> None:
+        raise NotImplementedError
+
+    def _vider(self) -> None:
+        raise NotImplementedError
+
+    # ------------------------- chargement / synchro -------------------------
+    def _charger(self, s: Session) -> None:
+        # Version lue AVANT les lignes: une écriture concurrente fera au pire
+        # un rechargement de plus, jamais un cache en retard silencieux.
+        version = version_table(s, self.table)
+        etat = self._lire(s)
+        with self._verrou:
+            self._installer(etat)
+            self._version = version
+            self._charge_a = self._controle_a = time.monotonic()
+            self.actif = True
+
+    def charger(self, s: Session | None = None) -> None:
+        """Chargement complet depuis la BD (démarrage, ou resync)."""
+        if s is not None:
+            self._charger(s)
+            return
+        with SessionLocal() as s:
+            self._charger(s)
+
+    def desactiver(self) -> None:
+        with self._verrou:
+            self.actif = False
+            self._vider()
+            self._version = None
+
+    def synchroniser(self, s: Session | None = None, forcer: bool = False) -> None:
+        """Contrôle de version (au plus 1 petite requête / intervalle)."""
+        if not self.actif:
+            return
+        maintenant = time.monotonic()
+        if not forcer and maintenant - self._controle_a < self.intervalle_controle:
+            return
+        if maintenant - self._charge_a > self.ttl:
+            self.charger(s)
+            return
+        if s is None:
+            with SessionLocal() as s2:
+                v = version_table(s2, self.table)
+        else:
+            v = version_table(s, self.table)
+        self._controle_a = maintenant
+        if v != self._version:
+            self.charger(s)
+
+    def _suivre_version(self, nouvelle: Optional[int]) -> None:
+        # Notre écriture a fait passer la BD à `nouvelle`. Si on était à
+        # nouvelle - 1, personne d'autre n'a écrit entre-temps: on suit.
+        # Sinon on laisse l'ancienne version => le prochain contrôle recharge.
+        if nouvelle is not None and self._version is not None and nouvelle == self._version + 1:
+            self._version = nouvelle
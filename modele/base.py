@@ -4,7 +4,10 @@
 # Rôle : Base déclarative SQLAlchemy. Tous les modèles héritent de ça.
 # -----------------------------------------------------------------------------
 
+from uuid import UUID
 from sqlalchemy.orm import DeclarativeBase
+from .types import GUID
 
 class Base(DeclarativeBase):
-    pass  # Rien d’autre ici, c’est correct. On garde ça simple.
+    # Tous les Mapped[UUID] passent par GUID (portable MSSQL/SQLite).
+    type_annotation_map = {UUID: GUID}
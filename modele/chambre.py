@@ -9,7 +9,7 @@
 
 from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import ForeignKey, SmallInteger, Boolean, Text
+from sqlalchemy import ForeignKey, Index, SmallInteger, Boolean, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import UUID, uuid4
 from .base import Base
@@ -20,6 +20,11 @@ if TYPE_CHECKING:
 
 class Chambre(Base):
     __tablename__ = "chambre"
+    __table_args__ = (
+        # Un numéro = une chambre (GET /chambres/{numero}, import idempotent).
+        Index("uq_chambre_numero", "numero_chambre", unique=True),
+        Index("ix_chambre_type", "fk_type_chambre"),
+    )
 
     id_chambre: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
     numero_chambre: Mapped[int] = mapped_column(SmallInteger, nullable=False)
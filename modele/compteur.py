@@ -0,0 +1,21 @@
+# modele/compteur.py
+# -----------------------------------------------------------------------------
+# Fichier: modele/compteur.py
+# Rôle : Modèle ORM pour "compteur_modification" (une ligne par table suivie).
+# Notes:
+#   - version est incrémentée par la couche métier après chaque écriture sur
+#     la table suivie (voir metier/versions.py).
+#   - Sert aux caches en mémoire des workers: si la version en BD a bougé,
+#     un autre process a écrit et le cache local doit se resynchroniser.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+class CompteurModification(Base):
+    __tablename__ = "compteur_modification"
+
+    nom_table: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,21 @@
+# modele/migration.py
+# -----------------------------------------------------------------------------
+# Fichier: modele/migration.py
+# Rôle : Modèle ORM pour "schema_migration" (une ligne par migration appliquée).
+# Notes:
+#   - Tenue par core/migrations.py: la ligne est insérée dans la même
+#     transaction que le DDL de la migration (tout ou rien).
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migration"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    nom: Mapped[str] = mapped_column(String(100), nullable=False)
+    applique_le: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
@@ -6,16 +6,18 @@
 #   - prix_jour en MONEY côté MSSQL, je le mappe à float côté Python.
 #   - date_debut/fin en DateTime(timezone=False) donc je « naïve » les dt en entrée.
 #   - FK vers usager et chambre sont NOT NULL (réservation doit référencer les deux).
+#   - Index (fk_id_chambre, date_debut, date_fin): sert la recherche de
+#     disponibilité (chevauchement de dates par chambre) sans scanner la table.
 # -----------------------------------------------------------------------------
 
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import ForeignKey, DateTime, Text
+from sqlalchemy import ForeignKey, DateTime, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.mssql import MONEY
 from uuid import UUID, uuid4
 from .base import Base
+from .types import Money
 
 if TYPE_CHECKING:
     from .usager import Usager
@@ -23,11 +25,17 @@ if TYPE_CHECKING:
 
 class Reservation(Base):
     __tablename__ = "reservation"
+    __table_args__ = (
+        Index("ix_reservation_chambre_dates", "fk_id_chambre", "date_debut_reservation", "date_fin_reservation"),
+        # Listes triées par début (keyset sur début + id) et jointure vers usager.
+        Index("ix_reservation_debut", "date_debut_reservation", "id_reservation"),
+        Index("ix_reservation_usager", "fk_id_usager"),
+    )
 
     id_reservation: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
     date_debut_reservation: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
     date_fin_reservation: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
-    prix_jour: Mapped[float] = mapped_column(MONEY, nullable=False)
+    prix_jour: Mapped[float] = mapped_column(Money, nullable=False)
     info_reservation: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     fk_id_usager: Mapped[UUID] = mapped_column(ForeignKey("usager.id_usager"), nullable=False)
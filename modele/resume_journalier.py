@@ -0,0 +1,31 @@
+# modele/resume_journalier.py
+# -----------------------------------------------------------------------------
+# Fichier: modele/resume_journalier.py
+# Rôle : Modèle ORM pour "daily_summary" (agrégat matérialisé par jour et par
+#        type de chambre: nuits vendues + revenu).
+# Notes:
+#   - Tenue à jour par les écritures de réservation (metier/resume.py), dans la
+#     même transaction que l'écriture: jamais en retard sur la table reservation.
+#   - Les chambres sans type sont comptées sous l'UUID nul (SANS_TYPE), d'où
+#     fk_type_chambre sans FK. Type supprimé: ses chambres passent sans type
+#     et ses nuits passent sous SANS_TYPE (metier/resume.retirer_type).
+#   - PK (jour, type): les lectures par plage de dates suivent la clé.
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+from datetime import date
+from uuid import UUID
+from sqlalchemy import Date, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+from .types import Money
+
+SANS_TYPE = UUID(int=0)
+
+class ResumeJournalier(Base):
+    __tablename__ = "daily_summary"
+
+    jour: Mapped[date] = mapped_column(Date, primary_key=True)
+    fk_type_chambre: Mapped[UUID] = mapped_column(primary_key=True)
+    nuits_vendues: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenu: Mapped[float] = mapped_column(Money, nullable=False, default=0)
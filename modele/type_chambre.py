@@ -9,21 +9,24 @@
 
 from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.mssql import MONEY, NCHAR
+from sqlalchemy.dialects.mssql import NCHAR
 from uuid import UUID, uuid4
 from .base import Base
+from .types import Money
 
 if TYPE_CHECKING:
     from .chambre import Chambre
 
 class TypeChambre(Base):
     __tablename__ = "type_chambre"
+    # nom_type sert de clé métier (création de chambre par nom): unique.
+    __table_args__ = (Index("uq_type_chambre_nom", "nom_type", unique=True),)
 
     id_type_chambre: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
     nom_type: Mapped[str] = mapped_column(String(50), nullable=False)
-    prix_plancher: Mapped[float] = mapped_column(MONEY, nullable=False)
+    prix_plancher: Mapped[float] = mapped_column(Money, nullable=False)
     prix_plafond: Mapped[Optional[str]] = mapped_column(NCHAR(10), nullable=True)
     description_chambre: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
 
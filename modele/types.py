@@ -0,0 +1,29 @@
+# modele/types.py
+# -----------------------------------------------------------------------------
+# Fichier: modele/types.py
+# Rôle : Types de colonnes portables MSSQL <-> SQLite.
+# Notes:
+#   - GUID: UNIQUEIDENTIFIER natif sur MSSQL, CHAR(32) ailleurs. Accepte aussi
+#     un str en entrée (les routes passent les IDs en str à session.get()).
+#   - Money: MONEY côté MSSQL, NUMERIC(19,4) côté SQLite (retourné en float).
+# -----------------------------------------------------------------------------
+
+from __future__ import annotations
+
+from uuid import UUID
+from sqlalchemy import Numeric, Uuid
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.mssql import MONEY
+
+class GUID(TypeDecorator):
+    impl = Uuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        # MSSQL accepte le str tel quel, mais le Uuid non natif veut un vrai UUID.
+        if value is not None and not isinstance(value, UUID):
+            value = UUID(str(value))
+        return value
+
+# MONEY n'existe pas en SQLite: on garde la même précision que MONEY.
+Money = MONEY().with_variant(Numeric(19, 4, asdecimal=False), "sqlite")
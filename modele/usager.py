@@ -9,7 +9,7 @@
 
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.dialects.mssql import CHAR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import UUID, uuid4
@@ -20,6 +20,9 @@ if TYPE_CHECKING:
 
 class Usager(Base):
     __tablename__ = "usager"
+    # Recherche anti-doublon (nom, prénom, mobile) et tri des listes (nom, prénom).
+    # Pas unique: modifierUsager ne l'interdit pas.
+    __table_args__ = (Index("ix_usager_identite", "nom", "prenom", "mobile"),)
 
     id_usager: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
     prenom: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -0,0 +1,33 @@
+# =====================================================================
+# Package de tests.
+# Sans HOTEL_DB_URL, les tests roulent sur SQLite en mémoire (pas besoin
+# de SQL Server). Pour tester contre MSSQL: exporter HOTEL_DB_URL avant.
+# Le mode strict de chargement est actif: un lazy load imprévu dans un DTO
+# fait échouer le test (raiseload).
+# Sur une BD vide, on insère un petit jeu de référence (1 type, 1 chambre,
+# 1 usager) comme dans la BD Hotel, car test_modele s'appuie dessus.
+# =====================================================================
+import os
+
+os.environ.setdefault("HOTEL_DB_URL", "sqlite://")
+os.environ.setdefault("HOTEL_DB_STRICT_LOADING", "1")
+
+from sqlalchemy import select  # noqa: E402
+from core.db import SessionLocal, init_db  # noqa: E402
+from modele.type_chambre import TypeChambre  # noqa: E402
+from modele.chambre import Chambre  # noqa: E402
+from modele.usager import Usager  # noqa: E402
+
+def _seed_reference_data() -> None:
+    with SessionLocal() as s:
+        if s.execute(select(TypeChambre)).scalars().first() is not None:
+            return
+        tc = TypeChambre(nom_type="Reference", prix_plancher=100.0, prix_plafond="200", description_chambre="Seed")
+        s.add(tc)
+        s.add(Chambre(numero_chambre=100, disponible_reservation=True, autre_informations="Seed", type_chambre=tc))
+        s.add(Usager(prenom="Seed", nom="Reference", adresse="1 rue Seed", mobile="000000000000000",
+                     mot_de_passe="seed".ljust(60), type_usager="Client"))
+        s.commit()
+
+init_db()
+_seed_reference_data()
@@ -0,0 +1,219 @@
+# =====================================================================
+# Test daily_summary (maintien incrémental) + indicateurs ADR/RevPAR
+# =====================================================================
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+from core.db import DBSettings, SessionLocal, make_engine
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO, ChambreUpdateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO, ReservationUpdateDTO
+from metier.chambreMetier import (
+    _modifierChambre, creerTypeChambre, creerChambre, modifierChambre, supprimerChambre, supprimerTypeChambre,
+)
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import (
+    _creerReservationAvecIds, creerReservationAvecIds, modifierReservation, supprimerReservation,
+)
+from metier.analytiqueMetier import indicateurs
+from metier import chambreMetier
+from metier.resume import reconstruireResume
+from tests.test_chargement import compter_selects
+from modele.base import Base
+from modele.chambre import Chambre
+from modele.resume_journalier import SANS_TYPE, ResumeJournalier
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+from main import app
+
+J0 = date(2038, 1, 30)
+
+def _t(jour, heure=15):
+    return datetime.combine(J0 + timedelta(days=jour), datetime.min.time()) + timedelta(hours=heure)
+
+def _resume():
+    with SessionLocal() as s:
+        return {(r.jour, r.fk_type_chambre): (r.nuits_vendues, r.revenu)
+                for r in s.scalars(select(ResumeJournalier).where(ResumeJournalier.nuits_vendues != 0))}
+
+class TestAnalytique(unittest.TestCase):
+    def setUp(self):
+        self.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Ana-Std", prix_plancher=50.0))
+        self.tc2 = creerTypeChambre(TypeChambreCreateDTO(nom_type="Ana-Suite", prix_plancher=50.0))
+        self.a = creerChambre(ChambreCreateDTO(numero_chambre=811, disponible_reservation=True, nom_type="Ana-Std"))
+        self.b = creerChambre(ChambreCreateDTO(numero_chambre=812, disponible_reservation=True, nom_type="Ana-Std"))
+        self.u = creerUsager(UsagerCreateDTO(prenom="An", nom="Alytique", adresse="1 rue", mobile="818181818181818", mot_de_passe="x", type_usager="Usager"))
+        self.rs = []
+
+    def tearDown(self):
+        for r in self.rs: supprimerReservation(str(r.idReservation))
+        supprimerChambre(str(self.a.idChambre)); supprimerChambre(str(self.b.idChambre))
+        supprimerTypeChambre(str(self.tc.idTypeChambre)); supprimerTypeChambre(str(self.tc2.idTypeChambre))
+        supprimerUsager(str(self.u.idUsager))
+
+    def _reserver(self, ch, debut, fin, prix):
+        r = creerReservationAvecIds(ReservationCreateDTO(idUsager=self.u.idUsager, idChambre=ch.idChambre,
+                                                         dateDebut=debut, dateFin=fin, prixParJour=prix))
+        self.rs.append(r)
+        return r
+
+    def _indic(self, periode="total", nom_type="Ana-Std"):
+        return {i.periode: i for i in indicateurs(J0, J0 + timedelta(days=4), periode, nom_type)}
+
+    def test_indicateurs_et_maintien(self):
+        self._reserver(self.a, _t(0), _t(2, 11), 100.0)   # nuits 0, 1 (janvier 30, 31)
+        r = self._reserver(self.b, _t(1), _t(3, 11), 80.0)  # nuits 1, 2 (31 janv., 1er fév.)
+
+        total = self._indic()["total"]
+        self.assertEqual((total.chambres, total.nuits_vendues, total.nuits_disponibles), (2, 4, 8))
+        self.assertAlmostEqual(total.revenu, 360.0)
+        self.assertAlmostEqual(total.adr, 90.0)
+        self.assertAlmostEqual(total.revpar, 45.0)
+        self.assertAlmostEqual(total.taux_occupation, 0.5)
+
+        par_mois = self._indic("mois")
+        self.assertEqual((par_mois["2038-01"].nuits_vendues, par_mois["2038-02"].nuits_vendues), (3, 1))
+        self.assertEqual(par_mois["2038-01"].nuits_disponibles, 4)
+
+        # Modif: prix et dates => -ancien séjour, +nouveau.
+        modifierReservation(str(r.idReservation), ReservationUpdateDTO(prixParJour=120.0, dateFin=_t(2, 11)))
+        self.assertAlmostEqual(self._indic()["total"].revenu, 320.0)
+        self.assertEqual(self._indic()["total"].nuits_vendues, 3)
+
+        # Changement de type de la chambre: ses nuits suivent.
+        modifierChambre(str(self.b.idChambre), ChambreUpdateDTO(nom_type="Ana-Suite"))
+        self.assertEqual(self._indic(nom_type="Ana-Suite")["total"].nuits_vendues, 1)
+        self.assertEqual(self._indic()["total"].nuits_vendues, 2)
+
+        # Le maintien incrémental donne la même chose qu'un recalcul complet.
+        incremental = _resume()
+        reconstruireResume()
+        self.assertEqual(_resume(), incremental)
+
+        supprimerReservation(str(r.idReservation)); self.rs.remove(r)
+        self.assertEqual(self._indic(nom_type="Ana-Suite")["total"].nuits_vendues, 0)
+
+    def test_jour_cree_pendant_l_ajustement(self):
+        # r1 crée les nuits 0 et 1; la nuit 2 de r3 est retirée du résumé pour
+        # être « insérée par une autre transaction » entre le SELECT et l'UPDATE de r2.
+        self._reserver(self.b, _t(0), _t(2, 11), 100.0)
+        self._reserver(self.b, _t(2), _t(3, 11), 80.0)
+        id_type, nuit2 = self.tc.idTypeChambre, J0 + timedelta(days=2)
+        with SessionLocal() as s:
+            s.execute(delete(ResumeJournalier).where(ResumeJournalier.fk_type_chambre == id_type,
+                                                     ResumeJournalier.jour == nuit2))
+            s.commit()
+        concurrente = [{"jour": nuit2, "fk_type_chambre": id_type, "nuits_vendues": 1, "revenu": 80.0}]
+        scalars = Session.scalars
+
+        def scalars_course(session, stmt, *a, **k):
+            res = scalars(session, stmt, *a, **k)
+            if concurrente and "daily_summary" in str(stmt):
+                res = res.all()
+                session.execute(insert(ResumeJournalier.__table__), concurrente.pop())
+            return res
+
+        with mock.patch.object(Session, "scalars", scalars_course):
+            self._reserver(self.a, _t(0), _t(3, 11), 50.0)   # nuits 0, 1 existantes, 2 manquante
+        self.assertFalse(concurrente)
+
+        incremental = _resume()
+        self.assertEqual(incremental[(nuit2, id_type)], (2, 130.0))
+        reconstruireResume()
+        self.assertEqual(_resume(), incremental)
+
+    def test_changement_de_type_en_un_lot(self):
+        for j in range(0, 8, 2):
+            self._reserver(self.b, _t(j), _t(j + 1, 11), 70.0)
+        with compter_selects() as q:
+            modifierChambre(str(self.b.idChambre), ChambreUpdateDTO(nom_type="Ana-Suite"))
+        # Une seule lecture du résumé pour les 4 réservations, pas une par réservation.
+        self.assertEqual(sum("daily_summary" in sql for sql in q), 1)
+        self.assertEqual(self._indic(nom_type="Ana-Suite")["total"].nuits_vendues, 2)
+        incremental = _resume()
+        reconstruireResume()
+        self.assertEqual(_resume(), incremental)
+
+    def test_suppression_du_type(self):
+        self._reserver(self.a, _t(0), _t(2, 11), 50.0)
+        self.assertTrue(supprimerTypeChambre(str(self.tc.idTypeChambre)))
+        incremental = _resume()
+        # Plus rien sous l'ancien type: les 2 nuits sont sous SANS_TYPE.
+        self.assertFalse([cle for cle in incremental if cle[1] == self.tc.idTypeChambre])
+        self.assertIn((J0 + timedelta(days=1), SANS_TYPE), incremental)
+        reconstruireResume()
+        self.assertEqual(_resume(), incremental)
+
+    def test_validation_et_route(self):
+        self._reserver(self.a, _t(0), _t(1, 11), 100.0)
+        with self.assertRaises(ValueError):
+            indicateurs(J0, J0, "total")
+        with self.assertRaises(ValueError):
+            indicateurs(J0, J0 + timedelta(days=1), "total", "Type-Inexistant")
+        with TestClient(app) as client:
+            res = client.get("/analytics/indicateurs", params={"debut": J0.isoformat(), "fin": (J0 + timedelta(days=2)).isoformat(),
+                                                               "periode": "jour", "nom_type": "Ana-Std"})
+            self.assertEqual(res.status_code, 200)
+            jours = {i["periode"]: i for i in res.json()}
+            self.assertEqual(jours[J0.isoformat()]["nuits_vendues"], 1)
+            self.assertEqual(jours[(J0 + timedelta(days=1)).isoformat()]["nuits_vendues"], 0)
+            res = client.get("/analytics/indicateurs", params={"debut": J0.isoformat(), "fin": J0.isoformat()})
+            self.assertEqual(res.status_code, 400)
+
+class TestResumeConcurrent(unittest.TestCase):
+    """Vraies connexions (SQLite fichier): changement de type d'une chambre
+    pendant qu'une réservation s'insère sur la même chambre."""
+
+    def test_changement_de_type_et_reservation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            eng = make_engine(DBSettings(url=f"sqlite:///{os.path.join(tmp, 'r.db')}", pool_size=4))
+            Base.metadata.create_all(eng)
+            Fabrique = sessionmaker(bind=eng, autoflush=False)
+            with Fabrique() as s:
+                ancien = TypeChambre(nom_type="Ancien", prix_plancher=1.0)
+                s.add_all([ancien, TypeChambre(nom_type="Nouveau", prix_plancher=1.0)])
+                ch = Chambre(numero_chambre=1, disponible_reservation=True, type_chambre=ancien)
+                u = Usager(prenom="a", nom="b", adresse="c", mobile="1", mot_de_passe="x", type_usager="U")
+                s.add_all([ch, u]); s.commit()
+                id_u, id_ch = u.id_usager, ch.id_chambre
+
+            # La résa part juste après deplacer_chambre(), avant le commit du type.
+            deplacee, reservee = threading.Event(), threading.Event()
+            deplacer = chambreMetier.deplacer_chambre
+            def deplacer_puis_attendre(*a):
+                deplacer(*a)
+                deplacee.set()
+                reservee.wait(0.5)    # avec verrou: la résa attend notre commit
+
+            def reserver():
+                deplacee.wait(5)
+                with Fabrique() as s:
+                    _creerReservationAvecIds(s, ReservationCreateDTO(
+                        idUsager=id_u, idChambre=id_ch, dateDebut=_t(0), dateFin=_t(2, 11), prixParJour=10.0))
+                reservee.set()
+
+            t = threading.Thread(target=reserver)
+            t.start()
+            with mock.patch.object(chambreMetier, "deplacer_chambre", deplacer_puis_attendre), Fabrique() as s:
+                _modifierChambre(s, str(id_ch), ChambreUpdateDTO(nom_type="Nouveau"))
+            t.join()
+
+            def resume():
+                with Fabrique() as s:
+                    return {(r.jour, r.fk_type_chambre): (r.nuits_vendues, r.revenu)
+                            for r in s.scalars(select(ResumeJournalier).where(ResumeJournalier.nuits_vendues != 0))}
+            incremental = resume()
+            with Fabrique() as s:
+                reconstruireResume(s)
+            self.assertEqual(resume(), incremental)
+            self.assertEqual(len(incremental), 2)
+            eng.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
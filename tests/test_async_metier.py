@@ -0,0 +1,81 @@
+# =====================================================================
+# Test couche métier async (AsyncSession) + routes async via TestClient
+# =====================================================================
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from core.db import dispose_async_engine
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO, ReservationUpdateDTO
+from metier.chambreMetier import (
+    creerTypeChambreAsync, creerChambreAsync, listerChambresAsync,
+    supprimerChambreAsync, supprimerTypeChambreAsync, supprimerChambre, supprimerTypeChambre,
+    creerTypeChambre, creerChambre,
+)
+from metier.usagerMetier import creerUsagerAsync, supprimerUsagerAsync, getUsagerParId
+from metier.reservationMetier import (
+    creerReservationAvecIdsAsync, getReservationParIdAsync, modifierReservationAsync,
+    supprimerReservationAsync, getReservationParId,
+)
+from main import app
+
+def _run(coro):
+    # Chaque asyncio.run() a sa boucle: on libère l'engine async après.
+    async def _wrap():
+        try:
+            return await coro
+        finally:
+            await dispose_async_engine()
+    return asyncio.run(_wrap())
+
+class TestAsyncMetier(unittest.TestCase):
+    def test_flux_reservation_async(self):
+        async def scenario():
+            tc = await creerTypeChambreAsync(TypeChambreCreateDTO(nom_type="Async-RSV", prix_plancher=90.0))
+            ch = await creerChambreAsync(ChambreCreateDTO(numero_chambre=731, disponible_reservation=True, nom_type=tc.nom_type))
+            u = await creerUsagerAsync(UsagerCreateDTO(prenom="Asy", nom="Nc", adresse="1 rue", mobile="121212121212121", mot_de_passe="x", type_usager="Usager"))
+            debut = datetime(2030, 1, 10, 15)
+            r = await creerReservationAvecIdsAsync(ReservationCreateDTO(
+                idUsager=u.idUsager, idChambre=ch.idChambre, dateDebut=debut,
+                dateFin=debut + timedelta(days=2), prixParJour=120.0))
+            self.assertEqual(r.chambre.type_chambre.nom_type, "Async-RSV")
+            maj = await modifierReservationAsync(str(r.idReservation), ReservationUpdateDTO(prixParJour=130.0))
+            self.assertEqual(maj.prixParJour, 130.0)
+            lu = await getReservationParIdAsync(str(r.idReservation))
+            self.assertEqual(lu.usager.idUsager, u.idUsager)
+            self.assertTrue(any(c.idChambre == ch.idChambre for c in await listerChambresAsync()))
+            self.assertTrue(await supprimerReservationAsync(str(r.idReservation)))
+            self.assertTrue(await supprimerChambreAsync(str(ch.idChambre)))
+            self.assertTrue(await supprimerTypeChambreAsync(str(tc.idTypeChambre)))
+            self.assertTrue(await supprimerUsagerAsync(str(u.idUsager)))
+            return r, u
+
+        r, u = _run(scenario())
+        # Les deux chemins (sync/async) voient la même BD.
+        self.assertIsNone(getReservationParId(str(r.idReservation)))
+        self.assertIsNone(getUsagerParId(str(u.idUsager)))
+
+    def test_erreur_metier_async(self):
+        with self.assertRaises(ValueError):
+            _run(creerChambreAsync(ChambreCreateDTO(numero_chambre=732, disponible_reservation=True, nom_type="Inexistant-XYZ")))
+
+class TestRoutesAsync(unittest.TestCase):
+    def test_routes(self):
+        tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Route-Async", prix_plancher=70.0))
+        ch = creerChambre(ChambreCreateDTO(numero_chambre=733, disponible_reservation=True, nom_type=tc.nom_type))
+        try:
+            with TestClient(app) as client:
+                res = client.get("/chambres/733")
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.json()["idChambre"], str(ch.idChambre))
+                self.assertEqual(client.get("/chambres/id/00000000-0000-0000-0000-000000000000").status_code, 404)
+                bad = client.post("/creerChambre", json={"numero_chambre": 734, "disponible_reservation": True, "nom_type": "Nope-XYZ"})
+                self.assertEqual(bad.status_code, 400)
+        finally:
+            supprimerChambre(str(ch.idChambre))
+            supprimerTypeChambre(str(tc.idTypeChambre))
+
+if __name__ == "__main__":
+    unittest.main()
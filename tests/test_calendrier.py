@@ -0,0 +1,99 @@
+# =====================================================================
+# Test grille d'occupation chambres × nuits (NumPy)
+# =====================================================================
+import base64
+import unittest
+from unittest import mock
+from datetime import date, datetime, timedelta
+import numpy as np
+from fastapi.testclient import TestClient
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import creerReservationAvecIds, supprimerReservation
+from core.db import SessionLocal
+from metier.calendrier import _calendrier, calendrierOccupation, plages_rle, bits_base64, binaire
+from main import app
+
+J0 = date(2037, 3, 1)
+
+def _t(jour, heure):
+    return datetime.combine(J0 + timedelta(days=jour), datetime.min.time()) + timedelta(hours=heure)
+
+class TestCalendrier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Cal-Grille", prix_plancher=100.0))
+        cls.a = creerChambre(ChambreCreateDTO(numero_chambre=801, disponible_reservation=True, nom_type="Cal-Grille"))
+        cls.b = creerChambre(ChambreCreateDTO(numero_chambre=802, disponible_reservation=True, nom_type="Cal-Grille"))
+        cls.u = creerUsager(UsagerCreateDTO(prenom="Ca", nom="Lendrier", adresse="1 rue", mobile="808080808080808", mot_de_passe="x", type_usager="Usager"))
+        sejours = [
+            (cls.a, _t(-2, 15), _t(1, 11)),   # commence avant la fenêtre: nuits 0
+            (cls.a, _t(3, 15), _t(5, 11)),    # nuits 3, 4
+            (cls.a, _t(5, 15), _t(6, 11)),    # nuit 5 (collée à la précédente)
+            (cls.b, _t(8, 15), _t(40, 11)),   # déborde après la fenêtre de 10 nuits
+        ]
+        cls.rs = [creerReservationAvecIds(ReservationCreateDTO(idUsager=cls.u.idUsager, idChambre=ch.idChambre, dateDebut=d,
+                                                               dateFin=f, prixParJour=100.0)) for ch, d, f in sejours]
+
+    @classmethod
+    def tearDownClass(cls):
+        for r in cls.rs: supprimerReservation(str(r.idReservation))
+        supprimerChambre(str(cls.a.idChambre)); supprimerChambre(str(cls.b.idChambre))
+        supprimerTypeChambre(str(cls.tc.idTypeChambre))
+        supprimerUsager(str(cls.u.idUsager))
+
+    def _ligne(self, cal, numero):
+        return int(np.nonzero(cal.numeros == numero)[0][0])
+
+    def test_matrice(self):
+        cal = calendrierOccupation(J0, 10)
+        self.assertEqual(cal.occupation.shape, (len(cal.ids), 10))
+        self.assertEqual(cal.occupation[self._ligne(cal, 801)].tolist(), [1, 0, 0, 1, 1, 1, 0, 0, 0, 0])
+        self.assertEqual(cal.occupation[self._ligne(cal, 802)].tolist(), [0] * 8 + [1, 1])
+
+    def test_chambre_creee_entre_les_deux_lectures(self):
+        # Le SELECT des chambres « ne voit pas encore » 802, celui des résas la voit.
+        with SessionLocal() as s:
+            conn = s.connection()
+            lectures = []
+            def executer(stmt):
+                rows = conn.execute(stmt).all()
+                if not lectures:
+                    rows = [r for r in rows if r[1] != 802]
+                lectures.append(stmt)
+                return mock.Mock(all=lambda: rows)
+            with mock.patch.object(s, "connection", return_value=mock.Mock(execute=executer)):
+                cal = _calendrier(s, J0, 10)
+        self.assertNotIn(802, cal.numeros.tolist())
+        self.assertEqual(cal.occupation[self._ligne(cal, 801)].tolist(), [1, 0, 0, 1, 1, 1, 0, 0, 0, 0])
+
+    def test_encodages(self):
+        cal = calendrierOccupation(J0, 10)
+        i, j = self._ligne(cal, 801), self._ligne(cal, 802)
+        rle = plages_rle(cal)
+        self.assertEqual(rle[i], [[0, 1], [3, 3]])
+        self.assertEqual(rle[j], [[8, 2]])
+        self.assertEqual(base64.b64decode(bits_base64(cal)[i]), bytes([0b10011100, 0]))
+        brut = binaire(cal)
+        self.assertEqual(len(brut), 2 * len(cal.ids))
+        self.assertEqual(brut[2 * j:2 * j + 2], bytes([0, 0b11000000]))
+
+    def test_routes(self):
+        with TestClient(app) as client:
+            res = client.get("/calendrier", params={"debut": J0.isoformat(), "jours": 10})
+            self.assertEqual(res.status_code, 200)
+            par_no = {c["numero_chambre"]: c for c in res.json()["chambres"]}
+            self.assertEqual(par_no[801]["occupe"], [[0, 1], [3, 3]])
+
+            res = client.get("/calendrier", params={"debut": J0.isoformat(), "jours": 10, "format": "binaire"})
+            self.assertEqual(res.headers["content-type"], "application/octet-stream")
+            numeros = [int(n) for n in res.headers["X-Calendrier-Chambres"].split(",")]
+            self.assertEqual(len(res.content), 2 * len(numeros))
+
+            self.assertEqual(client.get("/calendrier", params={"jours": 0}).status_code, 422)
+
+if __name__ == "__main__":
+    unittest.main()
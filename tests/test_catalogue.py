@@ -0,0 +1,142 @@
+# =====================================================================
+# Test catalogue des types en mémoire (lectures sans SQL + invalidation)
+# =====================================================================
+import time
+import unittest
+from uuid import UUID
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+from core.db import SessionLocal
+from DTO.chambreDTO import TypeChambreCreateDTO, TypeChambreUpdateDTO, ChambreCreateDTO, ChambreUpdateDTO
+from metier.catalogue import COLONNES_TRI, TABLE, CatalogueTypes, catalogue_types
+from metier.chambreMetier import (
+    creerTypeChambre, creerChambre, modifierChambre, modifierTypeChambre, supprimerChambre, supprimerTypeChambre,
+    getTypeChambreParId, listerChambres, listerChambresPage, listerTypesChambre, listerTypesChambrePage,
+)
+from metier.pagination import couper_page, decoder_curseur, paginer
+from metier.versions import incrementer_version
+from modele.compteur import CompteurModification
+from modele.type_chambre import TypeChambre
+from tests.test_chargement import compter_selects
+
+class TestCatalogueTypes(unittest.TestCase):
+    def setUp(self):
+        self.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Cat-A", prix_plancher=80.0))
+        self.tc2 = creerTypeChambre(TypeChambreCreateDTO(nom_type="Cat-B", prix_plancher=120.0))
+        catalogue_types.charger()
+        # Pas de contrôle de version pendant le test (sauf forcé).
+        self._intervalle = catalogue_types.intervalle_controle
+        catalogue_types.intervalle_controle = 3600.0
+        self.chs = []
+
+    def tearDown(self):
+        catalogue_types.intervalle_controle = self._intervalle
+        for ch in self.chs: supprimerChambre(str(ch.idChambre))
+        supprimerTypeChambre(str(self.tc.idTypeChambre))
+        supprimerTypeChambre(str(self.tc2.idTypeChambre))
+        catalogue_types.desactiver()
+
+    def test_lectures_sans_sql(self):
+        with compter_selects() as q:
+            types = listerTypesChambre()
+            relu = getTypeChambreParId(str(self.tc.idTypeChambre))
+            page = listerTypesChambrePage(limit=1)
+        self.assertEqual(q, [])
+        self.assertIn("Cat-A", [t.nom_type for t in types])
+        self.assertEqual(relu.nom_type, "Cat-A")
+        self.assertEqual(len(page.items), 1)
+
+        # Pagination en mémoire: mêmes pages que l'ordre complet.
+        vus, curseur = [], None
+        while True:
+            page = listerTypesChambrePage(limit=2, curseur=curseur)
+            vus += [t.idTypeChambre for t in page.items]
+            curseur = page.next_cursor
+            if not curseur:
+                break
+        self.assertEqual(vus, [t.idTypeChambre for t in types])
+
+    def test_chambres_sans_jointure_ni_select_type(self):
+        # Création: le nom_type se résout sans SELECT (seul le compteur de version est lu).
+        with compter_selects() as q:
+            ch = creerChambre(ChambreCreateDTO(numero_chambre=851, disponible_reservation=True, nom_type="Cat-A"))
+        self.chs.append(ch)
+        self.assertEqual([x for x in q if "compteur_modification" not in x], [])
+        self.assertEqual(ch.type_chambre.nom_type, "Cat-A")
+
+        with compter_selects() as q:
+            lst = listerChambres()
+            listerChambresPage(limit=10)
+        self.assertEqual(len(q), 2)
+        self.assertTrue(all("join" not in x.lower() for x in q))
+        self.assertEqual(next(c for c in lst if c.idChambre == ch.idChambre).type_chambre.nom_type, "Cat-A")
+
+        maj = modifierChambre(str(ch.idChambre), ChambreUpdateDTO(nom_type="Cat-B"))
+        self.assertEqual(maj.type_chambre.idTypeChambre, self.tc2.idTypeChambre)
+
+        with self.assertRaises(ValueError):
+            creerChambre(ChambreCreateDTO(numero_chambre=852, disponible_reservation=True, nom_type="Cat-Inconnu"))
+
+    def test_ecritures_invalident(self):
+        nouveau = creerTypeChambre(TypeChambreCreateDTO(nom_type="Cat-C", prix_plancher=50.0))
+        try:
+            self.assertEqual(catalogue_types.par_nom("Cat-C").idTypeChambre, nouveau.idTypeChambre)
+            modifierTypeChambre(str(nouveau.idTypeChambre), TypeChambreUpdateDTO(prix_plancher=55.0))
+            self.assertEqual(getTypeChambreParId(str(nouveau.idTypeChambre)).prix_plancher, 55.0)
+        finally:
+            supprimerTypeChambre(str(nouveau.idTypeChambre))
+        self.assertNotIn("Cat-C", [t.nom_type for t in listerTypesChambre()])
+
+    def test_resync_autre_worker(self):
+        # Un "autre process" modifie la table directement et incrémente la version.
+        with SessionLocal() as s:
+            s.execute(update(TypeChambre).where(TypeChambre.id_type_chambre == self.tc.idTypeChambre)
+                      .values(description_chambre="externe"))
+            s.commit()
+            incrementer_version(s, TABLE)
+        self.assertIsNone(getTypeChambreParId(str(self.tc.idTypeChambre)).description_chambre)
+        catalogue_types.intervalle_controle = 0.0
+        time.sleep(0.001)
+        self.assertEqual(getTypeChambreParId(str(self.tc.idTypeChambre)).description_chambre, "externe")
+
+    def test_ordre_et_curseurs_de_la_bd(self):
+        # Collation insensible à la casse (défaut MSSQL): "alpha"/"ALPHA" sont
+        # à égalité et départagés par l'id (9 avant 10), "beta" < "Charlie".
+        eng = create_engine("sqlite://")
+        ddl = str(CreateTable(TypeChambre.__table__).compile(eng))
+        with eng.begin() as c:
+            c.exec_driver_sql(ddl.replace("nom_type VARCHAR(50)", "nom_type VARCHAR(50) COLLATE NOCASE"))
+            CompteurModification.__table__.create(c)
+            c.execute(insert(TypeChambre.__table__), [
+                {"id_type_chambre": UUID(int=i), "nom_type": nom, "prix_plancher": 10.0}
+                for i, nom in ((10, "ALPHA"), (9, "alpha"), (2, "Charlie"), (11, "beta"))
+            ])
+        with Session(eng) as s:
+            cat = CatalogueTypes()
+            cat.charger(s)
+            self.assertEqual([t.nom_type for t in cat.lister()], ["alpha", "ALPHA", "beta", "Charlie"])
+            # Chaque curseur SQL donne la même page suivante sur les deux chemins.
+            curseur, vus = None, []
+            while True:
+                stmt = paginer(select(TypeChambre), "typeChambre", COLONNES_TRI, 1, curseur)
+                rows, suivant = couper_page(s.execute(stmt).scalars().all(), "typeChambre", COLONNES_TRI, 1)
+                apres = decoder_curseur("typeChambre", curseur, COLONNES_TRI) if curseur else None
+                self.assertEqual([t.idTypeChambre for t in cat.apres(apres, 1)], [r.id_type_chambre for r in rows])
+                vus += [r.id_type_chambre for r in rows]
+                if not suivant:
+                    break
+                curseur = suivant
+            self.assertEqual(vus, [UUID(int=i) for i in (9, 10, 11, 2)])
+            # Ligne du curseur renommée depuis: pas de rang fiable => None (repli SQL).
+            self.assertIsNone(cat.apres(["alpha-renomme", str(UUID(int=9))], 1))
+        eng.dispose()
+
+    def test_inactif_par_defaut(self):
+        cat = CatalogueTypes()
+        self.assertFalse(cat.actif)
+        self.assertIsNone(cat.par_nom("Cat-A"))
+        self.assertEqual(cat.lister(), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# =====================================================================
+# Test recherche de chambres disponibles (chevauchement de dates)
+# =====================================================================
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+import core.db
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, listerChambresDisponibles, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import creerReservationAvecIds, supprimerReservation
+from main import app
+
+D = datetime(2034, 2, 10, 15)
+
+class TestChambresDisponibles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Dispo-A", prix_plancher=100.0))
+        cls.tc2 = creerTypeChambre(TypeChambreCreateDTO(nom_type="Dispo-B", prix_plancher=100.0))
+        cls.libre = creerChambre(ChambreCreateDTO(numero_chambre=771, disponible_reservation=True, nom_type="Dispo-A"))
+        cls.occupee = creerChambre(ChambreCreateDTO(numero_chambre=772, disponible_reservation=True, nom_type="Dispo-A"))
+        cls.fermee = creerChambre(ChambreCreateDTO(numero_chambre=773, disponible_reservation=False, nom_type="Dispo-A"))
+        cls.autre = creerChambre(ChambreCreateDTO(numero_chambre=774, disponible_reservation=True, nom_type="Dispo-B"))
+        cls.u = creerUsager(UsagerCreateDTO(prenom="Dis", nom="Po", adresse="1 rue", mobile="707070707070707", mot_de_passe="x", type_usager="Usager"))
+        cls.r = creerReservationAvecIds(ReservationCreateDTO(idUsager=cls.u.idUsager, idChambre=cls.occupee.idChambre,
+                                                             dateDebut=D, dateFin=D + timedelta(days=3), prixParJour=100.0))
+
+    @classmethod
+    def tearDownClass(cls):
+        supprimerReservation(str(cls.r.idReservation))
+        for ch in (cls.libre, cls.occupee, cls.fermee, cls.autre): supprimerChambre(str(ch.idChambre))
+        supprimerTypeChambre(str(cls.tc.idTypeChambre)); supprimerTypeChambre(str(cls.tc2.idTypeChambre))
+        supprimerUsager(str(cls.u.idUsager))
+
+    def _numeros(self, debut, fin, nom_type="Dispo-A"):
+        return {c.numero_chambre for c in listerChambresDisponibles(debut, fin, nom_type)}
+
+    def test_chevauchement(self):
+        self.assertEqual(self._numeros(D + timedelta(days=1), D + timedelta(days=5)), {771})
+        # Arrivée le jour du départ: pas de chevauchement.
+        self.assertEqual(self._numeros(D + timedelta(days=3), D + timedelta(days=4)), {771, 772})
+        self.assertEqual(self._numeros(D - timedelta(days=2), D), {771, 772})
+
+    def test_filtre_type_et_dispo(self):
+        self.assertEqual(self._numeros(D, D + timedelta(days=1), "Dispo-B"), {774})
+        tous = {c.numero_chambre for c in listerChambresDisponibles(D, D + timedelta(days=1))}
+        self.assertNotIn(773, tous)
+        self.assertNotIn(772, tous)
+
+    def test_dates_invalides(self):
+        with self.assertRaises(ValueError):
+            listerChambresDisponibles(D, D)
+
+    def test_index_utilise(self):
+        if core.db.engine.dialect.name != "sqlite":
+            self.skipTest("plan SQLite seulement")
+        with core.db.engine.connect() as c:
+            plan = " ".join(str(r) for r in c.execute(text(
+                "EXPLAIN QUERY PLAN SELECT 1 FROM reservation WHERE fk_id_chambre = 'x' "
+                "AND date_debut_reservation < '2034-01-02' AND date_fin_reservation > '2034-01-01'")))
+        self.assertIn("ix_reservation_chambre_dates", plan)
+
+    def test_route(self):
+        with TestClient(app) as client:
+            res = client.get("/chambres/disponibles", params={"debut": D.isoformat(), "fin": (D + timedelta(days=1)).isoformat(), "nom_type": "Dispo-A"})
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual([c["numero_chambre"] for c in res.json()], [771])
+            res = client.get("/chambres/disponibles", params={"debut": D.isoformat(), "fin": D.isoformat()})
+            self.assertEqual(res.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# =====================================================================
+# Test stratégie de chargement (pas de N+1 dans les listes/get)
+# - On compte les SELECT émis pendant l'appel au service.
+# =====================================================================
+import unittest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError
+import core.db
+from core.db import SessionLocal
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO, ReservationUpdateDTO
+from metier.chargement import options_usager, strict_actif
+from metier.chambreMetier import creerTypeChambre, creerChambre, listerChambres, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import (
+    creerReservationAvecIds, listerReservations, getReservationParId,
+    modifierReservation, supprimerReservation,
+)
+from modele.usager import Usager
+
+@contextmanager
+def compter_selects(engine=None):
+    # engine: core.db.engine par défaut (get_async_engine().sync_engine pour les routes).
+    engine = engine if engine is not None else core.db.engine
+    compte = []
+    def _avant(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            compte.append(statement)
+    event.listen(engine, "before_cursor_execute", _avant)
+    try:
+        yield compte
+    finally:
+        event.remove(engine, "before_cursor_execute", _avant)
+
+class TestChargement(unittest.TestCase):
+    def test_pas_de_n_plus_1(self):
+        tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Load-N1", prix_plancher=90.0))
+        chs = [creerChambre(ChambreCreateDTO(numero_chambre=740 + i, disponible_reservation=True, nom_type=tc.nom_type)) for i in range(3)]
+        u = creerUsager(UsagerCreateDTO(prenom="N", nom="Plus1", adresse="1 rue", mobile="414141414141414", mot_de_passe="x", type_usager="Usager"))
+        debut = datetime(2031, 5, 1, 15)
+        rs = [creerReservationAvecIds(ReservationCreateDTO(idUsager=u.idUsager, idChambre=ch.idChambre, dateDebut=debut,
+                                                          dateFin=debut + timedelta(days=1), prixParJour=100.0)) for ch in chs]
+        try:
+            with compter_selects() as q:
+                lst = listerReservations()
+            self.assertEqual(len(q), 1)
+            self.assertTrue(all(x.chambre.type_chambre is not None for x in lst))
+
+            with compter_selects() as q:
+                listerChambres()
+            self.assertEqual(len(q), 1)
+
+            with compter_selects() as q:
+                relu = getReservationParId(str(rs[0].idReservation))
+            self.assertEqual(len(q), 1)
+            self.assertEqual(relu.chambre.type_chambre.nom_type, "Load-N1")
+
+            maj = modifierReservation(str(rs[0].idReservation), ReservationUpdateDTO(infoReservation="maj"))
+            self.assertEqual(maj.usager.idUsager, u.idUsager)
+        finally:
+            for r in rs:
+                supprimerReservation(str(r.idReservation))
+            for ch in chs:
+                supprimerChambre(str(ch.idChambre))
+            supprimerTypeChambre(str(tc.idTypeChambre))
+            supprimerUsager(str(u.idUsager))
+
+    def test_mode_strict_leve_sur_lazy_load(self):
+        self.assertTrue(strict_actif())
+        with SessionLocal() as s:
+            u = s.execute(select(Usager).options(*options_usager())).scalars().first()
+            with self.assertRaises(InvalidRequestError):
+                _ = u.reservations
+
+if __name__ == "__main__":
+    unittest.main()
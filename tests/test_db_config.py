@@ -0,0 +1,64 @@
+# =====================================================================
+# Test configuration de l'engine (core/db.py) par variables d'env.
+# =====================================================================
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+import core.db
+from core.db import DBSettings, DEFAULT_DATABASE_URL, configure_engine, make_async_engine, make_engine
+
+class TestDbConfig(unittest.TestCase):
+    def test_settings_from_env(self):
+        env = {"HOTEL_DB_URL": "sqlite:///x.db", "HOTEL_DB_POOL_SIZE": "3", "HOTEL_DB_ECHO": "1"}
+        with mock.patch.dict(os.environ, env):
+            st = DBSettings.from_env()
+        self.assertEqual(st.url, "sqlite:///x.db")
+        self.assertEqual(st.pool_size, 3)
+        self.assertTrue(st.echo)
+
+    def test_defaults(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            st = DBSettings.from_env()
+        self.assertEqual(st.url, DEFAULT_DATABASE_URL)
+        self.assertFalse(st.echo)
+        self.assertTrue(st.pool_pre_ping)
+
+    def test_bad_int(self):
+        with mock.patch.dict(os.environ, {"HOTEL_DB_POOL_SIZE": "beaucoup"}):
+            with self.assertRaises(ValueError):
+                DBSettings.from_env()
+
+    def test_sqlite_memory_engine(self):
+        eng = make_engine(DBSettings(url="sqlite://"))
+        try:
+            self.assertIsInstance(eng.pool, StaticPool)
+            with eng.connect() as c:
+                self.assertEqual(c.execute(text("PRAGMA foreign_keys")).scalar(), 1)
+        finally:
+            eng.dispose()
+
+    def test_reconfigurer_ferme_l_engine_async(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            asy = make_async_engine(DBSettings(url=f"sqlite:///{os.path.join(tmp, 'a.db')}"))
+            async def lire():
+                async with asy.connect() as c:
+                    await c.execute(text("select 1"))
+            # Boucle d'un autre thread, comme le TestClient.
+            t = threading.Thread(target=asyncio.run, args=(lire(),))
+            t.start(); t.join()
+            self.assertEqual(asy.pool.checkedin(), 1)
+            # Engine sync inchangé (la BD de test en mémoire doit survivre).
+            with mock.patch.object(core.db, "_async_engine", asy), \
+                 mock.patch.object(core.db, "make_engine", return_value=core.db.engine), \
+                 mock.patch.object(core.db.engine, "dispose"):
+                configure_engine(core.db.settings)
+                self.assertIsNone(core.db._async_engine)
+            self.assertEqual(asy.pool.checkedin(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
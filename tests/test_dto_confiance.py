@@ -0,0 +1,53 @@
+# =====================================================================
+# Test DTO de sortie: from_entity (sans validation) == chemin validé
+# =====================================================================
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+from DTO.chambreDTO import ChambreDTO, TypeChambreDTO
+from DTO.reservationDTO import ReservationDTO
+from DTO.usagerDTO import UsagerDTO
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+
+def _reservation(avec_type: bool = True) -> Reservation:
+    tc = TypeChambre(id_type_chambre=uuid4(), nom_type="Conf-T", prix_plancher=Decimal("89.9900"), prix_plafond="250")
+    ch = Chambre(id_chambre=uuid4(), numero_chambre=882, disponible_reservation=True, autre_informations=None,
+                 type_chambre=tc if avec_type else None)
+    u = Usager(id_usager=uuid4(), prenom="Léa", nom="Roy", adresse="1 rue A", mobile="514-555-0100",
+               mot_de_passe="x", type_usager="client")
+    return Reservation(id_reservation=uuid4(), date_debut_reservation=datetime(2025, 5, 1, 15),
+                       date_fin_reservation=datetime(2025, 5, 3, 11), prix_jour=Decimal("129.9900"),
+                       info_reservation="Étage élevé", chambre=ch, usager=u)
+
+class TestDtoConfiance(unittest.TestCase):
+    def _pareil(self, valide, confiance):
+        self.assertEqual(confiance, valide)
+        self.assertEqual(confiance.model_dump_json(), valide.model_dump_json())
+        self.assertEqual(confiance.model_fields_set, valide.model_fields_set)
+
+    def test_meme_sortie_que_le_chemin_valide(self):
+        r = _reservation()
+        self._pareil(ReservationDTO(r), ReservationDTO.from_entity(r))
+        self._pareil(ChambreDTO(r.chambre), ChambreDTO.from_entity(r.chambre))
+        self._pareil(TypeChambreDTO(r.chambre.type_chambre), TypeChambreDTO.from_entity(r.chambre.type_chambre))
+        self._pareil(UsagerDTO(r.usager), UsagerDTO.from_entity(r.usager))
+        self.assertIsInstance(ReservationDTO.from_entity(r).prixParJour, float)
+
+    def test_chambre_sans_type(self):
+        ch = _reservation(avec_type=False).chambre
+        self._pareil(ChambreDTO(ch), ChambreDTO.from_entity(ch))
+        self.assertIsNone(ChambreDTO.from_entity(ch).type_chambre)
+
+    def test_instances_independantes(self):
+        u = _reservation().usager
+        a, b = UsagerDTO.from_entity(u), UsagerDTO.from_entity(u)
+        a.nom = "Autre"
+        self.assertEqual(b.nom, "Roy")
+        self.assertEqual(a.model_dump()["nom"], "Autre")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# =====================================================================
+# Test GET conditionnels (ETag / If-None-Match -> 304)
+# =====================================================================
+import unittest
+from fastapi.testclient import TestClient
+from core.db import get_async_engine
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO, ChambreUpdateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, modifierChambre, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from main import app, _correspond
+from tests.test_chargement import compter_selects
+
+class TestETag(unittest.TestCase):
+    def setUp(self):
+        self.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="ETag-T", prix_plancher=70.0))
+        self.ch = creerChambre(ChambreCreateDTO(numero_chambre=861, disponible_reservation=True, nom_type="ETag-T"))
+
+    def tearDown(self):
+        supprimerChambre(str(self.ch.idChambre))
+        supprimerTypeChambre(str(self.tc.idTypeChambre))
+
+    def test_304_sans_requete_de_liste(self):
+        with TestClient(app) as client:
+            res = client.get("/chambres", params={"limit": 5})
+            self.assertEqual(res.status_code, 200)
+            etag = res.headers["etag"]
+
+            with compter_selects(get_async_engine().sync_engine) as q:
+                res = client.get("/chambres", params={"limit": 5}, headers={"If-None-Match": etag})
+            self.assertEqual(res.status_code, 304)
+            self.assertEqual(res.content, b"")
+            self.assertEqual(res.headers["etag"], etag)
+            # Seule la lecture des compteurs.
+            self.assertEqual(len(q), 1)
+            self.assertIn("compteur_modification", q[0])
+
+            # Autre URL (autre page) => autre ETag.
+            self.assertNotEqual(client.get("/chambres", params={"limit": 6}).headers["etag"], etag)
+
+            # Écriture sur la table => l'ancien ETag ne correspond plus.
+            modifierChambre(str(self.ch.idChambre), ChambreUpdateDTO(autre_informations="maj"))
+            res = client.get("/chambres", params={"limit": 5}, headers={"If-None-Match": etag})
+            self.assertEqual(res.status_code, 200)
+            self.assertNotEqual(res.headers["etag"], etag)
+
+    def test_tables_dependantes(self):
+        with TestClient(app) as client:
+            e_types = client.get("/typesChambre").headers["etag"]
+            e_resas = client.get("/reservations").headers["etag"]
+            e_detail = client.get(f"/chambres/id/{self.ch.idChambre}").headers["etag"]
+            # Nouvel usager: les réservations (usager imbriqué) changent, pas les types.
+            u = creerUsager(UsagerCreateDTO(prenom="E", nom="Tag", adresse="1 rue", mobile="868686868686868",
+                                            mot_de_passe="x", type_usager="Usager"))
+            try:
+                self.assertEqual(client.get("/typesChambre", headers={"If-None-Match": e_types}).status_code, 304)
+                self.assertEqual(client.get("/reservations", headers={"If-None-Match": e_resas}).status_code, 200)
+                self.assertEqual(client.get(f"/chambres/id/{self.ch.idChambre}",
+                                            headers={"If-None-Match": e_detail}).status_code, 304)
+            finally:
+                supprimerUsager(str(u.idUsager))
+
+    def test_correspondance(self):
+        self.assertTrue(_correspond('"a", W/"b"', 'W/"b"'))
+        self.assertTrue(_correspond('"b"', 'W/"b"'))
+        self.assertTrue(_correspond("*", 'W/"b"'))
+        self.assertFalse(_correspond(None, 'W/"b"'))
+        self.assertFalse(_correspond('"c"', 'W/"b"'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# =====================================================================
+# Test export en flux (CSV / Parquet, lignes plates, filtre de dates)
+# =====================================================================
+import csv
+import io
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import creerReservationAvecIds, supprimerReservation
+from metier.export import exporter
+from main import app
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+D = datetime(2042, 5, 1, 15)
+
+def _csv(octets):
+    return list(csv.DictReader(io.StringIO(octets.decode("utf-8"))))
+
+class TestExport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Exp-Std", prix_plancher=50.0))
+        cls.ch = creerChambre(ChambreCreateDTO(numero_chambre=841, disponible_reservation=True, nom_type="Exp-Std"))
+        cls.u = creerUsager(UsagerCreateDTO(prenom="Ex", nom="Port", adresse="1 rue", mobile="848484848484848", mot_de_passe="secret", type_usager="Client"))
+        cls.rs = [creerReservationAvecIds(ReservationCreateDTO(idUsager=cls.u.idUsager, idChambre=cls.ch.idChambre, dateDebut=D + timedelta(days=3 * i),
+                                                               dateFin=D + timedelta(days=3 * i + 2), prixParJour=100.0 + i)) for i in range(3)]
+
+    @classmethod
+    def tearDownClass(cls):
+        for r in cls.rs: supprimerReservation(str(r.idReservation))
+        supprimerChambre(str(cls.ch.idChambre))
+        supprimerTypeChambre(str(cls.tc.idTypeChambre))
+        supprimerUsager(str(cls.u.idUsager))
+
+    def test_csv_filtre_et_petits_lots(self):
+        # Fenêtre qui touche les séjours 1 et 2 seulement; lot de 1 = plusieurs morceaux.
+        morceaux = list(exporter("reservations", "csv", D + timedelta(days=2), D + timedelta(days=7), taille_lot=1))
+        lignes = _csv(b"".join(morceaux))
+        self.assertEqual([l["id_reservation"] for l in lignes], [str(r.idReservation) for r in self.rs[1:]])
+        self.assertEqual(lignes[0]["numero_chambre"], "841")
+        self.assertEqual(lignes[0]["nom_type"], "Exp-Std")
+        self.assertEqual(lignes[0]["usager_nom"], "Port")
+        self.assertGreater(len(morceaux), 3)
+
+    def test_usagers_sans_mot_de_passe(self):
+        lignes = _csv(b"".join(exporter("usagers")))
+        self.assertNotIn("mot_de_passe", lignes[0])
+        self.assertIn("Port", {l["nom"] for l in lignes})
+        with self.assertRaises(ValueError):
+            list(exporter("usagers", "csv", D))
+
+    @unittest.skipIf(pq is None, "pyarrow non installé")
+    def test_parquet_row_groups(self):
+        octets = b"".join(exporter("reservations", "parquet", D, D + timedelta(days=30), taille_lot=2))
+        fichier = pq.ParquetFile(io.BytesIO(octets))
+        self.assertEqual(fichier.metadata.num_rows, 3)
+        self.assertEqual(fichier.metadata.num_row_groups, 2)
+        table = fichier.read()
+        self.assertEqual(table.column("prix_jour").to_pylist(), [100.0, 101.0, 102.0])
+        self.assertEqual(table.column("date_debut").to_pylist()[0], D)
+
+    def test_route(self):
+        with TestClient(app) as client:
+            res = client.get("/export/chambres")
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(res.headers["content-type"].startswith("text/csv"))
+            self.assertIn("841", {l["numero_chambre"] for l in _csv(res.content)})
+            res = client.get("/export/usagers", params={"debut": D.isoformat()})
+            self.assertEqual(res.status_code, 400)
+            if pq is not None:
+                res = client.get("/export/reservations", params={"format": "parquet", "debut": D.isoformat()})
+                self.assertEqual(pq.ParquetFile(io.BytesIO(res.content)).metadata.num_rows, 3)
+
+if __name__ == "__main__":
+    unittest.main()
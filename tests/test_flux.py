@@ -0,0 +1,56 @@
+# =====================================================================
+# Test streaming NDJSON (générateurs métier + routes)
+# =====================================================================
+import json
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, iterChambres, listerChambres, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, listerUsagers, supprimerUsager
+from metier.reservationMetier import creerReservationAvecIds, iterReservations, listerReservations, supprimerReservation
+from main import app
+
+class TestFlux(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Flux-ND", prix_plancher=60.0))
+        cls.chs = [creerChambre(ChambreCreateDTO(numero_chambre=760 + i, disponible_reservation=True, nom_type=cls.tc.nom_type)) for i in range(3)]
+        cls.u = creerUsager(UsagerCreateDTO(prenom="Flo", nom="Flux", adresse="1 rue", mobile="606060606060606", mot_de_passe="x", type_usager="Usager"))
+        debut = datetime(2033, 7, 1, 15)
+        cls.rs = [creerReservationAvecIds(ReservationCreateDTO(idUsager=cls.u.idUsager, idChambre=ch.idChambre, dateDebut=debut + timedelta(days=i),
+                                                               dateFin=debut + timedelta(days=i + 1), prixParJour=75.0)) for i, ch in enumerate(cls.chs)]
+
+    @classmethod
+    def tearDownClass(cls):
+        for r in cls.rs: supprimerReservation(str(r.idReservation))
+        for ch in cls.chs: supprimerChambre(str(ch.idChambre))
+        supprimerTypeChambre(str(cls.tc.idTypeChambre))
+        supprimerUsager(str(cls.u.idUsager))
+
+    def test_iter_sync_petits_lots(self):
+        # Lot de 1: force plusieurs allers-retours au driver.
+        ids = [r.idReservation for r in iterReservations(taille_lot=1)]
+        self.assertEqual(ids, [r.idReservation for r in listerReservations()])
+        self.assertEqual(len(list(iterChambres(taille_lot=2))), len(listerChambres()))
+
+    def test_routes_ndjson(self):
+        with TestClient(app) as client:
+            res = client.get("/reservations", params={"stream": 1})
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(res.headers["content-type"].startswith("application/x-ndjson"))
+            lignes = [json.loads(l) for l in res.text.splitlines() if l]
+            self.assertEqual(len(lignes), len(listerReservations()))
+            self.assertIn("chambre", lignes[0])
+
+            res = client.get("/usagers", headers={"Accept": "application/x-ndjson"})
+            self.assertEqual(len([l for l in res.text.splitlines() if l]), len(listerUsagers()))
+
+            res = client.get("/chambres", params={"stream": "true"})
+            ids = {json.loads(l)["idChambre"] for l in res.text.splitlines() if l}
+            self.assertTrue({str(ch.idChambre) for ch in self.chs} <= ids)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# =====================================================================
+# Test import en masse (CSV / JSONL, par lots, dédoublonnage)
+# =====================================================================
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from core.db import SessionLocal
+from metier import importation
+from metier.importation import importer, importerFichier, lire, main as cli
+from modele.chambre import Chambre
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+from main import app
+
+USAGERS_CSV = """prenom,nom,adresse,mobile,mot_de_passe,type_usager
+Ana,Import,"1 rue
+des Lots",838383838383831,x,Client
+Ben,Import,2 rue,838383838383832,x,Client
+Ana,Import,autre adresse,838383838383831,x,Client
+Cy,Import,3 rue,,x,Client
+"""
+
+class TestImportation(unittest.TestCase):
+    def tearDown(self):
+        with SessionLocal() as s:
+            s.execute(delete(Chambre).where(Chambre.numero_chambre.between(831, 839)))
+            s.execute(delete(TypeChambre).where(TypeChambre.nom_type.like("Imp-%")))
+            s.execute(delete(Usager).where(Usager.nom == "Import"))
+            s.commit()
+
+    def _usagers(self):
+        with SessionLocal() as s:
+            return s.execute(select(Usager.prenom, Usager.adresse).where(Usager.nom == "Import").order_by(Usager.prenom)).all()
+
+    def test_csv_usagers_petits_lots(self):
+        # Lot de 1: le doublon (ligne 3) est vu par la requête IN du lot suivant.
+        rapport = importer("usagers", lire(io.StringIO(USAGERS_CSV), "csv"), taille_lot=1)
+        self.assertEqual((rapport.lues, rapport.creees, rapport.existantes, rapport.erreurs), (4, 2, 1, 1))
+        self.assertEqual(rapport.exemples_erreurs[0].ligne, 4)
+        self.assertIn("mobile", rapport.exemples_erreurs[0].erreur)
+        self.assertEqual(self._usagers(), [("Ana", "1 rue\ndes Lots"), ("Ben", "2 rue")])
+        # Relancer l'import ne crée rien.
+        rapport = importer("usagers", lire(io.StringIO(USAGERS_CSV), "csv"))
+        self.assertEqual((rapport.creees, rapport.existantes), (0, 3))
+
+    def test_jsonl_types_puis_chambres(self):
+        types = "\n".join(json.dumps(t) for t in [
+            {"nom_type": "Imp-Std", "prix_plancher": 90},
+            {"nom_type": "Imp-Suite", "prix_plancher": 200, "prix_plafond": "100"},   # plafond < plancher
+        ]) + "\n\n{pas du json\n"
+        rapport = importer("types", lire(io.StringIO(types), "jsonl"))
+        self.assertEqual((rapport.lues, rapport.creees, rapport.erreurs), (3, 1, 2))
+        self.assertEqual([e.ligne for e in rapport.exemples_erreurs], [2, 3])
+
+        chambres = [
+            {"numero_chambre": 831, "disponible_reservation": True, "nom_type": "Imp-Std"},
+            {"numero_chambre": 832, "disponible_reservation": "false", "nom_type": "Imp-Std"},
+            {"numero_chambre": 833, "disponible_reservation": True, "nom_type": "Imp-Inconnu"},
+            {"numero_chambre": 831, "disponible_reservation": True, "nom_type": "Imp-Std"},
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            chemin = os.path.join(d, "chambres.jsonl")
+            with open(chemin, "w", encoding="utf-8") as f:
+                f.write("\n".join(json.dumps(c) for c in chambres))
+            rapport = importerFichier("chambres", chemin)
+        self.assertEqual((rapport.creees, rapport.existantes, rapport.erreurs), (2, 1, 1))
+        with SessionLocal() as s:
+            ch = s.execute(select(Chambre).where(Chambre.numero_chambre == 832)).scalar_one()
+            self.assertFalse(ch.disponible_reservation)
+            self.assertIsNotNone(ch.fk_type_chambre)
+
+    def test_route_et_cli(self):
+        with TestClient(app) as client:
+            res = client.post("/import/usagers", content=USAGERS_CSV.encode(), headers={"Content-Type": "text/csv"})
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()["creees"], 2)
+            res = client.post("/import/types", params={"format": "jsonl"}, content=b'{"nom_type": "Imp-Route", "prix_plancher": 1}\n')
+            self.assertEqual(res.json()["creees"], 1)
+            self.assertEqual(client.post("/import/factures", content=b"").status_code, 422)
+        with tempfile.TemporaryDirectory() as d:
+            chemin = os.path.join(d, "chambres.csv")
+            with open(chemin, "w", encoding="utf-8") as f:
+                f.write("numero_chambre,disponible_reservation,nom_type\n834,1,Imp-Route\n")
+            cli(["chambres", chemin])
+        with SessionLocal() as s:
+            self.assertIsNotNone(s.execute(select(Chambre).where(Chambre.numero_chambre == 834)).scalar_one_or_none())
+
+    def test_conflit_persistant_400(self):
+        # Le rejeu du lot rencontre encore un conflit: ValueError, pas une 500.
+        def conflit(_s, _lot, _rapport):
+            raise IntegrityError("INSERT", {}, Exception("UNIQUE"))
+        with mock.patch.dict(importation._PAR_ENTITE, {"usagers": conflit}):
+            with self.assertRaises(ValueError) as ctx:
+                importer("usagers", lire(io.StringIO(USAGERS_CSV), "csv"))
+            self.assertIn("lignes 1 à 4", str(ctx.exception))
+            with TestClient(app) as client:
+                res = client.post("/import/usagers", content=USAGERS_CSV, headers={"content-type": "text/csv"})
+            self.assertEqual(res.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
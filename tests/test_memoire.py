@@ -0,0 +1,88 @@
+# =====================================================================
+# Test instrumentation mémoire (pic par route, sessions orphelines, diff)
+# =====================================================================
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from core.contexte import MiddlewareContexte
+from core.db import DBSettings, make_engine
+from core.memoire import (
+    MiddlewareMemoire, arreter, demarrer, pics_par_route, rapport, sessions_orphelines, sessions_ouvertes,
+)
+from main import app
+
+_fuites = []
+
+class TestMemoire(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        demarrer(5)
+        cls.engine = make_engine(DBSettings(url="sqlite://"))
+        mini = FastAPI()
+        mini.add_middleware(MiddlewareMemoire)
+        mini.add_middleware(MiddlewareContexte)
+
+        @mini.get("/gros/{mio}")
+        async def gros(mio: int):
+            tampon = bytearray(mio * 1024 * 1024)
+            return {"taille": len(tampon)}
+
+        @mini.get("/fuite")
+        async def fuite():
+            s = Session(cls.engine)
+            s.execute(text("select 1"))
+            _fuites.append(s)           # ni commit ni close: la transaction survit à la requête
+            return {"ok": True}
+
+        @mini.get("/propre")
+        async def propre():
+            with Session(cls.engine) as s:
+                s.execute(text("select 1"))
+            return {"ok": True}
+        cls.client = TestClient(mini)
+
+    @classmethod
+    def tearDownClass(cls):
+        for s in _fuites:
+            s.close()
+        cls.engine.dispose()
+        arreter()
+
+    def test_pic_par_route(self):
+        self.client.get("/gros/1")
+        self.client.get("/gros/8")
+        pic = next(p for p in pics_par_route() if p["route"] == "/gros/{mio}")
+        self.assertEqual(pic["requetes"], 2)
+        self.assertGreaterEqual(pic["pic_max_octets"], 8 * 1024 * 1024)
+        self.assertLess(pic["pic_moyen_octets"], pic["pic_max_octets"])
+
+    def test_session_orpheline_attribuee(self):
+        avant = sessions_orphelines.valeur("GET", "/fuite")
+        self.client.get("/propre")
+        with self.assertLogs("hotel.memoire", "WARNING"):
+            res = self.client.get("/fuite")
+        self.assertEqual(sessions_orphelines.valeur("GET", "/fuite") - avant, 1)
+        self.assertEqual(sessions_orphelines.valeur("GET", "/propre"), 0)
+        ouvertes = [s for s in sessions_ouvertes() if s["id_requete"] == res.headers["x-request-id"]]
+        self.assertEqual(len(ouvertes), 1)
+        self.assertEqual(ouvertes[0]["route"], "/fuite")
+        self.assertTrue(ouvertes[0]["requete_terminee"])
+        _fuites.pop().close()
+        self.assertFalse([s for s in sessions_ouvertes() if s["id_requete"] == res.headers["x-request-id"]])
+
+    def test_diff_contre_reference(self):
+        rapport(nouvelle_reference=True)
+        garde = [bytearray(4096) for _ in range(500)]
+        diff = rapport(top=5)["diff"]
+        self.assertTrue(any("test_memoire.py" in d["lieu"] and d["octets_diff"] > 2_000_000 for d in diff))
+        del garde
+
+    def test_route_debug_protegee(self):
+        with TestClient(app) as client:
+            self.assertEqual(client.get("/debug/memoire").status_code, 404)
+            self.assertEqual(client.get("/debug/memoire", headers={"X-Debug-Jeton": "x"}).status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
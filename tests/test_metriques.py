@@ -0,0 +1,82 @@
+# =====================================================================
+# Test métriques Prometheus (SQL attribué à la route, erreurs, pool)
+# =====================================================================
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from core.db import get_async_engine
+from core.metriques import (
+    Histogramme, MiddlewareMetriques, TYPE_CONTENU, http_erreurs, http_requetes, http_sql, instrumenter, rendre,
+)
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, supprimerChambre, supprimerTypeChambre
+from main import app
+from tests.test_chargement import compter_selects
+
+ROUTE = ("GET", "/chambres/id/{id_chambre}")
+
+class TestMetriques(unittest.TestCase):
+    def test_sql_attribue_a_la_route(self):
+        tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Metr-T", prix_plancher=70.0))
+        ch = creerChambre(ChambreCreateDTO(numero_chambre=881, disponible_reservation=True, nom_type="Metr-T"))
+        try:
+            with TestClient(app) as client:
+                avant_sql, avant_n = http_sql.valeur(*ROUTE), http_requetes.valeur(*ROUTE, "200")
+                with compter_selects(get_async_engine().sync_engine) as q:
+                    self.assertEqual(client.get(f"/chambres/id/{ch.idChambre}").status_code, 200)
+                self.assertEqual(http_requetes.valeur(*ROUTE, "200") - avant_n, 1)
+                # Tout ce que le driver a exécuté pendant la requête lui est attribué.
+                self.assertGreaterEqual(len(q), 1)
+                self.assertEqual(http_sql.valeur(*ROUTE) - avant_sql, len(q))
+
+                res = client.get("/metrics")
+                self.assertEqual(res.headers["content-type"], TYPE_CONTENU)
+                self.assertIn('hotel_http_sql_requetes_total{methode="GET",route="/chambres/id/{id_chambre}"}', res.text)
+                self.assertIn('hotel_http_duree_secondes_bucket{methode="GET",route="/chambres/id/{id_chambre}",le="+Inf"}',
+                              res.text)
+        finally:
+            supprimerChambre(str(ch.idChambre))
+            supprimerTypeChambre(str(tc.idTypeChambre))
+
+    def test_exception_comptee(self):
+        mini = FastAPI()
+        mini.add_middleware(MiddlewareMetriques)
+
+        @mini.get("/boum/{n}")
+        async def boum(n: int):
+            raise RuntimeError("boum")
+
+        with TestClient(mini, raise_server_exceptions=False) as client:
+            self.assertEqual(client.get("/boum/1").status_code, 500)
+            client.get("/boum/2")
+        self.assertEqual(http_erreurs.valeur("GET", "/boum/{n}", "RuntimeError"), 2)
+        self.assertEqual(http_requetes.valeur("GET", "/boum/{n}", "500"), 2)
+
+    def test_jauges_pool_et_erreurs_bd(self):
+        engine = create_engine("sqlite://", pool_size=3, poolclass=QueuePool)
+        instrumenter(engine, "test")
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            with self.assertRaises(Exception):
+                conn.execute(text("select * from table_absente"))
+            texte = rendre({"test": engine})
+        self.assertIn('hotel_bd_pool_prises{engine="test"} 1', texte)
+        self.assertIn('hotel_bd_erreurs_total{engine="test"} 1', texte)
+        self.assertIn('hotel_bd_requete_secondes_count{engine="test"} 1', texte)
+        engine.dispose()
+
+    def test_histogramme_cumulatif(self):
+        h = Histogramme("essai", "Essai.", (1, 5), ("x",))
+        for v in (0.5, 3, 3, 10):
+            h.observer(v, 'a"b')
+        lignes = h.rendre()
+        self.assertIn('essai_bucket{x="a\\"b",le="1"} 1', lignes)
+        self.assertIn('essai_bucket{x="a\\"b",le="5"} 3', lignes)
+        self.assertIn('essai_bucket{x="a\\"b",le="+Inf"} 4', lignes)
+        self.assertIn('essai_sum{x="a\\"b"} 16.5', lignes)
+        self.assertIn('essai_count{x="a\\"b"} 4', lignes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# =====================================================================
+# Test migrations de schéma (index sur une BD existante, idempotence)
+# =====================================================================
+import unittest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+from core.migrations import MIGRATIONS, etat, migrer
+from DTO.chambreDTO import TypeChambreCreateDTO, TypeChambreUpdateDTO, ChambreCreateDTO, ChambreUpdateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, modifierChambre, modifierTypeChambre, supprimerChambre, supprimerTypeChambre
+from modele.base import Base
+
+INDEX = {"uq_type_chambre_nom", "uq_chambre_numero", "ix_chambre_type", "ix_usager_identite",
+         "ix_reservation_chambre_dates", "ix_reservation_debut", "ix_reservation_usager"}
+
+def _ancienne_bd():
+    """BD créée avant les index: tables seules, sans aucun index secondaire."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in inspect(conn).get_table_names():
+            for ix in inspect(conn).get_indexes(table):
+                conn.execute(text(f"DROP INDEX {ix['name']}"))
+        conn.execute(text("DROP TABLE schema_migration"))
+    return engine
+
+def _index(engine):
+    insp = inspect(engine)
+    return {ix["name"] for t in insp.get_table_names() for ix in insp.get_indexes(t)}
+
+class TestMigrations(unittest.TestCase):
+    def test_bd_existante(self):
+        engine = _ancienne_bd()
+        self.assertFalse(INDEX & _index(engine))
+        self.assertEqual(migrer(engine), [m.version for m in MIGRATIONS])
+        self.assertTrue(INDEX <= _index(engine))
+        uniques = {ix["name"] for ix in inspect(engine).get_indexes("chambre") if ix["unique"]}
+        self.assertEqual(uniques, {"uq_chambre_numero"})
+        # Deuxième passage: rien à faire.
+        self.assertEqual(migrer(engine), [])
+        self.assertTrue(all(faite for _, _, faite in etat(engine)))
+
+    def test_cible_puis_suite(self):
+        engine = _ancienne_bd()
+        self.assertEqual(migrer(engine, cible=1), [1])
+        self.assertNotIn("ix_reservation_debut", _index(engine))
+        self.assertEqual(migrer(engine), [2])
+
+    def test_doublons_bloquent(self):
+        engine = _ancienne_bd()
+        with engine.begin() as conn:
+            for i in range(2):
+                conn.execute(text(
+                    "INSERT INTO type_chambre (id_type_chambre, nom_type, prix_plancher) "
+                    f"VALUES ('{i:032x}', 'Double', 100)"
+                ))
+        with self.assertRaisesRegex(RuntimeError, "Doublons dans type_chambre"):
+            migrer(engine)
+        # Transaction annulée: ni index ni version notée.
+        self.assertNotIn("uq_chambre_numero", _index(engine))
+        self.assertFalse(any(faite for _, _, faite in etat(engine)))
+
+    def test_unicite_en_erreur_metier(self):
+        tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Mig-A", prix_plancher=60.0))
+        tc2 = creerTypeChambre(TypeChambreCreateDTO(nom_type="Mig-B", prix_plancher=60.0))
+        ch = creerChambre(ChambreCreateDTO(numero_chambre=871, disponible_reservation=True, nom_type="Mig-A"))
+        ch2 = creerChambre(ChambreCreateDTO(numero_chambre=872, disponible_reservation=True, nom_type="Mig-A"))
+        try:
+            with self.assertRaisesRegex(ValueError, "871 existe déjà"):
+                creerChambre(ChambreCreateDTO(numero_chambre=871, disponible_reservation=True, nom_type="Mig-A"))
+            with self.assertRaisesRegex(ValueError, "871 existe déjà"):
+                modifierChambre(str(ch2.idChambre), ChambreUpdateDTO(numero_chambre=871))
+            with self.assertRaisesRegex(ValueError, "existe déjà"):
+                modifierTypeChambre(str(tc2.idTypeChambre), TypeChambreUpdateDTO(nom_type="Mig-A"))
+        finally:
+            supprimerChambre(str(ch.idChambre)); supprimerChambre(str(ch2.idChambre))
+            supprimerTypeChambre(str(tc.idTypeChambre)); supprimerTypeChambre(str(tc2.idTypeChambre))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# =====================================================================
+# Test index d'occupation en mémoire (write-through + resync par version)
+# =====================================================================
+import unittest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from core.db import SessionLocal
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO, ReservationUpdateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, listerChambresDisponibles, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import creerReservationAvecIds, modifierReservation, supprimerReservation
+from metier.occupation import TABLE, IndexOccupation, Intervalles, index_occupation
+from metier.versions import incrementer_version
+from modele.reservation import Reservation
+
+D = datetime(2036, 6, 1, 15)
+
+class TestIntervalles(unittest.TestCase):
+    def test_chevauchement_et_fin_max(self):
+        iv = Intervalles()
+        a, b, c = uuid4(), uuid4(), uuid4()
+        iv.ajouter(D, D + timedelta(days=10), a)                          # long séjour (données legacy)
+        iv.ajouter(D + timedelta(days=1), D + timedelta(days=2), b)       # chevauche a
+        iv.ajouter(D + timedelta(days=20), D + timedelta(days=21), c)
+        # [8, 9[ n'est couvert que par a: fin_max doit le voir malgré b.
+        self.assertTrue(iv.chevauche(D + timedelta(days=8), D + timedelta(days=9)))
+        self.assertFalse(iv.chevauche(D + timedelta(days=10), D + timedelta(days=20)))
+        self.assertTrue(iv.chevauche(D + timedelta(days=19), D + timedelta(days=20, hours=1)))
+        iv.retirer(D, a)
+        self.assertFalse(iv.chevauche(D + timedelta(days=8), D + timedelta(days=9)))
+        self.assertTrue(iv.chevauche(D + timedelta(days=1), D + timedelta(days=1, hours=1)))
+
+class TestIndexOccupation(unittest.TestCase):
+    def setUp(self):
+        self.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Occ-Idx", prix_plancher=100.0))
+        self.ch = creerChambre(ChambreCreateDTO(numero_chambre=791, disponible_reservation=True, nom_type="Occ-Idx"))
+        self.ch2 = creerChambre(ChambreCreateDTO(numero_chambre=792, disponible_reservation=True, nom_type="Occ-Idx"))
+        self.u = creerUsager(UsagerCreateDTO(prenom="Oc", nom="Cupe", adresse="1 rue", mobile="919191919191919", mot_de_passe="x", type_usager="Usager"))
+        index_occupation.charger()
+        self.rs = []
+
+    def tearDown(self):
+        index_occupation.desactiver()
+        for r in self.rs: supprimerReservation(str(r.idReservation))
+        supprimerChambre(str(self.ch.idChambre)); supprimerChambre(str(self.ch2.idChambre))
+        supprimerTypeChambre(str(self.tc.idTypeChambre))
+        supprimerUsager(str(self.u.idUsager))
+
+    def _dispo(self):
+        return {c.numero_chambre for c in listerChambresDisponibles(D, D + timedelta(days=1), "Occ-Idx")}
+
+    def test_write_through(self):
+        r = creerReservationAvecIds(ReservationCreateDTO(idUsager=self.u.idUsager, idChambre=self.ch.idChambre,
+                                                         dateDebut=D, dateFin=D + timedelta(days=2), prixParJour=100.0))
+        self.assertTrue(index_occupation.est_occupee(self.ch.idChambre, D, D + timedelta(days=1)))
+        self.assertEqual(self._dispo(), {792})
+
+        # Déplacement vers l'autre chambre: l'ancien intervalle disparaît.
+        modifierReservation(str(r.idReservation), ReservationUpdateDTO(idChambre=str(self.ch2.idChambre)))
+        self.assertFalse(index_occupation.est_occupee(self.ch.idChambre, D, D + timedelta(days=1)))
+        self.assertEqual(self._dispo(), {791})
+
+        supprimerReservation(str(r.idReservation))
+        self.assertEqual(self._dispo(), {791, 792})
+
+    def test_resync_autre_worker(self):
+        # Un "autre process" écrit directement en BD et incrémente la version.
+        with SessionLocal() as s:
+            r = Reservation(date_debut_reservation=D, date_fin_reservation=D + timedelta(days=1), prix_jour=1.0,
+                            fk_id_usager=self.u.idUsager, fk_id_chambre=self.ch.idChambre)
+            s.add(r); s.commit()
+            id_r = r.id_reservation
+            incrementer_version(s, TABLE)
+        try:
+            self.assertFalse(index_occupation.est_occupee(self.ch.idChambre, D, D + timedelta(hours=1)))
+            index_occupation.synchroniser(forcer=True)
+            self.assertTrue(index_occupation.est_occupee(self.ch.idChambre, D, D + timedelta(hours=1)))
+        finally:
+            supprimerReservation(str(id_r))
+
+    def test_inactif_par_defaut(self):
+        idx = IndexOccupation()
+        self.assertFalse(idx.actif)
+        idx.ajouter(uuid4(), uuid4(), D, D + timedelta(days=1))  # ignoré
+        self.assertFalse(idx.est_occupee(uuid4(), D, D + timedelta(days=1)))
+
+if __name__ == "__main__":
+    unittest.main()
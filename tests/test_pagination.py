@@ -0,0 +1,94 @@
+# =====================================================================
+# Test pagination keyset (listes par curseur)
+# - On parcourt toutes les pages et on vérifie: pas de doublon, ordre
+#   identique à la liste complète, next_cursor None à la fin.
+# =====================================================================
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.chambreMetier import (
+    creerTypeChambre, creerChambre, listerChambres, listerChambresPage,
+    supprimerChambre, supprimerTypeChambre,
+)
+from metier.usagerMetier import creerUsager, listerUsagers, listerUsagersPage, supprimerUsager
+from metier.reservationMetier import (
+    creerReservationAvecIds, listerReservations, listerReservationsPage, supprimerReservation,
+)
+from metier.pagination import encoder_curseur
+from main import app
+
+def _toutes_les_pages(fn, limit):
+    items, curseur, pages = [], None, 0
+    while True:
+        page = fn(limit, curseur)
+        items.extend(page.items)
+        pages += 1
+        if page.next_cursor is None:
+            return items, pages
+        curseur = page.next_cursor
+
+class TestPagination(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Page-KS", prix_plancher=80.0))
+        cls.chs = [creerChambre(ChambreCreateDTO(numero_chambre=750 + i, disponible_reservation=True, nom_type=cls.tc.nom_type)) for i in range(5)]
+        # Mêmes nom/prénom pour forcer le départage par id.
+        cls.us = [creerUsager(UsagerCreateDTO(prenom="Pat", nom="Page", adresse="1 rue", mobile=f"5000000000000{i:02d}", mot_de_passe="x", type_usager="Usager")) for i in range(4)]
+        debut = datetime(2032, 3, 1, 15)  # même date partout: départage par id aussi
+        cls.rs = [creerReservationAvecIds(ReservationCreateDTO(idUsager=cls.us[0].idUsager, idChambre=ch.idChambre,
+                                                               dateDebut=debut, dateFin=debut + timedelta(days=1), prixParJour=90.0)) for ch in cls.chs]
+
+    @classmethod
+    def tearDownClass(cls):
+        for r in cls.rs: supprimerReservation(str(r.idReservation))
+        for ch in cls.chs: supprimerChambre(str(ch.idChambre))
+        supprimerTypeChambre(str(cls.tc.idTypeChambre))
+        for u in cls.us: supprimerUsager(str(u.idUsager))
+
+    def test_parcours_complet(self):
+        for page_fn, liste_fn, cle in (
+            (listerReservationsPage, listerReservations, "idReservation"),
+            (listerChambresPage, listerChambres, "idChambre"),
+            (listerUsagersPage, listerUsagers, "idUsager"),
+        ):
+            items, pages = _toutes_les_pages(page_fn, 2)
+            ids = [getattr(x, cle) for x in items]
+            self.assertEqual(len(ids), len(set(ids)))
+            complet = [getattr(x, cle) for x in liste_fn()]
+            self.assertEqual(sorted(map(str, ids)), sorted(map(str, complet)))
+            self.assertGreater(pages, 1)
+
+    def test_ordre_reservations(self):
+        items, _ = _toutes_les_pages(listerReservationsPage, 3)
+        cles = [(x.dateDebut, str(x.idReservation)) for x in items]
+        self.assertEqual(len(cles), len(listerReservations()))
+        dates = [c[0] for c in cles]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_curseur_invalide(self):
+        with self.assertRaises(ValueError):
+            listerChambresPage(2, "pas-un-curseur")
+        # Curseur d'une autre liste refusé aussi.
+        with self.assertRaises(ValueError):
+            listerChambresPage(2, encoder_curseur("usager", ["a", "b", "c"]))
+        with self.assertRaises(ValueError):
+            listerChambresPage(0)
+
+    def test_routes(self):
+        with TestClient(app) as client:
+            res = client.get("/chambres", params={"limit": 2})
+            self.assertEqual(res.status_code, 200)
+            body = res.json()
+            self.assertEqual(len(body["items"]), 2)
+            self.assertIsNotNone(body["next_cursor"])
+            suite = client.get("/chambres", params={"limit": 2, "cursor": body["next_cursor"]}).json()
+            self.assertNotEqual(suite["items"][0]["idChambre"], body["items"][0]["idChambre"])
+            self.assertEqual(client.get("/reservations", params={"cursor": "zzz"}).status_code, 400)
+            self.assertEqual(client.get("/usagers", params={"limit": 0}).status_code, 422)
+            self.assertEqual(client.get("/typesChambre").status_code, 200)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# =====================================================================
+# Test profilage CPU à la demande (en-tête autorisé, échantillon, formats)
+# =====================================================================
+import os
+import pstats
+import tempfile
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from core.contexte import MiddlewareContexte
+from core.profilage import MiddlewareProfilage, ReglagesProfil
+
+def _calcul_couteux(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+def _mini_app(reglages: ReglagesProfil) -> FastAPI:
+    mini = FastAPI()
+    mini.add_middleware(MiddlewareProfilage, reglages=reglages)
+    mini.add_middleware(MiddlewareContexte)
+
+    @mini.get("/calcul/{n}")
+    async def calcul(n: int):
+        return {"total": _calcul_couteux(n)}
+    return mini
+
+class TestProfilage(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def test_entete_autorise_pstats(self):
+        app = _mini_app(ReglagesProfil(dossier=self.dossier.name, jeton="secret"))
+        with TestClient(app) as client:
+            sans = client.get("/calcul/10")
+            mauvais = client.get("/calcul/10", headers={"X-Profil": "devine"})
+            res = client.get("/calcul/200000", headers={"X-Profil": "secret", "X-Request-ID": "prof-1"})
+        self.assertNotIn("x-profil", sans.headers)
+        self.assertNotIn("x-profil", mauvais.headers)
+        nom = res.headers["x-profil"]
+        self.assertTrue(nom.endswith("-GET-calcul_n-prof-1.prof"))
+        self.assertEqual(os.listdir(self.dossier.name), [nom])
+        stats = pstats.Stats(os.path.join(self.dossier.name, nom))
+        self.assertTrue(any(f[2] == "_calcul_couteux" for f in stats.stats))
+
+    def test_echantillon_et_piles_repliees(self):
+        reglages = ReglagesProfil(dossier=self.dossier.name, echantillon=1.0, chemins=("/calcul",),
+                                  format="collapsed", intervalle_ms=0.5)
+        with TestClient(_mini_app(reglages)) as client:
+            nom = client.get("/calcul/2000000").headers["x-profil"]
+            self.assertNotIn("x-profil", client.get("/ailleurs").headers)
+        with open(os.path.join(self.dossier.name, nom), encoding="utf-8") as f:
+            lignes = f.read().splitlines()
+        self.assertTrue(lignes)
+        self.assertTrue(all(l.rsplit(" ", 1)[1].isdigit() for l in lignes))
+        self.assertTrue(any("_calcul_couteux" in l for l in lignes))
+
+    def test_inactif_par_defaut(self):
+        self.assertFalse(ReglagesProfil().actif)
+        self.assertFalse(ReglagesProfil(dossier=self.dossier.name).actif)
+        with self.assertRaises(ValueError):
+            ReglagesProfil(format="svg")
+
+if __name__ == "__main__":
+    unittest.main()
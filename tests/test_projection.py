@@ -0,0 +1,122 @@
+# =====================================================================
+# Test champs à la carte (?fields= / ?expand=) sur /chambres et /reservations
+# =====================================================================
+import json
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from core.db import get_async_engine
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, supprimerChambre, supprimerTypeChambre
+from metier.projection import RESERVATION, lire_projection
+from metier.reservationMetier import creerReservationAvecIds, supprimerReservation
+from metier.usagerMetier import creerUsager, supprimerUsager
+from main import app
+from tests.test_chargement import compter_selects
+
+class TestProjection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Proj-T", prix_plancher=95.0))
+        cls.ch = creerChambre(ChambreCreateDTO(numero_chambre=883, disponible_reservation=True,
+                                               autre_informations="Très longue note", nom_type="Proj-T"))
+        cls.u = creerUsager(UsagerCreateDTO(prenom="Pia", nom="Projection", adresse="1 rue P", mobile="514-555-0883",
+                                            mot_de_passe="x", type_usager="client"))
+        debut = datetime(2031, 3, 1, 15)
+        cls.resas = [creerReservationAvecIds(ReservationCreateDTO(
+            idUsager=cls.u.idUsager, idChambre=cls.ch.idChambre, dateDebut=debut + timedelta(days=3 * i),
+            dateFin=debut + timedelta(days=3 * i + 2), prixParJour=120.0, infoReservation="Note longue"))
+            for i in range(2)]
+        cls.client = TestClient(app)
+        cls.client.__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.__exit__(None, None, None)
+        for r in cls.resas:
+            supprimerReservation(str(r.idReservation))
+        supprimerChambre(str(cls.ch.idChambre))
+        supprimerTypeChambre(str(cls.tc.idTypeChambre))
+        supprimerUsager(str(cls.u.idUsager))
+
+    def _page(self, url):
+        with compter_selects(get_async_engine().sync_engine) as q:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200, res.text)
+        sql = [s for s in q if "FROM reservation" in s or "FROM chambre" in s]
+        return res.json(), " ".join(sql)
+
+    def _mes_resas(self, page):
+        ids = {str(r.idReservation) for r in self.resas}
+        return [i for i in page["items"] if i["idReservation"] in ids]
+
+    def test_fields_sans_jointure_ni_colonne_texte(self):
+        page, sql = self._page("/reservations?limit=1000&fields=dateDebut,prixParJour")
+        item = self._mes_resas(page)[0]
+        self.assertEqual(set(item), {"idReservation", "dateDebut", "prixParJour"})
+        self.assertEqual(item["prixParJour"], 120.0)
+        self.assertNotIn("info_reservation", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_expand_joint_seulement_ce_qui_est_demande(self):
+        page, sql = self._page("/reservations?limit=1000&fields=dateDebut,usager.nom&expand=chambre")
+        item = self._mes_resas(page)[0]
+        self.assertEqual(item["usager"], {"idUsager": str(self.u.idUsager), "nom": "Projection"})
+        self.assertEqual(item["chambre"]["numero_chambre"], 883)
+        self.assertNotIn("type_chambre", item["chambre"])
+        self.assertIn("JOIN usager", sql)
+        self.assertIn("JOIN chambre", sql)
+        self.assertNotIn("type_chambre", sql)
+        self.assertNotIn("adresse", sql)
+
+    def test_sans_parametre_reponse_complete(self):
+        page, _ = self._page("/reservations?limit=1000")
+        item = self._mes_resas(page)[0]
+        self.assertEqual(item["chambre"]["type_chambre"]["nom_type"], "Proj-T")
+        self.assertEqual(item["usager"]["prenom"], "Pia")
+
+    def test_etag_et_304(self):
+        url = "/reservations?limit=5&fields=dateDebut"
+        res = self.client.get(url)
+        self.assertEqual(res.headers["content-type"], "application/json")
+        self.assertEqual(self.client.get(url, headers={"If-None-Match": res.headers["etag"]}).status_code, 304)
+        autre = self.client.get("/reservations?limit=5&fields=dateFin").headers["etag"]
+        self.assertNotEqual(autre, res.headers["etag"])
+
+    def test_pagination_avec_projection(self):
+        vus, curseur = [], None
+        while True:
+            url = "/reservations?limit=1&fields=infoReservation" + (f"&cursor={curseur}" if curseur else "")
+            page, _ = self._page(url)
+            vus += [i["idReservation"] for i in page["items"]]
+            curseur = page["next_cursor"]
+            if not curseur:
+                break
+        self.assertEqual(len(vus), len(set(vus)))
+        self.assertTrue({str(r.idReservation) for r in self.resas} <= set(vus))
+
+    def test_chambres_type_via_catalogue(self):
+        page, sql = self._page("/chambres?limit=1000&fields=numero_chambre,type_chambre.nom_type")
+        item = next(i for i in page["items"] if i["idChambre"] == str(self.ch.idChambre))
+        self.assertEqual(item, {"idChambre": str(self.ch.idChambre), "numero_chambre": 883,
+                                "type_chambre": {"idTypeChambre": str(self.tc.idTypeChambre), "nom_type": "Proj-T"}})
+        self.assertNotIn("autre_informations", sql)
+
+    def test_flux_ndjson(self):
+        res = self.client.get("/chambres?stream=1&fields=numero_chambre&expand=type_chambre")
+        lignes = [json.loads(l) for l in res.text.splitlines()]
+        mienne = next(l for l in lignes if l["idChambre"] == str(self.ch.idChambre))
+        self.assertEqual(mienne["type_chambre"]["nom_type"], "Proj-T")
+        self.assertNotIn("autre_informations", mienne)
+
+    def test_champ_inconnu(self):
+        self.assertEqual(self.client.get("/reservations?fields=motDePasse").status_code, 400)
+        self.assertEqual(self.client.get("/chambres?expand=usager").status_code, 400)
+        with self.assertRaises(ValueError):
+            lire_projection(RESERVATION, "chambre.inconnu", None)
+        self.assertIsNone(lire_projection(RESERVATION, None, None))
+
+if __name__ == "__main__":
+    unittest.main()
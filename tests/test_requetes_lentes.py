@@ -0,0 +1,81 @@
+# =====================================================================
+# Test journal JSON des requêtes lentes (seuil, échantillon, contexte)
+# =====================================================================
+import json
+import logging
+import unittest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from core.contexte import MiddlewareContexte
+from core.db import DBSettings, make_engine
+from core.requetes_lentes import empreinte, journal
+
+class TestRequetesLentes(unittest.TestCase):
+    def setUp(self):
+        self.engine = None
+
+    def tearDown(self):
+        if self.engine is not None:
+            with self.engine.begin() as c:
+                c.execute(text("drop table if exists t_lent"))
+            self.engine.dispose()
+            self.engine = None
+
+    def _engine(self, **reglages):
+        self.engine = make_engine(DBSettings(url="sqlite://", **reglages))
+        with self.engine.begin() as c:
+            c.execute(text("create table if not exists t_lent (id integer primary key, nom varchar(20))"))
+            c.execute(text("insert into t_lent (nom) values ('Tremblay'), ('Gagnon')"))
+        return self.engine
+
+    def test_empreinte_normalise(self):
+        h1, sql = empreinte("SELECT * FROM usager WHERE nom = 'Tremblay' AND id IN (1, 2, 3)  -- x")
+        h2, _ = empreinte("SELECT * FROM usager WHERE nom = 'Roy' AND id IN (7)")
+        self.assertEqual(sql, "SELECT * FROM usager WHERE nom = ? AND id IN (...)")
+        self.assertEqual(h1, h2)
+        _, sql = empreinte("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)")
+        self.assertEqual(sql, "INSERT INTO t (a, b) VALUES (...)")
+        self.assertNotEqual(empreinte("SELECT a FROM t")[0], empreinte("SELECT b FROM t")[0])
+
+    def test_ligne_json_avec_plan_sans_parametres(self):
+        eng = self._engine(lent_ms=0, lent_plan=True)
+        with self.assertLogs(journal, logging.INFO) as log, eng.connect() as c:
+            c.execute(text("select * from t_lent where nom = :n"), {"n": "Tremblay"}).all()
+        entree = json.loads(log.output[-1].split(":", 2)[2])
+        self.assertEqual(entree["evenement"], "requete_lente")
+        self.assertEqual(entree["sql"], "select * from t_lent where nom = ?")
+        self.assertEqual(entree["engine"], "sync")
+        self.assertIsNone(entree["route"])
+        self.assertTrue(entree["plan"])
+        self.assertNotIn("Tremblay", log.output[-1])
+
+    def test_sous_le_seuil_ou_hors_echantillon_silencieux(self):
+        for reglages in ({"lent_ms": 10_000}, {"lent_ms": 0, "lent_echantillon": 0}):
+            eng = self._engine(**reglages)
+            with self.assertNoLogs(journal, logging.INFO), eng.connect() as c:
+                c.execute(text("select count(*) from t_lent")).scalar()
+            self.tearDown()
+
+    def test_route_et_id_de_requete(self):
+        eng = self._engine(lent_ms=0)
+        mini = FastAPI()
+        mini.add_middleware(MiddlewareContexte)
+
+        @mini.get("/noms/{id_nom}")
+        def nom(id_nom: int):
+            with eng.connect() as c:
+                return {"nom": c.execute(text("select nom from t_lent where id = :i"), {"i": id_nom}).scalar()}
+
+        with TestClient(mini) as client, self.assertLogs(journal, logging.INFO) as log:
+            res = client.get("/noms/1", headers={"X-Request-ID": "req-42"})
+            auto = client.get("/noms/2")
+        self.assertEqual(res.headers["x-request-id"], "req-42")
+        self.assertEqual(len(auto.headers["x-request-id"]), 32)
+        entrees = [json.loads(l.split(":", 2)[2]) for l in log.output]
+        self.assertEqual(entrees[0]["route"], "GET /noms/{id_nom}")
+        self.assertEqual(entrees[0]["id_requete"], "req-42")
+        self.assertEqual(entrees[1]["id_requete"], auto.headers["x-request-id"])
+
+if __name__ == "__main__":
+    unittest.main()
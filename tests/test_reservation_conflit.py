@@ -0,0 +1,109 @@
+# =====================================================================
+# Test anti double-réservation (chevauchement + concurrence)
+# =====================================================================
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from core.db import DBSettings, make_engine
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO, ReservationUpdateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import (
+    ConflitReservation, _creerReservationAvecIds, creerReservationAvecIds,
+    modifierReservation, supprimerReservation,
+)
+from modele.base import Base
+from modele.chambre import Chambre
+from modele.reservation import Reservation
+from modele.type_chambre import TypeChambre
+from modele.usager import Usager
+from main import app
+
+D = datetime(2035, 4, 1, 15)
+
+def _dto(u, ch, debut, jours=2):
+    return ReservationCreateDTO(idUsager=u.idUsager, idChambre=ch.idChambre, dateDebut=debut,
+                                dateFin=debut + timedelta(days=jours), prixParJour=100.0)
+
+class TestReservationConflit(unittest.TestCase):
+    def setUp(self):
+        self.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Conflit", prix_plancher=100.0))
+        self.ch = creerChambre(ChambreCreateDTO(numero_chambre=781, disponible_reservation=True, nom_type="Conflit"))
+        self.ch2 = creerChambre(ChambreCreateDTO(numero_chambre=782, disponible_reservation=True, nom_type="Conflit"))
+        self.u = creerUsager(UsagerCreateDTO(prenom="Con", nom="Flit", adresse="1 rue", mobile="808080808080808", mot_de_passe="x", type_usager="Usager"))
+        self.rs = []
+
+    def tearDown(self):
+        for r in self.rs: supprimerReservation(str(r.idReservation))
+        supprimerChambre(str(self.ch.idChambre)); supprimerChambre(str(self.ch2.idChambre))
+        supprimerTypeChambre(str(self.tc.idTypeChambre))
+        supprimerUsager(str(self.u.idUsager))
+
+    def test_creation_en_conflit(self):
+        self.rs.append(creerReservationAvecIds(_dto(self.u, self.ch, D)))
+        with self.assertRaises(ConflitReservation):
+            creerReservationAvecIds(_dto(self.u, self.ch, D + timedelta(days=1)))
+        # Séjour qui commence au départ du précédent: OK. Autre chambre: OK.
+        self.rs.append(creerReservationAvecIds(_dto(self.u, self.ch, D + timedelta(days=2))))
+        self.rs.append(creerReservationAvecIds(_dto(self.u, self.ch2, D)))
+
+    def test_modification_en_conflit(self):
+        a = creerReservationAvecIds(_dto(self.u, self.ch, D)); self.rs.append(a)
+        b = creerReservationAvecIds(_dto(self.u, self.ch2, D)); self.rs.append(b)
+        with self.assertRaises(ConflitReservation):
+            modifierReservation(str(b.idReservation), ReservationUpdateDTO(idChambre=str(self.ch.idChambre)))
+        # Décaler sa propre résa (chevauche l'ancienne version d'elle-même): permis.
+        maj = modifierReservation(str(a.idReservation), ReservationUpdateDTO(dateFin=D + timedelta(days=3)))
+        self.assertEqual(maj.dateFin, D + timedelta(days=3))
+
+    def test_route_409(self):
+        self.rs.append(creerReservationAvecIds(_dto(self.u, self.ch, D)))
+        with TestClient(app) as client:
+            res = client.post("/reservations", json=_dto(self.u, self.ch, D).model_dump(mode="json"))
+            self.assertEqual(res.status_code, 409)
+
+class TestReservationConcurrente(unittest.TestCase):
+    """Plusieurs threads, vraies connexions (SQLite fichier): une seule gagne."""
+
+    def test_une_seule_reservation_gagne(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            eng = make_engine(DBSettings(url=f"sqlite:///{os.path.join(tmp, 'c.db')}", pool_size=8))
+            Base.metadata.create_all(eng)
+            Fabrique = sessionmaker(bind=eng, autoflush=False)
+            with Fabrique() as s:
+                tc = TypeChambre(nom_type="T", prix_plancher=1.0)
+                ch = Chambre(numero_chambre=1, disponible_reservation=True, type_chambre=tc)
+                u = Usager(prenom="a", nom="b", adresse="c", mobile="1", mot_de_passe="x", type_usager="U")
+                s.add_all([tc, ch, u]); s.commit()
+                id_u, id_ch = u.id_usager, ch.id_chambre
+
+            resultats = []
+            depart = threading.Barrier(8)
+            def client():
+                depart.wait()
+                data = ReservationCreateDTO(idUsager=id_u, idChambre=id_ch, dateDebut=D, dateFin=D + timedelta(days=1), prixParJour=10.0)
+                with Fabrique() as s:
+                    try:
+                        _creerReservationAvecIds(s, data)
+                        resultats.append("ok")
+                    except ConflitReservation:
+                        resultats.append("conflit")
+            threads = [threading.Thread(target=client) for _ in range(8)]
+            for t in threads: t.start()
+            for t in threads: t.join()
+
+            self.assertEqual(resultats.count("ok"), 1)
+            self.assertEqual(resultats.count("conflit"), 7)
+            with Fabrique() as s:
+                self.assertEqual(s.execute(select(func.count()).select_from(Reservation)).scalar(), 1)
+            eng.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# =====================================================================
+# Test création de réservations en lot (POST /reservations/batch)
+# =====================================================================
+import unittest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from DTO.chambreDTO import TypeChambreCreateDTO, ChambreCreateDTO
+from DTO.usagerDTO import UsagerCreateDTO
+from DTO.reservationDTO import ReservationCreateDTO
+from metier.chambreMetier import creerTypeChambre, creerChambre, supprimerChambre, supprimerTypeChambre
+from metier.usagerMetier import creerUsager, supprimerUsager
+from metier.reservationMetier import creerReservationAvecIds, creerReservationsLot, getReservationParId, supprimerReservation, LOT_MAX
+from metier.analytiqueMetier import indicateurs
+from main import app
+
+D = datetime(2039, 4, 1, 15)
+
+class TestReservationLot(unittest.TestCase):
+    def setUp(self):
+        self.tc = creerTypeChambre(TypeChambreCreateDTO(nom_type="Lot-Std", prix_plancher=50.0))
+        self.a = creerChambre(ChambreCreateDTO(numero_chambre=821, disponible_reservation=True, nom_type="Lot-Std"))
+        self.b = creerChambre(ChambreCreateDTO(numero_chambre=822, disponible_reservation=True, nom_type="Lot-Std"))
+        self.u = creerUsager(UsagerCreateDTO(prenom="Lo", nom="Tissement", adresse="1 rue", mobile="828282828282828", mot_de_passe="x", type_usager="Usager"))
+        self.existante = creerReservationAvecIds(self._dto(self.a, 0, 2))
+        self.ids = [self.existante.idReservation]
+
+    def tearDown(self):
+        for i in self.ids: supprimerReservation(str(i))
+        supprimerChambre(str(self.a.idChambre)); supprimerChambre(str(self.b.idChambre))
+        supprimerTypeChambre(str(self.tc.idTypeChambre))
+        supprimerUsager(str(self.u.idUsager))
+
+    def _dto(self, ch, jour, nuits, prix=100.0, id_usager=None, id_chambre=None):
+        return ReservationCreateDTO(idUsager=id_usager or self.u.idUsager, idChambre=id_chambre or ch.idChambre,
+                                    dateDebut=D + timedelta(days=jour), dateFin=D + timedelta(days=jour + nuits), prixParJour=prix)
+
+    def test_resultats_par_element(self):
+        lot = creerReservationsLot([
+            self._dto(self.a, 2, 1),                        # 201: colle à l'existante
+            self._dto(self.a, 1, 1),                        # 409: chevauche l'existante
+            self._dto(self.b, 0, 3),                        # 201
+            self._dto(self.b, 2, 2),                        # 409: chevauche l'élément précédent du lot
+            self._dto(self.b, 5, 1, id_usager=uuid4()),     # 400: usager inconnu
+            self._dto(self.b, 5, 1, id_chambre=uuid4()),    # 400: chambre inconnue
+            self._dto(self.b, 5, 1, prix=0),                # 400: prix
+        ])
+        self.ids += [r.idReservation for r in lot.resultats if r.idReservation]
+        self.assertEqual([r.statut for r in lot.resultats], [201, 409, 201, 409, 400, 400, 400])
+        self.assertEqual((lot.crees, lot.erreurs), (2, 5))
+        self.assertEqual([r.index for r in lot.resultats], list(range(7)))
+
+        cree = getReservationParId(str(lot.resultats[2].idReservation))
+        self.assertEqual(cree.chambre.numero_chambre, 822)
+        # daily_summary suit le lot: 2 (existante) + 1 + 3 nuits.
+        total = indicateurs(D.date(), D.date() + timedelta(days=10), "total", "Lot-Std")[0]
+        self.assertEqual(total.nuits_vendues, 6)
+
+    def test_route_et_limite(self):
+        with TestClient(app) as client:
+            corps = [self._dto(self.b, 10, 1).model_dump(mode="json"), self._dto(self.b, 10, 1).model_dump(mode="json")]
+            res = client.post("/reservations/batch", json=corps)
+            self.assertEqual(res.status_code, 200)
+            data = res.json()
+            self.ids += [r["idReservation"] for r in data["resultats"] if r["idReservation"]]
+            self.assertEqual([r["statut"] for r in data["resultats"]], [201, 409])
+        with self.assertRaises(ValueError):
+            creerReservationsLot([self._dto(self.b, 20, 1)] * (LOT_MAX + 1))
+
+if __name__ == "__main__":
+    unittest.main()